@@ -211,6 +211,64 @@ function _notifySubscribers(data) {
   }
 }
 
+// --- Bridge state frames ---
+// State messages (skin-state, chroma-state, ...) carry a topic and a per-connection
+// sequence number; after the first full frame of a topic the backend only sends
+// the fields that changed. Rebuild the full message before anyone sees it.
+const _bridgeTopics = new Map(); // topic -> last full payload
+let _bridgeSeq = 0;
+let _bridgeResyncPending = false;
+
+function resetBridgeFrames() {
+  _bridgeTopics.clear();
+  _bridgeSeq = 0;
+  _bridgeResyncPending = false;
+}
+
+function requestBridgeResync() {
+  _bridgeTopics.clear();
+  if (_bridgeResyncPending) return;
+  _bridgeResyncPending = true;
+  try {
+    bridgeSocket.send(JSON.stringify({ type: "bridge-resync" }));
+  } catch (error) {
+    console.warn(`${LOG_PREFIX} Bridge resync request failed`, error);
+  }
+}
+
+function applyBridgeFrame(data) {
+  if (!data || typeof data.seq !== "number" || !data.topic) {
+    return data; // Event or legacy full frame
+  }
+  const { topic, seq } = data;
+  if (seq === 1) {
+    // Backend (re)started the sequence: every topic begins with a full frame
+    _bridgeTopics.clear();
+    _bridgeResyncPending = false;
+  } else if (_bridgeResyncPending || seq !== _bridgeSeq + 1) {
+    requestBridgeResync();
+    return null;
+  }
+  _bridgeSeq = seq;
+
+  let full;
+  if (data.delta) {
+    const base = _bridgeTopics.get(topic);
+    if (!base) {
+      requestBridgeResync();
+      return null;
+    }
+    full = { ...base, ...(data.set || {}) };
+    for (const key of data.unset || []) delete full[key];
+  } else {
+    full = { ...data };
+    delete full.topic;
+    delete full.seq;
+  }
+  _bridgeTopics.set(topic, full);
+  return { ...full };
+}
+
 function _notifyReady() {
   for (const cb of _readyCallbacks) {
     try { cb(); } catch (e) {
@@ -355,6 +413,12 @@ function setupBridgeSocket() {
       clearTimeout(retryTimer);
       retryTimer = null;
     }
+    resetBridgeFrames();
+    try {
+      bridgeSocket.send(JSON.stringify({ type: "bridge-hello", deltas: true }));
+    } catch (error) {
+      console.warn(`${LOG_PREFIX} Bridge hello failed`, error);
+    }
     flushBridgeQueue();
     resyncSkinAfterConnect();
     bridgeErrorLogged = false;
@@ -372,6 +436,11 @@ function setupBridgeSocket() {
       return;
     }
 
+    data = applyBridgeFrame(data);
+    if (!data) {
+      return;
+    }
+
     // Notify all bridge subscribers
     _notifySubscribers(data);
 
@@ -456,6 +525,7 @@ function setupBridgeSocket() {
 
   bridgeSocket.addEventListener("close", () => {
     bridgeReady = false;
+    resetBridgeFrames();
     scheduleBridgeRetry();
   });
 
@@ -135,19 +135,26 @@ hiddenimports = [
     'injection.config.config_manager',
     'injection.config.threshold_manager',
     'injection.mods',
+    'injection.mods.extract_cache',
     'injection.mods.mod_manager',
+    'injection.mods.mod_index',
+    'injection.mods.prefetch',
+    'injection.mods.preparation',
     'injection.mods.zip_resolver',
     'injection.overlay',
     'injection.overlay.overlay_manager',
     'injection.overlay.process_manager',
+    'injection.overlay.overlay_cache',
     'injection.tools',
     'injection.tools.tools_manager',
     'lcu',
     'lcu.core',
     'lcu.core.client',
     'lcu.core.lcu_api',
+    'lcu.core.async_client',
     'lcu.core.lcu_connection',
     'lcu.core.lockfile',
+    'lcu.core.state_store',
     'lcu.data',
     'lcu.data.skin_scraper',
     'lcu.data.skin_cache',
@@ -162,10 +169,13 @@ hiddenimports = [
     'pengu.core',
     'pengu.core.skin_monitor',
     'pengu.core.websocket_server',
+    'pengu.core.broadcast_channel',
     'pengu.core.http_handler',
+    'pengu.core.file_cache',
     'pengu.communication',
     'pengu.communication.message_handler',
     'pengu.communication.broadcaster',
+    'pengu.communication.dispatcher',
     'pengu.processing',
     'pengu.processing.skin_processor',
     'pengu.processing.skin_mapping',
@@ -191,6 +201,7 @@ hiddenimports = [
     'threads.utilities.loadout_ticker',
     'threads.utilities.timer_manager',
     'threads.utilities.skin_name_resolver',
+    'threads.utilities.speculative_builder',
     'threads.websocket',
     'threads.websocket.websocket_connection',
     'threads.websocket.websocket_event_handler',
@@ -198,21 +209,31 @@ hiddenimports = [
     'utils.core',
     'utils.core.logging',
     'utils.core.paths',
+    'utils.core.config_store',
     'utils.core.utilities',
     'utils.core.validation',
     'utils.core.normalization',
     'utils.core.historic',
+    'utils.core.journaled_store',
+    'utils.core.fingerprint',
+    'utils.core.directory_cache',
+    'utils.core.latency',
     'utils.system',
     'utils.system.admin_utils',
     'utils.system.win32_base',
     'utils.system.window_utils',
     'utils.system.resolution_utils',
+    'utils.system.process_watcher',
     'utils.download',
     'utils.download.repo_downloader',
     'utils.download.skin_downloader',
     'utils.download.smart_skin_downloader',
     'utils.download.hashes_downloader',
     'utils.download.hash_updater',
+    'utils.download.extract_manifest',
+    'utils.download.segmented_download',
+    'utils.download.tree_sync',
+    'utils.download.zip_stream',
     'utils.integration',
     'utils.integration.tray_manager',
     'utils.integration.tray_settings',
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ConfigStore benchmark
+Config lookups per second through ConfigStore versus the old path, which
+re-read config.ini with a fresh ConfigParser (_reload_config) on every
+get_config_option call. Also counts disk writes for a burst of settings
+changes, which the store batches.
+
+Runs against a generated config.ini in a temporary directory, shaped like the
+app's (sections General/Settings/Paths/..., float, bool and path values).
+
+Usage:
+    python benchmarks/config_store_bench.py [--seconds 2] [--options 44] [--burst 50]
+"""
+
+import argparse
+import configparser
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Headless runs: keep the tray icon backend from opening a display
+os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+
+from config import CONFIG_REVALIDATE_S, CONFIG_WRITE_DELAY_S  # noqa: E402
+from utils.core.config_store import ConfigStore  # noqa: E402
+
+SECTIONS = ["General", "Settings", "Paths", "Overlay", "Network", "Updates"]
+
+
+def write_config(path: Path, options: int) -> list:
+    """Write a config.ini with *options* options; returns the float options as (section, option)"""
+    parser = configparser.ConfigParser()
+    floats = []
+    for i in range(options):
+        section = SECTIONS[i % len(SECTIONS)]
+        if not parser.has_section(section):
+            parser.add_section(section)
+        kind = i % 3
+        if kind == 0:
+            parser.set(section, f"threshold_{i}", f"{0.1 + i / 100:.2f}")
+            floats.append((section, f"threshold_{i}"))
+        elif kind == 1:
+            parser.set(section, f"enabled_{i}", "true" if i % 2 else "false")
+        else:
+            parser.set(section, f"path_{i}", f"C:\\Riot Games\\League of Legends\\Game\\{i}")
+    with open(path, "w", encoding="utf-8") as fh:
+        parser.write(fh)
+    return floats
+
+
+class LegacyConfig:
+    """get_config_option before ConfigStore: clear and re-read on every call"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.config = configparser.ConfigParser()
+
+    def _reload_config(self) -> None:
+        self.config.clear()
+        if self.path.exists():
+            try:
+                self.config.read(self.path)
+            except Exception:
+                pass
+
+    def get(self, section: str, option: str, fallback=None):
+        self._reload_config()
+        if self.config.has_option(section, option):
+            return self.config.get(section, option)
+        return fallback
+
+
+def lookups_per_second(get, keys: list, seconds: float) -> tuple:
+    """get_config_float through *get* for *seconds*; returns (lookups/s, lookups)"""
+    count = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while True:
+        for section, option in keys:
+            value = get(section, option)
+            float(value) if value is not None else 0.0
+        count += len(keys)
+        if time.perf_counter() >= deadline:
+            break
+    return count / (time.perf_counter() - start), count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--options", type=int, default=44)
+    parser.add_argument("--burst", type=int, default=50, help="set_config_option calls in a row")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "config.ini"
+        keys = write_config(path, args.options)
+        print(f"config.ini with {args.options} options, {args.seconds:.1f} s per path, "
+              f"revalidate every {CONFIG_REVALIDATE_S * 1000:.0f} ms\n")
+
+        legacy = LegacyConfig(path)
+        old_rate, _ = lookups_per_second(legacy.get, keys, args.seconds)
+        print(f"old (_reload_config per call)  {old_rate:12,.0f} lookups/s")
+
+        store = ConfigStore(lambda: path, CONFIG_REVALIDATE_S, CONFIG_WRITE_DELAY_S)
+        new_rate, count = lookups_per_second(store.get, keys, args.seconds)
+        print(f"new (ConfigStore)              {new_rate:12,.0f} lookups/s "
+              f"({store.stats['stats']} stats, {store.stats['reloads']} parse(s) for {count:,} lookups)")
+        print(f"speed-up                       {new_rate / old_rate:12,.0f}x\n")
+
+        writes_before = store.stats["writes"]
+        section, option = keys[0]
+        for i in range(args.burst):
+            store.set(section, option, f"{i / 10:.1f}")
+        time.sleep(CONFIG_WRITE_DELAY_S * 2 + 0.1)
+        store.flush()
+        print(f"{args.burst} set_config_option calls -> {store.stats['writes'] - writes_before} write(s) "
+              f"(old path: {args.burst})")
+
+
+if __name__ == "__main__":
+    main()
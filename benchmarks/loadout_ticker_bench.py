@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LoadoutTicker benchmark
+Wake-ups per second, injection trigger jitter and CPU time of the deadline
+scheduled ticker versus the old fixed-rate loop (sleep 1/hz per iteration).
+
+The ticker runs against a stubbed LCU session and shared state; the skin name
+resolver and injection trigger are replaced by stubs that record when the
+injection would have fired. Jitter is that time minus the ideal trigger time
+(countdown deadline - threshold).
+
+Usage:
+    python benchmarks/loadout_ticker_bench.py [--runs 5] [--countdown-ms 4000] [--threshold-ms 300] [--hz 1000]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Headless runs: keep the tray icon backend from opening a display
+os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+
+from threads.utilities import loadout_ticker  # noqa: E402
+from threads.utilities.loadout_ticker import LoadoutTicker  # noqa: E402
+
+TICKER_ID = 1
+
+
+class StubLCU:
+    """Session that keeps reporting the countdown the ticker was started with"""
+
+    def __init__(self, left_ms: int):
+        self._left_ms = left_ms
+        self._t0 = time.monotonic()
+        self.state_store = types.SimpleNamespace(age=lambda _uri: 0.0)
+
+    @property
+    def session(self):
+        left = max(0, int(self._left_ms - (time.monotonic() - self._t0) * 1000.0))
+        return {"timer": {"phase": "BAN_PICK", "adjustedTimeLeftInPhase": left}}
+
+
+class StubResolver:
+    def build_skin_label(self):
+        return "Benchmark Skin"
+
+    def resolve_injection_name(self):
+        return "Benchmark Skin"
+
+
+class StubTrigger:
+    def __init__(self, state):
+        self.state = state
+        self.fired_at = None
+
+    def trigger_injection(self, name, ticker_id, cname=""):
+        if self.fired_at is None:
+            self.fired_at = time.monotonic()
+        self.state.last_hover_written = True
+
+
+class CountingTime:
+    """Stand-in for the ticker module's `time`, counting sleeps of the ticker thread"""
+
+    def __init__(self):
+        self.wakeups = 0
+        self.thread = None
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+    def sleep(self, seconds):
+        if threading.current_thread() is self.thread:
+            self.wakeups += 1
+        time.sleep(seconds)
+
+
+class LegacyLoadoutTicker(LoadoutTicker):
+    """The loop before deadline scheduling: one iteration every 1/hz"""
+
+    def _sleep_until_next_event(self, deadline, next_poll, thresh_ms):
+        loadout_ticker.time.sleep(1.0 / float(self.hz))
+
+
+def run_once(ticker_cls, countdown_ms: int, threshold_ms: int, hz: int) -> dict:
+    t0 = time.monotonic()
+    state = types.SimpleNamespace(
+        stop=False,
+        loadout_countdown_active=True,
+        current_ticker=TICKER_ID,
+        phase="ChampSelect",
+        loadout_left0_ms=countdown_ms,
+        loadout_t0=t0,
+        last_remain_ms=0,
+        skin_write_ms=threshold_ms,
+        last_hover_written=False,
+        locked_champ_id=None,
+        hovered_champ_id=None,
+    )
+    ticker = ticker_cls(StubLCU(countdown_ms), state, hz=hz, fallback_ms=0, ticker_id=TICKER_ID)
+    ticker.skin_name_resolver = StubResolver()
+    trigger = ticker.injection_trigger = StubTrigger(state)
+
+    counting = CountingTime()
+    original_time = loadout_ticker.time
+    loadout_ticker.time = counting
+    try:
+        cpu_start = time.process_time()
+        wall_start = time.monotonic()
+        counting.thread = ticker
+        ticker.start()
+        ticker.join()
+        wall = time.monotonic() - wall_start
+        cpu = time.process_time() - cpu_start
+    finally:
+        loadout_ticker.time = original_time
+
+    ideal = t0 + (countdown_ms - threshold_ms) / 1000.0
+    return {
+        "wakeups_per_s": counting.wakeups / wall,
+        "jitter_ms": (trigger.fired_at - ideal) * 1000.0 if trigger.fired_at else None,
+        "cpu_ms": cpu * 1000.0,
+    }
+
+
+def report(label: str, results: list) -> None:
+    wakeups = [r["wakeups_per_s"] for r in results]
+    jitter = [r["jitter_ms"] for r in results if r["jitter_ms"] is not None]
+    cpu = [r["cpu_ms"] for r in results]
+    print(f"{label}:")
+    print(f"  wake-ups/s   {statistics.mean(wakeups):8.1f}")
+    if jitter:
+        print(f"  trigger      {min(jitter):+8.2f} .. {max(jitter):+.2f} ms (mean {statistics.mean(jitter):+.2f})")
+    else:
+        print("  trigger      never fired")
+    print(f"  CPU          {statistics.mean(cpu):8.1f} ms per countdown")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--countdown-ms", type=int, default=4000)
+    parser.add_argument("--threshold-ms", type=int, default=300)
+    parser.add_argument("--hz", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{args.runs} run(s): {args.countdown_ms} ms countdown, {args.threshold_ms} ms threshold, {args.hz} Hz\n")
+    for label, cls in (("old (fixed rate)", LegacyLoadoutTicker), ("new (deadline)", LoadoutTicker)):
+        results = [run_once(cls, args.countdown_ms, args.threshold_ms, args.hz) for _ in range(args.runs)]
+        report(label, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log ring buffer benchmark
+A burst of debug records (verbose mode, console plus file) through
+RingBufferHandler versus the old setup: console behind a 1000-record queue
+that dropped silently when full, file written on the calling thread with a
+stat() per record.
+
+Reports records/s (until the last logging call returns, and until the last
+record is written), the latency of the logging call on the emitting threads,
+and records lost. A last run stalls the console once for --stall-ms with a
+small ring, to show overflow costs a caller at most LOG_RING_BLOCK_S.
+
+Console output goes to a file in a temporary directory, so lost console lines
+can be counted. With several emitting threads the max call latency is set by
+GIL hand-offs between them and the writer thread, not by the handler; compare
+p50/p99.
+
+Usage:
+    python benchmarks/log_ring_bench.py [--records 50000] [--threads 1 4] [--stall-ms 200] [--stall-capacity 1024]
+"""
+
+import argparse
+import logging
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Headless runs: keep the tray icon backend from opening a display
+os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+
+from config import LOG_RING_BLOCK_S, LOG_RING_CAPACITY  # noqa: E402
+from utils.core.logging import (  # noqa: E402
+    RingBufferHandler,
+    SizeRotatingCompositeHandler,
+    _format_batch,
+)
+
+VERBOSE_FMT = "%(_when)s | %(levelname)-7s | %(message)s"
+
+
+class WhenFormatter(logging.Formatter):
+    def format(self, record):
+        record._when = time.strftime("%H:%M:%S", time.localtime(record.created))
+        return super().format(record)
+
+
+class ConsoleTarget(logging.StreamHandler):
+    """The console handler of setup_logging, optionally stalling once"""
+
+    def __init__(self, stream, stall_s: float = 0.0):
+        super().__init__(stream)
+        self.stall_s = stall_s
+
+    def _maybe_stall(self):
+        if self.stall_s:
+            stall, self.stall_s = self.stall_s, 0.0
+            time.sleep(stall)
+
+    def emit(self, record):
+        self._maybe_stall()
+        self.stream.write(self.format(record) + self.terminator)
+        self.stream.flush()
+
+    def handle_batch(self, records):
+        self._maybe_stall()
+        lines = _format_batch(self, records)
+        if lines:
+            self.stream.write(self.terminator.join(lines) + self.terminator)
+            self.stream.flush()
+
+
+class LegacyFileHandler(SizeRotatingCompositeHandler):
+    """File handler before the ring buffer: stat() and write per record"""
+
+    def emit(self, record):
+        try:
+            if self.current_path.exists():
+                self.current_path.stat().st_size
+            self.current_handler.emit(record)
+        except Exception:
+            pass
+
+
+class LegacyQueueHandler(logging.Handler):
+    """Console queue before the ring buffer: 1000 records, drops when full"""
+
+    def __init__(self, target):
+        super().__init__()
+        self.target = target
+        self.queue = queue.Queue(maxsize=1000)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            try:
+                self.target.emit(record)
+            finally:
+                self.queue.task_done()
+
+    def emit(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+    def flush(self):
+        self.queue.join()
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join(timeout=2.0)
+        super().close()
+
+
+def make_targets(tmp: Path, name: str, legacy: bool, stall_s: float = 0.0):
+    console_path = tmp / f"{name}.console"
+    console_stream = open(console_path, "w", encoding="utf-8")
+    console = ConsoleTarget(console_stream, stall_s)
+    file_cls = LegacyFileHandler if legacy else SizeRotatingCompositeHandler
+    file_handler = file_cls(tmp / f"{name}.log", lambda p: logging.FileHandler(p, encoding="utf-8"), 1 << 40)
+    for handler in (console, file_handler):
+        handler.setFormatter(WhenFormatter(VERBOSE_FMT))
+        handler.setLevel(logging.DEBUG)
+    return console, file_handler, console_stream, console_path
+
+
+def run(tmp: Path, name: str, legacy: bool, records: int, threads: int,
+        capacity: int = LOG_RING_CAPACITY, stall_s: float = 0.0) -> dict:
+    console, file_handler, console_stream, console_path = make_targets(tmp, name, legacy, stall_s)
+    if legacy:
+        handlers = [LegacyQueueHandler(console), file_handler]
+    else:
+        handlers = [RingBufferHandler([console, file_handler], capacity=capacity)]
+    logger = logging.getLogger(f"bench.{name}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    for handler in handlers:
+        logger.addHandler(handler)
+
+    per_thread = records // threads
+    latencies = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def emitter(slot: int):
+        samples = latencies[slot]
+        clock = time.perf_counter
+        barrier.wait()
+        for i in range(per_thread):
+            start = clock()
+            logger.debug("[BENCH] record %d from emitter %d with some payload %s", i, slot, "x" * 40)
+            samples.append(clock() - start)
+
+    workers = [threading.Thread(target=emitter, args=(slot,)) for slot in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    emitted = time.perf_counter() - start
+    total = per_thread * threads
+    if legacy:
+        handlers[0].flush()
+    else:
+        ring = handlers[0]
+        while ring.stats["records"] + ring.stats["dropped"] < total:
+            time.sleep(0.001)
+    written = time.perf_counter() - start
+
+    dropped = handlers[0].stats["dropped"] if not legacy else None
+    for handler in handlers:
+        logger.removeHandler(handler)
+        handler.close()
+    file_handler.close()
+    console_stream.close()
+    with open(console_path, encoding="utf-8") as fh:
+        console_lines = sum(1 for _ in fh)
+
+    samples = sorted(s * 1e6 for thread_samples in latencies for s in thread_samples)
+    return {
+        "total": total,
+        "emit_rate": total / emitted,
+        "end_to_end_rate": total / written,
+        "p50": samples[len(samples) // 2],
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "max": samples[-1],
+        "console_lost": total - console_lines,
+        "dropped": dropped,
+    }
+
+
+def report(label: str, result: dict) -> None:
+    print(f"{label}:")
+    print(f"  {result['emit_rate'] / 1000:6.1f}k rec/s emit, {result['end_to_end_rate'] / 1000:6.1f}k rec/s written")
+    print(f"  call p50 {result['p50']:6.1f} us  p99 {result['p99']:6.1f} us  max {result['max'] / 1000:7.2f} ms")
+    lost = f"  console lines lost {result['console_lost']}"
+    if result["dropped"] is not None:
+        lost += f", dropped (counted) {result['dropped']}"
+    print(lost)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--stall-ms", type=float, default=200.0)
+    parser.add_argument("--stall-capacity", type=int, default=1024, help="ring size for the stall run")
+    args = parser.parse_args()
+
+    print(f"{args.records} debug records, console + file, verbose format\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for threads in args.threads:
+            report(f"old, {threads} thread(s)", run(tmp, f"old{threads}", True, args.records, threads))
+            report(f"new, {threads} thread(s)", run(tmp, f"new{threads}", False, args.records, threads))
+        if args.stall_ms > 0:
+            result = run(tmp, "stall", False, args.records, 1,
+                         capacity=args.stall_capacity, stall_s=args.stall_ms / 1000.0)
+            report(f"new, console stalled {args.stall_ms:.0f} ms, ring of {args.stall_capacity} "
+                   f"(block limit {LOG_RING_BLOCK_S * 1000:.0f} ms)", result)
+
+
+if __name__ == "__main__":
+    main()
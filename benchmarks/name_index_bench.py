@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NameIndex benchmark
+Skin name lookup latency of NameIndex versus the scans it replaced: the
+nested levenshtein_distance loop of find_skin_by_text (per champion and over
+a whole language) and the linear partial-match loop of
+SkinMapping.find_skin_id_by_name.
+
+Names come from skin_ids.json ({"<skin id>": "<name>"}): --mapping, else the
+user data copy for --language, else a generated mapping of the same shape
+(skin id = champion id * 1000 + skin number). Fuzzy queries are real names
+with 1-3 random edits.
+
+Usage:
+    python benchmarks/name_index_bench.py [--mapping skin_ids.json] [--language en_US] [--queries 200]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Headless runs: keep the tray icon backend from opening a display
+os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+
+from utils.core.normalization import NameIndex, levenshtein_distance  # noqa: E402
+from utils.core.paths import get_user_data_dir  # noqa: E402
+
+THEMES = [
+    "Arcade", "Battle Academia", "Blood Moon", "Coven", "Cosmic", "Dark Star",
+    "Elderwood", "Empyrean", "Faerie Court", "High Noon", "Infernal", "K/DA",
+    "Lunar Beast", "Mecha", "Odyssey", "PROJECT:", "Pool Party", "Prestige",
+    "PsyOps", "Snow Day", "Soul Fighter", "Spirit Blossom", "Star Guardian",
+    "Winterblessed", "Worlds 2023", "Sentinel", "Space Groove", "Debonair",
+]
+SYLLABLES = ["ka", "ra", "sh", "th", "el", "zi", "mor", "an", "ix", "on", "ve", "ly", "sa", "gar", "ni"]
+ALPHABET = "abcdefghijklmnopqrstuvwxyz "
+
+
+def generate_mapping(rng: random.Random, champions: int, skins_per_champion: int) -> dict:
+    mapping = {}
+    for champion_id in range(1, champions + 1):
+        champion = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        mapping[str(champion_id * 1000)] = champion
+        for number in range(1, skins_per_champion):
+            name = f"{rng.choice(THEMES)} {champion}"
+            if rng.random() < 0.2:
+                name += f" ({rng.choice(THEMES)})"
+            mapping[str(champion_id * 1000 + number)] = name
+    return mapping
+
+
+def load_mapping(args, rng: random.Random):
+    candidates = [Path(args.mapping)] if args.mapping else []
+    candidates.append(get_user_data_dir() / "skinid_mapping" / args.language / "skin_ids.json")
+    for path in candidates:
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as handle:
+                return json.load(handle), str(path)
+    return generate_mapping(rng, args.champions, args.skins_per_champion), "generated"
+
+
+def typo(rng: random.Random, text: str) -> str:
+    chars = list(text)
+    for _ in range(rng.randint(1, 3)):
+        pos = rng.randrange(len(chars) + 1)
+        op = rng.randrange(3)
+        if op == 0 or not chars:
+            chars.insert(pos, rng.choice(ALPHABET))
+        elif pos < len(chars):
+            if op == 1:
+                del chars[pos]
+            else:
+                chars[pos] = rng.choice(ALPHABET)
+    return "".join(chars)
+
+
+def old_closest(names, query):
+    """find_skin_by_text before NameIndex"""
+    best, best_distance = None, float("inf")
+    for name in names:
+        distance = levenshtein_distance(query, name)
+        if distance < best_distance:
+            best_distance, best = distance, name
+    return best
+
+
+def old_containing(mapping, query):
+    """find_skin_id_by_name partial match before NameIndex"""
+    for mapped_name, skin_id in mapping.items():
+        if query in mapped_name or mapped_name in query:
+            return skin_id
+    return None
+
+
+def timed(fn, queries) -> list:
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def pct(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def fmt_us(value: float) -> str:
+    return f"{value / 1000:.2f} ms" if value >= 1000 else f"{value:.0f} us"
+
+
+def report(label: str, old: list, new: list) -> None:
+    print(f"{label}:")
+    print(f"  old  p50 {fmt_us(pct(old, 0.5)):>10}  p99 {fmt_us(pct(old, 0.99)):>10}")
+    print(f"  new  p50 {fmt_us(pct(new, 0.5)):>10}  p99 {fmt_us(pct(new, 0.99)):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mapping", help="path to a skin_ids.json")
+    parser.add_argument("--language", default="en_US")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--champions", type=int, default=170, help="generated mapping only")
+    parser.add_argument("--skins-per-champion", type=int, default=12, help="generated mapping only")
+    parser.add_argument("--seed", type=int, default=17)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    raw, source = load_mapping(args, rng)
+    skins = []  # (skin id, original name)
+    for skin_id_str, name in raw.items():
+        try:
+            skins.append((int(skin_id_str), (name or "").strip()))
+        except (TypeError, ValueError):
+            continue
+    skins = [(skin_id, name) for skin_id, name in skins if name]
+    by_champion = {}
+    for skin_id, name in skins:
+        by_champion.setdefault(skin_id // 1000, []).append((skin_id, name))
+    # Lowercased mapping, as SkinMapping.load_mapping builds it
+    mapping = {}
+    for skin_id, name in skins:
+        mapping.setdefault(name.lower(), skin_id)
+    print(f"{len(skins)} names, {len(by_champion)} champions ({source}), {args.queries} queries\n")
+
+    # Per champion (ChampionSkinCache): the index is built once per champion
+    champion_ids = [cid for cid, entries in by_champion.items() if len(entries) > 1] or list(by_champion)
+    champion_queries = []
+    for _ in range(args.queries):
+        entries = by_champion[rng.choice(champion_ids)]
+        champion_queries.append((entries, typo(rng, rng.choice(entries)[1])))
+    champion_indexes = {id(entries): NameIndex(entries, memo_size=0) for entries in by_champion.values()}
+    old = timed(lambda item: old_closest([name for _, name in item[0]], item[1]), champion_queries)
+    new = timed(lambda item: champion_indexes[id(item[0])].closest([item[1]]), champion_queries)
+    report("per-champion fuzzy", old, new)
+
+    # Whole language: worst case for the ranking (many names share trigrams)
+    names = [name for _, name in skins]
+    start = time.perf_counter()
+    language_index = NameIndex(skins, memo_size=0)
+    build_ms = (time.perf_counter() - start) * 1000
+    language_queries = [typo(rng, rng.choice(names)) for _ in range(max(1, args.queries // 10))]
+    old = timed(lambda query: old_closest(names, query), language_queries)
+    new = timed(lambda query: language_index.closest([query]), language_queries)
+    report(f"whole-language fuzzy (index build {build_ms:.1f} ms)", old, new)
+
+    # Partial match over the lowercased mapping (SkinMapping)
+    lowered = list(mapping)
+    partial_queries = []
+    for _ in range(args.queries):
+        name = rng.choice(lowered)
+        partial_queries.append(name[: max(3, len(name) // 2)] if rng.random() < 0.5 else f"{name} extra")
+    start = time.perf_counter()
+    mapping_index = NameIndex(((skin_id, name) for name, skin_id in mapping.items()), memo_size=0)
+    build_ms = (time.perf_counter() - start) * 1000
+    old = timed(lambda query: old_containing(mapping, query), partial_queries)
+    new = timed(mapping_index.containing, partial_queries)
+    report(f"mapping partial match (index build {build_ms:.1f} ms)", old, new)
+
+    memo_index = NameIndex(skins)
+    query = language_queries[0]
+    memo_index.closest([query])
+    hits = timed(lambda q: memo_index.closest([q]), [query] * 1000)
+    print(f"\nmemo hit: {statistics.median(hits):.1f} us")
+
+
+if __name__ == "__main__":
+    main()
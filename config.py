@@ -5,13 +5,13 @@ Global constants for Rose
 All arbitrary values are centralized here for easy tracking and modification
 """
 
-import shutil
+import atexit
 import sys
 import logging
-from typing import TYPE_CHECKING, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
 from pathlib import Path
-import configparser
 
+from utils.core.config_store import ConfigChange, ConfigStore
 from utils.core.paths import get_user_data_dir
 
 log = logging.getLogger(__name__)
@@ -23,7 +23,8 @@ log = logging.getLogger(__name__)
 APP_VERSION = "1.1.12"                          # Application version
 APP_USER_AGENT = f"Rose/{APP_VERSION}"  # User-Agent header for HTTP requests
 
-_CONFIG = configparser.ConfigParser()
+CONFIG_REVALIDATE_S = 0.25   # config.ini is stat'ed at most this often to pick up outside edits
+CONFIG_WRITE_DELAY_S = 0.2   # Settings changes are batched and written this long after the first one
 
 
 def get_config_file_path() -> Path:
@@ -32,31 +33,21 @@ def get_config_file_path() -> Path:
     return config_dir / "config.ini"
 
 
+_CONFIG_STORE = ConfigStore(get_config_file_path, CONFIG_REVALIDATE_S, CONFIG_WRITE_DELAY_S)
+# Don't lose settings changed right before exit
+atexit.register(_CONFIG_STORE.flush)
+
+
 def _reload_config() -> None:
-    _CONFIG.clear()
-    config_path = get_config_file_path()
-    if not config_path.exists():
-        legacy_path = Path("config.ini")
-        if legacy_path.exists():
-            try:
-                shutil.copy2(legacy_path, config_path)
-            except Exception as e:
-                log.debug(f"Failed to migrate legacy config: {e}")
-    if config_path.exists():
-        try:
-            _CONFIG.read(config_path)
-        except Exception as e:
-            log.warning(f"Failed to read config file: {e}")
+    """Re-check config.ini now instead of waiting for the next revalidation"""
+    _CONFIG_STORE.reload()
 
 
 _reload_config()
 
 
 def get_config_option(section: str, option: str, fallback: Optional[str] = None) -> Optional[str]:
-    _reload_config()
-    if _CONFIG.has_option(section, option):
-        return _CONFIG.get(section, option)
-    return fallback
+    return _CONFIG_STORE.get(section, option, fallback)
 
 
 def get_config_float(section: str, option: str, fallback: float) -> float:
@@ -70,21 +61,26 @@ def get_config_float(section: str, option: str, fallback: float) -> float:
 
 
 def set_config_option(section: str, option: str, value: str) -> None:
-    config_path = get_config_file_path()
-    config = configparser.ConfigParser()
-    if config_path.exists():
-        try:
-            config.read(config_path)
-        except Exception as e:
-            log.debug(f"Failed to read config for update: {e}")
-    if section not in config:
-        config.add_section(section)
-    config.set(section, option, value)
-    try:
-        with open(config_path, "w", encoding="utf-8") as fh:
-            config.write(fh)
-    except Exception as e:
-        log.warning(f"Failed to write config file: {e}")
+    _CONFIG_STORE.set(section, option, value)
+
+
+def set_config_options(section: str, values: Dict[str, str]) -> None:
+    """Set several options of a section in one write"""
+    _CONFIG_STORE.set_many({(section, option): value for option, value in values.items()})
+
+
+def flush_config() -> bool:
+    """Write pending config changes to disk now (for code that reads config.ini directly)"""
+    return _CONFIG_STORE.flush()
+
+
+def subscribe_config(
+    callback: Callable[[ConfigChange], None],
+    section: Optional[str] = None,
+    option: Optional[str] = None,
+) -> Callable[[], None]:
+    """Get called with a ConfigChange when a matching option changes; returns an unsubscribe function"""
+    return _CONFIG_STORE.subscribe(callback, section, option)
 
 
 # =============================================================================
@@ -107,6 +103,11 @@ CHAMP_POLL_INTERVAL = 0.25  # Seconds between champion state checks
 
 # LCU connection monitoring
 LCU_MONITOR_INTERVAL = 1.0  # Seconds between LCU connection checks
+LOCKFILE_SCAN_INTERVAL_S = 5.0  # Min seconds between process-table scans for the lockfile while the client is closed
+
+# LCU state store (WebSocket-fed cache read by the threads above)
+LCU_STATE_MAX_AGE_S = 30.0      # Re-fetch a cached resource over REST after this long, even with the WebSocket up
+LCU_STATE_NEGATIVE_TTL_S = 1.0  # How long an empty (404/None) REST answer is cached
 
 # Main loop sleep intervals
 MAIN_LOOP_SLEEP = 0.016     # Main loop iteration sleep time (16ms for 60 FPS responsive chroma UI)
@@ -119,6 +120,15 @@ MAIN_LOOP_SLEEP = 0.016     # Main loop iteration sleep time (16ms for 60 FPS re
 WS_PING_INTERVAL_DEFAULT = 20  # Seconds between WebSocket pings
 WS_PING_TIMEOUT_DEFAULT = 10   # Seconds before WebSocket ping times out
 WS_RECONNECT_DELAY = 1.0       # Seconds to wait before WebSocket reconnect
+PENGU_HANDLER_WORKERS = 4      # Threads running blocking Pengu bridge message handlers
+PENGU_FAST_PATH_WARN_MS = 20   # Log in-loop Pengu handlers slower than this (candidates for the executor)
+PENGU_BROADCAST_TICK_S = 0.016 # Bursts of plugin state updates are coalesced into one frame per topic per tick
+PENGU_CLIENT_QUEUE_MAX = 256   # Frames queued for one plugin client before it's dropped as too slow
+PENGU_CLIENT_SEND_TIMEOUT_S = 2.0  # A single send to a plugin client taking longer than this drops it
+PENGU_FILE_CACHE_MAX_MB = 64   # In-memory cache for previews, assets and plugin files served over HTTP
+PENGU_FILE_CACHE_MAX_ENTRY_MB = 8  # Larger files are still served, just not kept in memory
+PENGU_FILE_CACHE_REVALIDATE_S = 2.0  # Serve cached files without touching the disk for this long after a stat
+PENGU_PREVIEW_PREWARM = True   # Load the locked champion's skin previews into the cache ahead of time
 
 # =============================================================================
 # NODEMASTER P2P CONSTANTS
@@ -140,10 +150,12 @@ WS_PROBE_WINDOW_MS = 480       # Total probe window (8 * 60ms ~= 480ms)
 # LOADOUT TIMER CONSTANTS
 # =============================================================================
 
-TIMER_HZ_DEFAULT = 1000                     # Countdown display frequency (Hz)
+TIMER_HZ_DEFAULT = 1000                     # Ticker step rate near the injection threshold (Hz)
 TIMER_HZ_MIN = 10                           # Minimum timer frequency
 TIMER_HZ_MAX = 2000                         # Maximum timer frequency
 TIMER_POLL_PERIOD_S = 0.2                   # Seconds between LCU resync checks
+TIMER_FINE_WINDOW_S = 0.05                  # Ticker steps at timer Hz only this long before the injection threshold
+TIMER_TRIGGER_RETRY_S = 0.01                # Retry period once past the threshold without an injection
 FALLBACK_LOADOUT_MS_DEFAULT = 0             # Fallback countdown duration (ms)
 
 # Skin injection timing
@@ -158,6 +170,21 @@ PERSISTENT_MONITOR_AUTO_RESUME_S = 20.0     # Auto-resume game after this many s
 GAME_RESUME_VERIFICATION_WAIT_S = 0.1       # Seconds to wait after resume for status verification
 GAME_RESUME_MAX_ATTEMPTS = 3                # Max attempts to resume game (handles multiple suspensions)
 
+# Mod preparation (resolve/extract before mkoverlay)
+PREPARE_WORKERS_DEFAULT = 4                 # Max skins/mods extracted concurrently per injection
+
+# Custom mod index (mods/ folder listings served from memory, re-checked by mtime)
+MODS_INDEX_REVALIDATE_S = 1.0               # Re-check a mods folder against the disk at most this often
+
+# Extraction cache (skin archives extracted once, linked into mods/ as junctions)
+EXTRACT_CACHE_MAX_MB_DEFAULT = 4096         # Max disk space for extracted skins (MB, 0 = disabled)
+
+# Overlay cache (built mkoverlay output reused across injections)
+OVERLAY_CACHE_MAX_MB_DEFAULT = 2048         # Max disk space for cached overlays (MB, 0 = disabled)
+ENABLE_SPECULATIVE_OVERLAY_BUILD = True     # Pre-build the overlay during champ select once the selection settles
+SPECULATIVE_BUILD_STABLE_MS = 800           # Selection must be unchanged this long before pre-building
+SPECULATIVE_POLL_INTERVAL_S = 0.05          # How often the speculative builder checks the selection
+
 # Game delay strategies
 ENABLE_PRIORITY_BOOST = True         # Boost injection process priority to HIGH
 ENABLE_GAME_SUSPENSION = True        # Suspend game process during injection (RISKY - may trigger anti-cheat)
@@ -194,6 +221,12 @@ RATE_LIMIT_BACKOFF_MULTIPLIER = 1.5  # Multiply interval by this when low
 LOG_MAX_FILE_SIZE_MB_DEFAULT = 10        # Maximum single log file size before rolling (MB)
 LOG_CHUNK_SIZE = 8192                    # Chunk size for file downloads
 LOG_SEPARATOR_WIDTH = 80                 # Width of separator lines in logs (e.g., "=" * 80)
+LOG_RING_CAPACITY = 65536                # Records the log buffer holds between the caller and the writer thread
+LOG_BATCH_MAX = 512                      # Records formatted and written per batch by the writer thread
+LOG_RING_BLOCK_S = 0.05                  # Longest a logging call waits for buffer space before dropping
+LOG_DROP_REPORT_S = 5.0                  # Report dropped records at most this often
+LOG_TICKER_RATE_PER_S = 5.0              # Loadout ticker log lines per second per call site
+LOG_TICKER_BURST = 10                    # Loadout ticker lines allowed in a burst before limiting
 
 
 # =============================================================================
@@ -204,6 +237,12 @@ LOG_SEPARATOR_WIDTH = 80                 # Width of separator lines in logs (e.g
 PROCESS_TERMINATE_TIMEOUT_S = 5         # Timeout for process.wait() after terminate/kill
 PROCESS_TERMINATE_WAIT_S = 0.3          # Short timeout for process wait after terminate() before kill()
 PROCESS_ENUM_TIMEOUT_S = 2.0            # Timeout for process enumeration when finding runoverlay
+# Process watcher refresh period while anyone is subscribed (GameMonitor, for the
+# whole time it waits for the game). Worst-case appear/exit latency is this plus
+# one refresh (psutil.pids() + lookups of new PIDs, well under 1 ms), so 8 ms is
+# the slowest period that keeps detection under 10 ms. Cost is roughly 4% of one
+# core while subscribed (6% at 5 ms), nothing while nobody is subscribed.
+PROCESS_WATCH_INTERVAL_S = 0.008
 THREAD_JOIN_TIMEOUT_S = 2               # Timeout for thread.join() on shutdown (increased from 1.0s)
 THREAD_FORCE_EXIT_TIMEOUT_S = 4         # Total timeout before forcing app exit
 INJECTION_LOCK_TIMEOUT_S = 2.0          # Timeout for acquiring injection lock
@@ -219,10 +258,20 @@ CHROMA_PANEL_PROCESSING_THRESHOLD_S = 1.0  # Warning threshold for chroma panel
 
 # API request timeouts (seconds)
 LCU_API_TIMEOUT_S = 2.0                 # Timeout for LCU API requests
+LCU_HTTP_POOL_SIZE = 6                  # Keep-alive connections to the LCU for GET requests
+LCU_GET_CACHE_TTL_S = 0.05              # Identical LCU GETs within this window share one response
 LCU_SKIN_SCRAPER_TIMEOUT_S = 3.0        # Timeout for LCU skin scraper requests
+SKIN_CATALOG_MAX_CHAMPIONS = 400        # Champion skin lists kept in memory (LRU, all languages combined)
+SKIN_CATALOG_SAVE_DELAY_S = 5.0         # Batch skin catalog disk writes this long after a change
+SKIN_CATALOG_WARM_DELAY_S = 0.05        # Pause between background skin catalog fetches after login
 CHROMA_DOWNLOAD_TIMEOUT_S = 10          # Timeout for chroma preview downloads
 DEFAULT_SKIN_DOWNLOAD_TIMEOUT_S = 30    # Timeout for skin downloads
 SKIN_DOWNLOAD_STREAM_TIMEOUT_S = 60     # Timeout for streaming skin downloads
+ENABLE_STREAMING_REPO_EXTRACT = True    # Extract the repository ZIP while it downloads (no temp copy)
+REPO_DOWNLOAD_CONNECTIONS = 4           # Parallel range connections for the repository ZIP (1 = single stream)
+SKIN_UPDATE_WORKERS = 8                 # Changed skin files downloaded concurrently by incremental updates
+SKIN_UPDATE_ATTEMPTS = 4                # Tries per changed file (network errors, server errors, rate limits)
+SKIN_UPDATE_MAX_WAIT_S = 60             # Longest rate-limit wait before falling back to the repository ZIP
 
 # =============================================================================
 # SLEEP & DELAY CONSTANTS
@@ -291,6 +340,11 @@ LOG_FILE_PATTERN = "rose_*.log*"
 UPDATER_LOG_FILE_PATTERN = "log_updater_*.log*"
 LOG_TIMESTAMP_FORMAT = "%d-%m-%Y_%H-%M-%S"  # European format, Windows-compatible
 
+# Skin/mod history (historic.json, mod_historic.json): changes go to a journal
+# that is folded into the JSON file in the background
+HISTORY_COMPACT_RECORDS = 64    # Compact once the journal holds this many changes
+HISTORY_COMPACT_DELAY_S = 5.0   # ... or this long after the last change
+
 
 # =============================================================================
 # PHASE NAMES
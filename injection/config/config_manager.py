@@ -5,11 +5,10 @@ Configuration Manager
 Handles loading and saving League path configuration
 """
 
-import configparser
 from pathlib import Path
 from typing import Optional
 
-from config import get_config_file_path
+from config import flush_config, get_config_file_path, get_config_option, set_config_option, set_config_options
 from utils.core.logging import get_logger
 
 log = get_logger()
@@ -29,116 +28,38 @@ class ConfigManager:
     
     def load_league_path(self) -> Optional[str]:
         """Load league path (League of Legends.exe directory) from config.ini file"""
-        config_path = self._get_config_path()
-        if not config_path.exists():
-            log.debug("Config file not found, will create one")
+        league_path = get_config_option('General', 'leaguePath')
+        if league_path is None:
+            log.debug("League path not set in config")
             return None
-        
-        try:
-            config = configparser.ConfigParser()
-            config.read(config_path)
-            if 'General' in config and 'leaguePath' in config['General']:
-                league_path = config['General']['leaguePath']
-                log.debug(f"Loaded league path from config: {league_path}")
-                return league_path
-        except Exception as e:
-            log.warning(f"Failed to read config file: {e}")
-        
-        return None
+        log.debug(f"Loaded league path from config: {league_path}")
+        return league_path
     
     def load_client_path(self) -> Optional[str]:
         """Load client path (LeagueClient.exe directory) from config.ini file"""
-        config_path = self._get_config_path()
-        if not config_path.exists():
-            return None
-        
-        try:
-            config = configparser.ConfigParser()
-            config.read(config_path)
-            if 'General' in config and 'clientPath' in config['General']:
-                client_path = config['General']['clientPath']
-                log.debug(f"Loaded client path from config: {client_path}")
-                return client_path
-        except Exception as e:
-            log.warning(f"Failed to read config file: {e}")
-        
-        return None
+        client_path = get_config_option('General', 'clientPath')
+        if client_path is not None:
+            log.debug(f"Loaded client path from config: {client_path}")
+        return client_path
     
     def save_league_path(self, league_path: str):
         """Save league path to config.ini file"""
-        config_path = self._get_config_path()
-        try:
-            config = configparser.ConfigParser()
-            
-            # Load existing config if it exists
-            if config_path.exists():
-                config.read(config_path)
-            
-            # Ensure General section exists
-            if 'General' not in config:
-                config.add_section('General')
-            
-            # Set the league path
-            config.set('General', 'leaguePath', league_path)
-            
-            # Write to file
-            with open(config_path, 'w') as f:
-                config.write(f)
-            
+        set_config_option('General', 'leaguePath', league_path)
+        if flush_config():
             log.debug(f"Saved league path to config: {league_path}")
-        except Exception as e:
-            log.warning(f"Failed to save config file: {e}")
     
     def save_client_path(self, client_path: str):
         """Save client path to config.ini file"""
-        config_path = self._get_config_path()
-        try:
-            config = configparser.ConfigParser()
-            
-            # Load existing config if it exists
-            if config_path.exists():
-                config.read(config_path)
-            
-            # Ensure General section exists
-            if 'General' not in config:
-                config.add_section('General')
-            
-            # Set the client path
-            config.set('General', 'clientPath', client_path)
-            
-            # Write to file
-            with open(config_path, 'w') as f:
-                config.write(f)
-            
+        set_config_option('General', 'clientPath', client_path)
+        if flush_config():
             log.debug(f"Saved client path to config: {client_path}")
-        except Exception as e:
-            log.warning(f"Failed to save config file: {e}")
     
     def save_paths(self, league_path: str, client_path: str):
         """Save both league and client paths to config.ini file"""
-        config_path = self._get_config_path()
-        try:
-            config = configparser.ConfigParser()
-            
-            # Load existing config if it exists
-            if config_path.exists():
-                config.read(config_path)
-            
-            # Ensure General section exists
-            if 'General' not in config:
-                config.add_section('General')
-            
-            # Set both paths
-            config.set('General', 'leaguePath', league_path)
-            config.set('General', 'clientPath', client_path)
-            
-            # Write to file
-            with open(config_path, 'w') as f:
-                config.write(f)
-            
+        set_config_options('General', {'leaguePath': league_path, 'clientPath': client_path})
+        # Not batched: paths are needed by the next start even if this one crashes
+        if flush_config():
             log.debug(f"Saved paths to config: league={league_path}, client={client_path}")
-        except Exception as e:
-            log.warning(f"Failed to save config file: {e}")
     
     @staticmethod
     def infer_client_path_from_league_path(league_path: str) -> Optional[str]:
@@ -5,7 +5,7 @@ Threshold Manager
 Handles injection threshold configuration and management
 """
 
-from config import get_config_float
+from config import get_config_float, subscribe_config
 
 from utils.core.logging import get_logger
 
@@ -24,6 +24,8 @@ class ThresholdManager:
         self.shared_state = shared_state
         self.injection_threshold = get_config_float("General", "injection_threshold", 0.5)
         self._last_threshold_value = self.injection_threshold
+        # Apply changes from the settings UI as soon as they're made
+        self._unsubscribe = subscribe_config(lambda change: self.refresh(), "General", "injection_threshold")
     
     def refresh(self) -> float:
         """Reload injection threshold from config so tray changes apply immediately."""
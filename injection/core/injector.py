@@ -8,21 +8,25 @@ Handles the actual skin injection using CSLOL tools
 import sys
 import time
 import shutil
+import threading
 from pathlib import Path
 from typing import List, Optional
 
+from config import EXTRACT_CACHE_MAX_MB_DEFAULT, OVERLAY_CACHE_MAX_MB_DEFAULT, get_config_float
 from utils.core.logging import get_logger, log_action, log_success
 from utils.core.paths import get_skins_dir, get_injection_dir
 from utils.core.issue_reporter import report_issue
-from utils.core.junction import safe_remove_entry
 
 from ..config.config_manager import ConfigManager
 from ..game.game_detector import GameDetector
 from ..tools.tools_manager import ToolsManager
 from ..mods.zip_resolver import ZipResolver
 from ..mods.mod_manager import ModManager
+from ..mods.extract_cache import ExtractionCache
+from ..mods.preparation import format_timings, prepare_mods
 from ..overlay.overlay_manager import OverlayManager
 from ..overlay.process_manager import ProcessManager
+from ..overlay.overlay_cache import OverlayCache
 
 log = get_logger()
 
@@ -95,10 +99,21 @@ class SkinInjector:
         # Initialize managers
         self.tools_manager = ToolsManager(self.tools_dir)
         self.zip_resolver = ZipResolver(self.zips_dir)
-        self.mod_manager = ModManager(self.mods_dir)
+        # Persistent cache of extracted skins, linked into mods_dir (0 MB disables it)
+        extract_cache_mb = max(0.0, get_config_float("General", "extract_cache_max_mb", EXTRACT_CACHE_MAX_MB_DEFAULT))
+        self.extraction_cache = ExtractionCache(self.mods_dir.parent / "skin_cache", int(extract_cache_mb * 1024 * 1024))
+        self.mod_manager = ModManager(self.mods_dir, self.extraction_cache)
         self.process_manager = ProcessManager()
+        
+        # Persistent cache of built overlays (0 MB disables it)
+        overlay_cache_mb = max(0.0, get_config_float("General", "overlay_cache_max_mb", OVERLAY_CACHE_MAX_MB_DEFAULT))
+        self.overlay_cache = OverlayCache(self.mods_dir.parent / "overlay_cache", int(overlay_cache_mb * 1024 * 1024))
+        
         # Pass process_manager to overlay_manager so they share the process reference
-        self.overlay_manager = OverlayManager(self.tools_dir, self.mods_dir, self.game_dir, self.process_manager)
+        self.overlay_manager = OverlayManager(
+            self.tools_dir, self.mods_dir, self.game_dir, self.process_manager,
+            mod_manager=self.mod_manager, overlay_cache=self.overlay_cache,
+        )
         
         # Store last injection timing data
         self.last_injection_timing = None
@@ -106,9 +121,17 @@ class SkinInjector:
         # Check for CSLOL tools
         self.tools_manager.check_tools_available()
     
-    def refresh_skin_cache(self) -> None:
-        """Refresh the skin path cache (call after downloading new skins)."""
-        self.zip_resolver.refresh_cache()
+    def refresh_skin_cache(self, changes=None) -> None:
+        """Refresh the skin path cache (call after downloading new skins).
+        
+        Args:
+            changes: Optional SkinChangeSet from the downloader - applied as a
+                delta instead of rescanning the whole tree
+        """
+        if changes is not None:
+            self.zip_resolver.apply_changes(changes)
+        else:
+            self.zip_resolver.refresh_cache()
     
     def _resolve_zip(self, zip_arg: str, chroma_id: int = None, skin_name: str = None, champion_name: str = None, champion_id: int = None) -> Optional[Path]:
         """Resolve a ZIP by name or path with fuzzy matching"""
@@ -140,14 +163,30 @@ class SkinInjector:
         self.last_injection_timing = self.overlay_manager.last_injection_timing
         return result
     
-    def _prepare_skin_zip(self, skin_name: str, chroma_id: int = None, champion_name: str = None, champion_id: int = None) -> Optional[Path]:
-        """Resolve and extract a skin ZIP to the mods directory"""
+    def resolve_skin_entry(self, skin_data: dict) -> Optional[Path]:
+        """Resolve a skins_list entry to its skin ZIP (no extraction)"""
+        skin_name = skin_data.get("skin_name")
         # Extract base skin name (remove skin ID if present) for chroma path construction
         base_skin_name = skin_name
         if skin_name and skin_name.split()[-1].isdigit():
             base_skin_name = ' '.join(skin_name.split()[:-1])
         
-        zp = self._resolve_zip(skin_name, chroma_id=chroma_id, skin_name=base_skin_name, champion_name=champion_name, champion_id=champion_id)
+        return self._resolve_zip(
+            skin_name,
+            chroma_id=skin_data.get("chroma_id"),
+            skin_name=base_skin_name,
+            champion_name=skin_data.get("champion_name"),
+            champion_id=skin_data.get("champion_id"),
+        )
+    
+    def _prepare_skin_zip(self, skin_name: str, chroma_id: int = None, champion_name: str = None, champion_id: int = None) -> Optional[Path]:
+        """Resolve and extract a skin ZIP to the mods directory"""
+        zp = self.resolve_skin_entry({
+            "skin_name": skin_name,
+            "chroma_id": chroma_id,
+            "champion_name": champion_name,
+            "champion_id": champion_id,
+        })
         if not zp:
             log.error(f"[INJECT] Skin ZIP not found for '{skin_name}' (champ={champion_id})")
             return None
@@ -156,6 +195,22 @@ class SkinInjector:
         mod_folder = self._extract_zip_to_mod(zp)
         return mod_folder
 
+    def resolve_skins_list(self, skins_list: List[dict]) -> List[Path]:
+        """Resolve every skins_list entry to a ZIP, in order, dropping misses and duplicates"""
+        zips: List[Path] = []
+        for skin_data in skins_list:
+            try:
+                zp = self.resolve_skin_entry(skin_data)
+            except Exception as e:
+                log.error(f"[INJECT] Failed to resolve skin for multi-inject: {e}")
+                continue
+            if not zp:
+                log.error(f"[INJECT] Skin ZIP not found for '{skin_data.get('skin_name')}' (champ={skin_data.get('champion_id')})")
+                continue
+            if zp not in zips:
+                zips.append(zp)
+        return zips
+
     def inject_multi_skins(self, skins_list: List[dict], timeout: int = 120, stop_callback=None, injection_manager=None) -> bool:
         """Inject multiple skins at once (e.g. Local + Peers)
         
@@ -170,6 +225,33 @@ class SkinInjector:
             return False
 
         injection_start_time = time.time()
+        deadline = time.monotonic() + timeout
+        
+        zips = self.resolve_skins_list(skins_list)
+        if not zips:
+            log.error("[INJECT] No skin ZIPs could be resolved for multi-injection")
+            return False
+        
+        # Promote an overlay pre-built during champ select (or cached from an earlier game)
+        cache_key = self.overlay_manager.overlay_cache_key_for_sources(zips)
+        if cache_key:
+            self.overlay_manager.cancel_builds(keep=cache_key)
+            # Only spend what's left of the injection budget; a build that
+            # doesn't make it in time is cancelled before we rebuild below
+            self.overlay_manager.wait_for_build(cache_key, deadline - time.monotonic(), stop_callback)
+            if stop_callback and stop_callback():
+                log.info("[INJECT] Game ended before the overlay was ready - aborting injection")
+                return False
+            result = self.overlay_manager.run_cached_overlay(cache_key, stop_callback, injection_manager)
+            if result is not None:
+                self.last_injection_timing = self.overlay_manager.last_injection_timing
+                total_duration = time.time() - injection_start_time
+                if result == 0:
+                    log.info(f"[INJECT] Multi-injection ({len(zips)} skins) completed in {total_duration:.2f}s (pre-built overlay)")
+                    return True
+                log.warning(f"[INJECT] Pre-built overlay failed to run after {total_duration:.2f}s, rebuilding")
+        else:
+            self.overlay_manager.cancel_builds()
         
         # Clean mods and overlay directories
         clean_start = time.time()
@@ -179,33 +261,23 @@ class SkinInjector:
         log.debug(f"[INJECT] Directory cleanup took {clean_duration:.2f}s")
         
         extract_start = time.time()
-        mod_names = []
-        
-        for skin_data in skins_list:
-            try:
-                mod_folder = self._prepare_skin_zip(
-                    skin_name=skin_data.get("skin_name"),
-                    chroma_id=skin_data.get("chroma_id"),
-                    champion_name=skin_data.get("champion_name"),
-                    champion_id=skin_data.get("champion_id")
-                )
-                if mod_folder:
-                    mod_names.append(mod_folder.name)
-            except Exception as e:
-                log.error(f"[INJECT] Failed to prepare skin for multi-inject: {e}")
-
+        prepared = prepare_mods([(zp.name, lambda zp=zp: self.mod_manager.place_archive(zp)) for zp in zips])
+        mod_names = [r.mod_folder.name for r in prepared if r.ok]
+        extract_hits = sum(1 for r in prepared if r.ok and r.cache_hit)
         extract_duration = time.time() - extract_start
-        log.debug(f"[INJECT] All ZIP extractions took {extract_duration:.2f}s")
+        log.debug(f"[INJECT] All ZIP extractions took {extract_duration:.2f}s ({extract_hits}/{len(mod_names)} cached): {format_timings(prepared)}")
         
         if not mod_names:
             log.error("[INJECT] No skin ZIPs could be resolved for multi-injection")
             return False
 
-        # Create and run overlay with all mods
-        result = self._mk_run_overlay(mod_names, timeout, stop_callback, injection_manager)
+        # Create and run overlay with all mods, within the remaining budget
+        remaining = max(1, int(deadline - time.monotonic()))
+        result = self._mk_run_overlay(mod_names, remaining, stop_callback, injection_manager)
         
         # Get mkoverlay duration from stored timing data
         mkoverlay_duration = self.last_injection_timing.get('mkoverlay_duration', 0.0) if self.last_injection_timing else 0.0
+        overlay_cache_hit = bool(self.last_injection_timing.get('overlay_cache_hit')) if self.last_injection_timing else False
         
         total_duration = time.time() - injection_start_time
         runoverlay_duration = max(0, total_duration - clean_duration - extract_duration - mkoverlay_duration)
@@ -213,6 +285,8 @@ class SkinInjector:
         # Log timing breakdown
         if result == 0:
             log.info(f"[INJECT] Multi-injection ({len(mod_names)} skins) completed in {total_duration:.2f}s")
+            mkoverlay_label = "cached" if overlay_cache_hit else f"{mkoverlay_duration:.2f}s"
+            log.debug(f"[INJECT] Timing: clean {clean_duration:.2f}s, extract {extract_duration:.2f}s ({extract_hits}/{len(mod_names)} cached), mkoverlay {mkoverlay_label}")
         else:
             log.warning(f"[INJECT] Multi-injection failed after {total_duration:.2f}s")
             report_issue(
@@ -225,6 +299,41 @@ class SkinInjector:
         
         return result == 0
 
+    def prebuild_overlay(self, skins_list: List[dict], cancel_event: Optional[threading.Event] = None, timeout: int = 120) -> bool:
+        """Build the overlay for skins_list into the overlay cache without running it
+        
+        Used during champ select so inject_multi_skins can go straight to
+        runoverlay. Mods are extracted into a separate staging folder so the
+        live mods directory is never touched.
+        
+        Returns:
+            True if the overlay is cached afterwards
+        """
+        zips = self.resolve_skins_list(skins_list)
+        if not zips:
+            return False
+        cache_key = self.overlay_manager.overlay_cache_key_for_sources(zips)
+        if not cache_key:
+            return False
+        if self.overlay_cache.lookup(cache_key) is not None:
+            log.debug(f"[INJECT] Overlay {cache_key[:12]} already cached - nothing to pre-build")
+            return True
+        
+        staging = ModManager(self.mods_dir.parent / "speculative_mods", self.extraction_cache)
+        staging.clean_mods_dir()
+        try:
+            prepared = prepare_mods([(zp.name, lambda zp=zp: staging.place_archive(zp)) for zp in zips])
+            if (cancel_event is not None and cancel_event.is_set()) or not all(r.ok for r in prepared):
+                return False
+            mod_names = [r.mod_folder.name for r in prepared]
+            log.info(f"[INJECT] Pre-building overlay for {len(mod_names)} skin(s)")
+            return self.overlay_manager.build_overlay(mod_names, staging.mods_dir, cache_key, cancel_event, timeout)
+        except Exception as e:
+            log.warning(f"[INJECT] Overlay pre-build failed: {e}")
+            return False
+        finally:
+            staging.clean_mods_dir()
+
     def inject_skin(self, skin_name: str, timeout: int = 120, stop_callback=None, injection_manager=None, chroma_id: int = None, champion_name: str = None, champion_id: int = None) -> bool:
         """Inject a single skin (backwards compatibility wrapper)"""
         skins_list = [{
@@ -293,8 +402,7 @@ class SkinInjector:
         try:
             if self.mods_dir.exists():
                 # Remove entries individually so junctions are unlinked safely
-                for entry in self.mods_dir.iterdir():
-                    safe_remove_entry(entry)
+                self.mod_manager.clean_mods_dir()
                 shutil.rmtree(self.mods_dir, ignore_errors=True)
             overlay_dir = self.mods_dir.parent / "overlay"
             if overlay_dir.exists():
@@ -309,6 +417,9 @@ class SkinInjector:
         """Stop the current overlay process"""
         # Since they share the same reference, stopping via process_manager updates both
         self.process_manager.stop_overlay_process()
+        # The game is running on its own again - persist cache hits from this injection
+        self.overlay_cache.flush()
+        self.extraction_cache.flush()
     
     def kill_all_runoverlay_processes(self):
         """Kill all runoverlay processes (for ChampSelect cleanup)"""
@@ -316,4 +427,6 @@ class SkinInjector:
     
     def kill_all_modtools_processes(self):
         """Kill all mod-tools.exe processes (for application shutdown)"""
-        self.process_manager.kill_all_modtools_processes()
\ No newline at end of file
+        self.process_manager.kill_all_modtools_processes()
+        self.overlay_cache.flush()
+        self.extraction_cache.flush()
\ No newline at end of file
@@ -9,7 +9,7 @@ import threading
 import time
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from config import (
     INJECTION_LOCK_TIMEOUT_S,
@@ -19,6 +19,7 @@ from utils.core.logging import get_logger, log_action, log_success
 from utils.core.issue_reporter import report_issue
 
 from .injector import SkinInjector
+from ..mods.prefetch import PeerSkinPrefetcher
 from ..game.game_monitor import GameMonitor
 from ..config.threshold_manager import ThresholdManager
 
@@ -50,6 +51,9 @@ class InjectionManager:
         
         # Initialize game monitor with callback for auto-resume timeout
         self.game_monitor = GameMonitor(self._get_monitor_auto_resume_timeout)
+        
+        # Stages P2P peer skins in the extraction cache ahead of injection
+        self.peer_prefetcher = PeerSkinPrefetcher(self._get_ready_injector)
     
     def _get_monitor_auto_resume_timeout(self) -> float:
         """Get monitor auto-resume timeout from config."""
@@ -92,6 +96,14 @@ class InjectionManager:
                         )
                         self._initialized = False
     
+    def _get_ready_injector(self) -> Optional[SkinInjector]:
+        """Injector if it is already initialized, else None
+
+        For background threads: never initializes, so they don't take
+        injection_lock or re-report a missing game directory.
+        """
+        return self.injector if self._initialized else None
+    
     def _start_monitor(self):
         """Start game monitor - watches for game and suspends it"""
         self.game_monitor.start()
@@ -258,6 +270,22 @@ class InjectionManager:
             self.injection_lock.release()
             self._stop_monitor()
 
+    def prebuild_overlay(self, skins_list: List[dict], cancel_event: Optional[threading.Event] = None) -> bool:
+        """Speculatively build the overlay for skins_list (champ select, before the injection trigger)
+        
+        Never blocks on or interferes with a running injection.
+        """
+        if not skins_list or self._injection_in_progress:
+            return False
+        # Don't initialize from the builder thread: that takes injection_lock,
+        # which a real injection may be waiting for
+        injector = self._get_ready_injector()
+        if injector is None or injector.game_dir is None:
+            return False
+        if not injector.overlay_cache.enabled:
+            return False
+        return injector.prebuild_overlay(skins_list, cancel_event)
+
     def inject_skin_immediately(self, skin_name: str, stop_callback=None, chroma_id: int = None, champion_name: str = None, champion_id: int = None) -> bool:
         """Immediately inject a specific skin (backwards compatibility wrapper)"""
         # Base skin check logic
@@ -17,6 +17,7 @@ except ImportError:
     psutil = None
 
 from utils.core.logging import get_logger, log_success
+from utils.system.process_watcher import get_process_watcher
 from ..config.config_manager import ConfigManager
 
 log = get_logger()
@@ -77,42 +78,42 @@ class GameDetector:
             log.debug("Looking for LeagueClient.exe process...")
             
             # Find LeagueClient.exe process
-            for proc in psutil.process_iter(['pid', 'name', 'exe']):
+            watcher = get_process_watcher()
+            for proc in watcher.find('LeagueClient.exe'):
                 try:
-                    if proc.info['name'] == 'LeagueClient.exe':
-                        exe_path = proc.info['exe']
-                        if exe_path:
-                            log.debug(f"Found LeagueClient.exe at: {exe_path}")
+                    exe_path = watcher.exe_of(proc)
+                    if exe_path:
+                        log.debug(f"Found LeagueClient.exe at: {exe_path}")
+                        
+                        # Convert to Path and get parent directory
+                        client_path = Path(exe_path)
+                        client_dir = client_path.parent
+                        
+                        # Verify client directory has LeagueClient.exe
+                        if not (client_dir / "LeagueClient.exe").exists():
+                            continue
+                        
+                        # League should be in the same directory + "Game" subdirectory
+                        league_dir = client_dir / "Game"
+                        league_exe = league_dir / "League of Legends.exe"
+                        
+                        log.debug(f"Checking for League at: {league_exe}")
+                        if league_exe.exists():
+                            log_success(log, f"Found League via LeagueClient.exe: game={league_dir}, client={client_dir}", "")
+                            return league_dir, client_dir
+                        else:
+                            log.debug(f"League not found at expected location: {league_exe}")
                             
-                            # Convert to Path and get parent directory
-                            client_path = Path(exe_path)
-                            client_dir = client_path.parent
+                            # Try parent directory structure (for different installers)
+                            parent_dir = client_dir.parent
+                            parent_league_dir = parent_dir / "League of Legends" / "Game"
+                            parent_league_exe = parent_league_dir / "League of Legends.exe"
                             
-                            # Verify client directory has LeagueClient.exe
-                            if not (client_dir / "LeagueClient.exe").exists():
-                                continue
+                            log.debug(f"Trying parent directory structure: {parent_league_exe}")
+                            if parent_league_exe.exists():
+                                log_success(log, f"Found League via parent directory: game={parent_league_dir}, client={client_dir}", "")
+                                return parent_league_dir, client_dir
                             
-                            # League should be in the same directory + "Game" subdirectory
-                            league_dir = client_dir / "Game"
-                            league_exe = league_dir / "League of Legends.exe"
-                            
-                            log.debug(f"Checking for League at: {league_exe}")
-                            if league_exe.exists():
-                                log_success(log, f"Found League via LeagueClient.exe: game={league_dir}, client={client_dir}", "")
-                                return league_dir, client_dir
-                            else:
-                                log.debug(f"League not found at expected location: {league_exe}")
-                                
-                                # Try parent directory structure (for different installers)
-                                parent_dir = client_dir.parent
-                                parent_league_dir = parent_dir / "League of Legends" / "Game"
-                                parent_league_exe = parent_league_dir / "League of Legends.exe"
-                                
-                                log.debug(f"Trying parent directory structure: {parent_league_exe}")
-                                if parent_league_exe.exists():
-                                    log_success(log, f"Found League via parent directory: game={parent_league_dir}, client={client_dir}", "")
-                                    return parent_league_dir, client_dir
-                                
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                     continue
             
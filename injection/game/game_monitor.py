@@ -34,9 +34,12 @@ from config import (
 )
 from utils.core.logging import get_logger, log_section, log_event, log_success
 from utils.core.issue_reporter import report_issue
+from utils.system.process_watcher import get_process_watcher
 
 log = get_logger()
 
+GAME_PROCESS_NAME = "League of Legends.exe"
+
 
 class GameMonitor:
     """Monitors and controls game process suspension/resume"""
@@ -51,6 +54,8 @@ class GameMonitor:
         self._monitor_thread = None
         self._suspended_game_process = None
         self._runoverlay_started = False
+        self._suspension_start_time = None
+        self._suspend_lock = threading.Lock()  # Orders watcher-thread suspends against resume/stop
         self._get_auto_resume_timeout = get_auto_resume_timeout_callback
     
     def start(self):
@@ -60,10 +65,13 @@ class GameMonitor:
         
         self._monitor_active = True
         self._suspended_game_process = None
+        self._suspension_start_time = None
         self._runoverlay_started = False  # Reset flag when starting new monitor
         
         def game_monitor():
-            """Monitor for game process and suspend immediately when found"""
+            """Suspend the game as soon as the process watcher reports it, then
+            enforce the auto-resume safety timeout"""
+            unsubscribe = None
             try:
                 if not PSUTIL_AVAILABLE:
                     log.error("[monitor] psutil not available - cannot monitor game process")
@@ -71,64 +79,12 @@ class GameMonitor:
                     return
                 
                 log_section(log, "Game Process Monitor Started", "")
-                suspension_start_time = None
                 
-                # Immediately check for existing game process when monitor starts
-                # This prevents the game from starting before we can suspend it
-                # Do multiple rapid checks to catch the game as soon as it starts
-                log.debug("[monitor] Starting immediate game process checks...")
-                for immediate_check in range(10):  # Check 10 times immediately (very fast)
-                    if not self._monitor_active:
-                        break
-                    try:
-                        for proc in psutil.process_iter(['name', 'pid']):
-                            if not self._monitor_active:
-                                break
-                            if proc.info['name'] == 'League of Legends.exe':
-                                try:
-                                    game_proc = psutil.Process(proc.info['pid'])
-                                    # Check if already suspended
-                                    if game_proc.status() == STATUS_STOPPED:
-                                        # Already suspended, just track it
-                                        if self._suspended_game_process is None:
-                                            self._suspended_game_process = game_proc
-                                            suspension_start_time = time.time()
-                                            log_event(log, "Game already suspended - tracking", "", {"PID": proc.info['pid']})
-                                        break
-                                    
-                                    log_event(log, "Game process found - suspending immediately", "", {"PID": proc.info['pid']})
-                                    
-                                    try:
-                                        game_proc.suspend()
-                                        self._suspended_game_process = game_proc
-                                        suspension_start_time = time.time()
-                                        auto_resume_timeout = self._get_auto_resume_timeout()
-                                        log_event(log, "Game suspended immediately", "", {
-                                            "PID": proc.info['pid'],
-                                            "Auto-resume": f"{auto_resume_timeout:.0f}s"
-                                        })
-                                        break
-                                    except AccessDenied:
-                                        log.error("[monitor] ACCESS DENIED - Cannot suspend game")
-                                        log.error("[monitor] Try running Rose as Administrator")
-                                        self._monitor_active = False
-                                        break
-                                    except Exception as e:
-                                        log.error(f"[monitor] Failed to suspend existing game: {e}")
-                                except (NoSuchProcess, AccessDenied):
-                                    continue
-                                except Exception as e:
-                                    log.debug(f"[monitor] Error checking existing process: {e}")
-                    except Exception as e:
-                        log.debug(f"[monitor] Error in immediate check {immediate_check}: {e}")
-                    
-                    # If we found and suspended the game, break out of immediate checks
-                    if self._suspended_game_process is not None:
-                        break
-                    
-                    # Very short sleep between immediate checks (5ms)
-                    if immediate_check < 9:  # Don't sleep after last check
-                        time.sleep(0.005)
+                # The watcher calls back within a few ms of the game starting, and
+                # right away (replay) if it is already running
+                unsubscribe = get_process_watcher().subscribe(
+                    [GAME_PROCESS_NAME], on_appear=self._on_game_process, replay=True
+                )
                 
                 while self._monitor_active:
                     # Don't suspend if runoverlay has already started - exit monitor entirely
@@ -140,6 +96,7 @@ class GameMonitor:
                     # If we've already suspended the game, check for safety timeout
                     if self._suspended_game_process is not None:
                         # Check safety timeout to auto-resume (prevent permanent freeze)
+                        suspension_start_time = self._suspension_start_time
                         if suspension_start_time is not None:
                             elapsed = time.time() - suspension_start_time
                             auto_resume_timeout = self._get_auto_resume_timeout()
@@ -172,7 +129,7 @@ class GameMonitor:
                                 # Always clear reference and stop monitor after auto-resume attempt
                                 # Even if resume failed, we can't keep trying forever
                                 self._suspended_game_process = None
-                                suspension_start_time = None
+                                self._suspension_start_time = None
                                 log.info("[monitor] Stopping monitor after auto-resume - runoverlay should have hooked")
                                 self._monitor_active = False
                                 break
@@ -181,70 +138,63 @@ class GameMonitor:
                         time.sleep(PERSISTENT_MONITOR_IDLE_INTERVAL_S)
                         continue
                     
-                    # Look for game process (in case it starts after monitor begins)
-                    found_processes = []
-                    for proc in psutil.process_iter(['name', 'pid']):
-                        if not self._monitor_active:
-                            break
-                        
-                        # Log all processes for debugging (first few iterations only)
-                        if len(found_processes) < 5:
-                            found_processes.append(proc.info.get('name', 'unknown'))
-                        
-                        if proc.info['name'] == 'League of Legends.exe':
-                            try:
-                                game_proc = psutil.Process(proc.info['pid'])
-                                log_event(log, "Game process found", "", {"PID": proc.info['pid']})
-                                
-                                # Try to suspend immediately
-                                try:
-                                    game_proc.suspend()
-                                    self._suspended_game_process = game_proc
-                                    suspension_start_time = time.time()  # Start safety timer
-                                    auto_resume_timeout = self._get_auto_resume_timeout()
-                                    log_event(log, "Game suspended", "", {
-                                        "PID": proc.info['pid'],
-                                        "Auto-resume": f"{auto_resume_timeout:.0f}s"
-                                    })
-                                    break
-                                except AccessDenied:
-                                    log.error("[monitor] ACCESS DENIED - Cannot suspend game")
-                                    log.error("[monitor] Try running Rose as Administrator")
-                                    self._monitor_active = False
-                                    # Clear reference if we couldn't suspend (game is running anyway)
-                                    self._suspended_game_process = None
-                                    break
-                                except Exception as e:
-                                    log.error(f"[monitor] Failed to suspend: {e}")
-                                    # Clear reference on error (game might not be suspended)
-                                    self._suspended_game_process = None
-                                    break
-                                
-                            except NoSuchProcess:
-                                continue
-                            except Exception as e:
-                                log.error(f"[monitor] Error: {e}")
-                                # Clear reference on error to prevent leaving game suspended
-                                self._suspended_game_process = None
-                                break
-                    
-                    # Sleep after checking all processes (not after each process)
+                    # Game not seen yet: suspension happens in the watcher callback
                     time.sleep(PERSISTENT_MONITOR_CHECK_INTERVAL_S)
                 
                 log.debug("[monitor] Stopped")
                 
             except Exception as e:
                 log.error(f"[monitor] Fatal error: {e}")
+            finally:
+                if unsubscribe is not None:
+                    unsubscribe()
         
         self._monitor_thread = threading.Thread(target=game_monitor, daemon=True, name="GameMonitor")
         self._monitor_thread.start()
         log.debug("[monitor] Background thread started")
     
+    def _on_game_process(self, info):
+        """Process watcher callback: suspend the game the moment it appears"""
+        with self._suspend_lock:
+            if not self._monitor_active or self._runoverlay_started or self._suspended_game_process is not None:
+                return
+            try:
+                game_proc = psutil.Process(info.pid)
+                # Check if already suspended
+                if game_proc.status() == STATUS_STOPPED:
+                    self._suspended_game_process = game_proc
+                    self._suspension_start_time = time.time()
+                    log_event(log, "Game already suspended - tracking", "", {"PID": info.pid})
+                    return
+                
+                log_event(log, "Game process found - suspending immediately", "", {"PID": info.pid})
+                game_proc.suspend()
+                self._suspended_game_process = game_proc
+                self._suspension_start_time = time.time()  # Start safety timer
+                auto_resume_timeout = self._get_auto_resume_timeout()
+                log_event(log, "Game suspended", "", {
+                    "PID": info.pid,
+                    "Auto-resume": f"{auto_resume_timeout:.0f}s"
+                })
+            except AccessDenied:
+                log.error("[monitor] ACCESS DENIED - Cannot suspend game")
+                log.error("[monitor] Try running Rose as Administrator")
+                self._monitor_active = False
+                # Clear reference if we couldn't suspend (game is running anyway)
+                self._suspended_game_process = None
+            except NoSuchProcess:
+                log.debug(f"[monitor] Game process {info.pid} exited before it could be suspended")
+            except Exception as e:
+                log.error(f"[monitor] Failed to suspend: {e}")
+                # Clear reference on error (game might not be suspended)
+                self._suspended_game_process = None
+    
     def stop(self):
         """Stop the game monitor"""
         if self._monitor_active:
             log.debug("[monitor] Stopping...")
-            self._monitor_active = False
+            with self._suspend_lock:
+                self._monitor_active = False
             
             # Resume game if still suspended
             if self._suspended_game_process is not None and PSUTIL_AVAILABLE:
@@ -266,7 +216,9 @@ class GameMonitor:
     def resume_game(self):
         """Resume the suspended game (called when runoverlay starts)"""
         # Set flag to prevent monitor from suspending after runoverlay starts
-        self._runoverlay_started = True
+        # (under the lock, so a suspend already in progress finishes first)
+        with self._suspend_lock:
+            self._runoverlay_started = True
         
         if self._suspended_game_process is not None and PSUTIL_AVAILABLE:
             try:
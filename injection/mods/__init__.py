@@ -7,11 +7,13 @@ Handles ZIP resolution and mod management
 
 from .zip_resolver import ZipResolver
 from .mod_manager import ModManager
+from .extract_cache import ExtractionCache
 from .storage import ModStorageService
 
 __all__ = [
     'ZipResolver',
     'ModManager',
+    'ExtractionCache',
     'ModStorageService',
 ]
 
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Extraction Cache
+Content-addressed cache of extracted skin archives.
+
+Each archive is extracted once into a folder named after its fingerprint
+(archive size + member CRC set, re-read whenever the archive's size or mtime
+changes) and then placed into the mods directory as a junction, so picking
+the same skin again costs no extraction at all. Entries are evicted LRU once
+the cache grows past its byte budget; entries linked into a mods directory
+are pinned and never evicted.
+"""
+
+import zipfile
+from pathlib import Path
+from typing import Optional, Tuple
+
+from utils.core.logging import get_logger
+from utils.core.directory_cache import DirectoryCache
+from utils.core.safe_extract import safe_extractall
+from utils.core.fingerprint import archive_fingerprint
+
+log = get_logger()
+
+STAGING_PREFIX = ".extracting-"
+
+
+def _archive_size(zip_path: Path) -> int:
+    """Uncompressed size of an archive's members"""
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            return sum(info.file_size for info in zf.infolist())
+    except (OSError, zipfile.BadZipFile):
+        return 0
+
+
+class ExtractionCache(DirectoryCache):
+    """Persistent LRU cache of extracted skin archives"""
+
+    STAGING_PREFIX = STAGING_PREFIX
+    LOG_TAG = "EXTRACT_CACHE"
+    ENTRY_NOUN = "skin(s)"
+
+    # ------------------------------------------------------------------
+    # Lookup / extract
+    # ------------------------------------------------------------------
+
+    def get_or_extract(self, zip_path: Path) -> Tuple[Optional[Path], Optional[str], bool]:
+        """Return the cached extraction of *zip_path*, extracting it on a miss.
+
+        Returns ``(entry_dir, key, hit)``. ``entry_dir`` is None if the
+        archive can't be fingerprinted or extracted; the caller should fall
+        back to a plain extraction then. The returned entry is pinned - call
+        ``unpin(key)`` once it's no longer linked anywhere.
+        """
+        zip_path = Path(zip_path)
+        key = archive_fingerprint(zip_path)
+        if not key:
+            return None, None, False
+
+        self.pin(key)
+        entry_dir = self._touch(key)
+        if entry_dir is not None:
+            return entry_dir, key, True
+
+        staging = self._staging_dir(key)
+        try:
+            safe_extractall(zip_path, staging)
+            # Another thread may have extracted the same archive meanwhile
+            entry_dir = self._promote(key, staging, _archive_size(zip_path), keep_existing=True, source=zip_path.name)
+        except Exception as e:
+            log.warning(f"[EXTRACT_CACHE] Failed to cache {zip_path.name}: {e}")
+            self.discard_build(staging)
+            self.unpin(key)
+            return None, None, False
+
+        log.debug(f"[EXTRACT_CACHE] Cached {zip_path.name} as {key[:12]}")
+        self.evict()
+        return entry_dir, key, False
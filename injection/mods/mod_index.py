@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mod Index
+In-memory listing of the custom mods under the mods directory
+
+Every folder that holds mods (mods/skins/{skin_id}, mods/maps, ...) is
+listed once with os.scandir and kept with its mtime. A folder is re-checked
+against the disk at most once per revalidation window: if its mtime is
+unchanged only its entries are re-stat'ed, otherwise just that folder is
+listed again. Adding or removing a mod therefore refreshes only the folder
+it lives in. The mods/skins folder itself is indexed the same way to map
+champions to their skin folders.
+
+Descriptions (description.txt inside a mod folder, or <name>.txt next to an
+archive) are read the first time they are asked for and kept until the
+mod or its description file changes.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import MODS_INDEX_REVALIDATE_S
+from utils.core.logging import get_logger
+
+log = get_logger()
+
+ARCHIVE_SUFFIXES = {".zip", ".fantome"}
+
+Stamp = Tuple[int, int]     # (mtime_ns, size)
+
+_UNREAD = object()
+
+
+def _stamp(path: Path) -> Optional[Stamp]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@dataclass
+class ModRecord:
+    """One mod (folder or archive) inside a mods folder"""
+    name: str                   # Folder name, or archive name without suffix
+    path: Path
+    is_dir: bool
+    mtime_ns: int
+    _description: object = field(default=_UNREAD, repr=False)
+    _description_stamp: Optional[Stamp] = field(default=None, repr=False)
+
+    @property
+    def updated_at(self) -> float:
+        return self.mtime_ns / 1_000_000_000
+
+    @property
+    def description_path(self) -> Path:
+        return self.path / "description.txt" if self.is_dir else self.path.with_suffix(".txt")
+
+    def description(self) -> Optional[str]:
+        """Contents of the mod's description file (read once, then memoized)"""
+        if self._description is _UNREAD:
+            self._description_stamp = _stamp(self.description_path)
+            self._description = self._read_description() if self._description_stamp else None
+        return self._description
+
+    def _read_description(self) -> Optional[str]:
+        try:
+            return self.description_path.read_text(encoding="utf-8").strip()
+        except Exception as exc:
+            log.debug(f"[ModStorage] Unable to read descriptor {self.description_path}: {exc}")
+            return None
+
+    def revalidate(self) -> bool:
+        """Re-stat the mod and its description; False if the mod is gone"""
+        stamp = _stamp(self.path)
+        if stamp is None:
+            return False
+        if stamp[0] != self.mtime_ns:
+            self.mtime_ns = stamp[0]
+            self._description = _UNREAD
+        elif self._description is not _UNREAD and _stamp(self.description_path) != self._description_stamp:
+            # Description edited in place (doesn't touch the folder's mtime)
+            self._description = _UNREAD
+        return True
+
+
+@dataclass
+class _Folder:
+    """Listing of one mods folder"""
+    mtime_ns: int
+    checked_at: float
+    records: List[ModRecord]            # Sorted by file name, case-insensitively
+    subdirs: Tuple[str, ...]            # Names of the folders inside it (same tuple until rescanned)
+
+
+class ModIndex:
+    """Cached listings of mods folders, validated by mtime"""
+
+    def __init__(self, revalidate_s: float = MODS_INDEX_REVALIDATE_S):
+        self.revalidate_s = revalidate_s
+        self._folders: Dict[Path, _Folder] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "scans": 0}
+
+    def mods_in(self, folder: Path) -> List[ModRecord]:
+        """Mods directly inside *folder* (empty if it doesn't exist)"""
+        listing = self._get(Path(folder))
+        return list(listing.records) if listing is not None else []
+
+    def subdirs_of(self, folder: Path) -> Tuple[str, ...]:
+        """Names of the folders directly inside *folder*
+
+        The same tuple is returned until the folder is listed again, so
+        callers can key derived data on its identity.
+        """
+        listing = self._get(Path(folder))
+        return listing.subdirs if listing is not None else ()
+
+    def invalidate(self, folder: Optional[Path] = None) -> None:
+        """Forget one folder's listing (or all of them)"""
+        with self._lock:
+            if folder is None:
+                self._folders.clear()
+            else:
+                self._folders.pop(Path(folder), None)
+
+    def _get(self, folder: Path) -> Optional[_Folder]:
+        with self._lock:
+            listing = self._folders.get(folder)
+            now = time.monotonic()
+            if listing is not None and now - listing.checked_at < self.revalidate_s:
+                self.stats["hits"] += 1
+                return listing
+
+            stamp = _stamp(folder)
+            if stamp is None or not os.path.isdir(folder):
+                self._folders.pop(folder, None)
+                return None
+            if listing is not None and listing.mtime_ns == stamp[0]:
+                # Same set of entries; pick up changes inside them
+                if all(record.revalidate() for record in listing.records):
+                    listing.checked_at = now
+                    self.stats["revalidated"] += 1
+                    return listing
+
+            listing = self._scan(folder, stamp[0], now, listing)
+            self._folders[folder] = listing
+            return listing
+
+    def _scan(self, folder: Path, mtime_ns: int, now: float, previous: Optional[_Folder]) -> _Folder:
+        self.stats["scans"] += 1
+        known = {record.path: record for record in previous.records} if previous is not None else {}
+        records: List[ModRecord] = []
+        subdirs: List[str] = []
+        try:
+            with os.scandir(folder) as it:
+                entries = sorted(it, key=lambda entry: entry.name.lower())
+        except OSError as exc:
+            log.debug(f"[ModStorage] Failed to list {folder}: {exc}")
+            entries = []
+
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+                if is_dir:
+                    name = entry.name
+                    subdirs.append(name)
+                elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in ARCHIVE_SUFFIXES:
+                    name = os.path.splitext(entry.name)[0]
+                else:
+                    continue
+                entry_mtime = entry.stat().st_mtime_ns
+            except OSError:
+                continue
+            path = folder / entry.name
+            record = known.get(path)
+            if record is not None and record.is_dir == is_dir and record.revalidate():
+                # Unchanged mod keeps its memoized description
+                records.append(record)
+                continue
+            records.append(ModRecord(name=name, path=path, is_dir=is_dir, mtime_ns=entry_mtime))
+        return _Folder(mtime_ns=mtime_ns, checked_at=now, records=records, subdirs=tuple(subdirs))
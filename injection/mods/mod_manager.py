@@ -6,13 +6,17 @@ Handles mod extraction, installation, and management
 """
 
 import shutil
+import threading
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from utils.core.logging import get_logger, log_success
 from utils.core.paths import get_user_data_dir
 from utils.core.safe_extract import safe_extractall
-from utils.core.junction import is_junction, safe_remove_entry
+from utils.core.junction import create_junction, is_junction, safe_remove_entry
+from utils.core.fingerprint import source_fingerprint, tree_fingerprint
+
+from .extract_cache import ExtractionCache
 
 log = get_logger()
 
@@ -20,17 +24,55 @@ log = get_logger()
 class ModManager:
     """Manages mod extraction and installation"""
     
-    def __init__(self, mods_dir: Path):
+    def __init__(self, mods_dir: Path, extraction_cache: Optional[ExtractionCache] = None):
         self.mods_dir = mods_dir
         self.mods_dir.mkdir(parents=True, exist_ok=True)
+        self.extraction_cache = extraction_cache
+        # Maps mod folder name -> archive/folder it was placed from
+        self._mod_sources: Dict[str, Path] = {}
+        # Maps mod folder name -> extraction cache entry it is linked to (pinned)
+        self._cache_links: Dict[str, str] = {}
+        self._sources_lock = threading.Lock()
     
     def clean_mods_dir(self):
         """Clean the mods directory"""
+        with self._sources_lock:
+            self._mod_sources.clear()
+            cache_links = list(self._cache_links.values())
+            self._cache_links.clear()
         if not self.mods_dir.exists():
             self.mods_dir.mkdir(parents=True, exist_ok=True)
             return
         for p in self.mods_dir.iterdir():
             safe_remove_entry(p)
+        if self.extraction_cache is not None:
+            for key in cache_links:
+                self.extraction_cache.unpin(key)
+    
+    def record_mod_source(self, mod_folder_name: str, source: Path) -> None:
+        """Remember which archive/folder a mod folder was placed from.
+        
+        Used to fingerprint the mod set for the overlay cache. Call this after
+        placing a mod in mods_dir by other means than extract_zip_to_mod
+        (e.g. link_or_extract for custom mods).
+        """
+        with self._sources_lock:
+            self._mod_sources[mod_folder_name] = Path(source)
+    
+    def mod_fingerprint(self, mod_folder_name: str) -> Optional[str]:
+        """Content fingerprint of a mod folder in mods_dir.
+        
+        Uses the recorded source archive (CRC set) when known, otherwise falls
+        back to a stat walk of the placed folder. Returns None if the mod
+        folder is missing.
+        """
+        with self._sources_lock:
+            source = self._mod_sources.get(mod_folder_name)
+        if source is not None:
+            fingerprint = source_fingerprint(source)
+            if fingerprint:
+                return fingerprint
+        return tree_fingerprint(self.mods_dir / mod_folder_name)
     
     def clean_overlay_dir(self):
         """Clean the overlay directory to prevent file lock issues"""
@@ -49,13 +91,47 @@ class ModManager:
         Note: Both .zip and .fantome files are ZIP-compatible archives.
         Uses safe_extractall to prevent path traversal (zip slip) attacks.
         """
+        return self.place_archive(zp)[0]
+    
+    def place_archive(self, zp: Path) -> Tuple[Path, bool]:
+        """Place a skin archive in the mod directory.
+        
+        Goes through the extraction cache when one is configured: the archive
+        is extracted once and linked in as a junction. Falls back to a plain
+        extraction into the mod directory otherwise.
+        
+        Returns:
+            (mod folder, True if served from the extraction cache)
+        """
         target = self.mods_dir / zp.stem
-        if target.exists():
-            shutil.rmtree(target, ignore_errors=True)
+        if target.exists() or is_junction(target):
+            safe_remove_entry(target)
+        self._release_cache_link(target.name)
+        
+        if self.extraction_cache is not None and self.extraction_cache.enabled:
+            cached, key, hit = self.extraction_cache.get_or_extract(zp)
+            if cached is not None:
+                if create_junction(cached, target) or target.is_dir():
+                    with self._sources_lock:
+                        self._cache_links[target.name] = key
+                    self.record_mod_source(target.name, zp)
+                    if hit:
+                        log.debug(f"[INJECT] Extraction cache hit: {zp.name}")
+                    else:
+                        log_success(log, f"Extracted {zp.name} to cache", "📦")
+                    return target, hit
+                self.extraction_cache.unpin(key)
+        
         target.mkdir(parents=True, exist_ok=True)
         # Security: Use safe extraction to prevent path traversal attacks
         safe_extractall(zp, target)
+        self.record_mod_source(target.name, zp)
         file_type = "ZIP" if zp.suffix == ".zip" else ".fantome"
         log_success(log, f"Extracted {file_type}: {zp.name}", "📦")
-        return target
+        return target, False
     
+    def _release_cache_link(self, mod_folder_name: str) -> None:
+        with self._sources_lock:
+            key = self._cache_links.pop(mod_folder_name, None)
+        if key and self.extraction_cache is not None:
+            self.extraction_cache.unpin(key)
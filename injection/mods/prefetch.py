@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Peer Skin Prefetch
+Stages P2P peer skins in the extraction cache as soon as their updates arrive,
+so injection finds every peer mod already extracted.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from utils.core.logging import get_logger
+
+log = get_logger()
+
+PREFETCH_WORKERS = 2
+
+
+@dataclass
+class PeerPrefetch:
+    """Prefetch state for one peer's current skin"""
+    skin_id: int
+    champion_id: Optional[int]
+    zip_path: Optional[Path] = None
+    cache_key: Optional[str] = None  # Pinned extraction cache entry
+    cache: Optional[object] = None  # ExtractionCache holding the pin
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+
+class PeerSkinPrefetcher:
+    """Resolves and pre-extracts peer skins in the background
+
+    One entry per peer: a new update for the same peer cancels the previous
+    one, and a peer leaving cancels and releases its entry. Staged entries
+    stay pinned in the extraction cache until released.
+    """
+
+    def __init__(self, injector_provider: Callable[[], Optional[object]]):
+        """
+        Args:
+            injector_provider: Returns the SkinInjector if it is already
+                initialized, None otherwise. Called from the prefetch threads, so
+                it must not initialize the injector itself.
+        """
+        self._injector_provider = injector_provider
+        self._entries: Dict[str, PeerPrefetch] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="PeerPrefetch")
+
+    def prefetch(self, peer_id: str, skin_id: int, champion_id: Optional[int] = None) -> None:
+        """Start staging a peer's skin (replaces any previous entry for the peer)"""
+        if not peer_id or not skin_id:
+            return
+        with self._lock:
+            current = self._entries.get(peer_id)
+            if current is not None and current.skin_id == skin_id and not current.cancel_event.is_set():
+                return  # Already staged or staging
+            entry = PeerPrefetch(skin_id=int(skin_id), champion_id=champion_id)
+            self._entries[peer_id] = entry
+        if current is not None:
+            self._release(current)
+        self._executor.submit(self._stage, peer_id, entry)
+
+    def evict(self, peer_id: str) -> None:
+        """Cancel and release a peer's entry (peer left)"""
+        with self._lock:
+            entry = self._entries.pop(peer_id, None)
+        if entry is not None:
+            self._release(entry)
+            log.debug(f"[PREFETCH] Released staged skin {entry.skin_id} of peer {peer_id}")
+
+    def clear(self) -> None:
+        """Release every entry"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._release(entry)
+
+    def _stage(self, peer_id: str, entry: PeerPrefetch) -> None:
+        if entry.cancel_event.is_set():
+            return
+        start = time.time()
+        try:
+            injector = self._injector_provider()
+            if injector is None or not injector.extraction_cache.enabled:
+                return
+            zp = injector.resolve_skin_entry({"skin_name": f"skin_{entry.skin_id}", "champion_id": entry.champion_id})
+            if not zp:
+                log.debug(f"[PREFETCH] No skin file for peer {peer_id} skin {entry.skin_id}")
+                return
+            if entry.cancel_event.is_set():
+                return
+            cached, key, hit = injector.extraction_cache.get_or_extract(zp)
+            if cached is None:
+                return
+        except Exception as e:
+            log.debug(f"[PREFETCH] Failed to stage peer {peer_id} skin {entry.skin_id}: {e}")
+            return
+
+        with self._lock:
+            entry.zip_path = zp
+            entry.cache_key = key
+            entry.cache = injector.extraction_cache
+            cancelled = entry.cancel_event.is_set()
+        if cancelled:
+            self._release(entry)
+            return
+        log.info(f"[PREFETCH] Peer skin {entry.skin_id} staged in {time.time() - start:.2f}s ({'cached' if hit else 'extracted'})")
+
+    def _release(self, entry: PeerPrefetch) -> None:
+        """Cancel an entry and unpin its cache entry (if staged)"""
+        with self._lock:
+            entry.cancel_event.set()
+            key, cache = entry.cache_key, entry.cache
+            entry.cache_key = None
+            entry.cache = None
+        if key and cache is not None:
+            cache.unpin(key)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mod Preparation
+Resolves/extracts the mods of one injection concurrently on a bounded pool.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from config import PREPARE_WORKERS_DEFAULT, get_config_float
+from utils.core.logging import get_logger
+
+log = get_logger()
+
+# A preparation job places one mod in the mods directory and returns
+# (mod folder or None, served from cache)
+PrepareJob = Callable[[], Tuple[Optional[Path], bool]]
+
+
+@dataclass
+class PreparedMod:
+    """Outcome of preparing a single mod"""
+    label: str
+    mod_folder: Optional[Path] = None
+    cache_hit: bool = False
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.mod_folder is not None
+
+
+def get_prepare_workers() -> int:
+    """Preparation pool size from config (at least 1)"""
+    return max(1, int(get_config_float("General", "prepare_workers", PREPARE_WORKERS_DEFAULT)))
+
+
+def _run_job(label: str, job: PrepareJob) -> PreparedMod:
+    start = time.time()
+    try:
+        mod_folder, cache_hit = job()
+        return PreparedMod(label, mod_folder, bool(cache_hit), time.time() - start)
+    except Exception as e:
+        log.error(f"[INJECT] Failed to prepare {label}: {e}")
+        return PreparedMod(label, None, False, time.time() - start, str(e))
+
+
+def prepare_mods(jobs: List[Tuple[str, PrepareJob]], max_workers: Optional[int] = None) -> List[PreparedMod]:
+    """Run preparation jobs concurrently.
+
+    A failing job only affects its own entry. Results keep the order of
+    *jobs* (mod order decides conflict precedence in mkoverlay).
+    """
+    if not jobs:
+        return []
+    workers = min(len(jobs), max_workers or get_prepare_workers())
+    if workers <= 1:
+        return [_run_job(label, job) for label, job in jobs]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ModPrepare") as pool:
+        futures = [pool.submit(_run_job, label, job) for label, job in jobs]
+        return [f.result() for f in futures]
+
+
+def format_timings(results: List[PreparedMod]) -> str:
+    """One-line per-entry timing summary for the injection log"""
+    parts = []
+    for r in results:
+        if not r.ok:
+            status = "failed"
+        else:
+            status = "cached" if r.cache_hit else "extracted"
+        parts.append(f"{r.label} {r.duration:.2f}s ({status})")
+    return ", ".join(parts)
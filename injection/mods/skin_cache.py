@@ -2,170 +2,476 @@
 # -*- coding: utf-8 -*-
 """
 Skin Path Cache
-Caches skin and chroma file paths for O(1) lookup instead of filesystem scanning.
+Indexed catalog of the skins tree (skins, chromas, form files and previews)
+for O(1) lookup instead of filesystem scanning.
+
+The catalog is built in a single os.scandir pass and persisted together with
+a manifest of every directory's mtime. On the next startup the manifest is
+re-stat'ed and, if nothing changed, the catalog is loaded instead of
+rescanning the tree. The root is tracked by its listing rather than its
+mtime, because the downloaders keep their state files there. Download change sets are applied as deltas.
+
+Readers never take the lock: every build or delta produces a new catalog
+snapshot that replaces the old one in a single assignment.
 """
 
+import hashlib
+import json
+import os
 import threading
 from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import Dict, Iterable, Optional, Set
 
 from utils.core.logging import get_logger
 
 log = get_logger()
 
+CATALOG_VERSION = 2
+ARCHIVE_EXTENSIONS = (".zip", ".fantome")  # Preference order when both exist
+PREVIEW_EXTENSION = ".png"
+
+
+def _root_listing(skins_dir: Path) -> str:
+    """Signature of the root's entry names, ignoring dot-files.
+
+    The downloaders rewrite their state files (.repo_state.json,
+    .extract_manifest.json, ...) in the root with tmp+rename, which bumps
+    its mtime on every update check.
+    """
+    with os.scandir(skins_dir) as it:
+        names = sorted(entry.name for entry in it if not entry.name.startswith("."))
+    return hashlib.sha1("\0".join(names).encode("utf-8", "surrogateescape")).hexdigest()
+
+
+def _ids_for(rel_dir: str) -> Optional[tuple]:
+    """Numeric (champion_id, skin_id, chroma_id) prefix for a relative directory.
+
+    Returns None below a non-numeric directory, where only named files are
+    indexed.
+    """
+    ids: tuple = ()
+    for part in rel_dir.split("/") if rel_dir else ():
+        if len(ids) >= 3 or not part.isdigit():
+            return None
+        ids += (int(part),)
+    return ids
+
+
+class _Catalog:
+    """One immutable-once-published snapshot of the skins tree index.
+
+    - skins: Maps skin_id -> file path (for base skins)
+    - chromas: Maps chroma_id -> file path (for chromas)
+    - chroma_champions: Maps chroma_id -> champion_id owning it
+    - champion_skins: Maps champion_id -> set of skin_ids (for quick champion lookup)
+    - skin_previews / chroma_previews: Maps skin/chroma id -> preview image
+    - named_files: Maps lowercased file name -> path for non-numeric archives
+      (form files such as "Lux Elementalist Air.zip")
+    - dir_mtimes: Manifest of scanned directories below the root (relative path -> mtime_ns)
+    - root_listing: Signature of the root's entries (see _root_listing)
+    """
+
+    def __init__(self):
+        self.skins: Dict[int, Path] = {}
+        self.chromas: Dict[int, Path] = {}
+        self.chroma_champions: Dict[int, int] = {}
+        self.champion_skins: Dict[int, Set[int]] = {}
+        self.skin_previews: Dict[int, Path] = {}
+        self.chroma_previews: Dict[int, Path] = {}
+        self.named_files: Dict[str, Path] = {}
+        self.dir_mtimes: Dict[str, int] = {}
+        self.root_listing: Optional[str] = None
+
+    def copy(self) -> "_Catalog":
+        other = _Catalog()
+        other.skins = dict(self.skins)
+        other.chromas = dict(self.chromas)
+        other.chroma_champions = dict(self.chroma_champions)
+        other.champion_skins = {k: set(v) for k, v in self.champion_skins.items()}
+        other.skin_previews = dict(self.skin_previews)
+        other.chroma_previews = dict(self.chroma_previews)
+        other.named_files = dict(self.named_files)
+        other.dir_mtimes = dict(self.dir_mtimes)
+        other.root_listing = self.root_listing
+        return other
+
+    def summary(self) -> str:
+        return (f"{len(self.skins)} skins, {len(self.chromas)} chromas, "
+                f"{len(self.champion_skins)} champions, {len(self.named_files)} named files")
+
+    def add_dir(self, ids: Optional[tuple]) -> None:
+        """Register a numeric champion/skin directory."""
+        if not ids:
+            return
+        if len(ids) == 1:
+            self.champion_skins.setdefault(ids[0], set())
+        elif len(ids) == 2:
+            self.champion_skins.setdefault(ids[0], set()).add(ids[1])
+
+    def add_file(self, path: Path, name: str, ids: Optional[tuple]) -> None:
+        """Classify one file by its name and position in the tree."""
+        stem, ext = os.path.splitext(name)
+        ext = ext.lower()
+        is_own_file = bool(ids) and stem.isdigit() and int(stem) == ids[-1]
+
+        if ext in ARCHIVE_EXTENSIONS:
+            if is_own_file and len(ids) == 2:
+                self._put_archive(self.skins, ids[1], path)
+            elif is_own_file and len(ids) == 3:
+                self._put_archive(self.chromas, ids[2], path)
+                self.chroma_champions[ids[2]] = ids[0]
+            elif not stem.isdigit():
+                self.named_files.setdefault(name.lower(), path)
+        elif ext == PREVIEW_EXTENSION and is_own_file:
+            if len(ids) == 2:
+                self.skin_previews[ids[1]] = path
+            elif len(ids) == 3:
+                self.chroma_previews[ids[2]] = path
+
+    def remove_file(self, path: Path, ids: Optional[tuple]) -> None:
+        """Drop a deleted file, falling back to a sibling archive of the other type."""
+        for table in (self.skins, self.chromas, self.skin_previews, self.chroma_previews):
+            for item_id, existing in list(table.items()):
+                if existing == path:
+                    del table[item_id]
+                    if table is self.chromas:
+                        self.chroma_champions.pop(item_id, None)
+        self.named_files = {k: v for k, v in self.named_files.items() if v != path}
+
+        # {id}.zip removed but {id}.fantome still there (or the other way round)
+        stem, ext = os.path.splitext(path.name)
+        if ext.lower() in ARCHIVE_EXTENSIONS:
+            for other_ext in ARCHIVE_EXTENSIONS:
+                sibling = path.with_name(f"{stem}{other_ext}")
+                if other_ext != ext.lower() and sibling.is_file():
+                    self.add_file(sibling, sibling.name, ids)
+
+    @staticmethod
+    def _put_archive(table: Dict[int, Path], item_id: int, path: Path) -> None:
+        """Store an archive, preferring .zip over .fantome."""
+        existing = table.get(item_id)
+        if existing is None or ARCHIVE_EXTENSIONS.index(path.suffix.lower()) < ARCHIVE_EXTENSIONS.index(existing.suffix.lower()):
+            table[item_id] = path
+
 
 class SkinPathCache:
     """Cache skin/chroma paths for fast lookup.
-    
-    Structure:
-    - _skin_cache: Maps skin_id -> file path (for base skins)
-    - _chroma_cache: Maps chroma_id -> file path (for chromas)
-    - _champion_skins: Maps champion_id -> set of skin_ids (for quick champion lookup)
-    
-    Memory estimate: ~0.5-1 MB for 1500 skins + 5000 chromas
+
+    Memory estimate: ~1-2 MB for 1500 skins + 5000 chromas
     """
-    
-    def __init__(self):
-        self._skin_cache: Dict[int, Path] = {}
-        self._chroma_cache: Dict[int, Path] = {}
-        self._champion_skins: Dict[int, Set[int]] = {}
+
+    def __init__(self, index_path: Optional[Path] = None):
+        self._catalog = _Catalog()
+        self._index_path = index_path
         self._lock = threading.Lock()
         self._built = False
-    
+
     @property
     def is_built(self) -> bool:
         """Check if cache has been built."""
         return self._built
-    
+
     def build(self, skins_dir: Path) -> None:
-        """Scan skins directory and build the cache.
-        
+        """Load the persisted catalog or scan the skins directory.
+
         Expected structure:
         skins_dir/
         ├── {champion_id}/
         │   ├── {skin_id}/
         │   │   ├── {skin_id}.zip or .fantome  (base skin)
+        │   │   ├── {skin_id}.png              (preview)
+        │   │   ├── <Form name>.zip            (named form files, any depth)
         │   │   ├── {chroma_id}/
-        │   │   │   └── {chroma_id}.zip or .fantome
+        │   │   │   ├── {chroma_id}.zip or .fantome
+        │   │   │   └── {chroma_id}.png
         """
         with self._lock:
             if self._built:
                 return
-            
-            self._skin_cache.clear()
-            self._chroma_cache.clear()
-            self._champion_skins.clear()
-            
+
             if not skins_dir.exists():
                 log.warning(f"[CACHE] Skins directory does not exist: {skins_dir}")
+                self._catalog = _Catalog()
                 self._built = True
                 return
-            
-            skin_count = 0
-            chroma_count = 0
-            
+
             try:
-                # Iterate through champion directories
-                for champ_dir in skins_dir.iterdir():
-                    if not champ_dir.is_dir():
-                        continue
-                    
-                    try:
-                        champion_id = int(champ_dir.name)
-                    except ValueError:
-                        continue  # Skip non-numeric directories
-                    
-                    self._champion_skins[champion_id] = set()
-                    
-                    # Iterate through skin directories
-                    for skin_dir in champ_dir.iterdir():
-                        if not skin_dir.is_dir():
-                            continue
-                        
-                        try:
-                            skin_id = int(skin_dir.name)
-                        except ValueError:
-                            continue
-                        
-                        self._champion_skins[champion_id].add(skin_id)
-                        
-                        # Look for base skin file
-                        skin_zip = skin_dir / f"{skin_id}.zip"
-                        skin_fantome = skin_dir / f"{skin_id}.fantome"
-                        
-                        if skin_zip.exists():
-                            self._skin_cache[skin_id] = skin_zip
-                            skin_count += 1
-                        elif skin_fantome.exists():
-                            self._skin_cache[skin_id] = skin_fantome
-                            skin_count += 1
-                        
-                        # Look for chroma directories
-                        for chroma_dir in skin_dir.iterdir():
-                            if not chroma_dir.is_dir():
-                                continue
-                            
-                            try:
-                                chroma_id = int(chroma_dir.name)
-                            except ValueError:
-                                continue
-                            
-                            chroma_zip = chroma_dir / f"{chroma_id}.zip"
-                            chroma_fantome = chroma_dir / f"{chroma_id}.fantome"
-                            
-                            if chroma_zip.exists():
-                                self._chroma_cache[chroma_id] = chroma_zip
-                                chroma_count += 1
-                            elif chroma_fantome.exists():
-                                self._chroma_cache[chroma_id] = chroma_fantome
-                                chroma_count += 1
-                
-                self._built = True
-                log.info(f"[CACHE] Built skin cache: {skin_count} skins, {chroma_count} chromas, {len(self._champion_skins)} champions")
-                
+                catalog = self._load_persisted(skins_dir)
+                if catalog is not None:
+                    log.info(f"[CACHE] Loaded skin catalog: {catalog.summary()}")
+                else:
+                    catalog = self._scan(skins_dir)
+                    log.info(f"[CACHE] Built skin cache: {catalog.summary()}")
+                    self._save_persisted(skins_dir, catalog)
+                self._catalog = catalog
             except Exception as e:
                 log.error(f"[CACHE] Failed to build skin cache: {e}")
-                self._built = True  # Mark as built to prevent retry loops
-    
+            self._built = True  # Also on failure, to prevent retry loops
+
+    def apply_changes(self, skins_dir: Path, changes) -> None:
+        """Apply a download change set as a delta instead of rescanning.
+
+        Args:
+            skins_dir: Root of the skins tree
+            changes: Object with ``added``, ``modified`` and ``removed`` lists of
+                paths relative to skins_dir, and a ``full`` flag that requests
+                a complete rescan (e.g. after a full ZIP download)
+
+        Works whether or not the cache is built in this process: an unbuilt
+        cache applies the delta to the persisted catalog.
+        """
+        changed = list(changes.added) + list(changes.modified)
+        removed = list(changes.removed)
+        touched_dirs = self._touched_dirs(changed + removed)
+
+        with self._lock:
+            base = None
+            if not changes.full:
+                base = self._catalog if self._built else self._load_persisted(skins_dir, allow_changed=touched_dirs)
+            if base is None:
+                catalog = self._scan(skins_dir) if skins_dir.exists() else _Catalog()
+                log.info(f"[CACHE] Rescanned skin catalog: {catalog.summary()}")
+            else:
+                catalog = base.copy()
+                for rel in removed:
+                    catalog.remove_file(skins_dir / rel, _ids_for(self._parent_of(rel)))
+                for rel in changed:
+                    path = skins_dir / rel
+                    if path.is_file():
+                        catalog.add_file(path, path.name, _ids_for(self._parent_of(rel)))
+                self._refresh_dirs(skins_dir, catalog, touched_dirs)
+                log.info(f"[CACHE] Applied {len(changed)} changed / {len(removed)} removed files to skin catalog")
+
+            self._save_persisted(skins_dir, catalog)
+            if self._built:
+                self._catalog = catalog  # Single swap - readers see old or new, never partial
+
     def get_skin(self, skin_id: int) -> Optional[Path]:
         """Get cached path for a skin by ID."""
-        return self._skin_cache.get(skin_id)
-    
+        return self._catalog.skins.get(skin_id)
+
     def get_chroma(self, chroma_id: int) -> Optional[Path]:
         """Get cached path for a chroma by ID."""
-        return self._chroma_cache.get(chroma_id)
-    
+        return self._catalog.chromas.get(chroma_id)
+
+    def get_chroma_champion(self, chroma_id: int) -> Optional[int]:
+        """Get the champion ID whose directory holds a chroma."""
+        return self._catalog.chroma_champions.get(chroma_id)
+
+    def get_skin_preview(self, skin_id: int) -> Optional[Path]:
+        """Get cached preview image for a skin."""
+        return self._catalog.skin_previews.get(skin_id)
+
+    def get_chroma_preview(self, chroma_id: int) -> Optional[Path]:
+        """Get cached preview image for a chroma."""
+        return self._catalog.chroma_previews.get(chroma_id)
+
+    def get_named_file(self, stem: str) -> Optional[Path]:
+        """Get a named archive (e.g. a form file) by file stem, .zip preferred."""
+        named_files = self._catalog.named_files
+        for ext in ARCHIVE_EXTENSIONS:
+            path = named_files.get(f"{stem}{ext}".lower())
+            if path is not None:
+                return path
+        return None
+
     def get_skins_for_champion(self, champion_id: int) -> Set[int]:
         """Get all skin IDs for a champion."""
-        return self._champion_skins.get(champion_id, set())
-    
+        return self._catalog.champion_skins.get(champion_id, set())
+
     def has_skin(self, skin_id: int) -> bool:
         """Check if a skin is in the cache."""
-        return skin_id in self._skin_cache
-    
+        return skin_id in self._catalog.skins
+
     def has_chroma(self, chroma_id: int) -> bool:
         """Check if a chroma is in the cache."""
-        return chroma_id in self._chroma_cache
-    
+        return chroma_id in self._catalog.chromas
+
     def invalidate(self) -> None:
         """Clear the cache (call when skins are added/removed)."""
         with self._lock:
-            self._skin_cache.clear()
-            self._chroma_cache.clear()
-            self._champion_skins.clear()
+            self._catalog = _Catalog()
             self._built = False
             log.debug("[CACHE] Skin cache invalidated")
-    
+
     def refresh(self, skins_dir: Path) -> None:
         """Rebuild the cache."""
         self.invalidate()
         self.build(skins_dir)
-    
+
     def stats(self) -> dict:
         """Get cache statistics."""
+        catalog = self._catalog
         return {
             "built": self._built,
-            "skins": len(self._skin_cache),
-            "chromas": len(self._chroma_cache),
-            "champions": len(self._champion_skins),
+            "skins": len(catalog.skins),
+            "chromas": len(catalog.chromas),
+            "champions": len(catalog.champion_skins),
+            "previews": len(catalog.skin_previews) + len(catalog.chroma_previews),
+            "named_files": len(catalog.named_files),
+        }
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _scan(skins_dir: Path) -> _Catalog:
+        """Index the whole tree in one scandir pass."""
+        catalog = _Catalog()
+        root = str(skins_dir)
+        catalog.root_listing = _root_listing(skins_dir)
+        # Stack of (directory path, relative path, numeric IDs on the way down)
+        stack = [(root, "", ())]
+        while stack:
+            dir_path, rel_dir, ids = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError as e:
+                log.debug(f"[CACHE] Cannot scan {dir_path}: {e}")
+                continue
+
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+
+                if not is_dir:
+                    catalog.add_file(Path(entry.path), entry.name, ids)
+                    continue
+
+                child_ids = None
+                if ids is not None and len(ids) < 3 and entry.name.isdigit():
+                    child_ids = ids + (int(entry.name),)
+                    catalog.add_dir(child_ids)
+                try:
+                    catalog.dir_mtimes[rel] = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+                stack.append((entry.path, rel, child_ids))
+        return catalog
+
+    @staticmethod
+    def _parent_of(rel: str) -> str:
+        """Relative parent directory of a relative file path ("" = root)."""
+        return rel.rsplit("/", 1)[0] if "/" in rel else ""
+
+    @staticmethod
+    def _touched_dirs(rel_files: Iterable[str]) -> Set[str]:
+        """Every ancestor directory (relative, "" = root) of the given files."""
+        dirs = {""}
+        for rel in rel_files:
+            parts = rel.replace("\\", "/").split("/")[:-1]
+            for i in range(1, len(parts) + 1):
+                dirs.add("/".join(parts[:i]))
+        return dirs
+
+    @staticmethod
+    def _refresh_dirs(skins_dir: Path, catalog: _Catalog, rel_dirs: Iterable[str]) -> None:
+        """Re-stat changed directories, registering new ones and dropping deleted ones."""
+        for rel_dir in sorted(rel_dirs):
+            if not rel_dir:
+                try:
+                    catalog.root_listing = _root_listing(skins_dir)
+                except OSError:
+                    catalog.root_listing = None
+                continue
+            try:
+                catalog.dir_mtimes[rel_dir] = os.stat(skins_dir / rel_dir if rel_dir else skins_dir).st_mtime_ns
+                catalog.add_dir(_ids_for(rel_dir))
+            except OSError:
+                catalog.dir_mtimes.pop(rel_dir, None)
+                ids = _ids_for(rel_dir)
+                if ids and len(ids) == 2:
+                    catalog.champion_skins.get(ids[0], set()).discard(ids[1])
+                elif ids and len(ids) == 1:
+                    catalog.champion_skins.pop(ids[0], None)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load_persisted(self, skins_dir: Path, allow_changed: Optional[Set[str]] = None) -> Optional[_Catalog]:
+        """Load the saved catalog if its directory manifest is still current.
+
+        Directories in allow_changed are not checked (a delta for them is
+        about to be applied).
+        """
+        if self._index_path is None or not self._index_path.exists():
+            return None
+        try:
+            data = json.loads(self._index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            log.debug(f"[CACHE] Failed to read skin catalog: {e}")
+            return None
+        if not isinstance(data, dict) or data.get("version") != CATALOG_VERSION or data.get("root") != str(skins_dir):
+            return None
+
+        if not (allow_changed and "" in allow_changed):
+            try:
+                if data.get("root_listing") != _root_listing(skins_dir):
+                    log.debug("[CACHE] Skin catalog stale (root changed), rescanning")
+                    return None
+            except OSError:
+                return None
+
+        dirs = data.get("dirs") or {}
+        for rel, mtime_ns in dirs.items():
+            if allow_changed and rel in allow_changed:
+                continue
+            try:
+                if os.stat(skins_dir / rel).st_mtime_ns != mtime_ns:
+                    log.debug(f"[CACHE] Skin catalog stale ({rel} changed), rescanning")
+                    return None
+            except OSError:
+                return None
+
+        catalog = _Catalog()
+        try:
+            def to_path(rel: str) -> Path:
+                return skins_dir / rel
+            catalog.skins = {int(k): to_path(v) for k, v in data["skins"].items()}
+            catalog.chromas = {int(k): to_path(v) for k, v in data["chromas"].items()}
+            catalog.chroma_champions = {int(k): int(v) for k, v in data["chroma_champions"].items()}
+            catalog.champion_skins = {int(k): set(v) for k, v in data["champions"].items()}
+            catalog.skin_previews = {int(k): to_path(v) for k, v in data["skin_previews"].items()}
+            catalog.chroma_previews = {int(k): to_path(v) for k, v in data["chroma_previews"].items()}
+            catalog.named_files = {k: to_path(v) for k, v in data["named"].items()}
+            catalog.dir_mtimes = {k: int(v) for k, v in dirs.items()}
+            catalog.root_listing = data.get("root_listing")
+        except (KeyError, TypeError, ValueError) as e:
+            log.debug(f"[CACHE] Skin catalog malformed, rescanning: {e}")
+            return None
+        return catalog
+
+    def _save_persisted(self, skins_dir: Path, catalog: _Catalog) -> None:
+        """Write the catalog atomically."""
+        if self._index_path is None:
+            return
+
+        def rel(path: Path) -> str:
+            return path.relative_to(skins_dir).as_posix()
+
+        data = {
+            "version": CATALOG_VERSION,
+            "root": str(skins_dir),
+            "dirs": catalog.dir_mtimes,
+            "root_listing": catalog.root_listing,
+            "skins": {str(k): rel(v) for k, v in catalog.skins.items()},
+            "chromas": {str(k): rel(v) for k, v in catalog.chromas.items()},
+            "chroma_champions": {str(k): v for k, v in catalog.chroma_champions.items()},
+            "champions": {str(k): sorted(v) for k, v in catalog.champion_skins.items()},
+            "skin_previews": {str(k): rel(v) for k, v in catalog.skin_previews.items()},
+            "chroma_previews": {str(k): rel(v) for k, v in catalog.chroma_previews.items()},
+            "named": {k: rel(v) for k, v in catalog.named_files.items()},
         }
+        tmp_path = self._index_path.with_suffix(".tmp")
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, self._index_path)
+        except OSError as e:
+            log.debug(f"[CACHE] Failed to save skin catalog: {e}")
@@ -3,21 +3,40 @@
 """
 Mod storage service
 Handles mods organized by category: skins, maps, fonts, announcers, others
+
+Listings come from a ModIndex shared by all instances, so repeated requests
+(every champion hover / panel open) are answered from memory.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 import shutil
+import threading
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from utils.core.logging import get_logger
 from utils.core.paths import get_user_data_dir
 from utils.core.utilities import get_champion_id_from_skin_id
 
+from .mod_index import ModIndex
+
 log = get_logger()
 
+_INDEX: Optional[ModIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def _get_index() -> ModIndex:
+    """Mod index shared by every ModStorageService"""
+    global _INDEX
+    if _INDEX is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                _INDEX = ModIndex()
+    return _INDEX
+
 
 @dataclass(frozen=True)
 class SkinModEntry:
@@ -60,6 +79,9 @@ class ModStorageService:
     def __init__(self, mods_root: Optional[Path] = None):
         self.mods_root = mods_root or (get_user_data_dir() / "mods")
         self.mods_root.mkdir(parents=True, exist_ok=True)
+        self._index = _get_index()
+        # skins/ folder names the champion map was built from -> champion -> skin folders
+        self._champion_skins: Tuple[Tuple[str, ...], Dict[int, List[str]]] = ((), {})
         self._ensure_mods_root_layout()
 
     def _ensure_mods_root_layout(self) -> None:
@@ -96,72 +118,62 @@ class ModStorageService:
     def get_skin_dir(self, skin_id: int | str) -> Path:
         return self.skins_dir / str(skin_id)
 
-    def list_mods_for_skin(self, skin_id: int | str) -> List[SkinModEntry]:
-        skin_dir = self.get_skin_dir(skin_id)
-        if not skin_dir.exists() or not skin_dir.is_dir():
-            return []
+    def invalidate(self, folder: Path) -> None:
+        """Drop the cached listings of *folder* and its parent after it was added or removed"""
+        self._index.invalidate(folder)
+        self._index.invalidate(folder.parent)
 
+    def list_mods_for_skin(self, skin_id: int | str) -> List[SkinModEntry]:
         skin_id_int = self._to_int(skin_id)
         if skin_id_int is None:
             return []
 
         champion_id = get_champion_id_from_skin_id(skin_id_int)
-        entries: List[SkinModEntry] = []
-        for candidate in sorted(skin_dir.iterdir(), key=lambda p: p.name.lower()):
-            if candidate.is_dir():
-                mod_name = candidate.name
-            elif candidate.is_file() and candidate.suffix.lower() in {".zip", ".fantome"}:
-                mod_name = candidate.stem
-            else:
-                continue
-
-            try:
-                updated_at = candidate.stat().st_mtime
-            except OSError:
-                updated_at = 0.0
-
-            entries.append(
-                SkinModEntry(
-                    champion_id=champion_id,
-                    skin_id=skin_id_int,
-                    mod_name=mod_name,
-                    path=candidate,
-                    updated_at=updated_at,
-                    description=self._read_mod_description(candidate),
-                )
+        return [
+            SkinModEntry(
+                champion_id=champion_id,
+                skin_id=skin_id_int,
+                mod_name=record.name,
+                path=record.path,
+                updated_at=record.updated_at,
+                description=record.description(),
             )
-
-        return entries
+            for record in self._index.mods_in(self.get_skin_dir(skin_id))
+        ]
 
     def list_mods_for_champion(self, champion_id: int | str) -> List[SkinModEntry]:
         """Return every SkinModEntry whose champion matches *champion_id*.
 
-        Scans all numeric subdirectories under ``skins/`` and aggregates the
-        entries from each skin that belongs to the given champion.
+        Looks through the numeric subdirectories under ``skins/`` and aggregates
+        the entries from each skin that belongs to the given champion.
         """
         champion_id_int = self._to_int(champion_id)
         if champion_id_int is None:
             return []
 
         entries: List[SkinModEntry] = []
-        skins_dir = self.skins_dir
-        if not skins_dir.exists() or not skins_dir.is_dir():
-            return entries
+        for name in self._skin_dirs_by_champion().get(champion_id_int, ()):
+            entries.extend(self.list_mods_for_skin(name))
 
-        for child in sorted(skins_dir.iterdir(), key=lambda p: p.name.lower()):
-            if not child.is_dir():
-                continue
-            child_int = self._to_int(child.name)
+        return entries
+
+    def _skin_dirs_by_champion(self) -> Dict[int, List[str]]:
+        """Numeric skins/ subfolders grouped by champion (rebuilt when skins/ changes)"""
+        names = self._index.subdirs_of(self.skins_dir)
+        built_from, by_champion = self._champion_skins
+        if names is built_from:
+            return by_champion
+        by_champion = {}
+        for name in names:
+            child_int = self._to_int(name)
             if child_int is None:
                 continue
-            if get_champion_id_from_skin_id(child_int) != champion_id_int:
-                continue
-            entries.extend(self.list_mods_for_skin(child_int))
-
-        return entries
+            by_champion.setdefault(get_champion_id_from_skin_id(child_int), []).append(name)
+        self._champion_skins = (names, by_champion)
+        return by_champion
 
     def has_mods_for_skin(self, skin_id: int | str) -> bool:
-        return bool(self.list_mods_for_skin(skin_id))
+        return bool(self._index.mods_in(self.get_skin_dir(skin_id)))
 
     def list_mods_for_category(self, category: str) -> List[dict]:
         """List all mods in a category (maps, fonts, announcers, others)
@@ -185,35 +197,16 @@ class ModStorageService:
         }:
             return []
         
-        category_dir = self.mods_root / category
-        if not category_dir.exists() or not category_dir.is_dir():
-            return []
-        
         entries = []
-        for candidate in sorted(category_dir.iterdir(), key=lambda p: p.name.lower()):
-            if candidate.is_dir():
-                mod_name = candidate.name
-            elif candidate.is_file() and candidate.suffix.lower() in {".zip", ".fantome"}:
-                mod_name = candidate.stem
-            else:
-                continue
-            
-            try:
-                updated_at = candidate.stat().st_mtime
-            except OSError:
-                updated_at = 0.0
-            
-            try:
-                relative_path = candidate.relative_to(self.mods_root)
-            except Exception:
-                relative_path = candidate
-            
+        for record in self._index.mods_in(self.mods_root / category):
+            # Mods sit directly in the category folder
+            relative_path = f"{category}/{record.path.name}"
             entries.append({
-                "id": str(relative_path).replace("\\", "/"),
-                "name": mod_name,
-                "path": str(relative_path).replace("\\", "/"),
-                "updatedAt": updated_at,
-                "description": self._read_mod_description(candidate),
+                "id": relative_path,
+                "name": record.name,
+                "path": relative_path,
+                "updatedAt": record.updated_at,
+                "description": record.description(),
             })
         
         return entries
@@ -224,16 +217,3 @@ class ModStorageService:
             return int(value)
         except (TypeError, ValueError):
             return None
-
-    @staticmethod
-    def _read_mod_description(candidate: Path) -> Optional[str]:
-        description_file = candidate / "description.txt" if candidate.is_dir() else candidate.with_suffix(".txt")
-        if not description_file.exists():
-            return None
-        try:
-            return description_file.read_text(encoding="utf-8").strip()
-        except Exception as exc:
-            log.debug(f"[ModStorage] Unable to read descriptor {description_file}: {exc}")
-            return None
-
-
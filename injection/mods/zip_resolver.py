@@ -9,20 +9,46 @@ from pathlib import Path
 from typing import Optional
 
 from utils.core.logging import get_logger, log_success
+from utils.core.paths import get_state_dir
 from .skin_cache import SkinPathCache
 
 log = get_logger()
 
+# Fake chroma IDs of skin forms -> (display name, archive file stem)
+FORM_FILES = {
+    # Elementalist Lux
+    99991: ("Elementalist Lux Air", "Lux Elementalist Air"),
+    99992: ("Elementalist Lux Dark", "Lux Elementalist Dark"),
+    99993: ("Elementalist Lux Ice", "Lux Elementalist Ice"),
+    99994: ("Elementalist Lux Magma", "Lux Elementalist Magma"),
+    99995: ("Elementalist Lux Mystic", "Lux Elementalist Mystic"),
+    99996: ("Elementalist Lux Nature", "Lux Elementalist Nature"),
+    99997: ("Elementalist Lux Storm", "Lux Elementalist Storm"),
+    99998: ("Elementalist Lux Water", "Lux Elementalist Water"),
+    99999: ("Elementalist Lux Fire", "Lux Elementalist Fire"),
+    # Sahn Uzal Mordekaiser
+    82998: ("Sahn Uzal Mordekaiser Form 1", "Sahn Uzal Mordekaiser Form 1"),
+    82999: ("Sahn Uzal Mordekaiser Form 2", "Sahn Uzal Mordekaiser Form 2"),
+    # Spirit Blossom Morgana
+    25999: ("Spirit Blossom Morgana Form 1", "Spirit Blossom Morgana Form 1"),
+    # Radiant Sett
+    875998: ("Radiant Sett Form 2", "Radiant Sett Form 2"),
+    875999: ("Radiant Sett Form 3", "Radiant Sett Form 3"),
+    # KDA Seraphine
+    147002: ("KDA Seraphine Form 1", "KDA Seraphine Form 1"),
+    147003: ("KDA Seraphine Form 2", "KDA Seraphine Form 2"),
+}
+
 
 class ZipResolver:
     """Resolves skin and chroma ZIP files from various naming conventions"""
     
-    def __init__(self, zips_dir: Path):
+    def __init__(self, zips_dir: Path, catalog_path: Optional[Path] = None):
         self.zips_dir = zips_dir
         self.zips_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize path cache for O(1) lookups
-        self._cache = SkinPathCache()
+        # Initialize path cache for O(1) lookups (persisted across startups)
+        self._cache = SkinPathCache(catalog_path or get_state_dir() / "skin_catalog.json")
     
     def ensure_cache(self) -> None:
         """Build cache if not already built."""
@@ -33,6 +59,10 @@ class ZipResolver:
         """Rebuild the cache (call after downloading new skins)."""
         self._cache.refresh(self.zips_dir)
     
+    def apply_changes(self, changes) -> None:
+        """Patch the cache with a download change set instead of rescanning."""
+        self._cache.apply_changes(self.zips_dir, changes)
+    
     def resolve_zip(self, zip_arg: str, chroma_id: int = None, skin_name: str = None, champion_name: str = None, champion_id: int = None) -> Optional[Path]:
         """Resolve a ZIP by name or path with fuzzy matching, supporting new merged structure
         
@@ -60,38 +90,23 @@ class ZipResolver:
             
             # If chroma_id is provided, this is actually a chroma (Swiftplay case)
             if chroma_id is not None:
-                # Fast path: Try cache first
                 cached = self._cache.get_chroma(chroma_id)
                 if cached:
                     log.debug(f"[INJECT] Cache hit for chroma: {chroma_id}")
                     return cached
                 return self._resolve_chroma_by_id(champion_id, chroma_id)
             
-            # Fast path: Try cache first for base skin
             cached = self._cache.get_skin(skin_id)
             if cached:
                 log.debug(f"[INJECT] Cache hit for skin: {skin_id}")
                 return cached
             
-            # Fallback: Filesystem lookup
-            skin_dir = self.zips_dir / str(champion_id) / str(skin_id)
-            skin_zip_path = skin_dir / f"{skin_id}.zip"
-            skin_fantome_path = skin_dir / f"{skin_id}.fantome"
-            
-            if skin_zip_path.exists():
-                log.debug(f"[INJECT] Found skin ZIP: {skin_zip_path}")
-                return skin_zip_path
-            elif skin_fantome_path.exists():
-                log.debug(f"[INJECT] Found skin FANTOME: {skin_fantome_path}")
-                return skin_fantome_path
-            else:
-                # Not found as base skin - might be a chroma
-                log.debug(f"[INJECT] Base skin not found, checking if {skin_id} is a chroma...")
-                # Try cache for chroma
-                cached = self._cache.get_chroma(skin_id)
-                if cached:
-                    return cached
-                return self._resolve_chroma_by_id(champion_id, skin_id)
+            # Not found as base skin - might be a chroma
+            log.debug(f"[INJECT] Base skin not found, checking if {skin_id} is a chroma...")
+            cached = self._cache.get_chroma(skin_id)
+            if cached:
+                return cached
+            return self._resolve_chroma_by_id(champion_id, skin_id)
         
         elif zip_arg.startswith('chroma_'):
             # Format: chroma_{chroma_id} - this is a chroma
@@ -100,7 +115,6 @@ class ZipResolver:
                 log.warning(f"[INJECT] No champion_id provided for chroma ID: {chroma_id}")
                 return None
             
-            # Fast path: Try cache first
             cached = self._cache.get_chroma(chroma_id)
             if cached:
                 log.debug(f"[INJECT] Cache hit for chroma: {chroma_id}")
@@ -120,25 +134,10 @@ class ZipResolver:
 
         # If chroma_id is provided, look in chroma subdirectory structure
         if chroma_id is not None:
-            # Special handling for Elementalist Lux forms (fake IDs 99991-99999)
-            if 99991 <= chroma_id <= 99999:
-                return self._resolve_elementalist_lux_form(chroma_id)
-            
-            # Special handling for Sahn Uzal Mordekaiser forms (IDs 82998, 82999)
-            if chroma_id in (82998, 82999):
-                return self._resolve_mordekaiser_form(chroma_id)
-            
-            # Special handling for Spirit Blossom Morgana forms (ID 25999)
-            if chroma_id == 25999:
-                return self._resolve_morgana_form(chroma_id)
-            
-            # Special handling for Radiant Sett forms (IDs 875998, 875999)
-            if chroma_id in (875998, 875999):
-                return self._resolve_sett_form(chroma_id)
-            
-            # Special handling for KDA Seraphine forms (IDs 147002, 147003)
-            if chroma_id in (147002, 147003):
-                return self._resolve_seraphine_form(chroma_id)
+            # Special handling for skin forms (Elementalist Lux, Sahn Uzal Mordekaiser,
+            # Spirit Blossom Morgana, Radiant Sett, KDA Seraphine)
+            if chroma_id in FORM_FILES:
+                return self._resolve_form(chroma_id)
             
             # For regular chromas, look for {champion_id}/{skin_id}/{chroma_id}/{chroma_id}.zip
             if not champion_id:
@@ -154,182 +153,28 @@ class ZipResolver:
     
     def _resolve_chroma_by_id(self, champion_id: int, chroma_id: int) -> Optional[Path]:
         """Resolve chroma ZIP by champion ID and chroma ID"""
-        champion_dir = self.zips_dir / str(champion_id)
-        if not champion_dir.exists():
-            log.warning(f"[INJECT] Champion directory not found: {champion_dir}")
-            return None
-        
-        # Search through all skin directories for this champion to find the chroma
-        for skin_dir in champion_dir.iterdir():
-            if not skin_dir.is_dir():
-                continue
-            
-            # Check if this is a skin directory (numeric name)
-            try:
-                int(skin_dir.name)  # If this succeeds, it's a skin ID directory
-                
-                # Check if chroma directory exists
-                chroma_dir = skin_dir / str(chroma_id)
-                if chroma_dir.exists():
-                    chroma_zip = chroma_dir / f"{chroma_id}.zip"
-                    chroma_fantome = chroma_dir / f"{chroma_id}.fantome"
-                    if chroma_zip.exists():
-                        log_success(log, f"Found chroma: {chroma_zip.name}", "")
-                        return chroma_zip
-                    elif chroma_fantome.exists():
-                        log_success(log, f"Found chroma: {chroma_fantome.name}", "")
-                        return chroma_fantome
-            except ValueError:
-                # Not a skin directory, skip
-                continue
-        
-        log.warning(f"[INJECT] Chroma {chroma_id} not found in any skin directory for champion {champion_id}")
-        return None
-    
-    def _resolve_elementalist_lux_form(self, chroma_id: int) -> Optional[Path]:
-        """Resolve Elementalist Lux form by fake chroma ID"""
-        log.info(f"[INJECT] Detected Elementalist Lux form fake ID: {chroma_id}")
-        
-        # Map fake IDs to form names
-        form_names = {
-            99991: 'Air',
-            99992: 'Dark', 
-            99993: 'Ice',
-            99994: 'Magma',
-            99995: 'Mystic',
-            99996: 'Nature',
-            99997: 'Storm',
-            99998: 'Water',
-            99999: 'Fire'
-        }
-        
-        form_name = form_names.get(chroma_id, 'Unknown')
-        log.info(f"[INJECT] Looking for Elementalist Lux {form_name} form")
-        
-        # Look for the form file in the Lux directory (check both .zip and .fantome)
-        form_pattern_zip = f"Lux Elementalist {form_name}.zip"
-        form_pattern_fantome = f"Lux Elementalist {form_name}.fantome"
-        form_files_zip = list(self.zips_dir.rglob(f"**/{form_pattern_zip}"))
-        form_files_fantome = list(self.zips_dir.rglob(f"**/{form_pattern_fantome}"))
-        
-        if form_files_zip:
-            log_success(log, f"Found Elementalist Lux {form_name} form: {form_files_zip[0].name}", "✨")
-            return form_files_zip[0]
-        elif form_files_fantome:
-            log_success(log, f"Found Elementalist Lux {form_name} form: {form_files_fantome[0].name}", "✨")
-            return form_files_fantome[0]
-        else:
-            log.warning(f"[INJECT] Elementalist Lux {form_name} form file not found: {form_pattern_zip} or {form_pattern_fantome}")
-            return None
-    
-    def _resolve_mordekaiser_form(self, chroma_id: int) -> Optional[Path]:
-        """Resolve Sahn Uzal Mordekaiser form by chroma ID"""
-        log.info(f"[INJECT] Detected Sahn Uzal Mordekaiser form ID: {chroma_id}")
-        
-        # Map IDs to form names
-        form_names = {
-            82998: 'Form 1',
-            82999: 'Form 2'
-        }
-        
-        form_name = form_names.get(chroma_id, 'Unknown')
-        log.info(f"[INJECT] Looking for Sahn Uzal Mordekaiser {form_name} form")
-        
-        # Look for the form file in the Mordekaiser directory (check both .zip and .fantome)
-        form_pattern_zip = f"Sahn Uzal Mordekaiser {form_name}.zip"
-        form_pattern_fantome = f"Sahn Uzal Mordekaiser {form_name}.fantome"
-        form_files_zip = list(self.zips_dir.rglob(f"**/{form_pattern_zip}"))
-        form_files_fantome = list(self.zips_dir.rglob(f"**/{form_pattern_fantome}"))
-        
-        if form_files_zip:
-            log_success(log, f"Found Sahn Uzal Mordekaiser {form_name} form: {form_files_zip[0].name}", "✨")
-            return form_files_zip[0]
-        elif form_files_fantome:
-            log_success(log, f"Found Sahn Uzal Mordekaiser {form_name} form: {form_files_fantome[0].name}", "✨")
-            return form_files_fantome[0]
-        else:
-            log.warning(f"[INJECT] Sahn Uzal Mordekaiser {form_name} form file not found: {form_pattern_zip} or {form_pattern_fantome}")
+        chroma_path = self._cache.get_chroma(chroma_id)
+        if chroma_path is None:
+            log.warning(f"[INJECT] Chroma {chroma_id} not found in any skin directory for champion {champion_id}")
             return None
-    
-    def _resolve_morgana_form(self, chroma_id: int) -> Optional[Path]:
-        """Resolve Spirit Blossom Morgana form by chroma ID"""
-        log.info(f"[INJECT] Detected Spirit Blossom Morgana form ID: {chroma_id}")
-        
-        # Map ID to form name
-        form_name = 'Form 1' if chroma_id == 25999 else 'Unknown'
-        log.info(f"[INJECT] Looking for Spirit Blossom Morgana {form_name} form")
-        
-        # Look for the form file in the Morgana directory (check both .zip and .fantome)
-        form_pattern_zip = f"Spirit Blossom Morgana {form_name}.zip"
-        form_pattern_fantome = f"Spirit Blossom Morgana {form_name}.fantome"
-        form_files_zip = list(self.zips_dir.rglob(f"**/{form_pattern_zip}"))
-        form_files_fantome = list(self.zips_dir.rglob(f"**/{form_pattern_fantome}"))
         
-        if form_files_zip:
-            log_success(log, f"Found Spirit Blossom Morgana {form_name} form: {form_files_zip[0].name}", "✨")
-            return form_files_zip[0]
-        elif form_files_fantome:
-            log_success(log, f"Found Spirit Blossom Morgana {form_name} form: {form_files_fantome[0].name}", "✨")
-            return form_files_fantome[0]
-        else:
-            log.warning(f"[INJECT] Spirit Blossom Morgana {form_name} form file not found: {form_pattern_zip} or {form_pattern_fantome}")
+        owner = self._cache.get_chroma_champion(chroma_id)
+        if owner is not None and owner != champion_id:
+            log.warning(f"[INJECT] Chroma {chroma_id} belongs to champion {owner}, not {champion_id}")
             return None
-    
-    def _resolve_sett_form(self, chroma_id: int) -> Optional[Path]:
-        """Resolve Radiant Sett form by chroma ID"""
-        log.info(f"[INJECT] Detected Radiant Sett form ID: {chroma_id}")
-        
-        # Map IDs to form names
-        form_names = {
-            875998: 'Form 2',
-            875999: 'Form 3'
-        }
-        
-        form_name = form_names.get(chroma_id, 'Unknown')
-        log.info(f"[INJECT] Looking for Radiant Sett {form_name} form")
         
-        # Look for the form file in the Sett directory (check both .zip and .fantome)
-        form_pattern_zip = f"Radiant Sett {form_name}.zip"
-        form_pattern_fantome = f"Radiant Sett {form_name}.fantome"
-        form_files_zip = list(self.zips_dir.rglob(f"**/{form_pattern_zip}"))
-        form_files_fantome = list(self.zips_dir.rglob(f"**/{form_pattern_fantome}"))
-        
-        if form_files_zip:
-            log_success(log, f"Found Radiant Sett {form_name} form: {form_files_zip[0].name}", "✨")
-            return form_files_zip[0]
-        elif form_files_fantome:
-            log_success(log, f"Found Radiant Sett {form_name} form: {form_files_fantome[0].name}", "✨")
-            return form_files_fantome[0]
-        else:
-            log.warning(f"[INJECT] Radiant Sett {form_name} form file not found: {form_pattern_zip} or {form_pattern_fantome}")
-            return None
+        log_success(log, f"Found chroma: {chroma_path.name}", "")
+        return chroma_path
     
-    def _resolve_seraphine_form(self, chroma_id: int) -> Optional[Path]:
-        """Resolve KDA Seraphine form by chroma ID"""
-        log.info(f"[INJECT] Detected KDA Seraphine form ID: {chroma_id}")
+    def _resolve_form(self, chroma_id: int) -> Optional[Path]:
+        """Resolve a named skin form (Elementalist Lux, Sahn Uzal Mordekaiser, ...) by fake chroma ID"""
+        display_name, file_stem = FORM_FILES[chroma_id]
+        log.info(f"[INJECT] Looking for {display_name} form (ID {chroma_id})")
         
-        # Map IDs to form names
-        form_names = {
-            147002: 'Form 1',
-            147003: 'Form 2'
-        }
+        form_path = self._cache.get_named_file(file_stem)
+        if form_path is not None:
+            log_success(log, f"Found {display_name} form: {form_path.name}", "✨")
+            return form_path
         
-        form_name = form_names.get(chroma_id, 'Unknown')
-        log.info(f"[INJECT] Looking for KDA Seraphine {form_name} form")
-        
-        # Look for the form file in the Seraphine directory (check both .zip and .fantome)
-        form_pattern_zip = f"KDA Seraphine {form_name}.zip"
-        form_pattern_fantome = f"KDA Seraphine {form_name}.fantome"
-        form_files_zip = list(self.zips_dir.rglob(f"**/{form_pattern_zip}"))
-        form_files_fantome = list(self.zips_dir.rglob(f"**/{form_pattern_fantome}"))
-        
-        if form_files_zip:
-            log_success(log, f"Found KDA Seraphine {form_name} form: {form_files_zip[0].name}", "✨")
-            return form_files_zip[0]
-        elif form_files_fantome:
-            log_success(log, f"Found KDA Seraphine {form_name} form: {form_files_fantome[0].name}", "✨")
-            return form_files_fantome[0]
-        else:
-            log.warning(f"[INJECT] KDA Seraphine {form_name} form file not found: {form_pattern_zip} or {form_pattern_fantome}")
-            return None
-
+        log.warning(f"[INJECT] {display_name} form file not found: {file_stem}.zip or {file_stem}.fantome")
+        return None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Overlay Cache
+Content-addressed cache of built overlays (mkoverlay output).
+
+Each entry is keyed on the fingerprints of the mods it was built from, the
+game build and the mod-tools binary, so picking the same skin(s) again can
+skip mkoverlay and go straight to runoverlay. Entries are evicted LRU once
+the cache grows past its byte budget.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from utils.core.logging import get_logger
+from utils.core.directory_cache import DirectoryCache
+from utils.core.fingerprint import stat_signature
+
+log = get_logger()
+
+STAGING_PREFIX = ".building-"
+
+
+# Paths (relative to the game dir) whose size/mtime identify the game build.
+# The executable and the patcher's content manifest are rewritten by every
+# patch; the directory entries catch WADs being added or removed.
+GAME_BUILD_FILES = (
+    "League of Legends.exe",
+    "content-metadata.json",
+    "DATA/FINAL",
+    "DATA/FINAL/Champions",
+    "DATA/FINAL/Maps/Shipping",
+)
+# Top-level WADs are stat'ed individually: a WAD patched in place doesn't
+# touch its directory's mtime.
+GAME_BUILD_WAD_DIR = "DATA/FINAL"
+
+
+def game_build_fingerprint(game_dir: Optional[Path]) -> Optional[str]:
+    """Fingerprint the installed game build.
+
+    Covers the executable's size and mtime, the content manifest, the WAD
+    directories and the top-level WAD files. Returns None if the executable
+    is missing.
+    """
+    if game_dir is None:
+        return None
+    game_dir = Path(game_dir)
+    if stat_signature(game_dir / GAME_BUILD_FILES[0]) is None:
+        return None
+    parts = []
+    for rel in GAME_BUILD_FILES:
+        sig = stat_signature(game_dir / rel)
+        parts.append(f"{rel}={sig[0]}:{sig[1]}" if sig else f"{rel}=missing")
+    try:
+        with os.scandir(game_dir / GAME_BUILD_WAD_DIR) as it:
+            wads = sorted(
+                (entry.name, entry.stat()) for entry in it
+                if entry.is_file() and entry.name.lower().endswith(".wad.client")
+            )
+        for name, st in wads:
+            parts.append(f"{GAME_BUILD_WAD_DIR}/{name}={st.st_size}:{st.st_mtime_ns}")
+    except OSError:
+        pass
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+
+class OverlayCache(DirectoryCache):
+    """Persistent LRU cache of mkoverlay output directories"""
+
+    STAGING_PREFIX = STAGING_PREFIX
+    LOG_TAG = "OVERLAY_CACHE"
+    ENTRY_NOUN = "overlay(s)"
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(mod_fingerprints: Iterable[Optional[str]], game_fingerprint: Optional[str], tools_fingerprint: Optional[str], flags: Iterable[str] = ()) -> Optional[str]:
+        """Build a cache key, or None if any component is unknown.
+
+        Mod order is kept: with --ignoreConflict the first mod wins a
+        conflict, so the same set in another order is a different overlay.
+        """
+        mod_fingerprints = list(mod_fingerprints)
+        if not mod_fingerprints or any(not fp for fp in mod_fingerprints):
+            return None
+        if not game_fingerprint or not tools_fingerprint:
+            return None
+        payload = json.dumps({
+            "mods": mod_fingerprints,
+            "game": game_fingerprint,
+            "tools": tools_fingerprint,
+            "flags": list(flags),
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:40]
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Return the cached overlay for *key* and mark it as recently used.
+
+        Runs while the game is suspended, so the LRU update stays in memory;
+        it is persisted by the next commit, eviction or ``flush()``.
+        """
+        if not self.enabled or not key:
+            return None
+        return self._touch(key)
+
+    def begin_build(self, key: str) -> Path:
+        """Return an empty staging directory for building the overlay of *key*."""
+        staging = self._staging_dir(key)
+        staging.mkdir(parents=True, exist_ok=True)
+        return staging
+
+    def commit_build(self, key: str, staging: Path, mod_names: List[str]) -> Path:
+        """Promote a successful staging build into the cache.
+
+        Returns the final entry directory. If the promote fails the staging
+        directory is returned unchanged so the caller can still run it.
+        """
+        size = _dir_size(staging)
+        try:
+            entry_dir = self._promote(key, staging, size, mods=list(mod_names))
+        except OSError as e:
+            log.warning(f"[OVERLAY_CACHE] Failed to store overlay {key[:12]}: {e}")
+            return staging
+        log.debug(f"[OVERLAY_CACHE] Stored overlay {key[:12]} ({size / (1024 * 1024):.1f} MB)")
+        self.evict()
+        return entry_dir
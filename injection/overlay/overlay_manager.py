@@ -15,7 +15,7 @@ import subprocess
 import threading
 import time
 from pathlib import Path
-from typing import List, Optional, Callable
+from typing import Callable, Dict, List, Optional, Tuple
 
 # Import psutil with fallback for development environments
 try:
@@ -27,24 +27,38 @@ except ImportError:
 
 from utils.core.logging import get_logger, log_action, log_success, log_event
 from utils.core.issue_reporter import report_issue
+from utils.core.fingerprint import source_fingerprint, stat_signature
 from config import (
     PROCESS_TERMINATE_TIMEOUT_S,
     PROCESS_MONITOR_SLEEP_S,
     ENABLE_PRIORITY_BOOST
 )
 
+from .overlay_cache import OverlayCache, game_build_fingerprint
+
 log = get_logger()
 
+# mkoverlay flags (part of the overlay cache key)
+MKOVERLAY_FLAGS = ("--noTFT", "--ignoreConflict")
+MKOVERLAY_CANCELLED = 130  # Return code when a build was cancelled
+BUILD_WAIT_POLL_S = 0.05   # How often wait_for_build re-checks stop_callback
+BUILD_CANCEL_GRACE_S = 2.0  # How long to wait for a cancelled build to kill mkoverlay
+
 
 class OverlayManager:
     """Manages overlay creation and execution"""
     
-    def __init__(self, tools_dir: Path, mods_dir: Path, game_dir: Optional[Path], process_manager=None):
+    def __init__(self, tools_dir: Path, mods_dir: Path, game_dir: Optional[Path], process_manager=None, mod_manager=None, overlay_cache: Optional[OverlayCache] = None):
         self.tools_dir = tools_dir
         self.mods_dir = mods_dir
         self.game_dir = game_dir
         self.process_manager = process_manager
+        self.mod_manager = mod_manager  # Provides mod fingerprints for the overlay cache
+        self.overlay_cache = overlay_cache
         self.last_injection_timing = None
+        # In-flight overlay builds: cache key -> (done event, cancel event)
+        self._builds: Dict[str, Tuple[threading.Event, threading.Event]] = {}
+        self._builds_lock = threading.Lock()
     
     @property
     def current_overlay_process(self):
@@ -60,6 +74,9 @@ class OverlayManager:
     def mk_run_overlay(self, mod_names: List[str], timeout: int = 120, stop_callback: Optional[Callable] = None, injection_manager=None) -> int:
         """Create and run overlay
         
+        A cached overlay built from the same mods, game build and tools is
+        reused when available, skipping mkoverlay entirely.
+        
         Args:
             mod_names: List of mod names to inject
             timeout: Unused (kept for backward compatibility) - overlay runs until explicitly killed
@@ -71,28 +88,214 @@ class OverlayManager:
             log.error("[INJECTOR] Please ensure League Client is running or manually set the path in config.ini")
             return 127
         
+        exe = self._find_modtools()
+        if exe is None:
+            return 127
+        
+        gpath = str(self.game_dir)
+        
+        cache_key = self._overlay_cache_key(mod_names, exe)
+        if cache_key:
+            self.overlay_cache.pin(cache_key)
+            # A speculative build of this exact overlay may be about to finish
+            self.wait_for_build(cache_key, timeout, stop_callback)
+        try:
+            overlay_dir = self.overlay_cache.lookup(cache_key) if cache_key else None
+            if overlay_dir is not None:
+                log_success(log, f"Overlay cache hit ({cache_key[:12]}) - skipping mkoverlay", "⚡")
+                self.last_injection_timing = {
+                    'mkoverlay_duration': 0.0,
+                    'overlay_cache_hit': True,
+                    'timestamp': time.time()
+                }
+            else:
+                if cache_key:
+                    # Build into a staging slot, promoted into the cache on success
+                    overlay_dir = self.overlay_cache.begin_build(cache_key)
+                else:
+                    # Use overlay directory (should already be clean from _clean_overlay_dir)
+                    overlay_dir = self.mods_dir.parent / "overlay"
+                    overlay_dir.mkdir(parents=True, exist_ok=True)
+                
+                result = self._run_mkoverlay(exe, overlay_dir, mod_names, gpath, timeout)
+                if result != 0:
+                    if cache_key:
+                        self.overlay_cache.discard_build(overlay_dir)
+                    return result
+                
+                if cache_key:
+                    overlay_dir = self.overlay_cache.commit_build(cache_key, overlay_dir, mod_names)
+            
+            return self._run_overlay(exe, overlay_dir, gpath, stop_callback, injection_manager)
+        finally:
+            if cache_key:
+                self.overlay_cache.unpin(cache_key)
+    
+    def run_cached_overlay(self, cache_key: str, stop_callback: Optional[Callable] = None, injection_manager=None) -> Optional[int]:
+        """Run a ready overlay straight from the cache.
+        
+        Returns None if no overlay is cached for cache_key (caller should build
+        one), otherwise the runoverlay result.
+        """
+        if self.game_dir is None or self.overlay_cache is None or not cache_key:
+            return None
+        exe = self._find_modtools()
+        if exe is None:
+            return None
+        self.overlay_cache.pin(cache_key)
+        try:
+            overlay_dir = self.overlay_cache.lookup(cache_key)
+            if overlay_dir is None:
+                return None
+            log_success(log, f"Overlay ready ({cache_key[:12]}) - skipping extraction and mkoverlay", "⚡")
+            self.last_injection_timing = {
+                'mkoverlay_duration': 0.0,
+                'overlay_cache_hit': True,
+                'timestamp': time.time()
+            }
+            return self._run_overlay(exe, overlay_dir, str(self.game_dir), stop_callback, injection_manager)
+        finally:
+            self.overlay_cache.unpin(cache_key)
+    
+    def build_overlay(self, mod_names: List[str], mods_dir: Path, cache_key: str, cancel_event: Optional[threading.Event] = None, timeout: int = 120) -> bool:
+        """Build an overlay into the cache without running it (speculative pre-build).
+        
+        Args:
+            mod_names: Mod folder names inside mods_dir
+            mods_dir: Directory holding the extracted mods (may differ from the live mods dir)
+            cache_key: Key the overlay is stored under (see overlay_cache_key_for_sources)
+            cancel_event: Set to abort the build (kills mkoverlay)
+            timeout: mkoverlay timeout in seconds
+        
+        Returns:
+            True if the overlay is in the cache afterwards
+        """
+        if self.game_dir is None or self.overlay_cache is None or not self.overlay_cache.enabled or not cache_key:
+            return False
+        exe = self._find_modtools()
+        if exe is None:
+            return False
+        
+        with self._builds_lock:
+            if cache_key in self._builds:
+                return False  # Already being built
+            done = threading.Event()
+            self._builds[cache_key] = (done, cancel_event or threading.Event())
+            cancel_event = self._builds[cache_key][1]
+        
+        self.overlay_cache.pin(cache_key)
+        try:
+            if self.overlay_cache.lookup(cache_key) is not None:
+                return True
+            staging = self.overlay_cache.begin_build(cache_key)
+            result = self._run_mkoverlay(exe, staging, mod_names, str(self.game_dir), timeout, mods_dir=mods_dir, cancel_event=cancel_event, speculative=True)
+            if result != 0:
+                self.overlay_cache.discard_build(staging)
+                return False
+            self.overlay_cache.commit_build(cache_key, staging, mod_names)
+            return True
+        finally:
+            self.overlay_cache.unpin(cache_key)
+            with self._builds_lock:
+                self._builds.pop(cache_key, None)
+            done.set()
+    
+    def wait_for_build(self, cache_key: str, timeout: float, stop_callback: Optional[Callable] = None) -> bool:
+        """Wait for an in-flight build of cache_key to finish.
+        
+        Returns True once no build of cache_key is running (none was, or it
+        finished). If timeout runs out or stop_callback reports the game
+        ended first, the build is cancelled and False is returned so the
+        caller doesn't build the same overlay twice in parallel.
+        """
+        with self._builds_lock:
+            build = self._builds.get(cache_key)
+        if build is None:
+            return True
+        done, cancel_event = build
+        log.info(f"[INJECT] Waiting for in-flight overlay build ({cache_key[:12]})")
+        deadline = time.monotonic() + max(0.0, timeout)
+        while not done.wait(min(BUILD_WAIT_POLL_S, max(0.0, deadline - time.monotonic()))):
+            if stop_callback and stop_callback():
+                log.info(f"[INJECT] Game ended while waiting for overlay build ({cache_key[:12]}) - cancelling it")
+                break
+            if time.monotonic() >= deadline:
+                log.warning(f"[INJECT] In-flight overlay build ({cache_key[:12]}) did not finish in {timeout:.1f}s - cancelling it")
+                break
+        else:
+            return True
+        cancel_event.set()
+        done.wait(BUILD_CANCEL_GRACE_S)
+        return False
+    
+    def cancel_builds(self, keep: Optional[str] = None) -> None:
+        """Cancel in-flight speculative builds, except the one for keep"""
+        with self._builds_lock:
+            for key, (_done, cancel_event) in self._builds.items():
+                if key != keep:
+                    cancel_event.set()
+    
+    def overlay_cache_key_for_sources(self, sources: List[Path]) -> Optional[str]:
+        """Overlay cache key for mods placed from these archives/folders (in order)"""
+        if self.overlay_cache is None or not self.overlay_cache.enabled:
+            return None
+        exe = self._find_modtools(quiet=True)
+        if exe is None:
+            return None
+        try:
+            return self._key_from_fingerprints([source_fingerprint(src) for src in sources], exe)
+        except Exception as e:
+            log.debug(f"[INJECT] Could not compute overlay cache key: {e}")
+            return None
+    
+    def _find_modtools(self, quiet: bool = False) -> Optional[Path]:
+        """Locate mod-tools.exe in the tools directory"""
         from ..tools.tools_manager import ToolsManager
         tools_manager = ToolsManager(self.tools_dir)
         tools = tools_manager.detect_tools()
         exe = tools.get("modtools")
         if not exe or not exe.exists():
-            log.error(f"[INJECTOR] Missing mod-tools.exe in {self.tools_dir}")
-            return 127
-        
-        # Use overlay directory (should already be clean from _clean_overlay_dir)
-        overlay_dir = self.mods_dir.parent / "overlay"
-        overlay_dir.mkdir(parents=True, exist_ok=True)
+            if not quiet:
+                log.error(f"[INJECTOR] Missing mod-tools.exe in {self.tools_dir}")
+            return None
+        return exe
+    
+    def _overlay_cache_key(self, mod_names: List[str], exe: Path) -> Optional[str]:
+        """Compute the overlay cache key for a mod set, or None if caching isn't possible"""
+        if self.overlay_cache is None or not self.overlay_cache.enabled or self.mod_manager is None:
+            return None
+        try:
+            return self._key_from_fingerprints([self.mod_manager.mod_fingerprint(name) for name in mod_names], exe)
+        except Exception as e:
+            log.debug(f"[INJECT] Could not compute overlay cache key: {e}")
+            return None
+    
+    def _key_from_fingerprints(self, mod_fingerprints: List[Optional[str]], exe: Path) -> Optional[str]:
+        tools_sig = stat_signature(exe)
+        tools_fingerprint = f"{tools_sig[0]}:{tools_sig[1]}" if tools_sig else None
+        return OverlayCache.make_key(
+            mod_fingerprints,
+            game_build_fingerprint(self.game_dir),
+            tools_fingerprint,
+            MKOVERLAY_FLAGS,
+        )
+    
+    def _run_mkoverlay(self, exe: Path, overlay_dir: Path, mod_names: List[str], gpath: str, timeout: int, mods_dir: Optional[Path] = None, cancel_event: Optional[threading.Event] = None, speculative: bool = False) -> int:
+        """Run mkoverlay into overlay_dir. Returns 0 on success, else an error code.
         
+        Speculative builds run at normal priority, don't report issues and
+        don't touch last_injection_timing.
+        """
         names_str = "/".join(mod_names)
-        gpath = str(self.game_dir)
+        mods_dir = mods_dir or self.mods_dir
+        tag = "speculative mkoverlay" if speculative else "mkoverlay"
 
         # Create overlay (this is the actual injection work)
         # Based on CSLOL source: flags.contains("--ignoreConflict") in main_mod_tools.cpp:332
         # Documentation: mod-tools.md shows --ignoreConflict flag (camelCase, no --opts: prefix)
         cmd = [
-            str(exe), "mkoverlay", str(self.mods_dir), str(overlay_dir),
-            f"--game:{gpath}", f"--mods:{names_str}", "--noTFT",
-            "--ignoreConflict"
+            str(exe), "mkoverlay", str(mods_dir), str(overlay_dir),
+            f"--game:{gpath}", f"--mods:{names_str}", *MKOVERLAY_FLAGS
         ]
         
         log.debug(f"[INJECT] Creating overlay: {' '.join(cmd)}")
@@ -108,7 +311,7 @@ class OverlayManager:
             proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, creationflags=creationflags, text=True, bufsize=1)
             
             # Boost process priority to maximize CPU contention if enabled
-            if ENABLE_PRIORITY_BOOST and PSUTIL_AVAILABLE:
+            if ENABLE_PRIORITY_BOOST and PSUTIL_AVAILABLE and not speculative:
                 try:
                     p = psutil.Process(proc.pid)
                     p.nice(psutil.HIGH_PRIORITY_CLASS)
@@ -138,7 +341,9 @@ class OverlayManager:
             stderr_thread.start()
             
             try:
-                proc.wait(timeout=timeout)
+                if self._wait_mkoverlay(proc, timeout, cancel_event):
+                    log.info(f"[INJECT] {tag} cancelled")
+                    return MKOVERLAY_CANCELLED
                 # Give threads a moment to finish reading
                 stdout_thread.join(timeout=1.0)
                 stderr_thread.join(timeout=1.0)
@@ -157,20 +362,28 @@ class OverlayManager:
             mkoverlay_duration = time.time() - mkoverlay_start
             
             if proc.returncode != 0:
-                log.error(f"[INJECT] mkoverlay failed with return code: {proc.returncode}")
+                log.error(f"[INJECT] {tag} failed with return code: {proc.returncode}")
                 return proc.returncode
+            elif speculative:
+                log.info(f"[INJECT] {tag} completed in {mkoverlay_duration:.2f}s")
+                return 0
             else:
                 log_success(log, f"mkoverlay completed in {mkoverlay_duration:.2f}s", "⚡")
                 # Store timing data for external access
                 self.last_injection_timing = {
                     'mkoverlay_duration': mkoverlay_duration,
+                    'overlay_cache_hit': False,
                     'timestamp': time.time()
                 }
                 
                 # DON'T resume game yet - keep it frozen until runoverlay starts
                 log_event(log, "mkoverlay done - keeping game frozen until runoverlay starts", "❄️")
+                return 0
                 
         except subprocess.TimeoutExpired:
+            if speculative:
+                log.warning(f"[INJECT] {tag} timeout")
+                return 124
             log.error("[INJECT] mkoverlay timeout - monitor will auto-resume if needed")
             report_issue(
                 "MKOVERLAY_TIMEOUT",
@@ -181,6 +394,9 @@ class OverlayManager:
             )
             return 124
         except Exception as e:
+            if speculative:
+                log.warning(f"[INJECT] {tag} error: {e}")
+                return 1
             log.error(f"[INJECT] mkoverlay error: {e} - monitor will auto-resume if needed")
             report_issue(
                 "MKOVERLAY_ERROR",
@@ -190,8 +406,31 @@ class OverlayManager:
                 hint="Check Rose logs for details, then retry.",
             )
             return 1
-
-        # Run overlay
+    
+    @staticmethod
+    def _wait_mkoverlay(proc: subprocess.Popen, timeout: float, cancel_event: Optional[threading.Event]) -> bool:
+        """Wait for mkoverlay to exit. Returns True if it was killed because of cancel_event.
+        
+        Raises subprocess.TimeoutExpired if it runs past timeout.
+        """
+        if cancel_event is None:
+            proc.wait(timeout=timeout)
+            return False
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                proc.wait(timeout=0.05)
+                return False
+            except subprocess.TimeoutExpired:
+                if cancel_event.is_set():
+                    proc.kill()
+                    proc.wait()
+                    return True
+                if time.monotonic() >= deadline:
+                    raise
+    
+    def _run_overlay(self, exe: Path, overlay_dir: Path, gpath: str, stop_callback: Optional[Callable] = None, injection_manager=None) -> int:
+        """Run runoverlay from overlay_dir and monitor it until it exits or the game ends"""
         cfg = overlay_dir / "cslol-config.json"
         cmd = [
             str(exe), "runoverlay", str(overlay_dir), str(cfg),
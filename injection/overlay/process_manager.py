@@ -18,6 +18,7 @@ except ImportError:
     psutil = None
 
 from utils.core.logging import get_logger
+from utils.system.process_watcher import get_process_watcher
 from config import (
     PROCESS_TERMINATE_TIMEOUT_S,
     PROCESS_TERMINATE_WAIT_S,
@@ -26,6 +27,8 @@ from config import (
 
 log = get_logger()
 
+MODTOOLS_PROCESS_NAME = "mod-tools.exe"
+
 
 class ProcessManager:
     """Manages overlay process lifecycle"""
@@ -66,26 +69,23 @@ class ProcessManager:
                 log.debug("[INJECT] psutil not available, skipping process cleanup")
                 return
                 
-            for proc in psutil.process_iter(['pid', 'name']):
+            # The shared watcher only looks up PIDs it hasn't seen yet
+            for proc in get_process_watcher().find(MODTOOLS_PROCESS_NAME):
                 # Check timeout to prevent indefinite hangs
                 if time.time() - start_time > timeout:
                     log.warning(f"[INJECT] Process enumeration timeout after {timeout}s - some processes may not be killed")
                     break
                 
                 try:
-                    # Skip if not mod-tools.exe (avoid expensive cmdline check on unrelated processes)
-                    if proc.info.get('name') != 'mod-tools.exe':
-                        continue
-                    
                     # Only fetch cmdline for mod-tools.exe processes with a timeout
                     try:
                         # Create Process object for cmdline access
-                        p = psutil.Process(proc.info['pid'])
+                        p = psutil.Process(proc.pid)
                         # Use a short timeout on cmdline() to prevent hanging
                         cmdline = p.cmdline()
                         
                         if cmdline and any('runoverlay' in arg for arg in cmdline):
-                            log.info(f"[INJECT] Killing runoverlay process PID {proc.info['pid']}")
+                            log.info(f"[INJECT] Killing runoverlay process PID {proc.pid}")
                             try:
                                 # Try graceful termination first
                                 p.terminate()
@@ -104,7 +104,7 @@ class ProcessManager:
                                     log.debug(f"[INJECT] Unexpected error force killing process: {kill_e}")
                             killed_count += 1
                     except psutil.TimeoutExpired:
-                        log.debug(f"[INJECT] Timeout fetching cmdline for PID {proc.info['pid']}")
+                        log.debug(f"[INJECT] Timeout fetching cmdline for PID {proc.pid}")
                         continue
                     
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
@@ -112,7 +112,7 @@ class ProcessManager:
                     pass
                 except Exception as e:
                     # Log but continue with other processes
-                    log.debug(f"[INJECT] Error processing PID {proc.info.get('pid', '?')}: {e}")
+                    log.debug(f"[INJECT] Error processing PID {proc.pid}: {e}")
             
             if killed_count > 0:
                 log.info(f"[INJECT] Killed {killed_count} runoverlay process(es)")
@@ -139,22 +139,18 @@ class ProcessManager:
                 log.debug("[INJECT] psutil not available, skipping mod-tools cleanup")
                 return
             
-            for proc in psutil.process_iter(['pid', 'name']):
+            for proc in get_process_watcher().find(MODTOOLS_PROCESS_NAME):
                 # Check timeout to prevent indefinite hangs
                 if time.time() - start_time > timeout:
                     log.warning(f"[INJECT] Process enumeration timeout after {timeout}s - some processes may not be killed")
                     break
                 
                 try:
-                    # Only kill mod-tools.exe processes
-                    if proc.info.get('name') != 'mod-tools.exe':
-                        continue
-                    
                     # Kill all mod-tools.exe processes regardless of command
-                    log.info(f"[INJECT] Killing mod-tools.exe process PID {proc.info['pid']}")
+                    log.info(f"[INJECT] Killing mod-tools.exe process PID {proc.pid}")
                     try:
                         # Create Process object
-                        p = psutil.Process(proc.info['pid'])
+                        p = psutil.Process(proc.pid)
                         # Try graceful termination first
                         p.terminate()
                         # Give it a brief moment, then force kill if needed
@@ -177,7 +173,7 @@ class ProcessManager:
                     pass
                 except Exception as e:
                     # Log but continue with other processes
-                    log.debug(f"[INJECT] Error processing PID {proc.info.get('pid', '?')}: {e}")
+                    log.debug(f"[INJECT] Error processing PID {proc.pid}: {e}")
             
             if killed_count > 0:
                 log.info(f"[INJECT] Killed {killed_count} mod-tools.exe process(es)")
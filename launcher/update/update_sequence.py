@@ -11,7 +11,7 @@ import sys
 from pathlib import Path
 from typing import Callable, Optional
 
-from config import APP_VERSION, get_config_file_path
+from config import APP_VERSION, flush_config, get_config_file_path
 from utils.core.logging import get_logger, get_named_logger
 
 from .github_client import GitHubClient
@@ -131,7 +131,9 @@ class UpdateSequence:
         download_url = asset.get("browser_download_url")
         total_size = asset.get("size", 0) or None
         
-        # Check installed version
+        # Check installed version (this reads and fsyncs config.ini itself, so
+        # settings still queued in the config store go to disk first)
+        flush_config()
         config_path = get_config_file_path()
         config = configparser.ConfigParser()
         if config_path.exists():
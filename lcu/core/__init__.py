@@ -8,15 +8,23 @@ Contains core connection, API, and lockfile functionality
 from .client import LCU
 from .lcu_connection import LCUConnection
 from .lcu_api import LCUAPI
-from .lockfile import Lockfile, find_lockfile, parse_lockfile, SWIFTPLAY_MODES
+from .async_client import AsyncLCUClient, LCUHttpClient
+from .lockfile import Lockfile, LockfileLocator, find_lockfile, get_lockfile_locator, parse_lockfile, SWIFTPLAY_MODES
+from .state_store import LCUStateStore, LCUSnapshot
 
 __all__ = [
     'LCU',
     'LCUConnection',
     'LCUAPI',
+    'AsyncLCUClient',
+    'LCUHttpClient',
     'Lockfile',
+    'LockfileLocator',
     'find_lockfile',
+    'get_lockfile_locator',
     'parse_lockfile',
     'SWIFTPLAY_MODES',
+    'LCUStateStore',
+    'LCUSnapshot',
 ]
 
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Async LCU Client
+asyncio HTTP/1.1 client for LCU GET requests, with a sync facade for callers
+on regular threads.
+
+- Keep-alive connection pool (one TLS handshake per connection, not per request)
+- Single-flight: identical GETs in flight at the same time share one request
+- Micro-cache: a GET answered within the last few milliseconds is reused
+- Per-endpoint latency histograms
+
+The LCU only speaks plain HTTP/1.1 over TLS on localhost, so a minimal client
+on asyncio streams is enough and keeps the dependency list unchanged.
+"""
+
+import asyncio
+import base64
+import concurrent.futures
+import json
+import re
+import ssl
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import LCU_GET_CACHE_TTL_S, LCU_HTTP_POOL_SIZE
+from utils.core.latency import LatencyHistogram
+from utils.core.logging import get_logger
+
+log = get_logger()
+
+_ID_SEGMENT_RE = re.compile(r"(?<=/)\d+(?=\.json$|/|$)")
+
+
+def endpoint_key(path: str) -> str:
+    """Path with query and numeric ids stripped, for per-endpoint stats"""
+    return _ID_SEGMENT_RE.sub("{id}", path.split("?", 1)[0])
+
+
+class EndpointLatency(LatencyHistogram):
+    """Latency histogram of one endpoint, plus the GETs that skipped the wire"""
+
+    def __init__(self):
+        super().__init__()
+        self.coalesced = 0   # Requests served by joining an in-flight GET
+        self.cached = 0      # Requests served from the micro-cache
+
+    def summary(self) -> Dict[str, Any]:
+        summary = super().summary()
+        summary["coalesced"] = self.coalesced
+        summary["cached"] = self.cached
+        return summary
+
+
+class _PooledConnection:
+    """One keep-alive TLS connection to the LCU"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, key: Tuple):
+        self.reader = reader
+        self.writer = writer
+        self.key = key
+
+    def usable(self, key: Tuple) -> bool:
+        return self.key == key and not self.writer.is_closing() and not self.reader.at_eof()
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class LCUHTTPError(Exception):
+    """Transport-level failure talking to the LCU"""
+
+
+class AsyncLCUClient:
+    """asyncio LCU GET client (must be used from a single event loop)"""
+
+    def __init__(self, connection, pool_size: int = LCU_HTTP_POOL_SIZE, cache_ttl_s: float = LCU_GET_CACHE_TTL_S):
+        """Initialize client
+
+        Args:
+            connection: LCUConnection instance (port/password/ok, refresh_if_needed)
+            pool_size: Maximum concurrent connections to the LCU
+            cache_ttl_s: How long a GET result is reused (0 disables the micro-cache)
+        """
+        self.connection = connection
+        self.pool_size = max(1, int(pool_size))
+        self.cache_ttl_s = cache_ttl_s
+
+        self._ssl = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        # Self-signed LCU certificate on localhost - see LCUConnection._init_from_lockfile()
+        self._ssl.check_hostname = False
+        self._ssl.verify_mode = ssl.CERT_NONE
+
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: List[_PooledConnection] = []
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._cache: Dict[str, Tuple[float, int, Any]] = {}   # path -> (time, generation, value)
+        self._generation = 0
+        self._stats: Dict[str, EndpointLatency] = {}
+        self._stats_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get(self, path: str, timeout: float = 1.0) -> Any:
+        """GET *path* and decode JSON (None on 404/405, errors or no LCU)"""
+        generation = self._generation
+        cached = self._cache.get(path)
+        if cached is not None and cached[1] == generation and time.monotonic() - cached[0] < self.cache_ttl_s:
+            self._histogram(path).cached += 1
+            return cached[2]
+
+        key = (path, generation)
+        future = self._inflight.get(key)
+        if future is not None:
+            self._histogram(path).coalesced += 1
+        else:
+            future = asyncio.ensure_future(self._get_uncached(path, timeout, generation))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _f: self._inflight.pop(key, None))
+        try:
+            # Shield: a caller timing out must not cancel the request others share
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def invalidate(self) -> None:
+        """Forget cached GETs (call after any write). Safe from any thread."""
+        self._generation += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Latency summary per endpoint"""
+        with self._stats_lock:
+            return {endpoint: h.summary() for endpoint, h in sorted(self._stats.items())}
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    async def _get_uncached(self, path: str, timeout: float, generation: int) -> Any:
+        started = time.perf_counter()
+        try:
+            status, body = await asyncio.wait_for(self._request_with_retry("GET", path), timeout)
+        except (LCUHTTPError, asyncio.TimeoutError) as e:
+            log.debug(f"[LCU] GET {path} failed: {e}")
+            self._histogram(path).errors += 1
+            return None
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self._histogram(path).record(elapsed_ms)
+
+        if status is None or status >= 400:  # 404/405: resource absent in this phase
+            value = None
+        else:
+            try:
+                value = json.loads(body) if body else None
+            except ValueError as e:
+                log.debug(f"Failed to decode JSON response: {e}")
+                value = None
+        if generation == self._generation and self.cache_ttl_s > 0:
+            self._cache[path] = (time.monotonic(), generation, value)
+        return value
+
+    async def _request_with_retry(self, method: str, path: str) -> Tuple[Optional[int], bytes]:
+        """Send a request; on transport errors re-read the lockfile and retry once"""
+        if not self.connection.ok:
+            await self._refresh_connection()
+            if not self.connection.ok:
+                return None, b""
+        try:
+            return await self._request(method, path)
+        except LCUHTTPError as e:
+            log.debug(f"[LCU] {method} {path} transport error, refreshing connection: {e}")
+        await self._refresh_connection()
+        if not self.connection.ok:
+            return None, b""
+        return await self._request(method, path)
+
+    async def _refresh_connection(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.connection.refresh_if_needed)
+
+    async def _request(self, method: str, path: str) -> Tuple[int, bytes]:
+        """One request on a pooled connection (a stale keep-alive is retried fresh)"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        key = (self.connection.port, self.connection.pw)
+        async with self._slots:
+            conn, reused = await self._acquire(key)
+            try:
+                status, body, keep_alive = await self._roundtrip(conn, method, path)
+            except (OSError, asyncio.IncompleteReadError, LCUHTTPError) as e:
+                conn.close()
+                if not reused:
+                    raise LCUHTTPError(str(e) or type(e).__name__) from e
+                # The LCU closed an idle keep-alive connection: try once on a new one
+                conn = await self._open(key)
+                try:
+                    status, body, keep_alive = await self._roundtrip(conn, method, path)
+                except (OSError, asyncio.IncompleteReadError, LCUHTTPError) as e2:
+                    conn.close()
+                    raise LCUHTTPError(str(e2) or type(e2).__name__) from e2
+                except BaseException:
+                    conn.close()
+                    raise
+            except BaseException:
+                # Cancelled/timed out mid-response: the connection state is unknown
+                conn.close()
+                raise
+            if keep_alive and len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+            else:
+                conn.close()
+            return status, body
+
+    async def _acquire(self, key: Tuple) -> Tuple[_PooledConnection, bool]:
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.usable(key):
+                return conn, True
+            conn.close()
+        return await self._open(key), False
+
+    async def _open(self, key: Tuple) -> _PooledConnection:
+        port, _pw = key
+        if not port:
+            raise LCUHTTPError("LCU port unknown")
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", int(port), ssl=self._ssl)
+        except OSError as e:
+            raise LCUHTTPError(f"connect failed: {e}") from e
+        return _PooledConnection(reader, writer, key)
+
+    async def _roundtrip(self, conn: _PooledConnection, method: str, path: str) -> Tuple[int, bytes, bool]:
+        port, pw = conn.key
+        token = base64.b64encode(f"riot:{pw}".encode("utf-8")).decode("ascii")
+        request = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: 127.0.0.1:{port}\r\n"
+            f"Authorization: Basic {token}\r\n"
+            "Accept: application/json\r\n"
+            "Connection: keep-alive\r\n"
+            "\r\n"
+        )
+        conn.writer.write(request.encode("latin-1"))
+        await conn.writer.drain()
+
+        reader = conn.reader
+        status_line = await reader.readline()
+        if not status_line:
+            raise LCUHTTPError("connection closed before response")
+        try:
+            status = int(status_line.split(b" ", 2)[1])
+        except (IndexError, ValueError):
+            raise LCUHTTPError(f"bad status line {status_line[:60]!r}")
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get("connection", "").lower() != "close"
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            body = await self._read_chunked(reader)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return status, body, keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        parts = []
+        while True:
+            size_line = await reader.readline()
+            try:
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise LCUHTTPError(f"bad chunk size {size_line[:20]!r}")
+            if size == 0:
+                # Trailer headers until the blank line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(parts)
+            parts.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    def _histogram(self, path: str) -> EndpointLatency:
+        """Histogram for *path*'s endpoint (only updated from the loop thread)"""
+        endpoint = endpoint_key(path)
+        with self._stats_lock:
+            histogram = self._stats.get(endpoint)
+            if histogram is None:
+                histogram = self._stats[endpoint] = EndpointLatency()
+            return histogram
+
+
+class LCUHttpClient:
+    """Sync facade: runs an AsyncLCUClient on a private event loop thread"""
+
+    def __init__(self, connection, pool_size: int = LCU_HTTP_POOL_SIZE, cache_ttl_s: float = LCU_GET_CACHE_TTL_S):
+        self.client = AsyncLCUClient(connection, pool_size, cache_ttl_s)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="LCUHttpLoop", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def get(self, path: str, timeout: float = 1.0) -> Any:
+        """Blocking GET (same contract as LCUAPI.get)"""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("LCUHttpClient.get called from its own event loop; await client.get instead")
+        future = asyncio.run_coroutine_threadsafe(self.client.get(path, timeout), self._loop)
+        try:
+            # The coroutine enforces *timeout* itself; the margin covers a lockfile refresh
+            return future.result(timeout + 2.0)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return None
+
+    def invalidate(self) -> None:
+        self.client.invalidate()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return self.client.stats()
+
+    def close(self) -> None:
+        """Close pooled connections and stop the loop thread"""
+        if not self._loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.client.close(), self._loop).result(2.0)
+        except Exception as e:
+            log.debug(f"[LCU] Failed to close HTTP pool: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
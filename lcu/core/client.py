@@ -9,6 +9,8 @@ from typing import Optional
 
 from .lcu_connection import LCUConnection
 from .lcu_api import LCUAPI
+from .lockfile import LOCKFILE_DISCONNECTED
+from .state_store import LCUStateStore
 from ..features.lcu_properties import LCUProperties
 from ..features.lcu_skin_selection import LCUSkinSelection
 from ..features.lcu_game_mode import LCUGameMode
@@ -31,13 +33,25 @@ class LCU:
         # Initialize API handler
         self._api = LCUAPI(self._connection)
         
+        # Event-fed cache for phase/session/hover/lobby (fed by the WebSocket thread)
+        self._state_store = LCUStateStore(self._api.get)
+        
+        # Client closed: drop cached state right away instead of waiting for the socket to time out
+        self._connection.locator.subscribe(self._on_lockfile_event)
+        
         # Initialize property handlers
-        self._properties = LCUProperties(self._api)
+        self._properties = LCUProperties(self._api, self._state_store)
         self._skin_selection = LCUSkinSelection(self._api, self._connection)
         self._game_mode = LCUGameMode(self._properties)
         self._swiftplay = LCUSwiftplay(self._api, self._game_mode)
         self._party_chat = LCUPartyChat(self._api)
     
+    def _on_lockfile_event(self, event: str, lockfile) -> None:
+        """Lockfile locator callback"""
+        if event == LOCKFILE_DISCONNECTED:
+            self._state_store.set_live(False)
+            self._api.http.invalidate()
+    
     # Connection properties (delegated to connection)
     @property
     def ok(self) -> bool:
@@ -64,6 +78,11 @@ class LCU:
         """Get requests session (for backward compatibility)"""
         return self._connection.session
     
+    @property
+    def state_store(self) -> LCUStateStore:
+        """Get the WebSocket-fed state store"""
+        return self._state_store
+    
     def refresh_if_needed(self, force: bool = False):
         """Refresh connection if needed"""
         self._connection.refresh_if_needed(force)
@@ -72,6 +91,10 @@ class LCU:
         """Make GET request to LCU API"""
         return self._api.get(path, timeout)
     
+    def latency_stats(self) -> dict:
+        """Per-endpoint GET latency summary"""
+        return self._api.latency_stats()
+    
     # Properties (delegated to properties handler)
     @property
     def phase(self) -> Optional[str]:
@@ -5,6 +5,7 @@ LCU API Request Handler
 Handles HTTP requests to LCU API
 """
 
+from contextlib import contextmanager
 from typing import Optional
 
 import time
@@ -12,6 +13,8 @@ import requests
 
 from utils.core.logging import get_logger
 
+from .async_client import LCUHttpClient
+
 log = get_logger()
 
 
@@ -25,6 +28,8 @@ class LCUAPI:
             connection: LCUConnection instance
         """
         self.connection = connection
+        # Pooled, coalescing GET client on its own event loop
+        self.http = LCUHttpClient(connection)
     
     def get(self, path: str, timeout: float = 1.0) -> Optional[dict]:
         """Make GET request to LCU API
@@ -36,6 +41,32 @@ class LCUAPI:
         Returns:
             JSON response as dict, or None if failed
         """
+        try:
+            return self.http.get(path, timeout)
+        except Exception as e:
+            log.debug(f"[LCU] Pooled GET {path} failed ({type(e).__name__}: {e}), using blocking request")
+            return self._get_blocking(path, timeout)
+    
+    @contextmanager
+    def _write(self):
+        """Drop cached GETs around a write.
+
+        Before it is sent, and again once it returns: a GET that started
+        while the write was in flight may have read the old state, and must
+        not stay cached under the new generation.
+        """
+        self.http.invalidate()
+        try:
+            yield
+        finally:
+            self.http.invalidate()
+    
+    def latency_stats(self) -> dict:
+        """Per-endpoint GET latency summary (requests, coalesced, cached, p50/p95/p99)"""
+        return self.http.stats()
+    
+    def _get_blocking(self, path: str, timeout: float) -> Optional[dict]:
+        """GET through the requests session (fallback for the pooled client)"""
         if not self.connection.ok:
             self.connection.refresh_if_needed()
             if not self.connection.ok: 
@@ -85,24 +116,7 @@ class LCUAPI:
                 return None
 
         url = (self.connection.base or "") + path
-
-        try:
-            t0 = time.perf_counter()
-            resp = self.connection.session.put(
-                url,
-                json=json_data,
-                timeout=timeout,
-                headers=headers,
-            )
-            dt_ms = (time.perf_counter() - t0) * 1000.0
-            log.info(f"[LCU] PUT {path} -> {getattr(resp, 'status_code', 'None')} in {dt_ms:.1f}ms")
-            return resp
-        except Exception as exc:
-            log.warning(f"[LCU] PUT {path} failed ({type(exc).__name__}): {exc}")
-            self.connection.refresh_if_needed(force=True)
-            if not self.connection.ok:
-                log.warning(f"[LCU] PUT {path} - connection lost after refresh")
-                return None
+        with self._write():
             try:
                 t0 = time.perf_counter()
                 resp = self.connection.session.put(
@@ -112,11 +126,28 @@ class LCUAPI:
                     headers=headers,
                 )
                 dt_ms = (time.perf_counter() - t0) * 1000.0
-                log.info(f"[LCU] PUT(retry) {path} -> {getattr(resp, 'status_code', 'None')} in {dt_ms:.1f}ms")
+                log.info(f"[LCU] PUT {path} -> {getattr(resp, 'status_code', 'None')} in {dt_ms:.1f}ms")
                 return resp
-            except Exception as exc2:
-                log.warning(f"[LCU] PUT(retry) {path} also failed ({type(exc2).__name__}): {exc2}")
-                return None
+            except Exception as exc:
+                log.warning(f"[LCU] PUT {path} failed ({type(exc).__name__}): {exc}")
+                self.connection.refresh_if_needed(force=True)
+                if not self.connection.ok:
+                    log.warning(f"[LCU] PUT {path} - connection lost after refresh")
+                    return None
+                try:
+                    t0 = time.perf_counter()
+                    resp = self.connection.session.put(
+                        url,
+                        json=json_data,
+                        timeout=timeout,
+                        headers=headers,
+                    )
+                    dt_ms = (time.perf_counter() - t0) * 1000.0
+                    log.info(f"[LCU] PUT(retry) {path} -> {getattr(resp, 'status_code', 'None')} in {dt_ms:.1f}ms")
+                    return resp
+                except Exception as exc2:
+                    log.warning(f"[LCU] PUT(retry) {path} also failed ({type(exc2).__name__}): {exc2}")
+                    return None
 
     def patch(self, path: str, json_data: dict, timeout: float) -> Optional[requests.Response]:
         """Make PATCH request to LCU API
@@ -134,23 +165,7 @@ class LCUAPI:
             if not self.connection.ok:
                 return None
         
-        try:
-            t0 = time.perf_counter()
-            resp = self.connection.session.patch(
-                (self.connection.base or "") + path,
-                json=json_data,
-                timeout=timeout,
-            )
-            dt_ms = (time.perf_counter() - t0) * 1000.0
-            try:
-                log.debug(f"[LCU] PATCH {path} -> {getattr(resp, 'status_code', 'None')} in {dt_ms:.1f}ms")
-            except Exception:
-                pass
-            return resp
-        except requests.exceptions.RequestException:
-            self.connection.refresh_if_needed(force=True)
-            if not self.connection.ok:
-                return None
+        with self._write():
             try:
                 t0 = time.perf_counter()
                 resp = self.connection.session.patch(
@@ -160,12 +175,29 @@ class LCUAPI:
                 )
                 dt_ms = (time.perf_counter() - t0) * 1000.0
                 try:
-                    log.debug(f"[LCU] PATCH(retry) {path} -> {getattr(resp, 'status_code', 'None')} in {dt_ms:.1f}ms")
+                    log.debug(f"[LCU] PATCH {path} -> {getattr(resp, 'status_code', 'None')} in {dt_ms:.1f}ms")
                 except Exception:
                     pass
                 return resp
             except requests.exceptions.RequestException:
-                return None
+                self.connection.refresh_if_needed(force=True)
+                if not self.connection.ok:
+                    return None
+                try:
+                    t0 = time.perf_counter()
+                    resp = self.connection.session.patch(
+                        (self.connection.base or "") + path,
+                        json=json_data,
+                        timeout=timeout,
+                    )
+                    dt_ms = (time.perf_counter() - t0) * 1000.0
+                    try:
+                        log.debug(f"[LCU] PATCH(retry) {path} -> {getattr(resp, 'status_code', 'None')} in {dt_ms:.1f}ms")
+                    except Exception:
+                        pass
+                    return resp
+                except requests.exceptions.RequestException:
+                    return None
 
     def post(self, path: str, json_data, timeout: float = 1.0) -> Optional[requests.Response]:
         """Make POST request to LCU API
@@ -184,29 +216,29 @@ class LCUAPI:
                 return None
 
         url = (self.connection.base or "") + path
-
-        try:
-            t0 = time.perf_counter()
-            resp = self.connection.session.post(
-                url,
-                json=json_data,
-                timeout=timeout,
-            )
-            dt_ms = (time.perf_counter() - t0) * 1000.0
-            log.debug(f"[LCU] POST {path} -> {getattr(resp, 'status_code', 'None')} in {dt_ms:.1f}ms")
-            return resp
-        except Exception as exc:
-            log.warning(f"[LCU] POST {path} failed ({type(exc).__name__}): {exc}")
-            self.connection.refresh_if_needed(force=True)
-            if not self.connection.ok:
-                return None
+        with self._write():
             try:
+                t0 = time.perf_counter()
                 resp = self.connection.session.post(
                     url,
                     json=json_data,
                     timeout=timeout,
                 )
+                dt_ms = (time.perf_counter() - t0) * 1000.0
+                log.debug(f"[LCU] POST {path} -> {getattr(resp, 'status_code', 'None')} in {dt_ms:.1f}ms")
                 return resp
-            except Exception as exc2:
-                log.warning(f"[LCU] POST(retry) {path} failed ({type(exc2).__name__}): {exc2}")
-                return None
+            except Exception as exc:
+                log.warning(f"[LCU] POST {path} failed ({type(exc).__name__}): {exc}")
+                self.connection.refresh_if_needed(force=True)
+                if not self.connection.ok:
+                    return None
+                try:
+                    resp = self.connection.session.post(
+                        url,
+                        json=json_data,
+                        timeout=timeout,
+                    )
+                    return resp
+                except Exception as exc2:
+                    log.warning(f"[LCU] POST(retry) {path} failed ({type(exc2).__name__}): {exc2}")
+                    return None
@@ -6,14 +6,13 @@ Handles connection initialization, refresh, and lifecycle
 """
 
 import time
-from pathlib import Path
 from typing import Optional
 
 import requests
 
 from utils.core.logging import get_logger, log_section, log_success
 
-from .lockfile import find_lockfile, parse_lockfile
+from .lockfile import get_lockfile_locator, parse_lockfile
 
 log = get_logger()
 
@@ -33,27 +32,24 @@ class LCUConnection:
         self.base = None
         self.session = None
         self._explicit_lockfile = lockfile_path
+        # Cached lockfile discovery: one stat per refresh while the client runs
+        self.locator = get_lockfile_locator(lockfile_path)
         self.lf_path = None
         self.lf_mtime = 0.0
         self._init_from_lockfile()
     
     def _init_from_lockfile(self):
         """Initialize from lockfile"""
-        lf = find_lockfile(self._explicit_lockfile)
+        lf = self.locator.locate()
         self.lf_path = lf
         
         if not lf:
             self._disable("LCU lockfile not found")
             return
         
-        lockfile_path = Path(lf)
-        if not lockfile_path.is_file():
-            self._disable("LCU lockfile not found")
-            return
-        
         try:
-            # Parse lockfile
-            lockfile_data = parse_lockfile(lf)
+            # Parse lockfile (the locator already did, unless it changed since)
+            lockfile_data = self.locator.lockfile or parse_lockfile(lf)
             if not lockfile_data:
                 self._disable("LCU lockfile parsing failed")
                 return
@@ -72,11 +68,7 @@ class LCUConnection:
             self.session.auth = ("riot", self.pw)
             self.session.headers.update({"Content-Type": "application/json"})
             self.ok = True
-            try: 
-                self.lf_mtime = lockfile_path.stat().st_mtime
-            except (OSError, IOError) as e:
-                log.debug(f"Failed to get lockfile mtime: {e}")
-                self.lf_mtime = time.time()
+            self.lf_mtime = self.locator.mtime or time.time()
             log_section(log, "LCU Connected", "", {"Port": self.port, "Status": "Ready"})
         except Exception as e:
             self._disable(f"LCU unavailable: {e}")
@@ -95,7 +87,7 @@ class LCUConnection:
     
     def refresh_if_needed(self, force: bool = False):
         """Refresh connection if needed"""
-        lf = find_lockfile(self._explicit_lockfile)
+        lf = self.locator.locate()
         
         if not lf:
             self._disable("lockfile not found")
@@ -103,18 +95,7 @@ class LCUConnection:
             self.lf_mtime = 0.0
             return
         
-        lockfile_path = Path(lf)
-        if not lockfile_path.is_file():
-            self._disable("lockfile not found")
-            self.lf_path = None
-            self.lf_mtime = 0.0
-            return
-        
-        try: 
-            mt = lockfile_path.stat().st_mtime
-        except (OSError, IOError) as e:
-            log.debug(f"Failed to get lockfile mtime during refresh: {e}")
-            mt = 0.0
+        mt = self.locator.mtime
         
         if force or lf != self.lf_path or (mt and mt != self.lf_mtime) or not self.ok:
             old = (self.port, self.pw)
@@ -6,18 +6,26 @@ Handles finding and parsing League Client lockfile
 """
 
 import os
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import psutil
 
+from config import LOCKFILE_SCAN_INTERVAL_S
 from utils.core.logging import get_logger
+from utils.system.process_watcher import get_process_watcher
 
 log = get_logger()
 
 SWIFTPLAY_MODES = {"SWIFTPLAY", "BRAWL"}
 
+# Events published by LockfileLocator
+LOCKFILE_CONNECTED = "connected"        # Lockfile appeared or was rewritten (new port/password)
+LOCKFILE_DISCONNECTED = "disconnected"  # Lockfile disappeared (client closed)
+
 
 @dataclass
 class Lockfile:
@@ -29,11 +37,12 @@ class Lockfile:
     protocol: str
 
 
-def find_lockfile(explicit: Optional[str] = None) -> Optional[str]:
+def find_lockfile(explicit: Optional[str] = None, scan_processes: bool = True) -> Optional[str]:
     """Find League Client lockfile using pathlib
     
     Args:
         explicit: Optional explicit path to lockfile
+        scan_processes: Also look next to running LeagueClient executables (slow)
         
     Returns:
         Path to lockfile if found, None otherwise
@@ -68,25 +77,147 @@ def find_lockfile(explicit: Optional[str] = None) -> Optional[str]:
         if p.is_file():
             return str(p)
     
-    # Try to find via process scanning
+    if not scan_processes:
+        return None
+    
+    # Try to find via process scanning (shared incremental index)
     try:
-        for proc in psutil.process_iter(attrs=["name", "exe"]):
-            nm = (proc.info.get("name") or "").lower()
-            if "leagueclient" in nm:
-                exe = proc.info.get("exe") or ""
-                if exe:
-                    exe_path = Path(exe)
-                    # Check in same directory and parent directory
-                    for directory in [exe_path.parent, exe_path.parent.parent]:
-                        lockfile = directory / "lockfile"
-                        if lockfile.is_file():
-                            return str(lockfile)
+        watcher = get_process_watcher()
+        for proc in watcher.find_matching(lambda name: "leagueclient" in name):
+            exe = watcher.exe_of(proc) or ""
+            if exe:
+                exe_path = Path(exe)
+                # Check in same directory and parent directory
+                for directory in [exe_path.parent, exe_path.parent.parent]:
+                    lockfile = directory / "lockfile"
+                    if lockfile.is_file():
+                        return str(lockfile)
     except (psutil.Error, OSError, AttributeError) as e:
         log.debug(f"Failed to find lockfile via process iteration: {e}")
     
     return None
 
 
+LockfileCallback = Callable[[str, Optional[Lockfile]], None]
+
+
+def _lockfile_signature(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of the lockfile, None if it's gone"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class LockfileLocator:
+    """Cached lockfile discovery
+    
+    Once found, the lockfile is re-validated with a single stat per call.
+    Discovery only runs again after the file disappears: the cheap locations
+    (explicit, environment, last known path, install paths) are checked on
+    every call, the process-table scan at most every LOCKFILE_SCAN_INTERVAL_S.
+    Connect/disconnect transitions are published to subscribers.
+    """
+    
+    def __init__(self, explicit: Optional[str] = None, scan_interval_s: float = LOCKFILE_SCAN_INTERVAL_S):
+        self.explicit = explicit
+        self.scan_interval_s = scan_interval_s
+        self.path: Optional[str] = None
+        self.lockfile: Optional[Lockfile] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._last_known: Optional[str] = None
+        self._last_scan = 0.0
+        self._lock = threading.Lock()
+        self._subscribers: List[LockfileCallback] = []
+    
+    @property
+    def mtime(self) -> float:
+        """Modification time of the current lockfile (0.0 if none)"""
+        return self._signature[0] / 1e9 if self._signature else 0.0
+    
+    def subscribe(self, callback: LockfileCallback) -> Callable[[], None]:
+        """Call callback(event, lockfile) on connect/disconnect. Returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers.append(callback)
+        
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+    
+    def locate(self) -> Optional[str]:
+        """Path of the current lockfile, None if the client isn't running"""
+        events: List[Tuple[str, Optional[Lockfile]]] = []
+        with self._lock:
+            if self.path is not None:
+                signature = _lockfile_signature(self.path)
+                if signature == self._signature:
+                    return self.path
+                if signature is not None:
+                    # Rewritten in place (client restarted): re-read port/password
+                    self._accept(self.path, signature, events)
+                else:
+                    log.debug(f"[lockfile] {self.path} disappeared")
+                    self.path = None
+                    self.lockfile = None
+                    self._signature = None
+                    events.append((LOCKFILE_DISCONNECTED, None))
+            if self.path is None:
+                path = self._discover()
+                if path is not None:
+                    signature = _lockfile_signature(path)
+                    if signature is not None:
+                        self._accept(path, signature, events)
+            path = self.path
+            subscribers = list(self._subscribers) if events else []
+        
+        for event, lockfile in events:
+            for callback in subscribers:
+                try:
+                    callback(event, lockfile)
+                except Exception as e:
+                    log.debug(f"[lockfile] Subscriber failed on {event}: {e}")
+        return path
+    
+    def _accept(self, path: str, signature: Tuple[int, int], events: list) -> None:
+        """Adopt *path* if it parses; otherwise leave state as is and retry next call
+        (the client may still be writing it)"""
+        lockfile = parse_lockfile(path)
+        if lockfile is None:
+            return
+        changed = self.lockfile is None or (lockfile.port, lockfile.password) != (self.lockfile.port, self.lockfile.password)
+        self.path = path
+        self.lockfile = lockfile
+        self._signature = signature
+        self._last_known = path
+        if changed:
+            log.debug(f"[lockfile] Using {path} (port {lockfile.port})")
+            events.append((LOCKFILE_CONNECTED, lockfile))
+    
+    def _discover(self) -> Optional[str]:
+        if self._last_known and os.path.isfile(self._last_known):
+            return self._last_known
+        scan = time.monotonic() - self._last_scan >= self.scan_interval_s
+        if scan:
+            self._last_scan = time.monotonic()
+        return find_lockfile(self.explicit, scan_processes=scan)
+
+
+_locators: Dict[Optional[str], LockfileLocator] = {}
+_locators_lock = threading.Lock()
+
+
+def get_lockfile_locator(explicit: Optional[str] = None) -> LockfileLocator:
+    """Shared locator for *explicit* (one cache per lockfile argument)"""
+    with _locators_lock:
+        locator = _locators.get(explicit)
+        if locator is None:
+            locator = _locators[explicit] = LockfileLocator(explicit)
+        return locator
+
+
 def parse_lockfile(lockfile_path: str) -> Optional[Lockfile]:
     """Parse lockfile and return Lockfile dataclass
     
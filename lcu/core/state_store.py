@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LCU State Store
+Caches the LCU resources the threads watch (gameflow phase, champ select
+session, hovered champion, lobby), fed by the WAMP event stream.
+
+While the WebSocket is connected, reads are served from memory and only fall
+back to a REST GET for resources that haven't been seen since the socket
+(re)connected. While it is down, every read goes to REST, as before.
+Every change bumps a global version, so threads can block until something
+they care about changes instead of sleeping a fixed poll interval.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import LCU_STATE_MAX_AGE_S, LCU_STATE_NEGATIVE_TTL_S
+from utils.core.logging import get_logger
+
+log = get_logger()
+
+PHASE_URI = "/lol-gameflow/v1/gameflow-phase"
+SESSION_URI = "/lol-champ-select/v1/session"
+HOVERED_CHAMPION_URI = "/lol-champ-select/v1/hovered-champion-id"
+LOBBY_URI = "/lol-lobby/v2/lobby"
+
+TRACKED_URIS = (PHASE_URI, SESSION_URI, HOVERED_CHAMPION_URI, LOBBY_URI)
+
+# (uri, new value, store version)
+StateCallback = Callable[[str, Any, int], None]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    version: int
+    updated: float        # time.monotonic() of the last event/fetch
+    from_rest: bool
+
+
+@dataclass(frozen=True)
+class LCUSnapshot:
+    """Consistent view of the tracked resources at one store version"""
+    version: int
+    live: bool
+    phase: Optional[str]
+    session: Optional[dict]
+    hovered_champion_id: Any
+    lobby: Optional[dict]
+
+
+class LCUStateStore:
+    """Versioned cache of LCU resources, updated from WebSocket events"""
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Any],
+        max_age_s: float = LCU_STATE_MAX_AGE_S,
+        negative_ttl_s: float = LCU_STATE_NEGATIVE_TTL_S,
+        uris: Iterable[str] = TRACKED_URIS,
+    ):
+        """Initialize the store
+
+        Args:
+            fetch: REST getter (path -> JSON or None) used when the cache can't answer
+            max_age_s: Re-fetch a cached resource after this long even while live
+            negative_ttl_s: How long a None answer from REST is trusted
+            uris: Resources to track
+        """
+        self._fetch = fetch
+        self.max_age_s = max_age_s
+        self.negative_ttl_s = negative_ttl_s
+        self._uris = frozenset(uris)
+        self._entries: Dict[str, _Entry] = {}
+        self._version = 0
+        self._reset_version = 0
+        self._live = False
+        self._cond = threading.Condition()
+        self._subscribers: List[Tuple[Optional[frozenset], StateCallback]] = []
+
+    # ------------------------------------------------------------------
+    # Feed
+    # ------------------------------------------------------------------
+
+    @property
+    def live(self) -> bool:
+        """Whether events are flowing (WebSocket connected and subscribed)"""
+        return self._live
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def tracks(self, uri: str) -> bool:
+        return uri in self._uris
+
+    def set_live(self, live: bool) -> None:
+        """Mark the event stream connected/disconnected
+
+        Either way the cache is dropped: after a disconnect it can't be kept
+        current, and after a connect we may have missed events in between.
+        """
+        with self._cond:
+            self._live = live
+            self._entries.clear()
+            self._version += 1
+            self._reset_version = self._version
+            self._cond.notify_all()
+        log.debug(f"[lcu-state] Event stream {'live' if live else 'down'} - cache reset")
+
+    def apply_event(self, uri: Optional[str], event_type: Optional[str], data: Any) -> bool:
+        """Apply a WAMP OnJsonApiEvent payload. Returns False for untracked URIs."""
+        if uri not in self._uris:
+            return False
+        value = None if event_type == "Delete" else data
+        self._store(uri, value, from_rest=False)
+        return True
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+
+    def get(self, uri: str) -> Any:
+        """Current value of *uri*: cached while live, otherwise via REST"""
+        if uri not in self._uris:
+            return self._fetch(uri)
+
+        with self._cond:
+            entry = self._entries.get(uri)
+            if entry is not None and self._live and self._fresh(entry):
+                return entry.value
+            seen_version = entry.version if entry is not None else None
+            reset_version = self._reset_version
+
+        value = self._fetch(uri)
+        return self._store(uri, value, from_rest=True, expect=(seen_version, reset_version))
+
+    def age(self, uri: str) -> float:
+        """Seconds since *uri* was last updated (0 if not cached)"""
+        entry = self._entries.get(uri)
+        return max(0.0, time.monotonic() - entry.updated) if entry is not None else 0.0
+
+    def snapshot(self) -> LCUSnapshot:
+        """Cached values only (no REST); resources not seen yet are None"""
+        with self._cond:
+            def value(uri):
+                entry = self._entries.get(uri)
+                return entry.value if entry is not None else None
+            return LCUSnapshot(
+                version=self._version,
+                live=self._live,
+                phase=value(PHASE_URI),
+                session=value(SESSION_URI),
+                hovered_champion_id=value(HOVERED_CHAMPION_URI),
+                lobby=value(LOBBY_URI),
+            )
+
+    # ------------------------------------------------------------------
+    # Change notification
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback: StateCallback, uris: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """Call *callback* on every change of *uris* (all tracked if None)
+
+        Callbacks run on the thread that applied the change (usually the
+        WebSocket thread) and must not block. Returns an unsubscribe function.
+        """
+        item = (frozenset(uris) if uris is not None else None, callback)
+        with self._cond:
+            self._subscribers.append(item)
+
+        def unsubscribe() -> None:
+            with self._cond:
+                try:
+                    self._subscribers.remove(item)
+                except ValueError:
+                    pass
+        return unsubscribe
+
+    def wait_for_change(self, since_version: int, timeout: float, uris: Optional[Iterable[str]] = None) -> int:
+        """Block until one of *uris* changes after *since_version*, or *timeout*
+
+        Also returns early when the event stream connects or drops. Returns the
+        store version to pass as *since_version* next time.
+        """
+        watched = tuple(uris) if uris is not None else tuple(self._uris)
+
+        def changed() -> bool:
+            if self._reset_version > since_version:
+                return True
+            for uri in watched:
+                entry = self._entries.get(uri)
+                if entry is not None and entry.version > since_version:
+                    return True
+            return False
+
+        with self._cond:
+            self._cond.wait_for(changed, timeout)
+            return self._version
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _fresh(self, entry: _Entry) -> bool:
+        ttl = self.negative_ttl_s if (entry.from_rest and entry.value is None) else self.max_age_s
+        return (time.monotonic() - entry.updated) < ttl
+
+    def _store(self, uri: str, value: Any, from_rest: bool, expect: Optional[Tuple] = None) -> Any:
+        """Record *value*; returns the value now current for *uri*
+
+        With *expect* (entry version, reset version as seen before a REST
+        fetch), the value is dropped if an event or reconnect landed meanwhile,
+        since that is newer than what the fetch returned.
+        """
+        now = time.monotonic()
+        with self._cond:
+            entry = self._entries.get(uri)
+            if expect is not None:
+                current = (entry.version if entry is not None else None, self._reset_version)
+                if current != expect:
+                    return entry.value if entry is not None else value
+            if entry is not None and entry.value == value:
+                entry.updated = now
+                entry.from_rest = from_rest
+                return value
+            self._version += 1
+            version = self._version
+            self._entries[uri] = _Entry(value, version, now, from_rest)
+            self._cond.notify_all()
+            callbacks = [cb for uris, cb in self._subscribers if uris is None or uri in uris]
+
+        for callback in callbacks:
+            try:
+                callback(uri, value, version)
+            except Exception as e:
+                log.debug(f"[lcu-state] Subscriber failed for {uri}: {e}")
+        return value
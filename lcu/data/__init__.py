@@ -6,13 +6,14 @@ Contains data handling, scraping, caching, types, and utilities
 """
 
 from .skin_scraper import LCUSkinScraper
-from .skin_cache import ChampionSkinCache
+from .skin_cache import ChampionSkinCache, SkinCatalog
 from .types import ChromaData, SkinData, ChampionData, SessionData
 from .utils import map_cells, compute_locked
 
 __all__ = [
     'LCUSkinScraper',
     'ChampionSkinCache',
+    'SkinCatalog',
     'ChromaData',
     'SkinData',
     'ChampionData',
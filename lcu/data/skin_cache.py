@@ -3,9 +3,28 @@
 """
 Skin Cache
 Cache for champion skins scraped from LCU
+
+ChampionSkinCache holds one champion's skins; SkinCatalog keeps many of them
+(LRU, keyed by language and champion ID) and persists them per client patch,
+so switching between champions doesn't refetch from the LCU.
 """
 
-from typing import Dict, List, Optional
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import SKIN_CATALOG_MAX_CHAMPIONS
+from utils.core.logging import get_logger
+from utils.core.normalization import NameIndex
+from utils.core.paths import get_user_data_dir
+
+log = get_logger()
+
+# Bump when the persisted entry layout changes
+CATALOG_FORMAT = 1
 
 
 class ChampionSkinCache:
@@ -18,6 +37,7 @@ class ChampionSkinCache:
         self.skin_id_map = {}  # skinId -> skin data
         self.skin_name_map = {}  # skinName -> skin data
         self.chroma_id_map = {}  # chromaId -> chroma data (for quick lookup)
+        self._name_index = None  # Fuzzy name matcher, built on first use
     
     def clear(self):
         """Clear the cache"""
@@ -27,6 +47,16 @@ class ChampionSkinCache:
         self.skin_id_map = {}
         self.skin_name_map = {}
         self.chroma_id_map = {}
+        self._name_index = None
+    
+    def add_skin(self, skin_data: Dict):
+        """Add a skin (and its chromas) to the lookup maps"""
+        self.skins.append(skin_data)
+        self.skin_id_map[skin_data['skinId']] = skin_data
+        self.skin_name_map[skin_data['skinName']] = skin_data
+        for chroma in skin_data.get('chromaDetails', []):
+            self.chroma_id_map[chroma['id']] = chroma
+        self._name_index = None
     
     def is_loaded_for_champion(self, champion_id: int) -> bool:
         """Check if cache is loaded for a specific champion"""
@@ -40,8 +70,165 @@ class ChampionSkinCache:
         """Get skin data by skin name (exact match)"""
         return self.skin_name_map.get(skin_name)
     
+    @property
+    def name_index(self) -> NameIndex:
+        """Fuzzy matcher over the skin names (skin data as IDs)"""
+        index = self._name_index
+        if index is None:
+            index = self._name_index = NameIndex((skin, skin['skinName']) for skin in self.skins)
+        return index
+    
     @property
     def all_skins(self) -> List[Dict]:
         """Get all skins for the cached champion"""
         return self.skins.copy()
+    
+    def to_dict(self) -> Dict:
+        """Serializable form (lookup maps are rebuilt on load)"""
+        return {'championId': self.champion_id, 'championName': self.champion_name, 'skins': self.skins}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ChampionSkinCache":
+        cache = cls()
+        cache.champion_id = data['championId']
+        cache.champion_name = data.get('championName')
+        for skin_data in data.get('skins', []):
+            cache.add_skin(skin_data)
+        return cache
+
+
+class SkinCatalog:
+    """LRU of ChampionSkinCache entries keyed by (language, champion_id)
+
+    Entries are immutable once added: a refresh replaces the entry, so a
+    ChampionSkinCache handed out to a caller never changes under it.
+    """
+
+    def __init__(self, max_champions: int = SKIN_CATALOG_MAX_CHAMPIONS, path: Optional[Path] = None):
+        self.max_champions = max(1, int(max_champions))
+        self.path = path or (get_user_data_dir() / "cache" / "skin_catalog.json")
+        self.patch: Optional[str] = None
+        self._entries: "OrderedDict[Tuple[str, int], ChampionSkinCache]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()   # Serializes writers of the file
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, language: str, champion_id: int) -> Optional[ChampionSkinCache]:
+        """Cached skins for a champion (marks it most recently used)"""
+        key = (language, champion_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def contains(self, language: str, champion_id: int) -> bool:
+        """Like get() without touching the LRU order (for background warm-up)"""
+        return (language, champion_id) in self._entries
+
+    def put(self, language: str, entry: ChampionSkinCache) -> None:
+        key = (language, entry.champion_id)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_champions:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def find_chroma(self, language: str, chroma_id: int) -> Optional[Dict]:
+        """Chroma data from any cached champion in *language*"""
+        with self._lock:
+            entries = [entry for (lang, _), entry in self._entries.items() if lang == language]
+        for entry in reversed(entries):
+            chroma = entry.chroma_id_map.get(chroma_id)
+            if chroma is not None:
+                return chroma
+        return None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def set_patch(self, patch: Optional[str]) -> None:
+        """Switch to the client patch *patch*, loading its saved catalog
+
+        Skin lists are only valid for the patch they were read on, so a
+        different patch drops everything in memory.
+        """
+        if not patch or patch == self.patch:
+            return
+        with self._lock:
+            self._entries.clear()
+            self._dirty = False
+            self.patch = patch
+        self._load(patch)
+
+    def save(self) -> bool:
+        """Write the catalog to disk if it changed (atomic replace)"""
+        with self._save_lock:
+            return self._save_locked()
+
+    def _save_locked(self) -> bool:
+        with self._lock:
+            if not self._dirty or not self.patch:
+                return False
+            payload = {
+                'format': CATALOG_FORMAT,
+                'patch': self.patch,
+                'entries': [
+                    {'language': language, **entry.to_dict()}
+                    for (language, _), entry in self._entries.items()
+                ],
+            }
+            self._dirty = False
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.debug(f"[LCU-SCRAPER] Failed to save skin catalog: {e}")
+            with self._lock:
+                self._dirty = True
+            return False
+        log.debug(f"[LCU-SCRAPER] Saved skin catalog ({len(payload['entries'])} champions, patch {payload['patch']})")
+        return True
+
+    def _load(self, patch: str) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log.debug(f"[LCU-SCRAPER] Ignoring unreadable skin catalog: {e}")
+            return
+
+        if payload.get('format') != CATALOG_FORMAT or payload.get('patch') != patch:
+            log.debug(f"[LCU-SCRAPER] Saved skin catalog is for patch {payload.get('patch')}, client is on {patch} - ignoring it")
+            return
 
+        loaded = 0
+        with self._lock:
+            if self.patch != patch:
+                return
+            for data in reversed(payload.get('entries', [])):
+                try:
+                    entry = ChampionSkinCache.from_dict(data)
+                    key = (data['language'], entry.champion_id)
+                except (KeyError, TypeError) as e:
+                    log.debug(f"[LCU-SCRAPER] Skipping malformed skin catalog entry: {e}")
+                    continue
+                # Entries scraped since the switch are newer than the saved ones
+                if key not in self._entries:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key, last=False)
+                    loaded += 1
+            while len(self._entries) > self.max_champions:
+                self._entries.popitem(last=False)
+        log.info(f"[LCU-SCRAPER] Loaded skin catalog for patch {patch} ({loaded} champions)")
@@ -4,12 +4,14 @@
 LCU Skin Scraper - Scrape skins for a specific champion from LCU
 """
 
-from typing import Optional, Dict, List, Tuple
+import threading
+import time
+from typing import Optional, Dict, Iterable, List, Tuple
 
-from config import LCU_SKIN_SCRAPER_TIMEOUT_S
+from config import LCU_SKIN_SCRAPER_TIMEOUT_S, SKIN_CATALOG_SAVE_DELAY_S, SKIN_CATALOG_WARM_DELAY_S
 from utils.core.logging import get_logger
 
-from .skin_cache import ChampionSkinCache
+from .skin_cache import ChampionSkinCache, SkinCatalog
 
 log = get_logger()
 
@@ -24,11 +26,19 @@ class LCUSkinScraper:
             lcu_client: LCU client instance
         """
         self.lcu = lcu_client
-        self.cache = ChampionSkinCache()
+        self.cache = ChampionSkinCache()  # Skins of the current champion
+        self.catalog = SkinCatalog()      # Every champion scraped so far, per language
+        self._context: Optional[Tuple[str, str]] = None  # (language, patch) of the connected client
+        self._context_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._warm_thread: Optional[threading.Thread] = None
     
     def scrape_champion_skins(self, champion_id: int, force_refresh: bool = False) -> bool:
         """Scrape all skins for a specific champion from LCU
         
+        Champions already in the skin catalog are served from memory; only
+        unknown champions (or force_refresh) go to the LCU.
+        
         Args:
             champion_id: Champion ID to scrape skins for
             force_refresh: If True, force refresh even if already cached
@@ -41,11 +51,39 @@ class LCUSkinScraper:
             log.debug(f"[LCU-SCRAPER] Champion {champion_id} skins already cached ({len(self.cache.skins)} skins)")
             return True
         
-        # Clear old cache
-        self.cache.clear()
+        language = self._language()
+        if language and not force_refresh:
+            entry = self.catalog.get(language, champion_id)
+            if entry is not None:
+                self.cache = entry
+                log.debug(f"[LCU-SCRAPER] Champion {champion_id} skins served from catalog ({len(entry.skins)} skins)")
+                return True
         
         log.info(f"[LCU-SCRAPER] Scraping skins for champion ID {champion_id}...")
+        entry = self._fetch_champion(champion_id)
+        if entry is None:
+            # Nothing valid for this champion - don't leave the previous one current
+            self.cache = ChampionSkinCache()
+            log.warning(f"[LCU-SCRAPER] Failed to scrape skins for champion {champion_id}")
+            return False
+        
+        self.cache = entry
+        if language:
+            self.catalog.put(language, entry)
+            self._schedule_save()
+        
+        log.info(f"[LCU-SCRAPER] Scraped {len(entry.skins)} skins for {entry.champion_name} (ID: {champion_id})")
+        
+        # Log first few skins for debugging
+        if entry.skins:
+            log.debug(f"[LCU-SCRAPER] Sample skins:")
+            for skin in entry.skins[:3]:
+                log.debug(f"  - {skin['skinName']} (ID: {skin['skinId']})")
         
+        return True
+    
+    def _fetch_champion(self, champion_id: int) -> Optional[ChampionSkinCache]:
+        """Fetch a champion's skins from the LCU into a new ChampionSkinCache"""
         # Try multiple endpoints to get champion skins
         endpoints = [
             f"/lol-game-data/assets/v1/champions/{champion_id}.json",
@@ -65,12 +103,12 @@ class LCUSkinScraper:
                 continue
         
         if not champ_data:
-            log.warning(f"[LCU-SCRAPER] Failed to scrape skins for champion {champion_id}")
-            return False
+            return None
         
         # Extract champion info
-        self.cache.champion_id = champion_id
-        self.cache.champion_name = champ_data.get('name', f'Champion{champion_id}')
+        entry = ChampionSkinCache()
+        entry.champion_id = champion_id
+        entry.champion_name = champ_data.get('name', f'Champion{champion_id}')
         
         # Extract skins
         raw_skins = champ_data.get('skins', [])
@@ -112,7 +150,6 @@ class LCUSkinScraper:
                 }
                 
                 chroma_details.append(chroma_info)
-                self.cache.chroma_id_map[chroma_id] = chroma_info
             
             skin_data = {
                 'skinId': skin_id,
@@ -124,19 +161,97 @@ class LCUSkinScraper:
                 'num': skin.get('num', 0)
             }
             
-            self.cache.skins.append(skin_data)
-            self.cache.skin_id_map[skin_id] = skin_data
-            self.cache.skin_name_map[english_skin_name] = skin_data
+            entry.add_skin(skin_data)
         
-        log.info(f"[LCU-SCRAPER] Scraped {len(self.cache.skins)} skins for {self.cache.champion_name} (ID: {champion_id})")
+        return entry
+    
+    # ------------------------------------------------------------------
+    # Catalog context, persistence and warm-up
+    # ------------------------------------------------------------------
+    
+    def reset_context(self):
+        """Forget the client language/patch (call on reconnect or language change)"""
+        with self._context_lock:
+            self._context = None
+    
+    def _language(self) -> str:
+        """Client language for catalog keys, resolving language and patch once per connection"""
+        with self._context_lock:
+            if self._context is not None:
+                return self._context[0]
         
-        # Log first few skins for debugging
-        if self.cache.skins:
-            log.debug(f"[LCU-SCRAPER] Sample skins:")
-            for skin in self.cache.skins[:3]:
-                log.debug(f"  - {skin['skinName']} (ID: {skin['skinId']})")
+        language = patch = None
+        try:
+            locale_info = self.lcu.get("/riotclient/region-locale", timeout=LCU_SKIN_SCRAPER_TIMEOUT_S)
+            if isinstance(locale_info, dict):
+                language = locale_info.get("locale")
+            patch = self.lcu.get("/lol-patch/v1/game-version", timeout=LCU_SKIN_SCRAPER_TIMEOUT_S)
+        except Exception as e:
+            log.debug(f"[LCU-SCRAPER] Failed to read client language/patch: {e}")
         
-        return True
+        if not language or not isinstance(patch, str) or not patch:
+            # Not cached: retried on the next scrape
+            return language or ""
+        
+        self.catalog.set_patch(patch)
+        with self._context_lock:
+            self._context = (language, patch)
+        log.debug(f"[LCU-SCRAPER] Skin catalog context: language {language}, patch {patch} ({len(self.catalog)} champions cached)")
+        return language
+    
+    def _schedule_save(self):
+        """Write the catalog to disk a little later, batching nearby changes"""
+        with self._context_lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(SKIN_CATALOG_SAVE_DELAY_S, self._save_now)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _save_now(self):
+        with self._context_lock:
+            self._save_timer = None
+        self.catalog.save()
+    
+    def warm_catalog(self, champion_ids: Iterable[int]):
+        """Fetch skins for *champion_ids* into the catalog on a background thread
+        
+        Champions already cached are skipped, so after the first session on a
+        patch this only reads the catalog from disk.
+        """
+        if self._warm_thread is not None and self._warm_thread.is_alive():
+            return
+        self._warm_thread = threading.Thread(
+            target=self._warm_catalog, args=(list(champion_ids),), daemon=True, name="SkinCatalogWarmup"
+        )
+        self._warm_thread.start()
+    
+    def _warm_catalog(self, champion_ids: List[int]):
+        language = self._language()
+        if not language:
+            return
+        missing = [cid for cid in champion_ids if not self.catalog.contains(language, cid)]
+        if not missing:
+            log.debug(f"[LCU-SCRAPER] Skin catalog already warm ({len(champion_ids)} champions)")
+            return
+        
+        log.info(f"[LCU-SCRAPER] Warming skin catalog for {len(missing)} champions...")
+        fetched = 0
+        for champion_id in missing:
+            if not self.lcu.ok or self._language() != language:
+                log.debug("[LCU-SCRAPER] Skin catalog warm-up interrupted (client disconnected or language changed)")
+                break
+            # A foreground scrape may have filled it meanwhile
+            if self.catalog.contains(language, champion_id):
+                continue
+            entry = self._fetch_champion(champion_id)
+            if entry is not None:
+                self.catalog.put(language, entry)
+                fetched += 1
+            time.sleep(SKIN_CATALOG_WARM_DELAY_S)
+        
+        self.catalog.save()
+        log.info(f"[LCU-SCRAPER] Skin catalog warmed: {fetched}/{len(missing)} champions fetched")
     
     def find_skin_by_text(self, text: str, use_levenshtein: bool = True) -> Optional[Tuple[int, str, float]]:
         """Find best matching skin by text using Levenshtein distance
@@ -148,11 +263,10 @@ class LCUSkinScraper:
         Returns:
             Tuple of (skinId, skinName, similarity_score) if found, None otherwise
         """
-        if not text or not self.cache.skins:
+        cache = self.cache  # May be swapped by another thread's scrape
+        if not text or not cache.skins:
             return None
 
-        from utils.core.normalization import levenshtein_distance
-
         # Build candidate input strings.  The League client sometimes appends
         # a chroma colour as a suffix whose format varies by locale:
         #   - Portuguese: "SkinName (Renegado)"       → trailing parentheses
@@ -169,7 +283,7 @@ class LCUSkinScraper:
 
         # Try exact match first (both candidates)
         for candidate in candidates:
-            exact_match = self.cache.get_skin_by_name(candidate)
+            exact_match = cache.get_skin_by_name(candidate)
             if exact_match:
                 return (exact_match['skinId'], exact_match['skinName'], 1.0)
 
@@ -177,25 +291,12 @@ class LCUSkinScraper:
         if not use_levenshtein:
             return None
 
-        best_match = None
-        best_distance = float('inf')
-        best_similarity = 0.0
-
-        for skin in self.cache.skins:
-            skin_name = skin['skinName']
-
-            for candidate in candidates:
-                distance = levenshtein_distance(candidate, skin_name)
-                max_len = max(len(candidate), len(skin_name))
-                similarity = 1.0 - (distance / max_len) if max_len > 0 else 0.0
-
-                if distance < best_distance:
-                    best_distance = distance
-                    best_similarity = similarity
-                    best_match = skin
-
-        if best_match:
-            return (best_match['skinId'], best_match['skinName'], best_similarity)
+        # Nearest name over the precomputed index (same result as scanning
+        # every skin with levenshtein_distance, without comparing them all)
+        match = cache.name_index.closest(candidates)
+        if match:
+            skin, skin_name, similarity = match
+            return (skin['skinId'], skin_name, similarity)
 
         return None
     
@@ -232,4 +333,11 @@ class LCUSkinScraper:
         Returns:
             Chroma dict or None if not found
         """
-        return self.cache.chroma_id_map.get(chroma_id)
+        chroma = self.cache.chroma_id_map.get(chroma_id)
+        if chroma is None:
+            # Chroma of another champion (e.g. Swiftplay's second pick, a trade)
+            with self._context_lock:
+                language = self._context[0] if self._context else None
+            if language is not None:
+                chroma = self.catalog.find_chroma(language, chroma_id)
+        return chroma
@@ -15,29 +15,37 @@ log = get_logger()
 class LCUProperties:
     """Property-based accessors for LCU endpoints"""
     
-    def __init__(self, api):
+    def __init__(self, api, state_store=None):
         """Initialize properties handler
         
         Args:
             api: LCUAPI instance
+            state_store: Optional LCUStateStore serving event-fed resources
         """
         self.api = api
+        self.state_store = state_store
+    
+    def _watched(self, path: str):
+        """GET a resource the state store tracks (cached while the WebSocket is up)"""
+        if self.state_store is not None:
+            return self.state_store.get(path)
+        return self.api.get(path)
     
     @property
     def phase(self) -> Optional[str]:
         """Get current gameflow phase"""
-        ph = self.api.get("/lol-gameflow/v1/gameflow-phase")
+        ph = self._watched("/lol-gameflow/v1/gameflow-phase")
         return ph if isinstance(ph, str) else None
     
     @property
     def session(self) -> Optional[dict]:
         """Get current session"""
-        return self.api.get("/lol-champ-select/v1/session")
+        return self._watched("/lol-champ-select/v1/session")
     
     @property
     def hovered_champion_id(self) -> Optional[int]:
         """Get hovered champion ID"""
-        v = self.api.get("/lol-champ-select/v1/hovered-champion-id")
+        v = self._watched("/lol-champ-select/v1/hovered-champion-id")
         try: 
             return int(v) if v is not None else None
         except (ValueError, TypeError) as e:
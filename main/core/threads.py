@@ -61,11 +61,16 @@ def initialize_threads(lcu, state, args, injection_manager, skin_scraper, app_st
     from threads.handlers.p2p_handler import P2PHandler
     
     # Initialize P2P Handler
-    state.p2p_handler = P2PHandler(state)
+    state.p2p_handler = P2PHandler(state, injection_manager=injection_manager)
     
     t_p2p = P2PThread(state)
     thread_manager.register("P2P Client", t_p2p, stop_method=t_p2p.stop)
     
+    # Pre-build overlays during champ select
+    from threads.utilities import SpeculativeOverlayBuilder
+    t_speculative = SpeculativeOverlayBuilder(state, injection_manager=injection_manager)
+    thread_manager.register("Speculative Overlay Builder", t_speculative, stop_method=t_speculative.stop)
+    
     # Initialize analytics thread
     t_analytics = AnalyticsThread(state)
     thread_manager.register("Analytics", t_analytics, stop_method=t_analytics.stop)
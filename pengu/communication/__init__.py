@@ -7,9 +7,12 @@ Contains message handling and broadcasting functionality
 
 from .message_handler import MessageHandler
 from .broadcaster import Broadcaster
+from .dispatcher import MessageDispatcher, MessageRoute
 
 __all__ = [
     'MessageHandler',
     'Broadcaster',
+    'MessageDispatcher',
+    'MessageRoute',
 ]
 
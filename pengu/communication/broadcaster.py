@@ -5,7 +5,6 @@ Message Broadcaster
 Handles broadcasting messages to WebSocket clients
 """
 
-import asyncio
 import json
 import logging
 import time
@@ -71,7 +70,7 @@ class Broadcaster:
             champion_id,
             has_chromas,
         )
-        self._send_message(json.dumps(payload))
+        self._publish_state("skin-state", payload)
     
     def broadcast_chroma_state(self) -> None:
         """Broadcast current chroma selection state to JavaScript"""
@@ -109,7 +108,7 @@ class Broadcaster:
             chroma_color,
         )
         
-        self._send_message(json.dumps(payload))
+        self._publish_state("chroma-state", payload)
     
     def broadcast_historic_state(self) -> None:
         """Broadcast current historic mode state to JavaScript"""
@@ -163,7 +162,7 @@ class Broadcaster:
             skin_name,
         )
         
-        self._send_message(json.dumps(payload))
+        self._publish_state("historic-state", payload)
     
     def broadcast_custom_mod_state(self) -> None:
         """Broadcast current custom mod selection state to JavaScript"""
@@ -189,7 +188,7 @@ class Broadcaster:
             mod_name,
         )
 
-        self._send_message(json.dumps(payload))
+        self._publish_state("custom-mod-state", payload)
 
     def broadcast_phase_change(self, phase: str) -> None:
         """Broadcast phase change to JavaScript plugins"""
@@ -261,7 +260,7 @@ class Broadcaster:
             random_skin_id,
         )
         
-        self._send_message(json.dumps(payload))
+        self._publish_state("random-mode-state", payload)
 
     def broadcast_skip_base_skin(self) -> None:
         """Broadcast skip base skin to JavaScript plugins"""
@@ -292,7 +291,7 @@ class Broadcaster:
         }
         
         log.debug(f"[SkinMonitor] Broadcasting P2P connection state: {payload}")
-        self._send_message(json.dumps(payload))
+        self._publish_state("p2p-connection-state", payload)
 
     def broadcast_peer_ack(self, sender_peer_id: str, target_peer_id: str) -> None:
         """Broadcast sync ACK to JavaScript plugins"""
@@ -320,21 +319,16 @@ class Broadcaster:
         message["timestamp"] = int(time.time() * 1000)
         
         log.debug(f"[SkinMonitor] Broadcasting peer update: {message}")
-        self._send_message(json.dumps(message))
+        # One topic per peer, so updates from different peers don't replace each other
+        self._publish_state(f"peer-skin-update:{message.get('peer_id')}", message)
+    
+    def _publish_state(self, topic: str, payload: dict) -> None:
+        """Publish a state snapshot; bursts are coalesced and sent as deltas"""
+        self.websocket_server.publish_state(topic, payload)
     
     def _send_message(self, message: str) -> None:
         """Send message to all connected clients"""
-        try:
-            running_loop = asyncio.get_running_loop()
-        except RuntimeError:
-            running_loop = None
-        
-        if running_loop is self.websocket_server.loop:
-            self.websocket_server.loop.create_task(self.websocket_server.broadcast(message))
-        else:
-            asyncio.run_coroutine_threadsafe(
-                self.websocket_server.broadcast(message), self.websocket_server.loop
-            )
+        self.websocket_server.send_event(message)
     
     def _skin_has_chromas(self, skin_id: Optional[int]) -> bool:
         """Check if skin has chromas"""
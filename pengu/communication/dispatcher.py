@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Message Dispatcher
+Runs Pengu bridge message handlers without stalling the WebSocket event loop
+
+Each message type has a route: fast-path handlers run inline on the event
+loop, blocking ones (file system, zip extraction, LCU calls) run on a small
+thread pool. Blocking handlers are queued per lane - by default one lane per
+message type - so messages of a type are still handled one at a time and in
+order. A route can mark messages as superseding: a newer one drops older
+ones still waiting in the lane, and a handler already running can notice
+via is_superseded() and stop early.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+from config import PENGU_FAST_PATH_WARN_MS, PENGU_HANDLER_WORKERS
+from utils.core.latency import LatencyHistogram
+
+log = logging.getLogger(__name__)
+
+MessageCallback = Callable[[dict], None]
+
+
+@dataclass(frozen=True)
+class MessageRoute:
+    """How a message type is handled"""
+    handler: MessageCallback
+    blocking: bool = False                                   # Run on the thread pool instead of the loop
+    lane: Optional[str] = None                               # Serial queue name (defaults to the message type)
+    supersede_key: Optional[Callable[[dict], Any]] = None    # Newer message with an equal, non-None key replaces older ones
+
+
+@dataclass
+class _Job:
+    message_type: str
+    route: MessageRoute
+    payload: dict
+    key: Any
+    queued_at: float
+    cancelled: threading.Event
+
+
+class _Lane:
+    def __init__(self):
+        self.pending: Deque[_Job] = deque()
+        self.running: Optional[_Job] = None
+
+
+class _TypeStats:
+    def __init__(self):
+        self.queue = LatencyHistogram()    # Time waiting in the lane
+        self.run = LatencyHistogram()      # Handler run time
+        self.superseded = 0
+
+    def summary(self) -> Dict[str, Any]:
+        run = self.run.summary()
+        return {
+            "handled": run["requests"],
+            "errors": self.run.errors,
+            "superseded": self.superseded,
+            "run_avg_ms": run["avg_ms"],
+            "run_p95_ms": run["p95_ms"],
+            "run_max_ms": run["max_ms"],
+            "queue_p95_ms": self.queue.percentile(0.95),
+        }
+
+
+_current = threading.local()
+
+
+def is_superseded() -> bool:
+    """True if the blocking handler running on this thread has been superseded
+
+    Handlers doing expensive work for a superseding route check this between
+    steps and return early; always False outside the dispatcher.
+    """
+    job = getattr(_current, "job", None)
+    return job is not None and job.cancelled.is_set()
+
+
+class MessageDispatcher:
+    """Routes messages to fast-path or executor-backed handlers"""
+
+    def __init__(self, max_workers: int = PENGU_HANDLER_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="PenguHandler")
+        self._lanes: Dict[str, _Lane] = {}
+        self._stats: Dict[str, _TypeStats] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def dispatch(self, message_type: str, route: MessageRoute, payload: dict) -> None:
+        """Handle *payload* now (fast path) or queue it on its lane (blocking)"""
+        if not route.blocking:
+            self._run_inline(message_type, route, payload)
+            return
+
+        key = route.supersede_key(payload) if route.supersede_key else None
+        job = _Job(message_type, route, payload, key, time.perf_counter(), threading.Event())
+        lane_name = route.lane or message_type
+        with self._lock:
+            if self._closed:
+                return
+            lane = self._lanes.setdefault(lane_name, _Lane())
+            if key is not None:
+                self._supersede_locked(lane, job)
+            lane.pending.append(job)
+            if lane.running is None:
+                self._start_next_locked(lane_name, lane)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per message type latency and counters"""
+        with self._lock:
+            return {message_type: s.summary() for message_type, s in sorted(self._stats.items())}
+
+    def shutdown(self) -> None:
+        """Drop queued messages and stop the worker threads (running handlers finish)"""
+        with self._lock:
+            self._closed = True
+            for lane in self._lanes.values():
+                lane.pending.clear()
+                if lane.running is not None:
+                    lane.running.cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _run_inline(self, message_type: str, route: MessageRoute, payload: dict) -> None:
+        started = time.perf_counter()
+        failed = self._call(message_type, route, payload)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self._record(message_type, 0.0, elapsed_ms, failed)
+        if elapsed_ms > PENGU_FAST_PATH_WARN_MS:
+            log.debug("[SkinMonitor] Fast-path handler '%s' blocked the event loop for %.1fms", message_type, elapsed_ms)
+
+    def _supersede_locked(self, lane: _Lane, job: _Job) -> None:
+        kept: Deque[_Job] = deque()
+        for queued in lane.pending:
+            if queued.message_type == job.message_type and queued.key == job.key:
+                self._type_stats_locked(queued.message_type).superseded += 1
+            else:
+                kept.append(queued)
+        lane.pending = kept
+        running = lane.running
+        if running is not None and running.message_type == job.message_type and running.key == job.key:
+            running.cancelled.set()
+
+    def _start_next_locked(self, lane_name: str, lane: _Lane) -> None:
+        if not lane.pending or self._closed:
+            lane.running = None
+            return
+        job = lane.pending.popleft()
+        lane.running = job
+        try:
+            self._executor.submit(self._run_job, lane_name, lane, job)
+        except RuntimeError:
+            # Executor shut down
+            lane.running = None
+            lane.pending.clear()
+
+    def _run_job(self, lane_name: str, lane: _Lane, job: _Job) -> None:
+        started = time.perf_counter()
+        queued_ms = (started - job.queued_at) * 1000.0
+        _current.job = job
+        try:
+            if job.cancelled.is_set():
+                with self._lock:
+                    self._type_stats_locked(job.message_type).superseded += 1
+                return
+            failed = self._call(job.message_type, job.route, job.payload)
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            self._record(job.message_type, queued_ms, elapsed_ms, failed)
+            if job.cancelled.is_set():
+                with self._lock:
+                    self._type_stats_locked(job.message_type).superseded += 1
+        finally:
+            _current.job = None
+            with self._lock:
+                self._start_next_locked(lane_name, lane)
+
+    @staticmethod
+    def _call(message_type: str, route: MessageRoute, payload: dict) -> bool:
+        """Run a handler; returns True if it raised"""
+        try:
+            route.handler(payload)
+            return False
+        except Exception as exc:  # noqa: BLE001
+            log.warning("[SkinMonitor] Handler for '%s' failed: %s", message_type, exc)
+            return True
+
+    def _record(self, message_type: str, queued_ms: float, elapsed_ms: float, failed: bool) -> None:
+        with self._lock:
+            stats = self._type_stats_locked(message_type)
+            stats.queue.record(queued_ms)
+            stats.run.record(elapsed_ms)
+            if failed:
+                stats.run.errors += 1
+
+    def _type_stats_locked(self, message_type: str) -> _TypeStats:
+        stats = self._stats.get(message_type)
+        if stats is None:
+            stats = self._stats[message_type] = _TypeStats()
+        return stats
@@ -5,7 +5,6 @@ Message Handler
 Routes and handles different WebSocket message types
 """
 
-import asyncio
 import json
 import logging
 import os
@@ -15,7 +14,7 @@ import sys
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from config import get_config_float, get_config_option, set_config_option
 from injection.mods.storage import ModStorageService
@@ -29,6 +28,8 @@ from utils.system.admin_utils import (
     unregister_autostart,
 )
 
+from .dispatcher import MessageDispatcher, MessageRoute, is_superseded
+
 log = logging.getLogger(__name__)
 
 
@@ -69,6 +70,8 @@ class MessageHandler:
         self.port = port
         self.mod_storage = mod_storage or ModStorageService()
         self.injection_manager = injection_manager
+        self.dispatcher = MessageDispatcher()
+        self._routes = self._build_routes()
     
     def handle_message(self, message: str) -> None:
         """Handle incoming WebSocket message
@@ -83,76 +86,89 @@ class MessageHandler:
             return
         
         payload_type = payload.get("type")
+        route = self._routes.get(payload_type)
+        if route is None:
+            if not payload.get("skin"):
+                return
+            # Handle skin detection message
+            payload_type = "skin-detection"
+            route = self._routes[payload_type]
+        
+        self.dispatcher.dispatch(payload_type, route, payload)
+    
+    def dispatch_stats(self) -> dict:
+        """Per message type handler latency (see MessageDispatcher.stats)"""
+        return self.dispatcher.stats()
+    
+    def shutdown(self) -> None:
+        """Stop the handler threads"""
+        self.dispatcher.shutdown()
+    
+    def _build_routes(self) -> Dict[str, MessageRoute]:
+        """Message type -> route
+        
+        Fast-path handlers only touch memory and run on the event loop.
+        Anything doing file system work, extraction, subprocesses or LCU calls
+        is blocking and runs on the dispatcher's threads, one message at a
+        time per lane.
+        """
+        def fast(handler):
+            return MessageRoute(handler)
         
-        # Route to appropriate handler
-        if payload_type == "chroma-log":
-            self._handle_chroma_log(payload)
-        elif payload_type == "request-local-preview":
-            self._handle_request_local_preview(payload)
-        elif payload_type == "request-local-asset":
-            self._handle_request_local_asset(payload)
-        elif payload_type == "chroma-selection":
-            self._handle_chroma_selection(payload)
-        elif payload_type == "dice-button-click":
-            self._handle_dice_button_click(payload)
-        elif payload_type == "settings-request":
-            self._handle_settings_request(payload)
-        elif payload_type == "path-validate":
-            self._handle_path_validate(payload)
-        elif payload_type == "open-mods-folder":
-            self._handle_open_mods_folder(payload)
-        elif payload_type == "request-skin-mods":
-            self._handle_request_skin_mods(payload)
-        elif payload_type == "request-maps":
-            self._handle_request_maps(payload)
-        elif payload_type == "request-fonts":
-            self._handle_request_fonts(payload)
-        elif payload_type == "request-announcers":
-            self._handle_request_announcers(payload)
-        elif payload_type == "request-category-mods":
-            self._handle_request_category_mods(payload)
-        elif payload_type == "request-others":
+        def blocking(handler, lane=None, supersede_key=None):
+            return MessageRoute(handler, blocking=True, lane=lane, supersede_key=supersede_key)
+        
+        return {
+            "chroma-log": fast(self._handle_chroma_log),
+            "dismiss-historic": fast(self._handle_dismiss_historic),
+            "request-local-preview": blocking(self._handle_request_local_preview),
+            "request-local-asset": blocking(self._handle_request_local_asset),
+            # Hover detection, chroma panel and dice button all update the
+            # hovered/selected skin and may call the LCU
+            "chroma-selection": blocking(self._handle_chroma_selection, lane="ui"),
+            "dice-button-click": blocking(self._handle_dice_button_click, lane="ui"),
+            "find-match-hover": blocking(self._handle_find_match_hover),
+            # A save must be visible to the next settings request
+            "settings-request": blocking(self._handle_settings_request, lane="settings"),
+            "settings-save": blocking(self._handle_settings_save, lane="settings"),
+            "path-validate": blocking(self._handle_path_validate, lane="settings"),
+            "diagnostics-request": blocking(self._handle_diagnostics_request, lane="diagnostics"),
+            "diagnostics-clear": blocking(self._handle_diagnostics_clear, lane="diagnostics"),
+            "diagnostics-clear-category": blocking(self._handle_diagnostics_clear_category, lane="diagnostics"),
+            "open-mods-folder": blocking(self._handle_open_mods_folder),
+            "open-logs-folder": blocking(self._handle_open_logs_folder),
+            "open-pengu-loader-ui": blocking(self._handle_open_pengu_loader_ui),
+            "request-skin-mods": blocking(self._handle_request_skin_mods),
+            "request-maps": blocking(self._handle_request_maps),
+            "request-fonts": blocking(self._handle_request_fonts),
+            "request-announcers": blocking(self._handle_request_announcers),
+            "request-category-mods": blocking(self._handle_request_category_mods),
             # Backwards compatible: treat as a request for the "others" category only
-            self._handle_request_category_mods({"category": self.mod_storage.CATEGORY_OTHERS})
-        elif payload_type == "select-skin-mod":
-            self._handle_select_skin_mod(payload)
-        elif payload_type == "select-map":
-            self._handle_select_map(payload)
-        elif payload_type == "select-font":
-            self._handle_select_font(payload)
-        elif payload_type == "select-announcer":
-            self._handle_select_announcer(payload)
-        elif payload_type == "select-other":
-            self._handle_select_other(payload)
-        elif payload_type == "open-logs-folder":
-            self._handle_open_logs_folder(payload)
-        elif payload_type == "diagnostics-request":
-            self._handle_diagnostics_request(payload)
-        elif payload_type == "diagnostics-clear":
-            self._handle_diagnostics_clear(payload)
-        elif payload_type == "diagnostics-clear-category":
-            self._handle_diagnostics_clear_category(payload)
-        elif payload_type == "open-pengu-loader-ui":
-            self._handle_open_pengu_loader_ui(payload)
-        elif payload_type == "settings-save":
-            self._handle_settings_save(payload)
-        elif payload_type == "add-custom-mods-category-selected":
-            self._handle_add_custom_mods_category_selected(payload)
-        elif payload_type == "add-custom-mods-champion-selected":
-            self._handle_add_custom_mods_champion_selected(payload)
-        elif payload_type == "add-custom-mods-skin-selected":
-            self._handle_add_custom_mods_skin_selected(payload)
-        elif payload_type == "find-match-hover":
-            self._handle_find_match_hover(payload)
-        elif payload_type == "dismiss-custom-mod":
-            self._handle_dismiss_custom_mod(payload)
-        elif payload_type == "dismiss-historic":
-            self._handle_dismiss_historic(payload)
-        elif payload_type == "spoof-rank":
-            self._handle_spoof_rank(payload)
-        elif payload.get("skin"):
-            # Handle skin detection message
-            self._handle_skin_detection(payload)
+            "request-others": blocking(
+                lambda _payload: self._handle_request_category_mods({"category": self.mod_storage.CATEGORY_OTHERS}),
+                lane="request-category-mods",
+            ),
+            # Mod selections all clean/extract into the injector's mods directory,
+            # so they share one lane. Only the latest skin mod selection matters,
+            # but deselections always run (they remove extracted files)
+            "select-skin-mod": blocking(
+                self._handle_select_skin_mod,
+                lane="mod-selection",
+                supersede_key=lambda payload: "select" if payload.get("modId") is not None else None,
+            ),
+            "dismiss-custom-mod": blocking(self._handle_dismiss_custom_mod, lane="mod-selection"),
+            "select-map": blocking(self._handle_select_map, lane="mod-selection"),
+            "select-font": blocking(self._handle_select_font, lane="mod-selection"),
+            "select-announcer": blocking(self._handle_select_announcer, lane="mod-selection"),
+            "select-other": blocking(self._handle_select_other, lane="mod-selection"),
+            "add-custom-mods-category-selected": blocking(self._handle_add_custom_mods_category_selected, lane="add-custom-mods"),
+            "add-custom-mods-champion-selected": blocking(self._handle_add_custom_mods_champion_selected, lane="add-custom-mods"),
+            "add-custom-mods-skin-selected": blocking(self._handle_add_custom_mods_skin_selected, lane="add-custom-mods"),
+            "spoof-rank": blocking(self._handle_spoof_rank),
+            # Hover detection may scrape the champion's skins from the LCU; a
+            # newer hover makes a queued one pointless
+            "skin-detection": blocking(self._handle_skin_detection, lane="ui", supersede_key=lambda _payload: "hover"),
+        }
     
     def _handle_chroma_log(self, payload: dict) -> None:
         """Handle chroma log message"""
@@ -959,6 +975,11 @@ class MessageHandler:
                 log.warning(f"[SkinMonitor] Mod not found: {mod_id} for champion {champion_id}")
                 return
 
+            # A newer selection is queued: skip extracting this one
+            if is_superseded():
+                log.debug(f"[SkinMonitor] Mod selection superseded before extraction: {mod_id}")
+                return
+
             # Extract mod immediately when selected (not during injection)
             if not self.injection_manager:
                 log.warning("[SkinMonitor] Cannot extract mod - injection manager not available")
@@ -1014,6 +1035,7 @@ class MessageHandler:
             if mod_dest.exists() or is_junction(mod_dest):
                 safe_remove_entry(mod_dest)
             link_or_extract(mod_source, mod_dest, cache_dir=extract_cache_dir)
+            injector.mod_manager.record_mod_source(mod_dest.name, mod_source)
             log.info(f"[SkinMonitor] Linked/extracted mod to: {mod_dest}")
 
             # Store selected mod in shared state for injection trigger
@@ -1199,6 +1221,7 @@ class MessageHandler:
             if mod_dest.exists() or is_junction(mod_dest):
                 safe_remove_entry(mod_dest)
             link_or_extract(mod_source, mod_dest, cache_dir=extract_cache_dir)
+            injector.mod_manager.record_mod_source(mod_dest.name, mod_source)
             log.info(f"[SkinMonitor] Linked/extracted map mod to: {mod_dest}")
 
             # Store selected map mod in shared state for injection
@@ -1298,6 +1321,7 @@ class MessageHandler:
             if mod_dest.exists() or is_junction(mod_dest):
                 safe_remove_entry(mod_dest)
             link_or_extract(mod_source, mod_dest, cache_dir=extract_cache_dir)
+            injector.mod_manager.record_mod_source(mod_dest.name, mod_source)
             log.info(f"[SkinMonitor] Linked/extracted font mod to: {mod_dest}")
 
             # Store selected font mod in shared state for injection
@@ -1397,6 +1421,7 @@ class MessageHandler:
             if mod_dest.exists() or is_junction(mod_dest):
                 safe_remove_entry(mod_dest)
             link_or_extract(mod_source, mod_dest, cache_dir=extract_cache_dir)
+            injector.mod_manager.record_mod_source(mod_dest.name, mod_source)
             log.info(f"[SkinMonitor] Linked/extracted announcer mod to: {mod_dest}")
 
             # Store selected announcer mod in shared state for injection
@@ -1514,6 +1539,7 @@ class MessageHandler:
             if mod_dest.exists() or is_junction(mod_dest):
                 safe_remove_entry(mod_dest)
             link_or_extract(mod_source, mod_dest, cache_dir=extract_cache_dir)
+            injector.mod_manager.record_mod_source(mod_dest.name, mod_source)
             log.info(f"[SkinMonitor] Linked/extracted other mod to: {mod_dest}")
 
             # Store selected other mod in shared state for injection (add to list)
@@ -1777,17 +1803,7 @@ class MessageHandler:
     
     def _send_response(self, message: str) -> None:
         """Send response message to clients"""
-        try:
-            running_loop = asyncio.get_running_loop()
-        except RuntimeError:
-            running_loop = None
-        
-        if running_loop is self.websocket_server.loop:
-            self.websocket_server.loop.create_task(self.websocket_server.broadcast(message))
-        else:
-            asyncio.run_coroutine_threadsafe(
-                self.websocket_server.broadcast(message), self.websocket_server.loop
-            )
+        self.websocket_server.send_event(message)
     
     def _send_settings_save_success(self) -> None:
         """Send settings save success response"""
@@ -1821,6 +1837,7 @@ class MessageHandler:
             for empty_folder in empty_folders:
                 try:
                     empty_folder.rmdir()
+                    self.mod_storage.invalidate(empty_folder)
                     log.info(f"[SkinMonitor] Cleaned up empty skin folder: {empty_folder}")
                 except Exception as e:
                     log.debug(f"[SkinMonitor] Error deleting empty folder {empty_folder}: {e}")
@@ -1850,6 +1867,7 @@ class MessageHandler:
             
             category_folder = self.mod_storage.mods_root / category
             category_folder.mkdir(parents=True, exist_ok=True)
+            self.mod_storage.invalidate(category_folder)
             
             if sys.platform == "win32":
                 os.startfile(str(category_folder))
@@ -2075,6 +2093,7 @@ class MessageHandler:
                 # Create skin folder
                 skin_folder = self.mod_storage.get_skin_dir(skin_id)
                 skin_folder.mkdir(parents=True, exist_ok=True)
+                self.mod_storage.invalidate(skin_folder)
                 
                 # Open folder
                 if sys.platform == "win32":
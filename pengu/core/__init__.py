@@ -7,11 +7,13 @@ Contains core monitor, WebSocket server, and HTTP handler
 
 from .skin_monitor import PenguSkinMonitorThread
 from .websocket_server import WebSocketServer
+from .broadcast_channel import BroadcastChannel
 from .http_handler import HTTPHandler
 
 __all__ = [
     'PenguSkinMonitorThread',
     'WebSocketServer',
+    'BroadcastChannel',
     'HTTPHandler',
 ]
 
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Broadcast Channel
+Coalescing, delta-encoding fan-out from Python to the Pengu plugins
+
+- State topics (skin-state, chroma-state, ...) are coalesced: several updates
+  of a topic published within one tick go out as a single frame with the
+  latest value. Events (responses, phase changes, ...) are never coalesced,
+  and publishing one flushes pending states first so ordering is preserved.
+- Clients that announce delta support ("bridge-hello" with deltas: true) get
+  state frames carrying only the fields that changed since the last frame
+  they received for that topic, numbered with a per-client sequence number.
+  A client that sees a gap sends "bridge-resync" and gets full frames again.
+  Other clients get the full payloads, as before.
+- Every client has its own bounded send queue and writer task, so sends run
+  concurrently; a client whose queue fills up or whose send times out is
+  disconnected instead of stalling the others (the plugin reconnects).
+
+publish_state() / publish_event() may be called from any thread.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from config import PENGU_BROADCAST_TICK_S, PENGU_CLIENT_QUEUE_MAX, PENGU_CLIENT_SEND_TIMEOUT_S
+
+log = logging.getLogger(__name__)
+
+HELLO_TYPE = "bridge-hello"
+RESYNC_TYPE = "bridge-resync"
+
+_MISSING = object()
+
+
+class _Client:
+    """Send queue and delta baseline of one connection"""
+
+    def __init__(self, websocket, queue_max: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_max)
+        self.deltas = False
+        self.known: Dict[str, dict] = {}   # topic -> last payload sent to this client
+        self.seq = 0
+        self.task: Optional[asyncio.Task] = None
+        self.dropped = False
+
+    def state_frame(self, topic: str, payload: dict) -> Optional[str]:
+        """Frame for a state update (None if the client doesn't take deltas and
+        the caller should send the shared full frame)"""
+        if not self.deltas:
+            return None
+        self.seq += 1
+        base = self.known.get(topic)
+        self.known[topic] = payload
+        if base is None:
+            return json.dumps({**payload, "topic": topic, "seq": self.seq})
+        changed = {k: v for k, v in payload.items() if base.get(k, _MISSING) != v}
+        removed = [k for k in base if k not in payload]
+        return json.dumps({
+            "type": payload.get("type"),
+            "topic": topic,
+            "seq": self.seq,
+            "delta": True,
+            "set": changed,
+            "unset": removed,
+        })
+
+
+class BroadcastChannel:
+    """Coalesced, delta-encoded broadcast to all connected plugin clients"""
+
+    def __init__(
+        self,
+        tick_s: float = PENGU_BROADCAST_TICK_S,
+        queue_max: int = PENGU_CLIENT_QUEUE_MAX,
+        send_timeout_s: float = PENGU_CLIENT_SEND_TIMEOUT_S,
+    ):
+        self.tick_s = tick_s
+        self.queue_max = queue_max
+        self.send_timeout_s = send_timeout_s
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: Dict[Any, _Client] = {}
+
+        # Pending items: (topic, payload dict) for states, (None, message str) for events
+        self._pending: List[Tuple[Optional[str], Any]] = []
+        self._pending_index: Dict[str, int] = {}
+        self._last_event_index = -1
+        self._pending_lock = threading.Lock()
+        self._wake_scheduled = False
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._last_flush = 0.0
+
+        self.stats = {"states": 0, "coalesced": 0, "events": 0, "frames": 0, "dropped_clients": 0}
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    # ------------------------------------------------------------------
+    # Connections (event loop thread)
+    # ------------------------------------------------------------------
+
+    def add_client(self, websocket) -> None:
+        client = _Client(websocket, self.queue_max)
+        client.task = asyncio.get_running_loop().create_task(self._writer(client))
+        self._clients[websocket] = client
+
+    def remove_client(self, websocket) -> None:
+        client = self._clients.pop(websocket, None)
+        if client is not None and client.task is not None:
+            client.task.cancel()
+
+    @property
+    def connections(self) -> Set[Any]:
+        return set(self._clients)
+
+    def handle_control(self, websocket, message: str) -> bool:
+        """Consume transport-level messages from a client (True if handled)"""
+        if HELLO_TYPE not in message and RESYNC_TYPE not in message:
+            return False
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            return False
+        message_type = payload.get("type") if isinstance(payload, dict) else None
+        client = self._clients.get(websocket)
+        if message_type == HELLO_TYPE:
+            if client is not None:
+                client.deltas = bool(payload.get("deltas"))
+                client.known.clear()
+                client.seq = 0
+            log.debug("[SkinMonitor] Client %s hello (deltas=%s)", websocket.remote_address, payload.get("deltas"))
+            return True
+        if message_type == RESYNC_TYPE:
+            if client is not None:
+                # Next frame of every topic is sent in full
+                client.known.clear()
+                client.seq = 0
+            log.debug("[SkinMonitor] Client %s requested resync", websocket.remote_address)
+            return True
+        return False
+
+    def close_all(self) -> None:
+        self._flush()
+        for websocket in list(self._clients):
+            self.remove_client(websocket)
+
+    # ------------------------------------------------------------------
+    # Publishing (any thread)
+    # ------------------------------------------------------------------
+
+    def publish_state(self, topic: str, payload: dict) -> None:
+        """Queue the latest value of a state topic (coalesced within a tick)"""
+        with self._pending_lock:
+            self.stats["states"] += 1
+            index = self._pending_index.get(topic)
+            if index is not None and index > self._last_event_index:
+                self._pending[index] = (topic, payload)
+                self.stats["coalesced"] += 1
+                return
+            # New topic, or an event was queued after its pending value: the
+            # old value still goes out before the event, the new one after it
+            self._pending_index[topic] = len(self._pending)
+            self._pending.append((topic, payload))
+            wake = not self._wake_scheduled
+            self._wake_scheduled = True
+        if wake:
+            self._call_soon(self._on_wake)
+
+    def publish_event(self, message: str) -> None:
+        """Queue a message that must reach clients as-is (flushes pending states first)"""
+        with self._pending_lock:
+            self.stats["events"] += 1
+            self._last_event_index = len(self._pending)
+            self._pending.append((None, message))
+            self._wake_scheduled = True
+        # Events go out on the next loop iteration, not the next tick
+        self._call_soon(self._flush_soon)
+
+    # ------------------------------------------------------------------
+    # Flushing (event loop thread)
+    # ------------------------------------------------------------------
+
+    def _call_soon(self, callback) -> None:
+        loop = self._loop
+        try:
+            if loop is not None and not loop.is_closed():
+                loop.call_soon_threadsafe(callback)
+                return
+        except RuntimeError:
+            pass  # Loop shutting down
+        # Nobody to deliver to: don't let pending items pile up
+        with self._pending_lock:
+            self._pending = []
+            self._pending_index = {}
+            self._last_event_index = -1
+            self._wake_scheduled = False
+
+    def _on_wake(self) -> None:
+        """First state of a burst: send now if the last frame is a tick old, else at the tick"""
+        if self._flush_handle is not None:
+            return
+        delay = self._last_flush + self.tick_s - time.monotonic()
+        if delay <= 0:
+            self._flush_soon()
+        else:
+            self._flush_handle = self._loop.call_later(delay, self._flush_soon)
+
+    def _flush_soon(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._flush()
+
+    def _flush(self) -> None:
+        with self._pending_lock:
+            items = self._pending
+            self._pending = []
+            self._pending_index = {}
+            self._last_event_index = -1
+            self._wake_scheduled = False
+        if not items:
+            return
+        self._last_flush = time.monotonic()
+
+        clients = list(self._clients.values())
+        for topic, value in items:
+            if topic is None:
+                for client in clients:
+                    self._enqueue(client, value)
+                continue
+            full_frame = None
+            for client in clients:
+                frame = client.state_frame(topic, value)
+                if frame is None:
+                    if full_frame is None:
+                        full_frame = json.dumps(value)
+                    frame = full_frame
+                self._enqueue(client, frame)
+
+    def _enqueue(self, client: _Client, frame: str) -> None:
+        if client.dropped:
+            return
+        try:
+            client.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self._drop(client, f"send queue full ({self.queue_max} frames)")
+
+    async def _writer(self, client: _Client) -> None:
+        websocket = client.websocket
+        try:
+            while True:
+                frame = await client.queue.get()
+                try:
+                    await asyncio.wait_for(websocket.send(frame), self.send_timeout_s)
+                except asyncio.TimeoutError:
+                    self._drop(client, f"send took over {self.send_timeout_s}s")
+                    return
+                except Exception as e:
+                    log.debug(f"[SkinMonitor] Broadcast failed to client, marking stale: {e}")
+                    self._drop(client, None)
+                    return
+                self.stats["frames"] += 1
+        except asyncio.CancelledError:
+            pass
+
+    def _drop(self, client: _Client, reason: Optional[str]) -> None:
+        """Disconnect a client that can't keep up (the plugin reconnects)"""
+        if client.dropped:
+            return
+        client.dropped = True
+        self._clients.pop(client.websocket, None)
+        if reason:
+            self.stats["dropped_clients"] += 1
+            log.warning("[SkinMonitor] Dropping slow client %s: %s", client.websocket.remote_address, reason)
+        if client.task is not None and client.task is not asyncio.current_task():
+            client.task.cancel()
+        self._loop.create_task(self._close(client.websocket))
+
+    @staticmethod
+    async def _close(websocket) -> None:
+        try:
+            await websocket.close(code=1013, reason="too slow")
+        except Exception as e:
+            log.debug(f"[SkinMonitor] Error closing slow client: {e}")
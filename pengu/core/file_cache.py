@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File Cache
+Bounded in-memory LRU of files served by the Pengu HTTP handler
+
+Entries are keyed by request path and hold the file bytes with a content
+hash ETag and Last-Modified date, so repeat requests are answered from
+memory and browsers revalidating a cached image get a 304. A cached file is
+re-checked against the disk (size and mtime) at most once per revalidation
+window; inside the window it can be served without any file system access.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import PENGU_FILE_CACHE_MAX_ENTRY_MB, PENGU_FILE_CACHE_MAX_MB, PENGU_FILE_CACHE_REVALIDATE_S
+
+
+@dataclass
+class CachedFile:
+    """File contents and validators"""
+    path: Path
+    data: bytes
+    content_type: str
+    etag: str
+    last_modified: str      # HTTP date
+    mtime_ns: int
+    validated_at: float     # time.monotonic() of the last stat
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    def matches(self, request_headers) -> bool:
+        """True if the client's cached copy is current (conditional GET)"""
+        if_none_match = request_headers.get("If-None-Match")
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or any(tag.removeprefix("W/") == self.etag for tag in tags)
+        if_modified_since = request_headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return self.mtime_ns // 1_000_000_000 <= since
+        return False
+
+
+class FileCache:
+    """Thread-safe LRU of CachedFile entries bounded by total size"""
+
+    def __init__(
+        self,
+        max_bytes: int = PENGU_FILE_CACHE_MAX_MB * 1024 * 1024,
+        max_entry_bytes: int = PENGU_FILE_CACHE_MAX_ENTRY_MB * 1024 * 1024,
+        revalidate_s: float = PENGU_FILE_CACHE_REVALIDATE_S,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.revalidate_s = revalidate_s
+        self._entries: "OrderedDict[str, CachedFile]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "revalidated": 0, "reads": 0, "evictions": 0}
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def peek(self, key: str) -> Optional[CachedFile]:
+        """Entry for *key* if it was validated recently (no disk access)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry.validated_at > self.revalidate_s:
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry
+
+    def contains(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str, path: Path, content_type: str) -> Optional[CachedFile]:
+        """Entry for *key*, read from *path* if missing or changed on disk
+
+        Returns None if the file doesn't exist (or can't be read). Files over
+        max_entry_bytes are returned without being cached.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.discard(key)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.path == path and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                entry.validated_at = time.monotonic()
+                self._entries.move_to_end(key)
+                self.stats["revalidated"] += 1
+                return entry
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.discard(key)
+            return None
+
+        entry = CachedFile(
+            path=path,
+            data=data,
+            content_type=content_type,
+            etag='"%s"' % hashlib.blake2b(data, digest_size=12).hexdigest(),
+            last_modified=formatdate(st.st_mtime, usegmt=True),
+            mtime_ns=st.st_mtime_ns,
+            validated_at=time.monotonic(),
+        )
+        with self._lock:
+            self.stats["reads"] += 1
+            self._remove_locked(key)
+            if entry.size <= self.max_entry_bytes:
+                self._entries[key] = entry
+                self._bytes += entry.size
+                while self._bytes > self.max_bytes and self._entries:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= evicted.size
+                    self.stats["evictions"] += 1
+        return entry
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._remove_locked(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove_locked(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
@@ -3,17 +3,42 @@
 """
 HTTP Request Handler
 Handles HTTP requests for previews, assets, and plugin files
+
+File responses come from an in-memory FileCache and carry ETag and
+Last-Modified headers, so revalidation requests get a 304. Requests that
+need the disk are answered on a small thread pool instead of the
+WebSocket event loop.
 """
 
+import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from pathlib import Path
 from urllib.parse import urlparse, unquote
 
+from config import PENGU_PREVIEW_PREWARM
 from utils.core.paths import get_skins_dir, get_asset_path, get_state_dir
 
+from .file_cache import CachedFile, FileCache
+
 log = logging.getLogger(__name__)
 
+CONTENT_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".ttf": "font/ttf",
+    ".ogg": "audio/ogg",
+    ".js": "application/javascript",
+    ".css": "text/css",
+}
+
+# Requests answered from files (everything else, including the WebSocket
+# upgrade, is handled inline on the event loop)
+FILE_PREFIXES = ("/preview/", "/asset/", "/plugin/", "/bridge-port")
+
 
 class HTTPHandler:
     """Handles HTTP requests for file serving
@@ -31,6 +56,10 @@ class HTTPHandler:
             port: Server port for constructing URLs
         """
         self.port = port
+        self.file_cache = FileCache()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="PenguHTTP")
+        self._prewarmed_champion: Optional[int] = None
+        self._prewarm_lock = threading.Lock()
 
     def _is_safe_path(self, base_dir: Path, requested_path: Path) -> bool:
         """Validate that requested_path is safely within base_dir.
@@ -51,6 +80,27 @@ class HTTPHandler:
         except (OSError, ValueError):
             return False
     
+    async def handle_request_async(self, path: str, request_headers: dict) -> Optional[tuple]:
+        """Process HTTP requests without blocking the event loop
+
+        Recently validated cached files are served straight from memory;
+        anything else that touches the disk runs on the handler's thread pool.
+        """
+        path_clean = unquote(urlparse(path).path)
+        if not path_clean.startswith(FILE_PREFIXES):
+            return self.handle_request(path, request_headers)
+
+        entry = self.file_cache.peek(path_clean)
+        if entry is not None:
+            return self._file_response(entry, request_headers)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, self.handle_request, path, request_headers)
+        except RuntimeError:
+            # Executor shut down
+            return (503, {"Access-Control-Allow-Origin": "*"}, b"Service Unavailable")
+
     def handle_request(self, path: str, request_headers: dict) -> Optional[tuple]:
         """Process HTTP requests
         
@@ -98,15 +148,15 @@ class HTTPHandler:
             
             # Handle preview requests
             if path_clean.startswith("/preview/"):
-                return self._handle_preview_request(path_clean)
+                return self._handle_preview_request(path_clean, request_headers)
             
             # Handle asset requests
             elif path_clean.startswith("/asset/"):
-                return self._handle_asset_request(path_clean)
+                return self._handle_asset_request(path_clean, request_headers)
             
             # Handle plugin file requests
             elif path_clean.startswith("/plugin/"):
-                return self._handle_plugin_request(path_clean)
+                return self._handle_plugin_request(path_clean, request_headers)
             
             # Return None to let WebSocket handshake proceed
             return None
@@ -118,7 +168,7 @@ class HTTPHandler:
                 b"Internal Server Error"
             )
     
-    def _handle_preview_request(self, path_clean: str) -> Optional[tuple]:
+    def _handle_preview_request(self, path_clean: str, request_headers: dict) -> Optional[tuple]:
         """Handle preview image requests"""
         parts = path_clean.replace("/preview/", "").split("/")
         if len(parts) >= 4:
@@ -140,44 +190,25 @@ class HTTPHandler:
                 log.warning(f"[SkinMonitor] Blocked path traversal attempt: {path_clean}")
                 return (403, {"Access-Control-Allow-Origin": "*"}, b"Forbidden")
 
-            if file_path.exists():
+            entry = self.file_cache.get(path_clean, file_path, "image/png")
+            if entry is not None:
                 log.debug(f"[SkinMonitor] Serving preview: {file_path}")
-                with open(file_path, "rb") as f:
-                    file_data = f.read()
-                return (
-                    200,
-                    {
-                        "Content-Type": "image/png",
-                        "Access-Control-Allow-Origin": "*",
-                        "Cache-Control": "public, max-age=3600"
-                    },
-                    file_data
-                )
+                return self._file_response(entry, request_headers)
         return None
     
-    def _handle_asset_request(self, path_clean: str) -> Optional[tuple]:
+    def _handle_asset_request(self, path_clean: str, request_headers: dict) -> Optional[tuple]:
         """Handle asset file requests"""
         asset_path = path_clean.replace("/asset/", "")
         asset_file = get_asset_path(asset_path)
         
-        if asset_file and asset_file.exists():
-            log.debug(f"[SkinMonitor] Serving asset: {asset_file}")
-            content_type = self._get_content_type(asset_file)
-            
-            with open(asset_file, "rb") as f:
-                file_data = f.read()
-            return (
-                200,
-                {
-                    "Content-Type": content_type,
-                    "Access-Control-Allow-Origin": "*",
-                    "Cache-Control": "public, max-age=3600"
-                },
-                file_data
-            )
+        if asset_file:
+            entry = self.file_cache.get(path_clean, asset_file, self._get_content_type(asset_file))
+            if entry is not None:
+                log.debug(f"[SkinMonitor] Serving asset: {asset_file}")
+                return self._file_response(entry, request_headers)
         return None
     
-    def _handle_plugin_request(self, path_clean: str) -> Optional[tuple]:
+    def _handle_plugin_request(self, path_clean: str, request_headers: dict) -> Optional[tuple]:
         """Handle plugin file requests"""
         plugin_path = path_clean.replace("/plugin/", "")
         parts = plugin_path.split("/", 1)
@@ -198,21 +229,10 @@ class HTTPHandler:
                         log.warning(f"[SkinMonitor] Blocked path traversal attempt: {path_clean}")
                         return (403, {"Access-Control-Allow-Origin": "*"}, b"Forbidden")
 
-                    if file_path.exists():
+                    entry = self.file_cache.get(path_clean, file_path, self._get_content_type(file_path))
+                    if entry is not None:
                         log.debug(f"[SkinMonitor] Serving plugin file: {file_path}")
-                        content_type = self._get_content_type(file_path)
-                        
-                        with open(file_path, "rb") as f:
-                            file_data = f.read()
-                        return (
-                            200,
-                            {
-                                "Content-Type": content_type,
-                                "Access-Control-Allow-Origin": "*",
-                                "Cache-Control": "public, max-age=3600"
-                            },
-                            file_data
-                        )
+                        return self._file_response(entry, request_headers)
                     else:
                         log.info(f"[SkinMonitor] Plugin file not found: {file_path} (plugins_dir: {plugins_dir}, plugin_name: {plugin_name}, file_name: {file_name})")
                 else:
@@ -223,17 +243,78 @@ class HTTPHandler:
             log.info(f"[SkinMonitor] Invalid plugin path format: {path_clean} (parts: {parts})")
         return None
     
+    def _file_response(self, entry: CachedFile, request_headers) -> tuple:
+        """200 with the file, or 304 if the client's copy is current"""
+        headers = {
+            "Content-Type": entry.content_type,
+            "Access-Control-Allow-Origin": "*",
+            "Cache-Control": "public, max-age=3600",
+            "ETag": entry.etag,
+            "Last-Modified": entry.last_modified,
+        }
+        if entry.matches(request_headers):
+            del headers["Content-Type"]
+            return (304, headers, b"")
+        return (200, headers, entry.data)
+    
     def _get_content_type(self, file_path: Path) -> str:
         """Determine content type from file extension"""
-        suffix = file_path.suffix.lower()
-        content_types = {
-            ".png": "image/png",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".ttf": "font/ttf",
-            ".ogg": "audio/ogg",
-            ".js": "application/javascript",
-            ".css": "text/css",
-        }
-        return content_types.get(suffix, "application/octet-stream")
+        return CONTENT_TYPES.get(file_path.suffix.lower(), "application/octet-stream")
+    
+    def prewarm_previews(self, champion_id: Optional[int]) -> None:
+        """Load a champion's skin and chroma previews into the cache in the background"""
+        if not PENGU_PREVIEW_PREWARM or champion_id is None:
+            return
+        with self._prewarm_lock:
+            if self._prewarmed_champion == champion_id:
+                return
+            self._prewarmed_champion = champion_id
+        try:
+            self._executor.submit(self._prewarm_previews, champion_id)
+        except RuntimeError:
+            pass  # Shutting down
+    
+    def _prewarm_previews(self, champion_id: int) -> None:
+        champion_dir = get_skins_dir() / str(champion_id)
+        if not champion_dir.is_dir():
+            return
+        # Leave room for previews of other champions and the plugin's own files
+        budget = self.file_cache.max_bytes // 2
+        loaded = 0
+        loaded_bytes = 0
+        try:
+            for skin_dir in sorted(champion_dir.iterdir()):
+                if not skin_dir.name.isdigit() or not skin_dir.is_dir():
+                    continue
+                skin_id = skin_dir.name
+                previews = [(skin_id, skin_dir / f"{skin_id}.png")]
+                previews += [
+                    (chroma_dir.name, chroma_dir / f"{chroma_dir.name}.png")
+                    for chroma_dir in skin_dir.iterdir()
+                    if chroma_dir.name.isdigit() and chroma_dir.is_dir()
+                ]
+                for chroma_id, file_path in previews:
+                    # Same key as the URL the message handler hands out
+                    key = f"/preview/{champion_id}/{skin_id}/{chroma_id}/{chroma_id}.png"
+                    if self.file_cache.contains(key):
+                        continue
+                    entry = self.file_cache.get(key, file_path, "image/png")
+                    if entry is None:
+                        continue
+                    loaded += 1
+                    loaded_bytes += entry.size
+                    if loaded_bytes >= budget:
+                        log.debug(f"[SkinMonitor] Preview prewarm for champion {champion_id} stopped at the cache budget")
+                        return
+        except OSError as e:
+            log.debug(f"[SkinMonitor] Preview prewarm for champion {champion_id} failed: {e}")
+            return
+        finally:
+            if loaded:
+                log.debug(f"[SkinMonitor] Prewarmed {loaded} previews for champion {champion_id} ({loaded_bytes // 1024} KB)")
+    
+    def shutdown(self) -> None:
+        """Stop the file reader threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.file_cache.clear()
 
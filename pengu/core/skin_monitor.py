@@ -82,7 +82,7 @@ class PenguSkinMonitorThread(threading.Thread):
             host=self.host,
             port=self.port,
             message_handler=self._handle_message,
-            http_handler=self.http_handler.handle_request,
+            http_handler=self.http_handler.handle_request_async,
         )
         
         # Initialize broadcaster
@@ -111,6 +111,9 @@ class PenguSkinMonitorThread(threading.Thread):
     def stop(self) -> None:
         """Stop the server"""
         self.websocket_server.stop()
+        self.message_handler.shutdown()
+        self.http_handler.shutdown()
+        log.debug("[SkinMonitor] Handler latency by message type: %s", self.message_handler.dispatch_stats())
         # Clean up port file on shutdown
         delete_bridge_port_file()
 
@@ -162,6 +165,9 @@ class PenguSkinMonitorThread(threading.Thread):
     def _broadcast_champion_locked(self, locked: bool) -> None:
         """Broadcast champion lock state (delegates to broadcaster)"""
         self.broadcaster.broadcast_champion_locked(locked)
+        if locked:
+            # Plugins ask for the champion's previews right after the lock
+            self.http_handler.prewarm_previews(getattr(self.shared_state, "locked_champ_id", None))
     
     def _broadcast_random_mode_state(self) -> None:
         """Broadcast random mode state (delegates to broadcaster)"""
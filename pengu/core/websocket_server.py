@@ -6,12 +6,15 @@ Handles WebSocket server lifecycle and connection management
 """
 
 import asyncio
+import inspect
 import logging
 import threading
-from typing import Optional, Set, Callable
+from typing import Any, Optional, Set, Callable
 from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
 from websockets.server import WebSocketServerProtocol, serve
 
+from .broadcast_channel import BroadcastChannel
+
 log = logging.getLogger(__name__)
 
 # Suppress websockets library DEBUG logs
@@ -27,7 +30,7 @@ class WebSocketServer:
         host: str = "127.0.0.1",
         port: Optional[int] = None,
         message_handler: Optional[Callable[[str], None]] = None,
-        http_handler: Optional[Callable[[str, dict], Optional[tuple]]] = None,
+        http_handler: Optional[Callable[[str, dict], Any]] = None,
     ):
         """Initialize WebSocket server
         
@@ -35,7 +38,7 @@ class WebSocketServer:
             host: Server host address
             port: Server port (will find free port if None)
             message_handler: Callback for handling WebSocket messages
-            http_handler: Callback for handling HTTP requests
+            http_handler: Callback for handling HTTP requests (may be a coroutine function)
         """
         self.host = host
         self.port = port or 50000  # Default port if not specified (high port range like LCU)
@@ -45,7 +48,7 @@ class WebSocketServer:
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._server = None
         self._shutdown_event: Optional[asyncio.Event] = None
-        self._connections: Set[WebSocketServerProtocol] = set()
+        self.channel = BroadcastChannel()
         self._stop_event = threading.Event()
         self.ready_event = threading.Event()
     
@@ -54,6 +57,7 @@ class WebSocketServer:
         self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
         self._shutdown_event = asyncio.Event()
+        self.channel.attach(self._loop)
         
         try:
             # Create server that handles both HTTP and WebSocket
@@ -87,14 +91,14 @@ class WebSocketServer:
     
     async def _shutdown(self) -> None:
         """Shutdown server and close all connections"""
-        for ws in list(self._connections):
+        connections = list(self.channel.connections)
+        self.channel.close_all()
+        for ws in connections:
             try:
                 await ws.close()
             except Exception as e:
                 log.debug(f"[SkinMonitor] Error closing connection during shutdown: {e}")
         
-        self._connections.clear()
-        
         if self._server is not None:
             self._server.close()
             try:
@@ -123,9 +127,11 @@ class WebSocketServer:
         """Handle WebSocket connection"""
         client = websocket.remote_address
         log.info("[SkinMonitor] Client connected: %s", client)
-        self._connections.add(websocket)
+        self.channel.add_client(websocket)
         try:
             async for message in websocket:
+                if self.channel.handle_control(websocket, message):
+                    continue
                 if self.message_handler:
                     self.message_handler(message)
         except (ConnectionClosedError, ConnectionClosedOK):
@@ -135,30 +141,33 @@ class WebSocketServer:
                 "[SkinMonitor] Error handling client %s: %s", client, exc
             )
         finally:
-            self._connections.discard(websocket)
+            self.channel.remove_client(websocket)
     
     async def _process_http_request(self, path: str, request_headers) -> Optional[tuple]:
         """Process HTTP requests (delegates to http_handler)"""
         if self.http_handler:
-            return self.http_handler(path, request_headers)
+            response = self.http_handler(path, request_headers)
+            if inspect.isawaitable(response):
+                response = await response
+            return response
         return None
     
+    def publish_state(self, topic: str, payload: dict) -> None:
+        """Publish the latest value of a state topic (coalesced, thread-safe)"""
+        self.channel.publish_state(topic, payload)
+    
+    def send_event(self, message: str) -> None:
+        """Send a message to all clients as-is, in order (thread-safe)"""
+        self.channel.publish_event(message)
+    
     async def broadcast(self, message: str) -> None:
         """Broadcast message to all connected clients"""
-        stale: list[WebSocketServerProtocol] = []
-        for ws in list(self._connections):
-            try:
-                await ws.send(message)
-            except Exception as e:
-                log.debug(f"[SkinMonitor] Broadcast failed to client, marking stale: {e}")
-                stale.append(ws)
-        for ws in stale:
-            self._connections.discard(ws)
+        self.channel.publish_event(message)
     
     @property
     def connections(self) -> Set[WebSocketServerProtocol]:
         """Get set of active connections"""
-        return self._connections
+        return self.channel.connections
     
     @property
     def loop(self) -> Optional[asyncio.AbstractEventLoop]:
@@ -10,6 +10,7 @@ import logging
 from typing import Optional
 from pathlib import Path
 
+from utils.core.normalization import NameIndex
 from utils.core.paths import get_user_data_dir
 
 log = logging.getLogger(__name__)
@@ -28,6 +29,7 @@ class SkinMapping:
         self.skin_id_mapping: dict[str, int] = {}
         self.skin_id_name_mapping: dict[int, str] = {}  # Normalized (lowercase) names for backward compatibility
         self.skin_id_original_name_mapping: dict[int, str] = {}  # Original names with proper case
+        self.name_index: Optional[NameIndex] = None  # Partial-match index over skin_id_mapping
         self.skin_mapping_loaded = False
     
     def load_mapping(self) -> bool:
@@ -79,6 +81,7 @@ class SkinMapping:
                 self.skin_id_name_mapping[skin_id] = normalized
                 self.skin_id_original_name_mapping[skin_id] = original_name  # Store original case
         
+        self.name_index = NameIndex((skin_id, name) for name, skin_id in self.skin_id_mapping.items())
         self.skin_mapping_loaded = True
         log.info(
             "[SkinMonitor] Loaded %s skin mappings for '%s'",
@@ -104,12 +107,9 @@ class SkinMapping:
         if normalized in self.skin_id_mapping:
             return self.skin_id_mapping[normalized]
         
-        # Try partial matching
-        for mapped_name, skin_id in self.skin_id_mapping.items():
-            if normalized in mapped_name or mapped_name in normalized:
-                return skin_id
-        
-        return None
+        # Try partial matching (first mapped name containing, or contained in, the query)
+        match = self.name_index.containing(normalized) if self.name_index else None
+        return match[0] if match else None
     def find_skin_name_by_skin_id(self, skin_id: int) -> Optional[str]:
         """Find skin name by id using mapping
 
@@ -136,4 +136,5 @@ class SkinMapping:
         self.skin_mapping_loaded = False
         self.skin_id_mapping.clear()
         self.skin_id_original_name_mapping.clear()
+        self.name_index = None
 
@@ -0,0 +1,50 @@
+"""
+Shared pytest setup: run the tests against the source tree, and serve local
+HTTP stand-ins for the remote hosts the code talks to.
+"""
+
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Base for stand-in request handlers; the test's state object is self.stand_in"""
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def stand_in(self):
+        return self.server.stand_in
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def serve_http():
+    """serve_http(handler_cls, stand_in): run a local HTTP server on a free port
+
+    Sets stand_in.base to the server's http://127.0.0.1:<port> and returns
+    stand_in. Servers are shut down when the test ends.
+    """
+    servers = []
+
+    def serve(handler_cls, stand_in):
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler_cls)
+        httpd.stand_in = stand_in
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        servers.append(httpd)
+        stand_in.base = f"http://127.0.0.1:{httpd.server_address[1]}"
+        return stand_in
+
+    yield serve
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
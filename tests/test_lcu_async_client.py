@@ -0,0 +1,216 @@
+"""
+AsyncLCUClient / LCUAPI against a local HTTPS stand-in for the LCU:
+single-flight coalescing, keep-alive reuse, chunked bodies and cache
+invalidation around writes.
+"""
+
+import json
+import shutil
+import ssl
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+import urllib3
+
+from lcu.core.async_client import LCUHttpClient
+from lcu.core.lcu_api import LCUAPI
+
+PASSWORD = "stand-in-password"
+
+
+class StandInLCU(ThreadingHTTPServer):
+    """Tiny HTTPS server speaking just enough of the LCU API"""
+
+    daemon_threads = True
+
+    def __init__(self, cert_file, key_file):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_file, key_file)
+        self.socket = context.wrap_socket(self.socket, server_side=True)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.hits = {}
+        self.value = {"phase": "Lobby"}
+        self.get_delay_s = 0.0
+        self.put_delay_s = 0.0
+
+    def get_request(self):
+        request = super().get_request()
+        with self.lock:
+            self.connections += 1
+        return request
+
+    def count(self, path):
+        with self.lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload, chunked=False):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(0, len(body), 7):
+                piece = body[i:i + 7]
+                self.wfile.write(f"{len(piece):x};ext=1\r\n".encode("ascii") + piece + b"\r\n")
+            self.wfile.write(b"0\r\nX-Trailer: yes\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        server.count(self.path)
+        if self.headers.get("Authorization") is None:
+            self.send_response(401)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path == "/state":
+            with server.lock:
+                value = dict(server.value)
+            time.sleep(server.get_delay_s)
+            self._send_json(value)
+        elif self.path == "/chunked":
+            self._send_json({"items": list(range(50))}, chunked=True)
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def do_PUT(self):
+        server = self.server
+        server.count(f"PUT {self.path}")
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(server.put_delay_s)
+        with server.lock:
+            server.value = json.loads(body)
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class FakeConnection:
+    """Stand-in for LCUConnection"""
+
+    def __init__(self, port):
+        self.port = port
+        self.pw = PASSWORD
+        self.ok = True
+        self.base = f"https://127.0.0.1:{port}"
+        self.session = requests.Session()
+        self.session.verify = False
+        self.session.trust_env = False  # A CA bundle from the environment would override verify
+        self.session.auth = ("riot", PASSWORD)
+
+    def refresh_if_needed(self, force=False):
+        pass
+
+
+@pytest.fixture(scope="module")
+def certificate(tmp_path_factory):
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        pytest.skip("openssl is needed to create the stand-in certificate")
+    directory = tmp_path_factory.mktemp("cert")
+    cert_file, key_file = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        [openssl, "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", str(key_file), "-out", str(cert_file)],
+        check=True, capture_output=True,
+    )
+    return cert_file, key_file
+
+
+@pytest.fixture
+def lcu_server(certificate):
+    server = StandInLCU(*certificate)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http(lcu_server):
+    client = LCUHttpClient(FakeConnection(lcu_server.server_address[1]), pool_size=4, cache_ttl_s=0.0)
+    yield client
+    client.close()
+
+
+def test_get_decodes_json_and_404_is_none(http):
+    assert http.get("/state") == {"phase": "Lobby"}
+    assert http.get("/missing") is None
+
+
+def test_keep_alive_reuses_one_connection(http, lcu_server):
+    for _ in range(20):
+        assert http.get("/state") == {"phase": "Lobby"}
+    assert lcu_server.hits["/state"] == 20
+    assert lcu_server.connections == 1
+
+
+def test_identical_concurrent_gets_are_coalesced(http, lcu_server):
+    lcu_server.get_delay_s = 0.2
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(http.get("/state", timeout=2.0))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [{"phase": "Lobby"}] * 8
+    assert lcu_server.hits["/state"] == 1
+    assert http.stats()["/state"]["coalesced"] == 7
+
+
+def test_chunked_body_with_extensions_and_trailers(http, lcu_server):
+    assert http.get("/chunked") == {"items": list(range(50))}
+    # The connection is still usable after the trailer
+    assert http.get("/state") == {"phase": "Lobby"}
+    assert lcu_server.connections == 1
+
+
+def test_micro_cache_and_invalidate(lcu_server):
+    client = LCUHttpClient(FakeConnection(lcu_server.server_address[1]), cache_ttl_s=10.0)
+    try:
+        client.get("/state")
+        client.get("/state")
+        assert lcu_server.hits["/state"] == 1
+        client.invalidate()
+        client.get("/state")
+        assert lcu_server.hits["/state"] == 2
+    finally:
+        client.close()
+
+
+def test_get_racing_a_put_does_not_stay_cached(lcu_server):
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    api = LCUAPI(FakeConnection(lcu_server.server_address[1]))
+    api.http.client.cache_ttl_s = 10.0
+    try:
+        lcu_server.put_delay_s = 0.3
+        writer = threading.Thread(target=api.put, args=("/state", {"phase": "ChampSelect"}, 2.0))
+        writer.start()
+        time.sleep(0.1)
+        # Reads the pre-write state while the PUT is in flight
+        assert api.get("/state") == {"phase": "Lobby"}
+        writer.join()
+
+        assert api.get("/state") == {"phase": "ChampSelect"}
+    finally:
+        api.http.close()
@@ -0,0 +1,75 @@
+"""
+NameIndex against the scans it replaced: closest() must match a nested
+levenshtein_distance scan (result and tie-breaking), containing() the first
+mapped name containing or contained in the query.
+"""
+
+import random
+
+from utils.core.normalization import NameIndex, levenshtein_distance
+
+ALPHABET = "abcde fgh"
+
+
+def brute_closest(names, queries):
+    best = None
+    for index, name in enumerate(names):
+        for query in queries:
+            distance = levenshtein_distance(query, name)
+            if best is None or distance < best[0]:
+                max_len = max(len(query), len(name))
+                similarity = 1.0 - (distance / max_len) if max_len > 0 else 0.0
+                best = (distance, index, name, similarity)
+    return None if best is None else (best[1], best[2], best[3])
+
+
+def brute_containing(names, query):
+    for index, name in enumerate(names):
+        if query in name or name in query:
+            return (index, name)
+    return None
+
+
+def random_text(rng, low, high):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(low, high)))
+
+
+def mutate(rng, text):
+    chars = list(text)
+    for _ in range(rng.randint(0, 3)):
+        op = rng.randrange(3)
+        pos = rng.randrange(len(chars) + 1)
+        if op == 0:
+            chars.insert(pos, rng.choice(ALPHABET))
+        elif chars and pos < len(chars):
+            if op == 1:
+                del chars[pos]
+            else:
+                chars[pos] = rng.choice(ALPHABET)
+    return "".join(chars)
+
+
+def test_closest_matches_nested_scan():
+    rng = random.Random(17)
+    for _ in range(400):
+        names = [random_text(rng, 0, 14) for _ in range(rng.randint(1, 40))]
+        index = NameIndex(enumerate(names))
+        for _ in range(5):
+            queries = [mutate(rng, rng.choice(names)) if rng.random() < 0.7 else random_text(rng, 0, 14)]
+            if rng.random() < 0.5:
+                queries.append(queries[0][:-2])
+            assert index.closest(queries) == brute_closest(names, queries)
+
+
+def test_containing_matches_linear_scan():
+    rng = random.Random(23)
+    for _ in range(300):
+        names = [random_text(rng, 1, 10) for _ in range(rng.randint(1, 40))]
+        index = NameIndex(enumerate(names))
+        for _ in range(5):
+            query = mutate(rng, rng.choice(names)) if rng.random() < 0.7 else random_text(rng, 1, 16)
+            assert index.containing(query) == brute_containing(names, query)
+
+
+def test_closest_on_empty_index():
+    assert NameIndex([]).closest(["anything"]) is None
@@ -0,0 +1,96 @@
+"""
+ProcessWatcher on Linux with a renamed dummy process: appear/exit callbacks
+and find().
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from utils.system.process_watcher import PSUTIL_AVAILABLE, ProcessWatcher
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux") or not PSUTIL_AVAILABLE,
+    reason="spawns a renamed dummy process via a symlinked interpreter (Linux, psutil)",
+)
+
+
+@pytest.fixture
+def dummy_name(tmp_path):
+    # The kernel names the process after the file it exec'd (max 15 chars)
+    name = f"rosedummy{os.getpid() % 100000}"
+    link = tmp_path / name
+    link.symlink_to(sys.executable)
+    return name, str(link)
+
+
+def spawn(executable):
+    return subprocess.Popen([executable, "-c", "import time; time.sleep(30)"])
+
+
+def test_appear_and_exit_callbacks(dummy_name):
+    name, executable = dummy_name
+    watcher = ProcessWatcher(interval_s=0.005)
+    appeared, exited = [], []
+    appeared_event, exited_event = threading.Event(), threading.Event()
+
+    def on_appear(info):
+        appeared.append(info)
+        appeared_event.set()
+
+    def on_exit(info):
+        exited.append(info)
+        exited_event.set()
+
+    unsubscribe = watcher.subscribe([name.upper()], on_appear=on_appear, on_exit=on_exit)
+    proc = spawn(executable)
+    try:
+        assert appeared_event.wait(5.0)
+        assert [info.pid for info in appeared] == [proc.pid]
+        assert appeared[0].name == name
+
+        found = watcher.find(name)
+        assert [info.pid for info in found] == [proc.pid]
+        assert watcher.is_running(name.upper())
+        assert watcher.exe_of(found[0]) == os.path.realpath(sys.executable)
+    finally:
+        proc.kill()
+        proc.wait()
+
+    assert exited_event.wait(5.0)
+    assert [info.pid for info in exited] == [proc.pid]
+    unsubscribe()
+    assert not watcher.is_running(name)
+
+
+def test_replay_reports_already_running_process(dummy_name):
+    name, executable = dummy_name
+    watcher = ProcessWatcher(interval_s=0.005)
+    proc = spawn(executable)
+    try:
+        # Wait until the child has exec'd and carries its own name
+        for _ in range(500):
+            if watcher.find(name):
+                break
+            threading.Event().wait(0.01)
+        replayed = []
+        unsubscribe = watcher.subscribe([name], on_appear=replayed.append, replay=True)
+        unsubscribe()
+        assert [info.pid for info in replayed] == [proc.pid]
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_unsubscribing_stops_the_thread(dummy_name):
+    name, _executable = dummy_name
+    watcher = ProcessWatcher(interval_s=0.005)
+    unsubscribe = watcher.subscribe([name], on_appear=lambda info: None)
+    thread = watcher._thread
+    assert thread is not None and thread.is_alive()
+    unsubscribe()
+    thread.join(1.0)
+    assert not thread.is_alive()
@@ -0,0 +1,54 @@
+"""
+RepoDownloader.stream_and_extract_skins releases its streamed response on
+every early exit (fallback to download + extract, HTTP errors).
+"""
+
+import requests
+
+from utils.download.repo_downloader import RepoDownloader
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, status_code: int = 200):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {"Content-Length": str(len(body))}
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, response: FakeResponse):
+        self.response = response
+
+    def get(self, url, **kwargs):
+        return self.response
+
+
+def make_downloader(tmp_path, response):
+    downloader = RepoDownloader(target_dir=tmp_path / "skins")
+    downloader.session = FakeSession(response)
+    return downloader
+
+
+def test_response_closed_when_falling_back(tmp_path):
+    # Not a local file header: the streaming reader gives up, the caller falls back
+    response = FakeResponse(b"not a zip archive" * 100)
+    assert make_downloader(tmp_path, response).stream_and_extract_skins() is None
+    assert response.closed
+
+
+def test_response_closed_on_http_error(tmp_path):
+    response = FakeResponse(b"", status_code=503)
+    assert make_downloader(tmp_path, response).stream_and_extract_skins() is False
+    assert response.closed
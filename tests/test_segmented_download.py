@@ -0,0 +1,153 @@
+"""
+SegmentedDownloader against a local HTTP stand-in: range splitting, journal
+resume and the single-stream fallback when the server ignores Range.
+"""
+
+import os
+import re
+import threading
+
+import pytest
+import requests
+
+from conftest import StandInHandler
+from utils.download import segmented_download
+from utils.download.segmented_download import (
+    DownloadError,
+    SegmentedDownloader,
+    probe_remote,
+)
+
+PAYLOAD = os.urandom(3 * 1024 * 1024 + 12345)
+RANGE_RE = re.compile(r"bytes=(\d+)-(\d+)?")
+
+
+class StandIn:
+    """State shared with the request handler"""
+
+    def __init__(self):
+        self.honour_ranges = True
+        self.cut_after = None  # Serve at most this many bytes past the offset, then drop the connection
+        self.lock = threading.Lock()
+        self.requests = []  # (range header or None, bytes served)
+
+
+class Handler(StandInHandler):
+    def do_GET(self):
+        stand_in = self.stand_in
+        header = self.headers.get("Range")
+        match = RANGE_RE.match(header or "")
+        if match and stand_in.honour_ranges:
+            start = int(match.group(1))
+            end = int(match.group(2)) + 1 if match.group(2) else len(PAYLOAD)
+            end = min(end, len(PAYLOAD))
+            body = PAYLOAD[start:end]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end - 1}/{len(PAYLOAD)}")
+        else:
+            start = 0
+            body = PAYLOAD
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.send_header("Accept-Ranges", "bytes" if stand_in.honour_ranges else "none")
+        self.end_headers()
+
+        served = body
+        if stand_in.cut_after is not None and len(body) > 1 and start + len(body) > stand_in.cut_after:
+            served = body[:max(0, stand_in.cut_after - start)]
+            self.close_connection = True
+        # Logged before the body goes out, so the client never sees a response the log doesn't
+        with stand_in.lock:
+            stand_in.requests.append((header, len(served)))
+        try:
+            self.wfile.write(served)
+        except OSError:
+            pass
+
+
+@pytest.fixture
+def server(serve_http):
+    stand_in = serve_http(Handler, StandIn())
+    stand_in.url = f"{stand_in.base}/main.zip"
+    return stand_in
+
+
+@pytest.fixture(autouse=True)
+def small_segments(monkeypatch):
+    # Keep segments small so a few MB are split across several requests
+    monkeypatch.setattr(segmented_download, "INITIAL_SEGMENT_BYTES", 512 * 1024)
+    monkeypatch.setattr(segmented_download, "MAX_SEGMENT_BYTES", 512 * 1024)
+    monkeypatch.setattr(segmented_download, "JOURNAL_SAVE_INTERVAL_S", 0.0)
+
+
+def test_probe_reports_size_and_range_support(server):
+    with requests.Session() as session:
+        info = probe_remote(session, server.url)
+    assert info.accepts_ranges
+    assert info.size == len(PAYLOAD)
+    assert info.etag == '"v1"'
+
+
+def test_download_is_split_into_ranges(server, tmp_path):
+    dest = tmp_path / "repo.zip"
+    with requests.Session() as session:
+        SegmentedDownloader(session, server.url, dest, connections=3).download()
+
+    assert dest.read_bytes() == PAYLOAD
+    assert not (tmp_path / "repo.zip.journal").exists()
+    ranged = [h for h, _ in server.requests if h and h != "bytes=0-0"]
+    assert len(ranged) >= len(PAYLOAD) // (512 * 1024)
+
+
+def test_reuses_a_probe_from_the_caller(server, tmp_path):
+    with requests.Session() as session:
+        info = probe_remote(session, server.url)
+        server.requests.clear()
+        SegmentedDownloader(session, server.url, tmp_path / "repo.zip", connections=2, remote_info=info).download()
+    assert all(h != "bytes=0-0" for h, _ in server.requests)
+
+
+def test_interrupted_download_resumes_from_journal(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(segmented_download.time, "sleep", lambda _s: None)
+    dest = tmp_path / "repo.zip"
+    half = len(PAYLOAD) // 2
+    server.cut_after = half
+
+    with requests.Session() as session:
+        with pytest.raises(DownloadError):
+            SegmentedDownloader(session, server.url, dest, connections=2).download()
+    assert (tmp_path / "repo.zip.journal").exists()
+
+    server.cut_after = None
+    server.requests.clear()
+    with requests.Session() as session:
+        SegmentedDownloader(session, server.url, dest, connections=2).download()
+
+    assert dest.read_bytes() == PAYLOAD
+    assert not (tmp_path / "repo.zip.journal").exists()
+    # Only the missing tail was fetched again (give or take the partial
+    # block each dropped connection had buffered)
+    refetched = sum(n for h, n in server.requests if h != "bytes=0-0")
+    assert refetched <= len(PAYLOAD) - half + 2 * segmented_download.WRITE_BLOCK
+
+
+def test_falls_back_to_single_stream_when_ranges_are_ignored(server, tmp_path):
+    server.honour_ranges = False
+    dest = tmp_path / "repo.zip"
+    with requests.Session() as session:
+        SegmentedDownloader(session, server.url, dest, connections=4).download()
+
+    assert dest.read_bytes() == PAYLOAD
+    full_bodies = [n for h, n in server.requests if n == len(PAYLOAD)]
+    # The probe was answered with the whole body, then one plain GET fetched it
+    assert len(server.requests) == 2
+    assert len(full_bodies) >= 1
+
+
+def test_checksum_mismatch_discards_the_file(server, tmp_path):
+    dest = tmp_path / "repo.zip"
+    with requests.Session() as session:
+        with pytest.raises(DownloadError):
+            SegmentedDownloader(session, server.url, dest, connections=2, expected_sha256="0" * 64).download()
+    assert not dest.exists()
@@ -0,0 +1,216 @@
+"""
+TreeSync against a local stand-in for the GitHub trees API and the raw content
+host: blob-SHA checks, retries, rate-limit pauses, snapshot reuse and paths
+that would land outside the synced folder.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from urllib.parse import unquote, urlsplit
+
+import pytest
+import requests
+
+from conftest import StandInHandler
+from utils.download.tree_sync import SNAPSHOT_FILE_NAME, RateLimited, TreeSync
+
+REF = "main"
+FOLDER = "skins"
+
+
+def blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class StandIn:
+    """Repository served by the handler, plus scripted faults"""
+
+    def __init__(self, files):
+        self.files = dict(files)           # path under skins/ -> bytes
+        self.faults = {}                   # path -> list of "500" / "corrupt" / "429", served in order
+        self.lock = threading.Lock()
+        self.api_calls = 0
+        self.raw_requests = []             # paths, in order
+
+    def tree_sha(self) -> str:
+        return hashlib.sha1(json.dumps(sorted((p, blob_sha(d)) for p, d in self.files.items())).encode()).hexdigest()
+
+    def next_fault(self, path):
+        with self.lock:
+            faults = self.faults.get(path)
+            return faults.pop(0) if faults else None
+
+
+class Handler(StandInHandler):
+    def _send(self, status, body=b"", headers=()):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        stand_in = self.stand_in
+        url = urlsplit(self.path)
+        if url.path.startswith("/api/git/trees/"):
+            with stand_in.lock:
+                stand_in.api_calls += 1
+            sha = url.path.rsplit("/", 1)[1]
+            if sha == REF:
+                tree = [{"path": FOLDER, "type": "tree", "sha": stand_in.tree_sha()}]
+            elif sha == stand_in.tree_sha():
+                tree = [
+                    {"path": path, "type": "blob", "sha": blob_sha(data), "size": len(data)}
+                    for path, data in stand_in.files.items()
+                ]
+            else:
+                return self._send(404)
+            return self._send(200, json.dumps({"tree": tree, "truncated": False}).encode())
+
+        prefix = f"/raw/{REF}/{FOLDER}/"
+        path = unquote(url.path)[len(prefix):]
+        with stand_in.lock:
+            stand_in.raw_requests.append(path)
+        data = stand_in.files.get(path)
+        if data is None:
+            return self._send(404)
+        fault = stand_in.next_fault(path)
+        if fault == "500":
+            return self._send(500)
+        if fault == "429":
+            return self._send(429, headers=[("Retry-After", "0.3")])
+        if fault == "corrupt":
+            data = data[:-1] + bytes([data[-1] ^ 0xFF])
+        self._send(200, data)
+
+
+@pytest.fixture
+def server(serve_http):
+    return serve_http(Handler, StandIn({
+        "Ahri/Arcade Ahri.zip": b"arcade" * 1000,
+        "Ahri/Star Guardian Ahri.zip": b"star guardian" * 700,
+        "Lux/Elementalist Lux.zip": b"elementalist" * 900,
+    }))
+
+
+def make_sync(server, target_dir, **kwargs):
+    session = requests.Session()
+    session.trust_env = False
+    kwargs.setdefault("workers", 2)
+    kwargs.setdefault("attempts", 3)
+    kwargs.setdefault("max_wait_s", 5.0)
+    return TreeSync(session, f"{server.base}/api", f"{server.base}/raw", target_dir, REF, FOLDER, **kwargs)
+
+
+def assert_in_sync(server, target_dir):
+    for path, data in server.files.items():
+        assert (target_dir / path).read_bytes() == data
+
+
+def test_first_sync_then_unchanged_tree(server, tmp_path):
+    result = make_sync(server, tmp_path).run()
+    assert sorted(result.added) == sorted(server.files)
+    assert result.api_calls == 2
+    assert_in_sync(server, tmp_path)
+
+    server.raw_requests.clear()
+    result = make_sync(server, tmp_path).run()
+    assert (result.added, result.modified, result.removed) == ([], [], [])
+    assert result.api_calls == 1
+    assert server.raw_requests == []
+
+
+def test_only_changed_blobs_are_downloaded(server, tmp_path):
+    make_sync(server, tmp_path).run()
+    server.files["Lux/Elementalist Lux.zip"] = b"new elementalist" * 900
+    server.files["Lux/Dark Cosmic Lux.zip"] = b"dark cosmic" * 500
+    del server.files["Ahri/Arcade Ahri.zip"]
+    server.raw_requests.clear()
+
+    result = make_sync(server, tmp_path).run()
+    assert result.modified == ["Lux/Elementalist Lux.zip"]
+    assert result.added == ["Lux/Dark Cosmic Lux.zip"]
+    assert result.removed == ["Ahri/Arcade Ahri.zip"]
+    assert sorted(server.raw_requests) == ["Lux/Dark Cosmic Lux.zip", "Lux/Elementalist Lux.zip"]
+    assert not (tmp_path / "Ahri/Arcade Ahri.zip").exists()
+    assert_in_sync(server, tmp_path)
+
+
+def test_seeded_snapshot_skips_matching_local_files(server, tmp_path):
+    make_sync(server, tmp_path).run()
+    (tmp_path / SNAPSHOT_FILE_NAME).unlink()
+    (tmp_path / "Lux/Elementalist Lux.zip").write_bytes(b"stale" * 10)
+    server.raw_requests.clear()
+
+    result = make_sync(server, tmp_path).run()
+    assert result.modified == ["Lux/Elementalist Lux.zip"]
+    assert server.raw_requests == ["Lux/Elementalist Lux.zip"]
+    assert_in_sync(server, tmp_path)
+
+
+def test_errors_and_bad_blobs_are_retried(server, tmp_path):
+    server.faults["Ahri/Arcade Ahri.zip"] = ["500", "corrupt"]
+    result = make_sync(server, tmp_path).run()
+    assert result.failed == []
+    assert server.raw_requests.count("Ahri/Arcade Ahri.zip") == 3
+    assert_in_sync(server, tmp_path)
+    assert not list(tmp_path.rglob("*.part"))
+
+
+def test_failed_file_keeps_old_copy_and_is_retried_next_run(server, tmp_path):
+    make_sync(server, tmp_path).run()
+    old = server.files["Lux/Elementalist Lux.zip"]
+    server.files["Lux/Elementalist Lux.zip"] = b"new elementalist" * 900
+    server.faults["Lux/Elementalist Lux.zip"] = ["corrupt"] * 3
+
+    result = make_sync(server, tmp_path, attempts=3).run()
+    assert result.failed == ["Lux/Elementalist Lux.zip"]
+    assert (tmp_path / "Lux/Elementalist Lux.zip").read_bytes() == old
+
+    result = make_sync(server, tmp_path).run()
+    assert result.modified == ["Lux/Elementalist Lux.zip"]
+    assert_in_sync(server, tmp_path)
+
+
+def test_rate_limit_pauses_without_using_attempts(server, tmp_path):
+    server.faults["Ahri/Star Guardian Ahri.zip"] = ["429", "429"]
+    started = time.monotonic()
+    result = make_sync(server, tmp_path, attempts=1).run()
+    assert result.failed == []
+    assert time.monotonic() - started >= 0.5
+    assert_in_sync(server, tmp_path)
+
+
+def test_rate_limited_too_long_abandons_sync(server, tmp_path):
+    server.faults["Ahri/Star Guardian Ahri.zip"] = ["429"] * 10
+    with pytest.raises(RateLimited):
+        make_sync(server, tmp_path, max_wait_s=0.5).run()
+
+
+def test_paths_outside_the_folder_are_skipped(server, tmp_path):
+    target_dir = tmp_path / FOLDER
+    victim = tmp_path / "victim.txt"
+    victim.write_bytes(b"keep me")
+    sibling = tmp_path / f"{FOLDER}_old" / "keep.txt"
+    sibling.parent.mkdir()
+    sibling.write_bytes(b"keep me too")
+
+    server.files["../escape.txt"] = b"escaped"
+    server.files[f"../{FOLDER}_old/keep.txt"] = b"overwritten"
+    make_sync(server, target_dir).run()
+    assert not (tmp_path / "escape.txt").exists()
+    assert sibling.read_bytes() == b"keep me too"
+
+    # A tampered snapshot must not delete files outside the folder either
+    snapshot = json.loads((target_dir / SNAPSHOT_FILE_NAME).read_text(encoding="utf-8"))
+    snapshot["tree"] = None
+    snapshot["files"]["../victim.txt"] = "0" * 40
+    snapshot["files"][f"../{FOLDER}_old/keep.txt"] = "0" * 40
+    (target_dir / SNAPSHOT_FILE_NAME).write_text(json.dumps(snapshot), encoding="utf-8")
+    result = make_sync(server, target_dir).run()
+    assert result.removed == []
+    assert victim.read_bytes() == b"keep me"
+    assert sibling.read_bytes() == b"keep me too"
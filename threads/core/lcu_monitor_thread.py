@@ -82,6 +82,9 @@ class LCUMonitorThread(threading.Thread):
                     # WebSocket is connected, so LCU should be ready
                     self._load_owned_skins()
                     
+                    # Fill the skin catalog for owned champions in the background
+                    self._warm_skin_catalog()
+                    
                     # Check initial champion select state (for issue #29: app starting after lock)
                     self._check_initial_champion_state()
                     
@@ -131,6 +134,20 @@ class LCUMonitorThread(threading.Thread):
         except Exception as e:
             log.warning(f"[LCU] Error fetching owned skins: {e}")
     
+    def _warm_skin_catalog(self):
+        """Start fetching skins of owned champions so champion switches don't hit the LCU"""
+        if not self.skin_scraper:
+            return
+        try:
+            owned = self.lcu.unlocked_skins
+            if not isinstance(owned, list):
+                log.debug(f"[LCU] No owned champions to warm skin catalog with (response: {type(owned).__name__})")
+                return
+            champion_ids = [c.get("id") for c in owned if isinstance(c, dict) and isinstance(c.get("id"), int) and c.get("id") > 0]
+            self.skin_scraper.warm_catalog(champion_ids)
+        except Exception as e:
+            log.debug(f"[LCU] Failed to start skin catalog warm-up: {e}")
+    
     def _try_detect_language(self):
         """Try to detect and initialize language from LCU"""
         self.last_language_check = time.time()
@@ -149,6 +166,10 @@ class LCUMonitorThread(threading.Thread):
                     log.info(f"[LCU] Updating database for language: {new_language}")
                     self.db.update_language(new_language)
                 
+                # Skin catalog entries are per language (and the patch may have changed)
+                if self.skin_scraper:
+                    self.skin_scraper.reset_context()
+                
                 # Always call callback on reconnection to ensure UI detection is reinitialized
                 self.last_language = new_language
                 self.language_initialized = True
@@ -173,6 +194,9 @@ class LCUMonitorThread(threading.Thread):
                     log.info(f"[LCU] Updating database for language change: {current_language}")
                     self.db.update_language(current_language)
                 
+                if self.skin_scraper:
+                    self.skin_scraper.reset_context()
+                
                 self.last_language = current_language
                 if self.language_callback:
                     self.language_callback(current_language)
@@ -5,10 +5,10 @@ Phase monitoring thread
 """
 
 import threading
-import time
 
 from config import INTERESTING_PHASES, PHASE_POLL_INTERVAL_DEFAULT
 from lcu import LCU
+from lcu.core.state_store import PHASE_URI
 from state import SharedState
 from utils.core.logging import get_logger, log_status
 
@@ -53,6 +53,10 @@ class PhaseThread(threading.Thread):
         # Expose callback so the message handler can trigger base skin forcing directly
         state.force_base_skins_callback = self.swiftplay_handler.force_base_skins_if_needed
 
+    def _wait(self, since_version: int):
+        """Sleep until a phase event arrives or the poll interval elapses"""
+        self.lcu.state_store.wait_for_change(since_version, self.interval, (PHASE_URI,))
+
     def run(self):
         """Main thread loop"""
         while not self.state.stop:
@@ -61,6 +65,8 @@ class PhaseThread(threading.Thread):
             except (OSError, ConnectionError) as e:
                 log.debug(f"LCU refresh failed in phase thread: {e}")
             
+            # Read the version first so an event landing after the read still wakes us
+            seen_version = self.lcu.state_store.version
             ph = self.lcu.phase if self.lcu.ok else None
             if ph == "None":
                 ph = None
@@ -83,7 +89,7 @@ class PhaseThread(threading.Thread):
                         # Flag already cleared but orphaned mods remain
                         self.state.swiftplay_extracted_mods = []
 
-                time.sleep(self.interval)
+                self._wait(seen_version)
                 continue
 
             self._null_phase_streak = 0
@@ -130,4 +136,4 @@ class PhaseThread(threading.Thread):
                 # Phase unchanged but still in lobby – continue monitoring
                 self.lobby_processor.process_lobby_state(force=False)
             
-            time.sleep(self.interval)
+            self._wait(seen_version)
@@ -7,6 +7,7 @@ Champion monitoring thread
 import time
 import threading
 from lcu import LCU
+from lcu.core.state_store import HOVERED_CHAMPION_URI, SESSION_URI
 from state import SharedState
 from utils.core.logging import get_logger
 from ui.chroma.selector import get_chroma_selector
@@ -128,6 +129,8 @@ class ChampThread(threading.Thread):
                 time.sleep(CHAMP_POLL_INTERVAL)
                 continue
             
+            # Read the version first so an event landing after the reads still wakes us
+            seen_version = self.lcu.state_store.version
             cid = self.lcu.hovered_champion_id
             if cid is None:
                 sel = self.lcu.my_selection or {}
@@ -213,4 +216,5 @@ class ChampThread(threading.Thread):
                             log.debug(f"[lock:champ] Failed to broadcast historic state reset: {e}")
             except Exception:
                 pass
-            time.sleep(self.interval)
+            # Wake on the next hover/session event; the interval bounds REST fallback polling
+            self.lcu.state_store.wait_for_change(seen_version, self.interval, (HOVERED_CHAMPION_URI, SESSION_URI))
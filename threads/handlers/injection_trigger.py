@@ -8,7 +8,8 @@ Handles triggering skin injection based on countdown timer
 import logging
 import threading
 import time
-from typing import Optional
+from pathlib import Path
+from typing import List, Optional, Tuple
 
 from config import BASE_SKIN_VERIFICATION_WAIT_S, LOG_SEPARATOR_WIDTH
 from lcu import LCU
@@ -17,10 +18,57 @@ from utils.core.issue_reporter import report_issue
 from utils.core.logging import get_logger, log_action
 from utils.core.junction import is_junction, safe_remove_entry, link_or_extract
 from utils.core.paths import get_injection_dir
+from injection.mods.preparation import format_timings, prepare_mods
 
 log = get_logger()
 
 
+def collect_injection_skins(state: SharedState, peer_skins: Optional[dict] = None) -> Tuple[List[dict], bool, Optional[int]]:
+    """Collect the skins a multi-injection would inject right now
+    
+    Shared by the injection trigger and the speculative overlay builder so
+    both agree on the exact mod set.
+    
+    Args:
+        state: Shared application state
+        peer_skins: P2P peer skin payloads ({peer_id: payload}), or None to skip peers
+    
+    Returns:
+        (skins_list, local_owned, effective_skin_id) where skins_list holds dicts
+        with skin_name ("skin_{id}") and champion_id
+    """
+    ui_skin_id = state.last_hovered_skin_id
+    owned_skin_ids = state.owned_skin_ids
+    selected_chroma_id = getattr(state, 'selected_chroma_id', None)
+    
+    # Chromas have IDs like base_skin_id + 1, +2, +3, etc.
+    is_chroma = bool(selected_chroma_id and ui_skin_id and ui_skin_id < selected_chroma_id < ui_skin_id + 100)
+    effective_skin_id = selected_chroma_id if is_chroma else ui_skin_id
+    
+    local_owned = (effective_skin_id in owned_skin_ids) or (ui_skin_id in owned_skin_ids and effective_skin_id != ui_skin_id)
+    
+    skins_list = []
+    
+    # Local unowned skin - use effective ID (chroma if selected, else base skin)
+    if not local_owned and ui_skin_id != 0 and effective_skin_id is not None:
+        skins_list.append({
+            "skin_name": f"skin_{effective_skin_id}",  # ID-based format for O(1) cache lookup
+            "champion_id": state.locked_champ_id or state.hovered_champ_id
+        })
+    
+    # Peer skins from P2P sync - use skin_id for accurate Chroma support
+    for s in (peer_skins or {}).values():
+        peer_skin_id = s.get("skin_id") if s else None
+        peer_champion_id = s.get("champion_id") if s else None
+        if peer_champion_id and peer_skin_id and not s.get("is_custom"):
+            skins_list.append({
+                "skin_name": f"skin_{peer_skin_id}",  # ID-based format
+                "champion_id": peer_champion_id
+            })
+    
+    return skins_list, local_owned, effective_skin_id
+
+
 class InjectionTrigger:
     """Handles triggering skin injection"""
     
@@ -132,7 +180,6 @@ class InjectionTrigger:
             historic_custom_mod_path = None
             if not selected_custom_mod:
                 try:
-                    from pathlib import Path
                     from utils.core.historic import get_historic_skin_for_champion, is_custom_mod_path, get_custom_mod_path
 
                     champ_id = self.state.locked_champ_id or self.state.hovered_champ_id
@@ -153,7 +200,6 @@ class InjectionTrigger:
 
             if not selected_custom_mod and historic_custom_mod_path:
                 try:
-                    from pathlib import Path
                     from injection.mods.storage import ModStorageService
                     mod_storage = ModStorageService()
 
@@ -313,6 +359,7 @@ class InjectionTrigger:
                                     if mod_dest.exists() or is_junction(mod_dest):
                                         safe_remove_entry(mod_dest)
                                     link_or_extract(mod_source, mod_dest, cache_dir=extract_cache_dir)
+                                    injector.mod_manager.record_mod_source(mod_dest.name, mod_source)
                                     log.info(f"[HISTORIC] Linked/extracted other mod to: {mod_dest}")
                                     
                                     # Add to valid mods list
@@ -409,6 +456,7 @@ class InjectionTrigger:
                             if mod_dest.exists() or is_junction(mod_dest):
                                 safe_remove_entry(mod_dest)
                             link_or_extract(mod_source, mod_dest, cache_dir=extract_cache_dir)
+                            injector.mod_manager.record_mod_source(mod_dest.name, mod_source)
                             log.info(f"[HISTORIC] Linked/extracted {mod_type} mod to: {mod_dest}")
                             
                             # Store selected mod in shared state
@@ -570,15 +618,7 @@ class InjectionTrigger:
         try:
             # 1. Determine local player skin status
             ui_skin_id = self.state.last_hovered_skin_id
-            owned_skin_ids = self.state.owned_skin_ids
-            selected_chroma_id = getattr(self.state, 'selected_chroma_id', None)
-            
-            effective_skin_id = ui_skin_id
-            if selected_chroma_id and ui_skin_id:
-                if selected_chroma_id > ui_skin_id and selected_chroma_id < ui_skin_id + 100:
-                    effective_skin_id = selected_chroma_id
-            
-            local_owned = (effective_skin_id in owned_skin_ids) or (ui_skin_id in owned_skin_ids and effective_skin_id != ui_skin_id)
+            skins_list, local_owned, effective_skin_id = collect_injection_skins(self.state, peer_skins)
             
             if local_owned:
                 self._force_owned_skin(effective_skin_id)
@@ -588,32 +628,11 @@ class InjectionTrigger:
                     base_skin_id = champ_id * 1000
                     self._force_base_skin(base_skin_id)
 
-            # 2. Collect skins list for injection (using ID-based format for ZipResolver)
-            skins_list = []
-            
-            # Local unowned skin - use effective ID (chroma if selected, else base skin)
-            if not local_owned and ui_skin_id != 0:
-                # Determine the effective skin/chroma ID
-                is_chroma = selected_chroma_id and selected_chroma_id > ui_skin_id and selected_chroma_id < ui_skin_id + 100
-                effective_id = selected_chroma_id if is_chroma else ui_skin_id
-                skins_list.append({
-                    "skin_name": f"skin_{effective_id}",  # ID-based format for O(1) cache lookup
-                    "champion_id": self.state.locked_champ_id or self.state.hovered_champ_id
-                })
-                log.debug(f"[INJECT] Local skin: skin_{effective_id} (chroma={is_chroma})")
-            
-            # Peer skins from P2P sync - use skin_id for accurate Chroma support
+            # 2. Skins list for injection (ID-based format for ZipResolver)
             if peer_skins:
                 log.info(f"[INJECT] Including {len(peer_skins)} peer skins in sync")
-                for peer_id, s in peer_skins.items():
-                    peer_skin_id = s.get("skin_id")
-                    peer_champion_id = s.get("champion_id")
-                    if s and peer_champion_id and peer_skin_id and not s.get("is_custom"):
-                        skins_list.append({
-                            "skin_name": f"skin_{peer_skin_id}",  # ID-based format
-                            "champion_id": peer_champion_id
-                        })
-                        log.debug(f"[INJECT] Peer {peer_id}: skin_{peer_skin_id}")
+            for entry in skins_list:
+                log.debug(f"[INJECT] Skin to inject: {entry['skin_name']} (champ={entry['champion_id']})")
             
             if not skins_list:
                 log.info("[INJECT] No skins to inject (all owned or base)")
@@ -822,8 +841,6 @@ class InjectionTrigger:
         Note: custom_mod can have mod_folder_name=None if only map/font/announcer mods are selected
         """
         try:
-            from pathlib import Path
-            
             if not self.injection_manager:
                 log.error("[INJECT] Cannot inject custom mod - injection manager not available")
                 return
@@ -860,10 +877,17 @@ class InjectionTrigger:
             missing_announcer_mod_path = None
             missing_other_mod_paths = []
             
+            # Every mod is placed by one preparation job; jobs run concurrently
+            # and results come back in this order (base skin, custom skin, map,
+            # font, announcer, other)
+            prepare_jobs = []
+            job_meta = []  # (display name, kind, mod dict) per job
+            
             # Extract and add base skin ZIP if provided (for unowned skins)
             if base_skin_name:
                 log.info(f"[INJECT] Extracting base skin ZIP: {base_skin_name}")
-                try:
+                
+                def place_base_skin():
                     # Resolve the base skin ZIP
                     zp = injector._resolve_zip(
                         base_skin_name,
@@ -871,140 +895,59 @@ class InjectionTrigger:
                         champion_name=champion_name,
                         champion_id=champion_id
                     )
-                    if zp and zp.exists():
-                        # Extract base skin ZIP to mods directory
-                        base_mod_folder = injector._extract_zip_to_mod(zp)
-                        if base_mod_folder:
-                            mod_folder_names.append(base_mod_folder.name)
-                            mod_names_list.append(f"Base Skin ({base_skin_name})")
-                            log.info(f"[INJECT] Base skin ZIP extracted: {base_mod_folder.name}")
-                        else:
-                            log.warning(f"[INJECT] Failed to extract base skin ZIP: {base_skin_name}")
-                    else:
+                    if not zp or not zp.exists():
                         log.warning(f"[INJECT] Base skin ZIP not found: {base_skin_name}")
-                except Exception as e:
-                    log.error(f"[INJECT] Error extracting base skin ZIP: {e}")
-                    import traceback
-                    log.debug(f"[INJECT] Traceback: {traceback.format_exc()}")
-            
-            # Re-extract custom skin mod if available (after cleaning mods directory)
-            if mod_folder_name and mod_path:
-                log.info(f"[INJECT] Re-extracting custom mod from: {mod_path}")
-                try:
-                    mod_source = Path(mod_path)
-                    if not mod_source.exists():
-                        log.warning(f"[INJECT] Custom mod source not found: {mod_source}")
-                    else:
-                        extract_cache_dir = get_injection_dir() / ".extract_cache"
-                        mod_dest = injector.mods_dir / mod_folder_name
-                        if mod_dest.exists() or is_junction(mod_dest):
-                            safe_remove_entry(mod_dest)
-                        link_or_extract(mod_source, mod_dest, cache_dir=extract_cache_dir)
-                        log.info(f"[INJECT] Custom mod linked/extracted: {mod_folder_name}")
-                        
-                        # Verify mod folder exists after extraction (junctions count too)
-                        if mod_dest.exists() or is_junction(mod_dest):
-                            mod_folder_names.append(mod_folder_name)
-                            mod_names_list.append(mod_name or "Custom Mod")
-                            log.info(f"[INJECT] Custom skin mod ready: {mod_folder_name}")
-                        else:
-                            log.warning(f"[INJECT] Custom mod folder not found after extraction: {mod_dest}")
-                except Exception as e:
-                    log.error(f"[INJECT] Error re-extracting custom mod: {e}")
-                    import traceback
-                    log.debug(f"[INJECT] Traceback: {traceback.format_exc()}")
-            elif mod_folder_name:
-                log.warning(f"[INJECT] Custom mod folder name provided but no mod_path - cannot re-extract")
-            else:
-                log.info(f"[INJECT] No custom skin mod selected, injecting base skin + map/font/announcer/other mods only")
+                        return None, False
+                    # Extract base skin ZIP to mods directory
+                    return injector.mod_manager.place_archive(zp)
+                
+                prepare_jobs.append(("Base Skin", place_base_skin))
+                job_meta.append((f"Base Skin ({base_skin_name})", "base", None))
             
             # Helper function to re-extract a mod from its source path
             def re_extract_mod(mod_dict, mod_type_name):
                 """Re-extract a mod from its source path after cleaning"""
                 if not mod_dict or not mod_dict.get("mod_folder_name"):
-                    return None
+                    return None, False
                 
                 mod_folder_name = mod_dict.get("mod_folder_name")
                 mod_path = mod_dict.get("mod_path")
                 
                 if not mod_path:
                     log.warning(f"[INJECT] {mod_type_name} mod folder name provided but no mod_path - cannot re-extract")
-                    return None
+                    return None, False
                 
-                try:
-                    mod_source = Path(mod_path)
-                    if not mod_source.exists():
-                        log.info(f"[INJECT] {mod_type_name} mod source not found (mod may have been deleted), ignoring: {mod_source}")
-                        return None
+                mod_source = Path(mod_path)
+                if not mod_source.exists():
+                    log.info(f"[INJECT] {mod_type_name} mod source not found (mod may have been deleted), ignoring: {mod_source}")
+                    return None, False
 
-                    extract_cache_dir = get_injection_dir() / ".extract_cache"
-                    mod_dest = injector.mods_dir / mod_folder_name
-                    if mod_dest.exists() or is_junction(mod_dest):
-                        safe_remove_entry(mod_dest)
-                    link_or_extract(mod_source, mod_dest, cache_dir=extract_cache_dir)
-                    log.info(f"[INJECT] {mod_type_name} mod linked/extracted: {mod_folder_name}")
+                extract_cache_dir = get_injection_dir() / ".extract_cache"
+                mod_dest = injector.mods_dir / mod_folder_name
+                if mod_dest.exists() or is_junction(mod_dest):
+                    safe_remove_entry(mod_dest)
+                link_or_extract(mod_source, mod_dest, cache_dir=extract_cache_dir)
+                injector.mod_manager.record_mod_source(mod_dest.name, mod_source)
+                log.info(f"[INJECT] {mod_type_name} mod linked/extracted: {mod_folder_name}")
 
-                    if mod_dest.exists() or is_junction(mod_dest):
-                        return mod_folder_name
-                    else:
-                        log.warning(f"[INJECT] {mod_type_name} mod folder not found after extraction: {mod_dest}")
-                        return None
-                except Exception as e:
-                    log.error(f"[INJECT] Error re-extracting {mod_type_name} mod: {e}")
-                    import traceback
-                    log.debug(f"[INJECT] Traceback: {traceback.format_exc()}")
-                    return None
+                if mod_dest.exists() or is_junction(mod_dest):
+                    return mod_dest, False
+                log.warning(f"[INJECT] {mod_type_name} mod folder not found after extraction: {mod_dest}")
+                return None, False
             
-            # Add map mod if selected
-            selected_map_mod = getattr(self.state, 'selected_map_mod', None)
-            if selected_map_mod:
-                map_mod_folder = re_extract_mod(selected_map_mod, "Map")
-                if map_mod_folder:
-                    mod_folder_names.append(map_mod_folder)
-                    mod_names_list.append(selected_map_mod.get("mod_name", "Map"))
-                    log.info(f"[INJECT] Including map mod: {selected_map_mod.get('mod_name')}")
-                else:
-                    # Track missing mod's relative path for cleanup
-                    relative_path = selected_map_mod.get("relative_path")
-                    if relative_path:
-                        missing_map_mod_path = relative_path
-                    log.info(f"[INJECT] Map mod not found (may have been deleted), ignoring: {selected_map_mod.get('mod_name', 'Unknown')}")
-                    # Clear missing mod from state
-                    self.state.selected_map_mod = None
+            # Re-extract custom skin mod if available (after cleaning mods directory)
+            if mod_folder_name and mod_path:
+                log.info(f"[INJECT] Re-extracting custom mod from: {mod_path}")
+                prepare_jobs.append(("Custom Mod", lambda: re_extract_mod(custom_mod, "Custom")))
+                job_meta.append((mod_name or "Custom Mod", "custom", custom_mod))
+            elif mod_folder_name:
+                log.warning(f"[INJECT] Custom mod folder name provided but no mod_path - cannot re-extract")
+            else:
+                log.info(f"[INJECT] No custom skin mod selected, injecting base skin + map/font/announcer/other mods only")
             
-            # Add font mod if selected
+            selected_map_mod = getattr(self.state, 'selected_map_mod', None)
             selected_font_mod = getattr(self.state, 'selected_font_mod', None)
-            if selected_font_mod:
-                font_mod_folder = re_extract_mod(selected_font_mod, "Font")
-                if font_mod_folder:
-                    mod_folder_names.append(font_mod_folder)
-                    mod_names_list.append(selected_font_mod.get("mod_name", "Font"))
-                    log.info(f"[INJECT] Including font mod: {selected_font_mod.get('mod_name')}")
-                else:
-                    # Track missing mod's relative path for cleanup
-                    relative_path = selected_font_mod.get("relative_path")
-                    if relative_path:
-                        missing_font_mod_path = relative_path
-                    log.info(f"[INJECT] Font mod not found (may have been deleted), ignoring: {selected_font_mod.get('mod_name', 'Unknown')}")
-                    # Clear missing mod from state
-                    self.state.selected_font_mod = None
-            
-            # Add announcer mod if selected
             selected_announcer_mod = getattr(self.state, 'selected_announcer_mod', None)
-            if selected_announcer_mod:
-                announcer_mod_folder = re_extract_mod(selected_announcer_mod, "Announcer")
-                if announcer_mod_folder:
-                    mod_folder_names.append(announcer_mod_folder)
-                    mod_names_list.append(selected_announcer_mod.get("mod_name", "Announcer"))
-                    log.info(f"[INJECT] Including announcer mod: {selected_announcer_mod.get('mod_name')}")
-                else:
-                    # Track missing mod's relative path for cleanup
-                    relative_path = selected_announcer_mod.get("relative_path")
-                    if relative_path:
-                        missing_announcer_mod_path = relative_path
-                    log.info(f"[INJECT] Announcer mod not found (may have been deleted), ignoring: {selected_announcer_mod.get('mod_name', 'Unknown')}")
-                    # Clear missing mod from state
-                    self.state.selected_announcer_mod = None
             
             # Add other mods if selected (support multiple selections)
             selected_other_mods = getattr(self.state, 'selected_other_mods', None)
@@ -1014,31 +957,66 @@ class InjectionTrigger:
                 if selected_other_mod:
                     selected_other_mods = [selected_other_mod]
             
-            if selected_other_mods:
-                # Filter out missing mods and keep track of valid ones
-                valid_other_mods = []
-                for selected_other_mod in selected_other_mods:
-                    other_mod_folder = re_extract_mod(selected_other_mod, "Other")
-                    if other_mod_folder:
-                        mod_folder_names.append(other_mod_folder)
-                        mod_names_list.append(selected_other_mod.get("mod_name", "Other"))
-                        valid_other_mods.append(selected_other_mod)
-                        log.info(f"[INJECT] Including other mod: {selected_other_mod.get('mod_name')}")
+            category_mods = [
+                ("Map", "map", selected_map_mod),
+                ("Font", "font", selected_font_mod),
+                ("Announcer", "announcer", selected_announcer_mod),
+            ] + [("Other", "other", mod) for mod in (selected_other_mods or [])]
+            for type_name, kind, mod_dict in category_mods:
+                if not mod_dict:
+                    continue
+                prepare_jobs.append((f"{type_name} mod", lambda mod_dict=mod_dict, type_name=type_name: re_extract_mod(mod_dict, type_name)))
+                job_meta.append((mod_dict.get("mod_name", type_name), kind, mod_dict))
+            
+            prepare_start = time.time()
+            prepared = prepare_mods(prepare_jobs)
+            log.debug(f"[INJECT] Mod preparation took {time.time() - prepare_start:.2f}s: {format_timings(prepared)}")
+            
+            valid_other_mods = []
+            for result, (display_name, kind, mod_dict) in zip(prepared, job_meta):
+                if result.ok:
+                    mod_folder_names.append(result.mod_folder.name)
+                    mod_names_list.append(display_name)
+                    if kind == "base":
+                        log.info(f"[INJECT] Base skin ZIP extracted: {result.mod_folder.name}")
+                    elif kind == "custom":
+                        log.info(f"[INJECT] Custom skin mod ready: {result.mod_folder.name}")
                     else:
-                        # Track missing mod's relative path for cleanup
-                        relative_path = selected_other_mod.get("relative_path")
-                        if relative_path:
-                            missing_other_mod_paths.append(relative_path)
-                        log.info(f"[INJECT] Other mod not found (may have been deleted), ignoring: {selected_other_mod.get('mod_name', 'Unknown')}")
+                        log.info(f"[INJECT] Including {kind} mod: {mod_dict.get('mod_name')}")
+                    if kind == "other":
+                        valid_other_mods.append(mod_dict)
+                    continue
                 
-                # Update state to only include valid mods
-                if len(valid_other_mods) != len(selected_other_mods):
-                    if valid_other_mods:
-                        self.state.selected_other_mods = valid_other_mods
-                    else:
-                        self.state.selected_other_mods = []
-                        if hasattr(self.state, 'selected_other_mod'):
-                            self.state.selected_other_mod = None
+                if kind == "base":
+                    log.warning(f"[INJECT] Failed to extract base skin ZIP: {base_skin_name}")
+                    continue
+                if kind == "custom":
+                    continue
+                
+                # Track missing mod's relative path for cleanup
+                relative_path = mod_dict.get("relative_path")
+                log.info(f"[INJECT] {kind.capitalize()} mod not found (may have been deleted), ignoring: {mod_dict.get('mod_name', 'Unknown')}")
+                if kind == "map":
+                    missing_map_mod_path = relative_path or missing_map_mod_path
+                    # Clear missing mod from state
+                    self.state.selected_map_mod = None
+                elif kind == "font":
+                    missing_font_mod_path = relative_path or missing_font_mod_path
+                    self.state.selected_font_mod = None
+                elif kind == "announcer":
+                    missing_announcer_mod_path = relative_path or missing_announcer_mod_path
+                    self.state.selected_announcer_mod = None
+                elif relative_path:
+                    missing_other_mod_paths.append(relative_path)
+            
+            # Update state to only include valid other mods
+            if selected_other_mods and len(valid_other_mods) != len(selected_other_mods):
+                if valid_other_mods:
+                    self.state.selected_other_mods = valid_other_mods
+                else:
+                    self.state.selected_other_mods = []
+                    if hasattr(self.state, 'selected_other_mod'):
+                        self.state.selected_other_mod = None
             
             # Check if we have any mods to inject
             if not mod_folder_names:
@@ -18,13 +18,15 @@ log = get_logger()
 class P2PHandler:
     """Handles P2P event logic and skin synchronization"""
 
-    def __init__(self, state: SharedState):
+    def __init__(self, state: SharedState, injection_manager=None):
         """Initialize P2P handler
 
         Args:
             state: Shared application state
+            injection_manager: Injection manager (used to pre-stage peer skins)
         """
         self.state = state
+        self.injection_manager = injection_manager
         self.state.active_peers = set()
         self._debounce_timer = None
         self._register_callbacks()
@@ -53,6 +55,7 @@ class P2PHandler:
                  self.state.active_peers.remove(peer_id)
             if peer_id in self.state.peer_skins:
                  del self.state.peer_skins[peer_id]
+            self._evict_peer_skin(peer_id)
             
             # If we are Host, report this disconnection to NodeMaster
             # This handles ungraceful disconnects (timeouts/crashes) detected by NeighborDown
@@ -88,6 +91,7 @@ class P2PHandler:
             log.info(f"[P2P] Received skin update from {peer_id}: {payload}")
 
             self.state.peer_skins[peer_id] = payload
+            self._prefetch_peer_skin(peer_id, payload)
 
             # Trigger UI update
             if hasattr(self.state, "ui_skin_thread") and self.state.ui_skin_thread:
@@ -99,6 +103,32 @@ class P2PHandler:
         except Exception as e:
             log.error(f"[P2P] Error handling RemoteSkinUpdate: {e}")
 
+    def _prefetch_peer_skin(self, peer_id: str, payload: dict):
+        """Stage the peer's skin in the extraction cache ahead of injection"""
+        prefetcher = getattr(self.injection_manager, "peer_prefetcher", None)
+        if prefetcher is None:
+            return
+        skin_id = payload.get("skin_id")
+        if payload.get("is_custom") or not skin_id or not payload.get("champion_id"):
+            prefetcher.evict(peer_id)
+            return
+        try:
+            prefetcher.prefetch(peer_id, int(skin_id), payload.get("champion_id"))
+        except Exception as e:
+            log.debug(f"[P2P] Failed to queue prefetch for {peer_id}: {e}")
+
+    def _evict_peer_skin(self, peer_id: str):
+        """Cancel and release the staged skin of a peer that left"""
+        prefetcher = getattr(self.injection_manager, "peer_prefetcher", None)
+        if prefetcher is not None:
+            prefetcher.evict(peer_id)
+
+    def release_staged_skins(self):
+        """Cancel and release every staged peer skin (left the P2P room)"""
+        prefetcher = getattr(self.injection_manager, "peer_prefetcher", None)
+        if prefetcher is not None:
+            prefetcher.clear()
+
     async def handle_skin_ack(self, payload: dict):
         """Handle incoming skin ACK confirmation from Sidecar"""
         try:
@@ -129,6 +129,10 @@ class PhaseHandler:
                 self._request_ui_destruction()
                 self._reset_state()
         
+        # Champ select is over - peer skins staged for it are no longer needed
+        if previous_phase == "ChampSelect" and phase != "ChampSelect":
+            self._release_peer_prefetch()
+        
         # Handle lobby exit
         # Don't cleanup Swiftplay if we're transitioning to Matchmaking/ChampSelect (need extracted mods)
         if previous_phase == "Lobby" and phase != "Lobby":
@@ -202,6 +206,16 @@ class PhaseHandler:
         except Exception as e:
             log.warning(f"[phase] Failed to request UI destruction: {e}")
     
+    def _release_peer_prefetch(self):
+        """Unpin peer skins staged in the extraction cache"""
+        prefetcher = getattr(self.injection_manager, "peer_prefetcher", None)
+        if prefetcher is None:
+            return
+        try:
+            prefetcher.clear()
+        except Exception as e:
+            log.debug(f"[phase] Failed to release staged peer skins: {e}")
+    
     def _reset_state(self):
         """Reset state for phase exit"""
         self.state.hovered_champ_id = None
@@ -8,10 +8,12 @@ Contains utility threads for loadout management, timers, and skin name resolutio
 from .loadout_ticker import LoadoutTicker
 from .timer_manager import TimerManager
 from .skin_name_resolver import SkinNameResolver
+from .speculative_builder import SpeculativeOverlayBuilder
 
 __all__ = [
     'LoadoutTicker',
     'TimerManager',
     'SkinNameResolver',
+    'SpeculativeOverlayBuilder',
 ]
 
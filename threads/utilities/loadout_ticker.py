@@ -4,24 +4,37 @@
 Loadout countdown ticker thread
 """
 
+import math
 import time
 import threading
 from lcu import LCU
+from lcu.core.state_store import SESSION_URI
 from state import SharedState
-from utils.core.logging import get_logger
+from utils.core.logging import get_logger, rate_limited
 from config import (
     TIMER_HZ_MIN, TIMER_HZ_MAX, TIMER_POLL_PERIOD_S,
+    TIMER_FINE_WINDOW_S, TIMER_TRIGGER_RETRY_S,
     SKIN_THRESHOLD_MS_DEFAULT,
+    LOG_TICKER_RATE_PER_S, LOG_TICKER_BURST,
 )
 
 from ..handlers.injection_trigger import InjectionTrigger
 from .skin_name_resolver import SkinNameResolver
 
-log = get_logger()
+# Logs from inside the countdown loop; limited so a stuck loop can't flood the log
+log = rate_limited(get_logger("tracer.ticker"), LOG_TICKER_RATE_PER_S, LOG_TICKER_BURST)
 
 
 class LoadoutTicker(threading.Thread):
-    """High-frequency loadout countdown ticker"""
+    """Loadout countdown ticker
+    
+    Instead of ticking at a fixed rate, each iteration sleeps until the next
+    thing that needs doing: the LCU resync, the next whole second of the
+    countdown (log + countdown notification) or the injection threshold.
+    Only the last TIMER_FINE_WINDOW_S before the threshold is stepped at
+    `hz`, so the trigger stays precise without spinning for the whole
+    countdown.
+    """
     
     def __init__(
         self,
@@ -74,6 +87,9 @@ class LoadoutTicker(threading.Thread):
                 t = (sess.get("timer") or {})
                 phase = str((t.get("phase") or "")).upper()
                 left_ms = int(t.get("adjustedTimeLeftInPhase") or 0)
+                # The session may come from the event cache: account for its age
+                if left_ms > 0:
+                    left_ms = max(1, left_ms - int(self.lcu.state_store.age(SESSION_URI) * 1000.0))
                 
                 # Check if phase changed to FINALIZATION
                 if phase == "FINALIZATION" and self.state.phase != "FINALIZATION":
@@ -137,8 +153,47 @@ class LoadoutTicker(threading.Thread):
 
             if remain_ms <= 0:
                 break
-            time.sleep(1.0 / float(self.hz))
+            self._sleep_until_next_event(deadline, last_poll + poll_period_s, thresh)
         
         # End of ticker: only release if we're still the current ticker
         if getattr(self.state, 'current_ticker', 0) == self.ticker_id:
             self.state.loadout_countdown_active = False
+
+    def _sleep_until_next_event(self, deadline: float, next_poll: float, thresh_ms: int) -> None:
+        """Sleep until the next resync, countdown second or injection threshold
+        
+        Args:
+            deadline: Monotonic time the countdown reaches zero
+            next_poll: Monotonic time of the next LCU resync
+            thresh_ms: Remaining time (ms) at which the injection fires
+        """
+        now = time.monotonic()
+        remain_s = deadline - now
+        
+        # Next whole-second boundary of the countdown (T-n log / notification)
+        next_second = deadline - math.floor(remain_s)
+        if next_second <= now:
+            next_second += 1.0
+        wake_at = min(next_poll, next_second, deadline)
+        
+        trigger_pending = not self.state.last_hover_written
+        trigger_at = deadline - thresh_ms / 1000.0
+        if trigger_pending:
+            if trigger_at <= now:
+                # Threshold passed but nothing injected yet (e.g. name not resolved): retry soon
+                wake_at = min(wake_at, now + TIMER_TRIGGER_RETRY_S)
+            else:
+                wake_at = min(wake_at, trigger_at)
+        
+        # Coarse sleep, stepping at `hz` only when the trigger is close
+        fine_from = trigger_at - TIMER_FINE_WINDOW_S if trigger_pending else wake_at
+        step = 1.0 / float(self.hz)
+        while not self.state.stop:
+            now = time.monotonic()
+            left = wake_at - now
+            if left <= 0:
+                return
+            if now < fine_from:
+                time.sleep(min(left, fine_from - now))
+            else:
+                time.sleep(min(left, step))
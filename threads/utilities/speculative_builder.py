@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Speculative overlay builder thread
+Pre-builds the overlay during champ select so injection only has to run it
+"""
+
+import threading
+import time
+from typing import Optional, Tuple
+
+from state import SharedState
+from utils.core.logging import get_logger
+from config import (
+    ENABLE_SPECULATIVE_OVERLAY_BUILD,
+    SPECULATIVE_BUILD_STABLE_MS,
+    SPECULATIVE_POLL_INTERVAL_S,
+)
+
+from ..handlers.injection_trigger import collect_injection_skins
+
+log = get_logger()
+
+
+class SpeculativeOverlayBuilder(threading.Thread):
+    """Watches the champ select selection and pre-builds its overlay once it settles
+
+    The build runs in a worker thread at normal priority. It is cancelled when
+    the selection changes or champ select ends, but never after the injection
+    trigger fired - from then on the injector waits for (and uses) it.
+    """
+
+    def __init__(self, state: SharedState, injection_manager=None,
+                 poll_interval: float = SPECULATIVE_POLL_INTERVAL_S,
+                 stable_ms: int = SPECULATIVE_BUILD_STABLE_MS):
+        super().__init__(daemon=True)
+        self.state = state
+        self.injection_manager = injection_manager
+        self.poll_interval = poll_interval
+        self.stable_s = stable_ms / 1000.0
+        self._stop_event = threading.Event()
+
+        self._signature: Optional[Tuple] = None
+        self._signature_since = 0.0
+        self._attempted: Optional[Tuple] = None
+        self._worker: Optional[threading.Thread] = None
+        self._cancel_event: Optional[threading.Event] = None
+
+    def run(self):
+        """Main loop"""
+        if not ENABLE_SPECULATIVE_OVERLAY_BUILD or self.injection_manager is None:
+            log.debug("[SPECULATIVE] Speculative overlay builds disabled")
+            return
+        while not self._stop_event.wait(self.poll_interval):
+            if self.state.stop:
+                break
+            try:
+                self._tick()
+            except Exception as e:
+                log.debug(f"[SPECULATIVE] Tick failed: {e}")
+        self._cancel()
+
+    def stop(self):
+        """Stop the thread and cancel any pending build"""
+        self._stop_event.set()
+        self._cancel()
+
+    def _tick(self):
+        if self.state.phase not in ("ChampSelect", "FINALIZATION") or self.state.is_swiftplay_mode:
+            self._cancel()
+            self._signature = None
+            self._attempted = None
+            return
+
+        # Injection trigger fired: the injector owns the build from here on
+        if self.state.last_hover_written:
+            return
+
+        signature = self._current_signature()
+        now = time.monotonic()
+        if signature != self._signature:
+            if self._signature is not None:
+                log.debug("[SPECULATIVE] Selection changed - cancelling pending pre-build")
+            self._cancel()
+            self._signature = signature
+            self._signature_since = now
+            return
+
+        if not signature or signature == self._attempted:
+            return
+        if self._worker is not None and self._worker.is_alive():
+            return  # Previous (cancelled) build still winding down
+        if now - self._signature_since < self.stable_s:
+            return
+
+        self._attempted = signature
+        self._cancel_event = threading.Event()
+        skins_list = [{"skin_name": name, "champion_id": champ} for name, champ in signature]
+        self._worker = threading.Thread(
+            target=self._build,
+            args=(skins_list, self._cancel_event),
+            daemon=True,
+            name="SpeculativeOverlayBuild",
+        )
+        self._worker.start()
+
+    def _current_signature(self) -> Optional[Tuple]:
+        """Selection signature, or None when the injection won't be a plain multi-skin one"""
+        state = self.state
+        # Custom mods are placed by the trigger itself - don't guess at them
+        if state.selected_custom_mod:
+            return None
+        for attr in ("selected_map_mod", "selected_font_mod", "selected_announcer_mod", "selected_other_mods", "selected_other_mod"):
+            if getattr(state, attr, None):
+                return None
+        if state.random_mode_active or state.selected_form_path:
+            return None
+
+        skins_list, _local_owned, _effective_skin_id = collect_injection_skins(state, dict(state.peer_skins or {}))
+        if not skins_list:
+            return None
+        return tuple((s["skin_name"], s.get("champion_id")) for s in skins_list)
+
+    def _build(self, skins_list: list, cancel_event: threading.Event):
+        start = time.time()
+        try:
+            built = self.injection_manager.prebuild_overlay(skins_list, cancel_event)
+        except Exception as e:
+            log.debug(f"[SPECULATIVE] Pre-build failed: {e}")
+            return
+        if built and not cancel_event.is_set():
+            log.info(f"[SPECULATIVE] Overlay ready for {len(skins_list)} skin(s) ({time.time() - start:.2f}s)")
+
+    def _cancel(self):
+        """Cancel the pending build unless the injection trigger already fired"""
+        if self._cancel_event is None or self.state.last_hover_written:
+            return
+        self._cancel_event.set()
+        self._cancel_event = None
+        self._attempted = None
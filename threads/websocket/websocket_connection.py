@@ -110,6 +110,10 @@ class WebSocketConnection:
             except Exception as e:
                 log.debug(f"[ws] exception: {e}")
             
+            # on_close isn't guaranteed on every failure path: stop trusting the cache
+            if self.lcu.state_store.live:
+                self.lcu.state_store.set_live(False)
+            
             # Check if we should stop before reconnecting
             if self.state.stop:
                 break
@@ -141,6 +145,8 @@ class WebSocketConnection:
         
         try:
             ws.send('[5,"OnJsonApiEvent"]')
+            # Events flow from here on: cached LCU state can be trusted
+            self.lcu.state_store.set_live(True)
         except Exception as e:
             log.debug(f"WebSocket: Subscribe error: {e}")
     
@@ -165,6 +171,7 @@ class WebSocketConnection:
         log.info(separator)
         
         self.is_connected = False
+        self.lcu.state_store.set_live(False)
         
         # Update app status
         if self.app_status_callback:
@@ -74,6 +74,12 @@ class WebSocketEventHandler:
         if not uri:
             return
         
+        # Keep the LCU state store current so threads read cached state instead of polling
+        try:
+            self.lcu.state_store.apply_event(uri, payload.get("eventType"), payload.get("data"))
+        except Exception as e:
+            log.debug(f"[WS] Failed to update LCU state store for {uri}: {e}")
+        
         if uri == "/lol-gameflow/v1/gameflow-phase":
             self._handle_phase_event(payload)
         elif uri == "/lol-champ-select/v1/hovered-champion-id":
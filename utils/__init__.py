@@ -53,8 +53,10 @@ def __getattr__(name):
         )
         return locals()[name]
     
-    if name in {'levenshtein_distance', 'levenshtein_score'}:
-        from utils.core.normalization import levenshtein_distance, levenshtein_score
+    if name in {'levenshtein_distance', 'levenshtein_score', 'banded_levenshtein_distance', 'NameIndex'}:
+        from utils.core.normalization import (
+            levenshtein_distance, levenshtein_score, banded_levenshtein_distance, NameIndex
+        )
         return locals()[name]
     
     if name in {
@@ -82,7 +84,7 @@ __all__ = [
     'validate_skin_id', 'validate_skin_name', 'validate_champion_id',
     'validate_positive_number', 'require_non_empty_list', 'validated_method',
     # Normalization (lazy)
-    'levenshtein_distance', 'levenshtein_score',
+    'levenshtein_distance', 'levenshtein_score', 'banded_levenshtein_distance', 'NameIndex',
     # Historic (lazy)
     'load_historic_map', 'get_historic_skin_for_champion', 'write_historic_entry',
 ]
@@ -10,6 +10,9 @@ This subpackage contains core utility functions used throughout the application:
 - validation: Input validation functions
 - normalization: Text normalization and matching
 - historic: Historic mode utilities
+- config_store: Cached config.ini access with change events (used by config.py)
+- directory_cache: Byte-bounded, pinnable LRU cache of directories (overlay and extraction caches)
+- latency: Fixed-bucket latency histogram (LCU client and Pengu dispatcher stats)
 """
 
 # Import paths first (doesn't depend on config)
@@ -53,8 +56,10 @@ def __getattr__(name):
         )
         return locals()[name]
     
-    if name in {'levenshtein_distance', 'levenshtein_score'}:
-        from utils.core.normalization import levenshtein_distance, levenshtein_score
+    if name in {'levenshtein_distance', 'levenshtein_score', 'banded_levenshtein_distance', 'NameIndex'}:
+        from utils.core.normalization import (
+            levenshtein_distance, levenshtein_score, banded_levenshtein_distance, NameIndex
+        )
         return locals()[name]
     
     if name in {
@@ -82,7 +87,7 @@ __all__ = [
     'validate_skin_id', 'validate_skin_name', 'validate_champion_id',
     'validate_positive_number', 'require_non_empty_list', 'validated_method',
     # Normalization (lazy)
-    'levenshtein_distance', 'levenshtein_score',
+    'levenshtein_distance', 'levenshtein_score', 'banded_levenshtein_distance', 'NameIndex',
     # Historic (lazy)
     'load_historic_map', 'get_historic_skin_for_champion', 'write_historic_entry',
 ]
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Config Store
+In-memory view of config.ini with cheap revalidation and batched writes
+
+Lookups are served from a parsed snapshot. The file is stat'ed (mtime and
+size) at most once per revalidation interval and only re-parsed when it
+changed, so edits made by hand or by other writers are still picked up.
+Writes update the snapshot immediately and are flushed to disk together
+after a short delay, atomically (temporary file + rename). Subscribers get a
+ConfigChange for every value that changes, from either side.
+
+This module is imported by config.py and must not import it.
+"""
+
+import configparser
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+Snapshot = Dict[str, Dict[str, str]]     # section -> option -> value
+
+
+@dataclass(frozen=True)
+class ConfigChange:
+    """One option that changed"""
+    section: str
+    option: str
+    old_value: Optional[str]     # None if the option didn't exist
+    new_value: Optional[str]     # None if the option was removed
+    source: str                  # "write" (set through the store) or "disk" (file changed)
+
+    def as_float(self, fallback: float) -> float:
+        try:
+            return float(self.new_value) if self.new_value is not None else fallback
+        except ValueError:
+            return fallback
+
+    def as_bool(self, fallback: bool) -> bool:
+        if self.new_value is None:
+            return fallback
+        value = self.new_value.strip().lower()
+        if value in ("1", "yes", "true", "on"):
+            return True
+        if value in ("0", "no", "false", "off"):
+            return False
+        return fallback
+
+
+ConfigCallback = Callable[[ConfigChange], None]
+
+
+@dataclass
+class _Subscription:
+    callback: ConfigCallback
+    section: Optional[str]
+    option: Optional[str]
+
+    def wants(self, change: ConfigChange) -> bool:
+        return (self.section is None or self.section == change.section) and (
+            self.option is None or self.option == change.option
+        )
+
+
+class ConfigStore:
+    """Cached config.ini with revalidation, batched atomic writes and change events"""
+
+    def __init__(self, path_provider: Callable[[], Path], revalidate_s: float = 0.25, write_delay_s: float = 0.2):
+        self._path_provider = path_provider
+        self.revalidate_s = revalidate_s
+        self.write_delay_s = write_delay_s
+        self._snapshot: Snapshot = {}
+        self._stamp: Optional[Tuple[int, int]] = None    # (mtime_ns, size) the snapshot was read at
+        self._checked_at = float("-inf")
+        self._pending: Dict[Tuple[str, str], str] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._subscriptions: List[_Subscription] = []
+        self.stats = {"lookups": 0, "stats": 0, "reloads": 0, "writes": 0}
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def get(self, section: str, option: str, fallback: Optional[str] = None) -> Optional[str]:
+        self._revalidate()
+        self.stats["lookups"] += 1
+        values = self._snapshot.get(section)
+        if values is not None:
+            value = values.get(option.lower())
+            if value is not None:
+                return value
+        return fallback
+
+    def reload(self) -> None:
+        """Re-check the file now, ignoring the revalidation interval"""
+        self._revalidate(force=True)
+
+    def _revalidate(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.revalidate_s:
+            return
+        with self._lock:
+            if not force and now - self._checked_at < self.revalidate_s:
+                return
+            self._checked_at = now
+            self.stats["stats"] += 1
+            path = self._path_provider()
+            stamp = self._stat(path)
+            if stamp is None and self._stamp is None and not self._snapshot:
+                stamp = self._migrate_legacy(path)
+            if stamp == self._stamp:
+                return
+            snapshot = self._read(path) if stamp is not None else {}
+            # Values set through the store but not flushed yet win over the file
+            for (section, option), value in self._pending.items():
+                snapshot.setdefault(section, {})[option] = value
+            changes = self._diff(self._snapshot, snapshot, "disk")
+            self._snapshot = snapshot
+            self._stamp = stamp
+            self.stats["reloads"] += 1
+            subscriptions = list(self._subscriptions)
+        self._notify(changes, subscriptions)
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _migrate_legacy(path: Path) -> Optional[Tuple[int, int]]:
+        """Copy a config.ini from the working directory (older versions kept it there)"""
+        legacy_path = Path("config.ini")
+        if not legacy_path.exists():
+            return None
+        try:
+            shutil.copy2(legacy_path, path)
+        except Exception as e:
+            log.debug(f"Failed to migrate legacy config: {e}")
+            return None
+        return ConfigStore._stat(path)
+
+    @staticmethod
+    def _read(path: Path) -> Snapshot:
+        parser = configparser.ConfigParser()
+        try:
+            parser.read(path, encoding="utf-8")
+        except Exception as e:
+            log.warning(f"Failed to read config file: {e}")
+            return {}
+        return {section: dict(parser.items(section, raw=True)) for section in parser.sections()}
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def set(self, section: str, option: str, value: str) -> None:
+        """Set an option; visible to get() at once, written to disk shortly after"""
+        self.set_many({(section, option): value})
+
+    def set_many(self, values: Dict[Tuple[str, str], str]) -> None:
+        """Set several options in one batch"""
+        self._revalidate()
+        with self._lock:
+            snapshot = {section: dict(options) for section, options in self._snapshot.items()}
+            for (section, option), value in values.items():
+                option = option.lower()
+                snapshot.setdefault(section, {})[option] = str(value)
+                self._pending[(section, option)] = str(value)
+            changes = self._diff(self._snapshot, snapshot, "write")
+            self._snapshot = snapshot
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.write_delay_s, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+            subscriptions = list(self._subscriptions)
+        self._notify(changes, subscriptions)
+
+    def flush(self) -> bool:
+        """Write pending changes to disk now (returns False if the write failed)"""
+        with self._write_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                pending = dict(self._pending)
+            if not pending:
+                return True
+
+            path = self._path_provider()
+            # Start from the file, not the snapshot, so changes made by other
+            # writers since the last revalidation aren't overwritten
+            parser = configparser.ConfigParser()
+            try:
+                if path.exists():
+                    parser.read(path, encoding="utf-8")
+            except Exception as e:
+                log.debug(f"Failed to read config for update: {e}")
+            for (section, option), value in pending.items():
+                if not parser.has_section(section):
+                    parser.add_section(section)
+                parser.set(section, option, value)
+
+            tmp_path = path.with_name(path.name + ".tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as fh:
+                    parser.write(fh)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                log.warning(f"Failed to write config file: {e}")
+                return False
+
+            with self._lock:
+                for key, value in pending.items():
+                    if self._pending.get(key) == value:
+                        del self._pending[key]
+                # Re-read on the next lookup to pick up what other writers put
+                # in the file (our own values diff as unchanged)
+                self._stamp = None
+                self._checked_at = float("-inf")
+                self.stats["writes"] += 1
+            return True
+
+    # ------------------------------------------------------------------
+    # Change events
+    # ------------------------------------------------------------------
+
+    def subscribe(
+        self,
+        callback: ConfigCallback,
+        section: Optional[str] = None,
+        option: Optional[str] = None,
+    ) -> Callable[[], None]:
+        """Get called with a ConfigChange when a matching option changes
+
+        Callbacks run on the thread that noticed the change (a writer, or a
+        reader revalidating the file). Returns an unsubscribe function.
+        """
+        subscription = _Subscription(callback, section, option.lower() if option else None)
+        with self._lock:
+            self._subscriptions.append(subscription)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if subscription in self._subscriptions:
+                    self._subscriptions.remove(subscription)
+        return unsubscribe
+
+    @staticmethod
+    def _diff(old: Snapshot, new: Snapshot, source: str) -> List[ConfigChange]:
+        changes = []
+        for section in old.keys() | new.keys():
+            old_values = old.get(section, {})
+            new_values = new.get(section, {})
+            for option in old_values.keys() | new_values.keys():
+                old_value = old_values.get(option)
+                new_value = new_values.get(option)
+                if old_value != new_value:
+                    changes.append(ConfigChange(section, option, old_value, new_value, source))
+        return changes
+
+    @staticmethod
+    def _notify(changes: List[ConfigChange], subscriptions: List[_Subscription]) -> None:
+        for change in changes:
+            for subscription in subscriptions:
+                if subscription.wants(change):
+                    try:
+                        subscription.callback(change)
+                    except Exception as e:
+                        log.debug(f"Config change callback failed for {change.section}.{change.option}: {e}")
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Directory Cache
+Byte-bounded, pinnable cache of directories keyed by content fingerprint.
+
+Each entry is a folder named after its key, described in a JSON index
+(size, created, last_used, hits plus whatever the subclass records).
+Entries are built in a staging folder and promoted with a rename, evicted
+LRU once the cache grows past its byte budget, and never evicted while
+pinned. Subclasses only implement how an entry is produced.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.core.logging import get_logger
+
+log = get_logger()
+
+INDEX_FILE_NAME = "index.json"
+
+
+class DirectoryCache:
+    """Persistent LRU cache of directories with pinning"""
+
+    # Overridden by subclasses
+    STAGING_PREFIX = ".staging-"
+    LOG_TAG = "DIR_CACHE"
+    ENTRY_NOUN = "entry(s)"
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._pinned: Dict[str, int] = {}
+        self._dirty = False
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._index = self._load_index()
+        self._drop_stale_staging()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def _touch(self, key: str) -> Optional[Path]:
+        """Return the entry for *key* and mark it as recently used.
+
+        Lookups sit on latency-sensitive paths, so the LRU update stays in
+        memory; it is persisted by the next store, eviction or ``flush()``.
+        """
+        entry_dir = self.cache_dir / key
+        with self._lock:
+            meta = self._index.get(key)
+            if meta is None:
+                return None
+            if not entry_dir.is_dir():
+                # Entry vanished from disk
+                self._index.pop(key, None)
+                self._dirty = True
+                return None
+            meta["last_used"] = time.time()
+            meta["hits"] = int(meta.get("hits", 0)) + 1
+            self._dirty = True
+        return entry_dir
+
+    def _staging_dir(self, key: str) -> Path:
+        """Return an unused staging path for building the entry of *key*."""
+        staging = self.cache_dir / f"{self.STAGING_PREFIX}{key}-{os.getpid()}-{threading.get_ident()}"
+        if staging.exists():
+            shutil.rmtree(staging, ignore_errors=True)
+        return staging
+
+    def _promote(self, key: str, staging: Path, size: int, keep_existing: bool = False, **meta) -> Path:
+        """Move a finished staging folder into the cache and index it.
+
+        With *keep_existing*, an entry stored meanwhile by another thread
+        wins and the staging folder is dropped. Raises OSError if the rename
+        fails.
+        """
+        entry_dir = self.cache_dir / key
+        with self._lock:
+            if keep_existing and key in self._index and entry_dir.is_dir():
+                shutil.rmtree(staging, ignore_errors=True)
+                return entry_dir
+            if entry_dir.exists():
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(staging, entry_dir)
+            now = time.time()
+            self._index[key] = {"size": size, "created": now, "last_used": now, "hits": 0, **meta}
+            self._save_index()
+        return entry_dir
+
+    def discard_build(self, staging: Path) -> None:
+        """Remove a failed or abandoned staging directory."""
+        shutil.rmtree(staging, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Pinning (pinned entries are never evicted)
+    # ------------------------------------------------------------------
+
+    def pin(self, key: str) -> None:
+        with self._lock:
+            self._pinned[key] = self._pinned.get(key, 0) + 1
+
+    def unpin(self, key: str) -> None:
+        with self._lock:
+            count = self._pinned.get(key, 0) - 1
+            if count > 0:
+                self._pinned[key] = count
+            else:
+                self._pinned.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(int(meta.get("size", 0)) for meta in self._index.values())
+
+    def evict(self) -> int:
+        """Evict least recently used entries until under the byte budget.
+
+        Returns the number of entries removed.
+        """
+        removed = 0
+        with self._lock:
+            total = sum(int(meta.get("size", 0)) for meta in self._index.values())
+            if total > self.max_bytes:
+                by_age = sorted(self._index.items(), key=lambda kv: kv[1].get("last_used", 0))
+                for key, meta in by_age:
+                    if total <= self.max_bytes:
+                        break
+                    if key in self._pinned:
+                        continue
+                    shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+                    total -= int(meta.get("size", 0))
+                    self._index.pop(key, None)
+                    removed += 1
+            if removed or self._dirty:
+                self._save_index()
+        if removed:
+            log.debug(f"[{self.LOG_TAG}] Evicted {removed} {self.ENTRY_NOUN}, {total / (1024 * 1024):.1f} MB cached")
+        return removed
+
+    def clear(self) -> None:
+        """Drop every unpinned entry."""
+        with self._lock:
+            for key in list(self._index):
+                if key in self._pinned:
+                    continue
+                shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+                self._index.pop(key, None)
+            self._save_index()
+
+    def flush(self) -> None:
+        """Persist LRU updates made by lookups since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": sum(int(meta.get("size", 0)) for meta in self._index.values()),
+                "max_bytes": self.max_bytes,
+                "pinned": len(self._pinned),
+            }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load_index(self) -> Dict[str, dict]:
+        index_path = self.cache_dir / INDEX_FILE_NAME
+        index: Dict[str, dict] = {}
+        try:
+            if index_path.exists():
+                data = json.loads(index_path.read_text(encoding="utf-8"))
+                if isinstance(data, dict):
+                    index = {k: v for k, v in data.items() if isinstance(v, dict)}
+        except (OSError, ValueError) as e:
+            log.debug(f"[{self.LOG_TAG}] Failed to load index, starting empty: {e}")
+
+        # Drop index entries whose directory is gone, and directories the index doesn't know
+        index = {k: v for k, v in index.items() if (self.cache_dir / k).is_dir()}
+        try:
+            for entry in self.cache_dir.iterdir():
+                if entry.is_dir() and not entry.name.startswith(self.STAGING_PREFIX) and entry.name not in index:
+                    shutil.rmtree(entry, ignore_errors=True)
+        except OSError:
+            pass
+        return index
+
+    def _drop_stale_staging(self) -> None:
+        try:
+            for entry in self.cache_dir.iterdir():
+                if entry.is_dir() and entry.name.startswith(self.STAGING_PREFIX):
+                    shutil.rmtree(entry, ignore_errors=True)
+        except OSError:
+            pass
+
+    def _save_index(self) -> None:
+        """Write the index atomically. Caller must hold the lock."""
+        index_path = self.cache_dir / INDEX_FILE_NAME
+        tmp_path = index_path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(json.dumps(self._index, indent=2), encoding="utf-8")
+            os.replace(tmp_path, index_path)
+            self._dirty = False
+        except OSError as e:
+            log.debug(f"[{self.LOG_TAG}] Failed to save index: {e}")
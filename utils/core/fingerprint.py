@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content Fingerprint Utilities
+Cheap, content-sensitive fingerprints for mod archives and folders.
+
+Archives are fingerprinted from their ZIP central directory (member names,
+CRC32 and sizes) so the file body never has to be read.  Results are
+memoized per (path, size, mtime) so repeated lookups cost a single stat.
+"""
+
+import hashlib
+import os
+import threading
+import zipfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from utils.core.logging import get_logger
+
+log = get_logger()
+
+ARCHIVE_SUFFIXES = {".zip", ".fantome"}
+
+_memo: Dict[Tuple[str, int, int], str] = {}
+_memo_lock = threading.Lock()
+
+
+def stat_signature(path: Union[str, Path]) -> Optional[Tuple[int, int]]:
+    """Return ``(size, mtime_ns)`` for *path*, or ``None`` if it can't be stat'ed."""
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+    except OSError:
+        return None
+
+
+def archive_fingerprint(path: Union[str, Path]) -> Optional[str]:
+    """Fingerprint a ZIP/fantome archive from its CRC set.
+
+    The digest covers every member's name, CRC32 and uncompressed size, plus
+    the archive's own size.  Two archives with the same fingerprint extract to
+    identical trees.  Returns ``None`` if the archive can't be read.
+    """
+    path = Path(path)
+    sig = stat_signature(path)
+    if sig is None:
+        return None
+
+    memo_key = (str(path), sig[0], sig[1])
+    with _memo_lock:
+        cached = _memo.get(memo_key)
+    if cached:
+        return cached
+
+    try:
+        with zipfile.ZipFile(path, "r") as zf:
+            infos = sorted(zf.infolist(), key=lambda i: i.filename)
+    except (OSError, zipfile.BadZipFile) as e:
+        log.debug(f"[FINGERPRINT] Cannot read archive {path}: {e}")
+        return None
+
+    h = hashlib.sha1()
+    h.update(str(sig[0]).encode())
+    for info in infos:
+        h.update(f"{info.filename}\0{info.CRC:08x}\0{info.file_size}\n".encode("utf-8", "surrogateescape"))
+    digest = h.hexdigest()
+
+    with _memo_lock:
+        _memo[memo_key] = digest
+    return digest
+
+
+def tree_fingerprint(path: Union[str, Path]) -> Optional[str]:
+    """Fingerprint a directory tree from relative paths, sizes and mtimes.
+
+    Follows junctions/symlinks at the root only.  Returns ``None`` if *path*
+    is not a directory.
+    """
+    root = Path(path)
+    if not root.is_dir():
+        return None
+
+    entries = []
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            sig = stat_signature(full)
+            if sig is None:
+                continue
+            rel = os.path.relpath(full, root).replace("\\", "/")
+            entries.append(f"{rel}\0{sig[0]}\0{sig[1]}\n")
+
+    h = hashlib.sha1()
+    for line in sorted(entries):
+        h.update(line.encode("utf-8", "surrogateescape"))
+    return h.hexdigest()
+
+
+def source_fingerprint(path: Union[str, Path]) -> Optional[str]:
+    """Fingerprint a mod source: archive, directory or plain file."""
+    path = Path(path)
+    if path.is_dir():
+        return tree_fingerprint(path)
+    if path.suffix.lower() in ARCHIVE_SUFFIXES:
+        return archive_fingerprint(path)
+    sig = stat_signature(path)
+    if sig is None:
+        return None
+    return hashlib.sha1(f"{path.name}\0{sig[0]}\0{sig[1]}".encode("utf-8", "surrogateescape")).hexdigest()
@@ -7,14 +7,18 @@ File format: historic.json with shape { "<championId>": <skinOrChromaId> | "path
 Supports both:
   - Integer skin/chroma IDs for official skins: { "234": 234000 }
   - String custom mod paths: { "234": "path:skins/234000/old-aatrox-viego_1.2.0.fantome" }
+The map is kept in memory; changes are journaled and folded into historic.json
+in the background (see journaled_store).
 """
 
 from __future__ import annotations
 
-import json
+import atexit
+import threading
 from pathlib import Path
-from typing import Dict, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
+from utils.core.journaled_store import JournaledStore
 from utils.core.paths import get_user_data_dir
 
 
@@ -23,6 +27,37 @@ def _historic_file_path() -> Path:
     return data_dir / "historic.json"
 
 
+def _normalize_historic_map(data: Any) -> Tuple[Dict[str, Union[int, str]], bool]:
+    """Keep entries with an integer champion ID key and an int or str value"""
+    result: Dict[str, Union[int, str]] = {}
+    if isinstance(data, dict):
+        for k, v in data.items():
+            try:
+                key = str(int(k))
+                # Keep value as-is: int for skin IDs, str for custom mod paths
+                if isinstance(v, int):
+                    result[key] = int(v)
+                elif isinstance(v, str):
+                    result[key] = str(v)
+            except Exception:
+                continue
+    return result, False
+
+
+_store: Optional[JournaledStore] = None
+_store_lock = threading.Lock()
+
+
+def _get_store() -> JournaledStore:
+    """Shared in-memory historic map, persisted through a journal"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JournaledStore(_historic_file_path(), _normalize_historic_map)
+            atexit.register(_store.compact)
+        return _store
+
+
 def load_historic_map() -> Dict[str, Union[int, str]]:
     """Load the historic mapping. Returns empty dict if missing or invalid.
     
@@ -30,25 +65,7 @@ def load_historic_map() -> Dict[str, Union[int, str]]:
         Dict mapping champion IDs to either skin/chroma IDs (int) or custom mod paths (str with "path:" prefix)
     """
     try:
-        p = _historic_file_path()
-        if not p.exists():
-            return {}
-        with p.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, dict):
-            result: Dict[str, Union[int, str]] = {}
-            for k, v in data.items():
-                try:
-                    key = str(int(k))
-                    # Keep value as-is: int for skin IDs, str for custom mod paths
-                    if isinstance(v, int):
-                        result[key] = int(v)
-                    elif isinstance(v, str):
-                        result[key] = str(v)
-                except Exception:
-                    continue
-            return result
-        return {}
+        return _get_store().snapshot()
     except Exception:
         return {}
 
@@ -59,9 +76,11 @@ def get_historic_skin_for_champion(champion_id: int) -> Optional[Union[int, str]
     Returns:
         Integer skin/chroma ID, or string custom mod path (with "path:" prefix), or None
     """
-    m = load_historic_map()
     key = str(int(champion_id))
-    return m.get(key)
+    try:
+        return _get_store().get(key)
+    except Exception:
+        return None
 
 
 def write_historic_entry(champion_id: int, skin_or_chroma_id: Union[int, str]) -> None:
@@ -71,13 +90,8 @@ def write_historic_entry(champion_id: int, skin_or_chroma_id: Union[int, str]) -
         champion_id: Champion ID
         skin_or_chroma_id: Either an integer skin/chroma ID, or a string custom mod path (with "path:" prefix)
     """
-    p = _historic_file_path()
-    m = load_historic_map()
-    m[str(int(champion_id))] = skin_or_chroma_id
     try:
-        p.parent.mkdir(parents=True, exist_ok=True)
-        with p.open("w", encoding="utf-8") as f:
-            json.dump(m, f, ensure_ascii=False, indent=2)
+        _get_store().set(str(int(champion_id)), skin_or_chroma_id)
     except Exception:
         # Silently ignore write errors; feature is best-effort
         pass
@@ -86,14 +100,7 @@ def write_historic_entry(champion_id: int, skin_or_chroma_id: Union[int, str]) -
 def clear_historic_entry(champion_id: int) -> None:
     """Remove the historic entry for a champion if it exists."""
     try:
-        p = _historic_file_path()
-        m = load_historic_map()
-        key = str(int(champion_id))
-        if key in m:
-            m.pop(key, None)
-            p.parent.mkdir(parents=True, exist_ok=True)
-            with p.open("w", encoding="utf-8") as f:
-                json.dump(m, f, ensure_ascii=False, indent=2)
+        _get_store().delete(str(int(champion_id)))
     except Exception:
         # Best-effort; ignore errors
         pass
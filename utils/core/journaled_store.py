@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journaled Store
+In-memory JSON map persisted as a snapshot file plus an append-only journal
+
+Used for the skin and mod history files. Reads are served from memory. A
+write updates the map and appends one line describing the change to
+<file>.journal (a few microseconds, no rewrite of the JSON file); a
+background thread folds the journal into the snapshot once it has grown or
+gone quiet. The snapshot keeps the plain JSON layout older versions read.
+
+Crash safety:
+- Journal lines carry a CRC32, so a line torn by a crash is detected and
+  skipped on replay.
+- Appends are flushed to the OS right away, so they survive the process
+  dying; the snapshot is fsynced and atomically replaced when compacting.
+- Compaction first rotates the journal to <file>.journal.old, so writes made
+  while the snapshot is being written go to a fresh journal. On load the
+  snapshot is read, then .journal.old and .journal are replayed in order
+  (changes are idempotent, so replaying ones already in the snapshot is
+  harmless), and the result is compacted before use.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import HISTORY_COMPACT_DELAY_S, HISTORY_COMPACT_RECORDS
+from utils.core.logging import get_logger
+
+log = get_logger()
+
+JsonMap = Dict[str, Any]
+# Turns the parsed snapshot into the in-memory map; the flag asks for the
+# file to be rewritten (e.g. after migrating an old layout)
+Normalizer = Callable[[Any], Tuple[JsonMap, bool]]
+
+_MISSING = object()
+
+
+def _default_normalize(data: Any) -> Tuple[JsonMap, bool]:
+    return (dict(data), False) if isinstance(data, dict) else ({}, False)
+
+
+class JournaledStore:
+    """Dict of JSON values kept in memory and persisted through a write-ahead journal"""
+
+    def __init__(
+        self,
+        path: Path,
+        normalize: Optional[Normalizer] = None,
+        compact_records: int = HISTORY_COMPACT_RECORDS,
+        compact_delay_s: float = HISTORY_COMPACT_DELAY_S,
+    ):
+        self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.name + ".journal")
+        self.rotated_path = self.path.with_name(self.path.name + ".journal.old")
+        self.compact_records = max(1, int(compact_records))
+        self.compact_delay_s = compact_delay_s
+        self._normalize = normalize or _default_normalize
+        self._data: Optional[JsonMap] = None
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._compact_lock = threading.Lock()
+        self._journal = None
+        self._records = 0             # Changes not yet in the snapshot
+        self._last_change = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"writes": 0, "replayed": 0, "compactions": 0}
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            value = self._loaded().get(key, _MISSING)
+        return default if value is _MISSING else copy.copy(value)
+
+    def snapshot(self) -> JsonMap:
+        """Copy of the whole map"""
+        with self._lock:
+            return {key: copy.copy(value) for key, value in self._loaded().items()}
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def set(self, key: str, value: Any) -> bool:
+        with self._lock:
+            data = self._loaded()
+            if data.get(key, _MISSING) == value:
+                return False
+            data[key] = copy.copy(value)
+            self._append({"set": {key: value}, "del": []})
+            return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            data = self._loaded()
+            if key not in data:
+                return False
+            del data[key]
+            self._append({"set": {}, "del": [key]})
+            return True
+
+    def mutate(self, change: Callable[[JsonMap], Any]) -> bool:
+        """Apply *change* to a copy of the map and journal the difference
+
+        *change* edits the dict it is given in place. Runs under the store lock,
+        so read-modify-write sequences from different threads don't interleave.
+        Returns True if anything changed.
+        """
+        with self._lock:
+            data = self._loaded()
+            updated = {key: copy.copy(value) for key, value in data.items()}
+            change(updated)
+            sets = {key: value for key, value in updated.items() if data.get(key, _MISSING) != value}
+            deletes = [key for key in data if key not in updated]
+            if not sets and not deletes:
+                return False
+            data.update(sets)
+            for key in deletes:
+                del data[key]
+            self._append({"set": sets, "del": deletes})
+            return True
+
+    def compact(self) -> bool:
+        """Fold the journal into the snapshot now (returns False if writing failed)"""
+        with self._compact_lock:
+            with self._lock:
+                if self._data is None or self._records == 0:
+                    return True
+                data = {key: copy.copy(value) for key, value in self._data.items()}
+                self._close_journal()
+                if not self._rotate_journal():
+                    return False
+                self._records = 0
+            if not self._write_snapshot(data):
+                # The rotated journal stays and is merged into on the next try
+                with self._lock:
+                    self._records = max(1, self._records)
+                return False
+            try:
+                self.rotated_path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                log.debug(f"[history] Failed to remove {self.rotated_path.name}: {e}")
+            self.stats["compactions"] += 1
+            return True
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _loaded(self) -> JsonMap:
+        """The map, loading and recovering it on first use (lock held)"""
+        if self._data is None:
+            self._data = self._load()
+        return self._data
+
+    def _load(self) -> JsonMap:
+        raw: Any = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            log.debug(f"[history] Ignoring unreadable {self.path.name}: {e}")
+        try:
+            data, rewrite = self._normalize(raw)
+        except Exception as e:
+            log.debug(f"[history] Failed to normalize {self.path.name}: {e}")
+            data, rewrite = {}, False
+
+        replayed = self._replay(self.rotated_path, data) + self._replay(self.journal_path, data)
+        if replayed:
+            self.stats["replayed"] += replayed
+            log.info(f"[history] Recovered {replayed} change(s) to {self.path.name} from its journal")
+        if replayed or rewrite or self.rotated_path.exists():
+            # Start from a clean snapshot with no journals behind it
+            if self._write_snapshot(data):
+                for path in (self.rotated_path, self.journal_path):
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        log.debug(f"[history] Failed to remove {path.name}: {e}")
+            else:
+                # Journals stay; the next compaction merges and retries
+                self._records = max(1, replayed)
+        return data
+
+    @staticmethod
+    def _replay(path: Path, data: JsonMap) -> int:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            log.debug(f"[history] Failed to read journal {path.name}: {e}")
+            return 0
+
+        applied = 0
+        for number, line in enumerate(lines, 1):
+            crc, _, body = line.partition(" ")
+            try:
+                if int(crc, 16) != zlib.crc32(body.encode("utf-8")):
+                    raise ValueError("checksum mismatch")
+                record = json.loads(body)
+                sets = record.get("set") or {}
+                deletes = record.get("del") or []
+            except (ValueError, AttributeError) as e:
+                # Torn by a crash mid-append; records are independent, so
+                # anything appended after it is still good
+                log.debug(f"[history] Skipping damaged line {number} of {path.name}: {e}")
+                continue
+            data.update(sets)
+            for key in deletes:
+                data.pop(key, None)
+            applied += 1
+        return applied
+
+    def _append(self, record: dict) -> None:
+        """Journal one change (lock held)"""
+        self.stats["writes"] += 1
+        self._records += 1
+        self._last_change = time.monotonic()
+        body = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        line = f"{zlib.crc32(body.encode('utf-8')):08x} {body}\n"
+        try:
+            if self._journal is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+            self._journal.write(line)
+            self._journal.flush()
+        except OSError as e:
+            # Still in memory; the next compaction writes it out with the snapshot
+            log.debug(f"[history] Failed to append to {self.journal_path.name}: {e}")
+            self._close_journal()
+        self._ensure_thread()
+        self._changed.notify()
+
+    def _close_journal(self) -> None:
+        if self._journal is not None:
+            try:
+                self._journal.close()
+            except OSError:
+                pass
+            self._journal = None
+
+    def _rotate_journal(self) -> bool:
+        """Move the journal aside for compaction (lock held)"""
+        if not self.journal_path.exists():
+            return True
+        try:
+            if self.rotated_path.exists():
+                # A previous compaction didn't finish; keep its changes too
+                with open(self.journal_path, "rb") as src, open(self.rotated_path, "ab") as dst:
+                    dst.write(src.read())
+                self.journal_path.unlink()
+            else:
+                os.replace(self.journal_path, self.rotated_path)
+            return True
+        except OSError as e:
+            log.debug(f"[history] Failed to rotate {self.journal_path.name}: {e}")
+            return False
+
+    def _write_snapshot(self, data: JsonMap) -> bool:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            log.debug(f"[history] Failed to write {self.path.name}: {e}")
+            return False
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True, name="HistoryCompactor")
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Compact when the journal is long enough or writes have gone quiet"""
+        while True:
+            with self._lock:
+                while True:
+                    if self._records >= self.compact_records:
+                        break
+                    if self._records:
+                        remaining = self._last_change + self.compact_delay_s - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._changed.wait(remaining)
+                    else:
+                        self._changed.wait()
+            if not self.compact():
+                # Don't spin on a persistent write error
+                time.sleep(self.compact_delay_s)
+
@@ -3,7 +3,8 @@
 """
 Junction Utilities for Windows
 Provides directory junctions to avoid copying large mods on every injection.
-Falls back to shutil.copytree when junctions are unavailable.
+Falls back to a directory symlink, then shutil.copytree, when junctions are
+unavailable.
 """
 
 import os
@@ -47,9 +48,9 @@ def is_junction(path: Union[str, Path]) -> bool:
 def create_junction(source: Path, link: Path) -> bool:
     """Create a Windows directory junction at *link* pointing to *source*.
 
-    Returns ``True`` on success.  Falls back to ``shutil.copytree`` and
-    returns ``False`` if the junction cannot be created (non-Windows, missing
-    API, etc.).
+    Returns ``True`` on success (junction or directory symlink).  Falls back
+    to ``shutil.copytree`` and returns ``False`` if no link can be created
+    (missing API, no symlink privilege, etc.).
     """
     source = Path(source).resolve()
     link = Path(link)
@@ -60,7 +61,14 @@ def create_junction(source: Path, link: Path) -> bool:
         log.info(f"[JUNCTION] Created junction: {link} -> {source}")
         return True
     except Exception as exc:
-        log.warning(f"[JUNCTION] CreateJunction failed ({exc}), falling back to copytree")
+        junction_error = exc
+
+    try:
+        os.symlink(source, link, target_is_directory=True)
+        log.info(f"[JUNCTION] Created symlink: {link} -> {source}")
+        return True
+    except Exception as exc:
+        log.warning(f"[JUNCTION] CreateJunction failed ({junction_error}) and symlink failed ({exc}), falling back to copytree")
         try:
             shutil.copytree(source, link, dirs_exist_ok=True)
             log.info(f"[JUNCTION] Fallback copytree: {source} -> {link}")
@@ -83,9 +91,12 @@ def safe_remove_entry(path: Union[str, Path]) -> None:
     """
     path = Path(path)
 
-    if is_junction(path):
+    if is_junction(path) or os.path.islink(path):
         try:
-            os.rmdir(path)  # removes junction point only
+            if os.path.islink(path) and os.name != "nt":
+                os.unlink(path)  # POSIX directory symlink
+            else:
+                os.rmdir(path)  # removes junction point only
             log.debug(f"[JUNCTION] Removed junction: {path}")
         except OSError as exc:
             log.warning(f"[JUNCTION] Failed to remove junction {path}: {exc}")
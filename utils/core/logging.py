@@ -6,14 +6,13 @@ Logging configuration and utilities
 
 # Standard library imports
 import os
-import queue
 import re
 import sys
 import threading
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Tuple
 
 # Third-party imports
 import logging
@@ -22,7 +21,11 @@ from urllib3.exceptions import InsecureRequestWarning
 
 # Local imports
 from config import (
+    LOG_BATCH_MAX,
+    LOG_DROP_REPORT_S,
     LOG_MAX_FILE_SIZE_MB_DEFAULT,
+    LOG_RING_BLOCK_S,
+    LOG_RING_CAPACITY,
     LOG_FILE_PATTERN,
     LOG_TIMESTAMP_FORMAT,
     LOG_SEPARATOR_WIDTH,
@@ -66,6 +69,9 @@ class SizeRotatingCompositeHandler(logging.Handler):
         self._index = 0
         self.current_path = self._compute_current_path()
         self.current_handler = self.create_handler_fn(self.current_path)
+        # Bytes in the current file: stat'ed once when it is opened, then
+        # counted as records are written (no stat per record)
+        self._bytes_written = self._file_size(self.current_path)
         self._stored_formatter = None
         # Ensure the inner handler starts at the same level/filters
         # as this composite handler once they are set by the caller
@@ -91,30 +97,63 @@ class SizeRotatingCompositeHandler(logging.Handler):
         except Exception:
             pass
 
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
     def _maybe_rotate(self):
+        if self._bytes_written < self.max_bytes:
+            return
         try:
-            current_size = self.current_path.stat().st_size if self.current_path.exists() else 0
-            if current_size >= self.max_bytes:
-                try:
-                    self.current_handler.close()
-                except Exception:
-                    pass
-                self._index += 1
-                self.current_path = self._compute_current_path()
-                self.current_handler = self.create_handler_fn(self.current_path)
-                self._apply_stored_config()
+            try:
+                self.current_handler.close()
+            except Exception:
+                pass
+            self._index += 1
+            self.current_path = self._compute_current_path()
+            self.current_handler = self.create_handler_fn(self.current_path)
+            self._bytes_written = self._file_size(self.current_path)
+            self._apply_stored_config()
         except Exception:
             # Never break logging due to rotation errors
             pass
 
+    def _write(self, text: str):
+        """Write formatted text to the current file, rolling over first if it is full"""
+        self._maybe_rotate()
+        stream = self.current_handler.stream
+        if stream is None:
+            # Inner handler was closed (e.g. at shutdown); let it reopen
+            stream = self.current_handler.stream = self.current_handler._open()
+        stream.write(text)
+        stream.flush()
+        # Newline translation on Windows isn't counted; close enough for rolling
+        self._bytes_written += len(text.encode("utf-8", "replace"))
+
     def emit(self, record):
         try:
-            self._maybe_rotate()
-            self.current_handler.emit(record)
+            self._write(self.format(record) + self.current_handler.terminator)
         except Exception:
             # Swallow any errors to avoid crashing the app due to logging
             pass
 
+    def handle_batch(self, records):
+        """Write several records with a single write and flush"""
+        lines = _format_batch(self, records)
+        if not lines:
+            return
+        terminator = self.current_handler.terminator
+        self.acquire()
+        try:
+            self._write(terminator.join(lines) + terminator)
+        except Exception:
+            pass
+        finally:
+            self.release()
+
     def setFormatter(self, fmt):
         self._stored_formatter = fmt
         try:
@@ -156,6 +195,252 @@ class SizeRotatingCompositeHandler(logging.Handler):
         except Exception:
             pass
 
+def _format_batch(handler: logging.Handler, records) -> List[str]:
+    """Formatted lines of the records *handler* accepts (unformattable ones are skipped)"""
+    lines = []
+    for record in records:
+        if record.levelno < handler.level or not handler.filter(record):
+            continue
+        try:
+            lines.append(handler.format(record))
+        except Exception:
+            pass
+    return lines
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Hands records to a writer thread through a preallocated ring buffer.
+
+    - The logging call only stores the record in a free slot; formatting and
+      writing happen on the writer thread, which takes up to batch_max records
+      at a time and gives them to each target in one handle_batch() call, so a
+      burst costs one write and flush per batch instead of one per record.
+    - When the buffer is full the caller waits up to block_s for space. If it
+      is still full the record is dropped and counted, and further records are
+      dropped without waiting until the writer frees space, so a stuck target
+      delays each logging call at most once. Drops are reported in the log
+      itself ("[logging] Dropped N record(s) ...").
+    """
+    def __init__(
+        self,
+        targets,
+        capacity: int = LOG_RING_CAPACITY,
+        batch_max: int = LOG_BATCH_MAX,
+        block_s: float = LOG_RING_BLOCK_S,
+        report_s: float = LOG_DROP_REPORT_S,
+    ):
+        super().__init__()
+        self.targets = list(targets)
+        self.capacity = max(1, int(capacity))
+        self.batch_max = max(1, int(batch_max))
+        self.block_s = block_s
+        self.report_s = report_s
+        self._slots = [None] * self.capacity
+        self._head = 0                 # Records taken by the writer so far
+        self._tail = 0                 # Records stored so far
+        self._written = 0              # Records the writer has finished writing
+        self._ring_lock = threading.Lock()
+        self._not_empty = threading.Condition(self._ring_lock)
+        self._not_full = threading.Condition(self._ring_lock)
+        self._writer_waiting = False
+        self._space_waiters = 0
+        self._overflowing = False
+        self._stopping = False
+        self._dropped: Dict[str, int] = {}    # Level name -> records dropped since the last report
+        self._last_report = float("-inf")
+        self.stats = {"records": 0, "batches": 0, "dropped": 0}
+        # Nothing below the most verbose target needs to enter the buffer
+        self.setLevel(min((t.level for t in self.targets), default=logging.NOTSET))
+        self._thread = threading.Thread(target=self._run, daemon=True, name="LogQueueWorker")
+        self._thread.start()
+
+    def handle(self, record):
+        # Skip the per-handler lock: the ring has its own, held only to store
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record):
+        try:
+            # Resolve the message now: args may be mutated before the writer
+            # gets to the record
+            record.msg = record.getMessage()
+            record.args = None
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self._ring_lock:
+            if self._stopping and not self._thread.is_alive():
+                stored = False
+            elif self._tail - self._head >= self.capacity and not self._wait_for_space():
+                self._dropped[record.levelname] = self._dropped.get(record.levelname, 0) + 1
+                self.stats["dropped"] += 1
+                return
+            else:
+                self._slots[self._tail % self.capacity] = record
+                self._tail += 1
+                if self._writer_waiting:
+                    self._writer_waiting = False
+                    self._not_empty.notify()
+                stored = True
+        if not stored:
+            # Writer already gone (shutdown): write on the calling thread
+            self._write_batch([record])
+
+    def _wait_for_space(self) -> bool:
+        """Wait up to block_s for a free slot (ring lock held)"""
+        if self._overflowing or threading.current_thread() is self._thread:
+            return False
+        deadline = time.monotonic() + self.block_s
+        self._space_waiters += 1
+        try:
+            while self._tail - self._head >= self.capacity:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._overflowing = True
+                    return False
+                self._not_full.wait(remaining)
+            return True
+        finally:
+            self._space_waiters -= 1
+
+    def _take(self, count: int) -> list:
+        """Remove the oldest *count* records from the ring (ring lock held)"""
+        start = self._head % self.capacity
+        end = start + count
+        slots = self._slots
+        if end <= self.capacity:
+            batch = slots[start:end]
+            slots[start:end] = [None] * count
+        else:
+            end -= self.capacity
+            batch = slots[start:] + slots[:end]
+            slots[start:] = [None] * (self.capacity - start)
+            slots[:end] = [None] * end
+        self._head += count
+        return batch
+
+    def _run(self):
+        """Writer thread: drain the ring in batches"""
+        while True:
+            with self._ring_lock:
+                if self._tail == self._head and not self._stopping:
+                    timeout = None
+                    if self._dropped:
+                        timeout = max(0.0, self._last_report + self.report_s - time.monotonic())
+                    self._writer_waiting = True
+                    self._not_empty.wait(timeout)
+                    self._writer_waiting = False
+                count = min(self._tail - self._head, self.batch_max)
+                batch = self._take(count) if count else []
+                if count:
+                    self._overflowing = False
+                    if self._space_waiters:
+                        self._not_full.notify_all()
+                report = None
+                if self._dropped and time.monotonic() - self._last_report >= self.report_s:
+                    report = self._drop_report(self._dropped)
+                    self._dropped = {}
+                    self._last_report = time.monotonic()
+                finished = self._stopping and self._tail == self._head
+                taken = self._head
+            if batch:
+                self._write_batch(batch)
+            self._written = taken
+            if report is not None:
+                self._write_batch([report])
+            if finished:
+                return
+
+    @staticmethod
+    def _drop_report(dropped: Dict[str, int]) -> logging.LogRecord:
+        detail = ", ".join(f"{count} {level}" for level, count in sorted(dropped.items()))
+        message = f"[logging] Dropped {sum(dropped.values())} record(s) while the log buffer was full ({detail})"
+        return logging.LogRecord("logging", logging.WARNING, __file__, 0, message, None, None, func="emit")
+
+    def _write_batch(self, batch):
+        for target in self.targets:
+            try:
+                handle_batch = getattr(target, "handle_batch", None)
+                if handle_batch is not None:
+                    handle_batch(batch)
+                else:
+                    for record in batch:
+                        target.handle(record)
+            except Exception:
+                # A failing target must not stop the writer thread
+                pass
+        self.stats["records"] += len(batch)
+        self.stats["batches"] += 1
+
+    def flush(self):
+        """Wait (up to a second) until everything logged so far has been written"""
+        if threading.current_thread() is self._thread:
+            return
+        target = self._tail
+        deadline = time.monotonic() + 1.0
+        while self._written < target and self._thread.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def close(self):
+        """Write out what is buffered and stop the writer thread"""
+        with self._ring_lock:
+            self._stopping = True
+            self._not_empty.notify()
+        if self._thread.is_alive() and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=2.0)
+        super().close()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per call site, for loggers used in hot loops.
+
+    Each logging call (file and line) may emit `burst` records at once and
+    `rate_per_s` per second after that. Records over the limit are counted
+    instead of logged; the next record from that call site that gets through
+    says how many were suppressed.
+    """
+    def __init__(self, rate_per_s: float, burst: int):
+        super().__init__()
+        self.rate_per_s = rate_per_s
+        self.burst = max(1.0, float(burst))
+        self._buckets: Dict[Tuple[str, int], list] = {}   # call site -> [tokens, updated_at, suppressed]
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record):
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now, 0]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate_per_s)
+                bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                self.suppressed += 1
+                return False
+            bucket[0] -= 1.0
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.msg = f"{record.getMessage()} (+{suppressed} similar suppressed)"
+            record.args = None
+        return True
+
+
+def rate_limited(logger: logging.Logger, rate_per_s: float, burst: int) -> logging.Logger:
+    """Limit how fast each call site of *logger* can log (see RateLimitFilter)"""
+    if not any(isinstance(f, RateLimitFilter) for f in logger.filters):
+        logger.addFilter(RateLimitFilter(rate_per_s, burst))
+    return logger
+
+
 def setup_logging(log_mode: str = 'customer', *, write_logs: bool = True):
     """
     Setup logging configuration with three modes.
@@ -180,61 +465,6 @@ def setup_logging(log_mode: str = 'customer', *, write_logs: bool = True):
         except (AttributeError, OSError):
             pass  # stderr doesn't support reconfigure or is redirected
     
-    # Create a queue-based non-blocking logging handler
-    class QueueHandler(logging.Handler):
-        """A queue-based handler that never blocks the calling thread"""
-        def __init__(self, target_handler):
-            super().__init__()
-            self.target_handler = target_handler
-            self.queue = queue.Queue(maxsize=1000)  # Limit queue size to prevent memory issues
-            self.worker_thread = None
-            self._stop_event = threading.Event()
-            self._start_worker()
-        
-        def _start_worker(self):
-            """Start the worker thread that processes log records"""
-            def worker():
-                while not self._stop_event.is_set():
-                    try:
-                        # Get record with timeout to allow checking stop event
-                        record = self.queue.get(timeout=0.1)
-                        if record is None:  # Sentinel value to stop
-                            break
-                        # Emit to target handler in worker thread
-                        try:
-                            self.target_handler.emit(record)
-                        except Exception:
-                            # If emit fails, silently drop the log message
-                            pass
-                        finally:
-                            self.queue.task_done()
-                    except queue.Empty:
-                        continue
-            
-            self.worker_thread = threading.Thread(target=worker, daemon=True, name="LogQueueWorker")
-            self.worker_thread.start()
-        
-        def emit(self, record):
-            """Queue the log record without blocking"""
-            try:
-                # Use put_nowait to never block the calling thread
-                self.queue.put_nowait(record)
-            except queue.Full:
-                # Queue is full - drop the message silently
-                # This prevents blocking even under extreme log load
-                pass
-        
-        def close(self):
-            """Stop the worker thread gracefully"""
-            self._stop_event.set()
-            try:
-                self.queue.put_nowait(None)  # Sentinel to stop worker
-            except queue.Full:
-                pass
-            if self.worker_thread and self.worker_thread.is_alive():
-                self.worker_thread.join(timeout=1.0)
-            super().close()
-    
     # Create a safe logging handler that works even without console
     class SafeStreamHandler(logging.StreamHandler):
         """A stream handler that safely handles None streams and prevents blocking"""
@@ -261,6 +491,18 @@ def setup_logging(log_mode: str = 'customer', *, write_logs: bool = True):
             except (AttributeError, OSError, ValueError):
                 # If the stream is broken, silently ignore
                 pass
+
+        def handle_batch(self, records):
+            """Write several records with a single write and flush"""
+            lines = _format_batch(self, records)
+            if not lines:
+                return
+            try:
+                self.stream.write(self.terminator.join(lines) + self.terminator)
+                self.stream.flush()
+            except (AttributeError, OSError, ValueError):
+                # Blocking or broken stream - skip these messages
+                pass
     
     # Use stderr if stdout is None or redirected to devnull (windowed mode), but make it safe
     if sys.stdout is not None and hasattr(sys.stdout, 'name') and sys.stdout.name == os.devnull:
@@ -284,13 +526,18 @@ def setup_logging(log_mode: str = 'customer', *, write_logs: bool = True):
     
     class _Fmt(logging.Formatter):
         def format(self, record):
-            record._when = time.strftime("%H:%M:%S", time.localtime())
+            # Time the record was made, not written (writing is deferred)
+            record._when = time.strftime("%H:%M:%S", time.localtime(record.created))
             return super().format(record)
     
     safe_handler.setFormatter(_Fmt(fmt))
-    
-    # Wrap in queue handler to prevent blocking
-    h = QueueHandler(safe_handler)
+    # Console handler level based on log mode
+    if log_mode == 'debug':
+        safe_handler.setLevel(TRACE)  # Show everything including TRACE
+    elif log_mode == 'verbose':
+        safe_handler.setLevel(logging.DEBUG)  # Show DEBUG and above
+    else:  # customer mode
+        safe_handler.setLevel(logging.INFO)  # Show INFO and above (clean output)
     
     # Setup file logging (only if dev mode isn't explicitly suppressing it)
     file_handler = None
@@ -325,7 +572,7 @@ def setup_logging(log_mode: str = 'customer', *, write_logs: bool = True):
             
             class _FileFmt(logging.Formatter):
                 def format(self, record):
-                    record._when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+                    record._when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.created))
                     return super().format(record)
             
             file_handler.setFormatter(_FileFmt(file_fmt))
@@ -345,21 +592,17 @@ def setup_logging(log_mode: str = 'customer', *, write_logs: bool = True):
             print(f"Warning: Could not setup file logging: {e}", file=sys.stderr)
     
     root = logging.getLogger()
+    for old_handler in root.handlers:
+        if isinstance(old_handler, RingBufferHandler):
+            old_handler.close()
     root.handlers.clear()
     
-    # Add console handler
-    root.addHandler(h)
-    # Console handler level based on log mode
-    if log_mode == 'debug':
-        h.setLevel(TRACE)  # Show everything including TRACE
-    elif log_mode == 'verbose':
-        h.setLevel(logging.DEBUG)  # Show DEBUG and above
-    else:  # customer mode
-        h.setLevel(logging.INFO)  # Show INFO and above (clean output)
-    
-    # Always add file handler
+    # Console and file both write on the ring buffer's writer thread, so a
+    # logging call never waits on console or disk I/O
+    targets = [safe_handler]
     if file_handler:
-        root.addHandler(file_handler)
+        targets.append(file_handler)
+    root.addHandler(RingBufferHandler(targets))
     
     # Root logger must be at TRACE to allow all handlers to receive all messages
     # This is critical - if root is at INFO, DEBUG/TRACE messages never reach handlers
@@ -457,7 +700,7 @@ def get_named_logger(name: str, prefix: str, log_mode: str = None) -> logging.Lo
 
         class _FileFmt(logging.Formatter):
             def format(self, record):
-                record._when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+                record._when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.created))
                 return super().format(record)
 
         file_handler.setFormatter(_FileFmt(file_fmt))
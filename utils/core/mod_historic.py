@@ -19,14 +19,18 @@ File format: mod_historic.json with shape:
   // Legacy (backward compat):
   // "other": "<relative_path>" | ["<relative_path>", ...]
 }
+The map is kept in memory; changes are journaled and folded into
+mod_historic.json in the background (see journaled_store).
 """
 
 from __future__ import annotations
 
-import json
+import atexit
+import threading
 from pathlib import Path
-from typing import Dict, Optional, Union, List, Iterable
+from typing import Any, Dict, Optional, Tuple, Union, List, Iterable
 
+from utils.core.journaled_store import JournaledStore
 from utils.core.paths import get_user_data_dir
 
 
@@ -74,6 +78,78 @@ def _mod_historic_file_path() -> Path:
     return data_dir / "mod_historic.json"
 
 
+def _normalize_mod_historic(data: Any) -> Tuple[Dict[str, Union[str, List[str]]], bool]:
+    """Normalize the file contents; the flag asks for a legacy-only file to be rewritten.
+
+    Normalized shape:
+      - "map"/"font"/"announcer": string
+      - category keys ("ui"/"voiceover"/"loading_screen"/"vfx"/"sfx"/"others"): list[str]
+
+    Legacy "other" (string or list) is merged into the category keys.
+    """
+    if not isinstance(data, dict):
+        return {}, False
+
+    result: Dict[str, Union[str, List[str]]] = {}
+
+    # Single-select types
+    for k in ("map", "font", "announcer"):
+        v = data.get(k)
+        if isinstance(v, str):
+            result[k] = v
+
+    # New per-category lists (string accepted as convenience)
+    any_new_category_key = False
+    for cat in _CATEGORY_KEYS:
+        v = data.get(cat)
+        if isinstance(v, str) or isinstance(v, list):
+            items = _as_list(v)
+            if items:
+                result[cat] = _dedupe_keep_order(items)
+                any_new_category_key = True
+            else:
+                result[cat] = []
+        else:
+            result[cat] = []
+
+    # Legacy "other" -> merge into inferred categories
+    legacy_items = _as_list(data.get("other"))
+    has_legacy_other = bool(legacy_items)
+    for item in legacy_items:
+        cat = _infer_category_from_relative_path(item)
+        existing = result.get(cat, [])
+        if not isinstance(existing, list):
+            existing = []
+        result[cat] = _dedupe_keep_order([*existing, item])
+
+    # Compact (drop empty category lists)
+    out: Dict[str, Union[str, List[str]]] = {}
+    for k in ("map", "font", "announcer"):
+        if k in result:
+            out[k] = result[k]
+    for cat in _CATEGORY_KEYS:
+        items = result.get(cat, [])
+        if isinstance(items, list) and items:
+            out[cat] = items
+
+    # Best-effort migration: legacy-only "other" and no new category keys
+    return out, has_legacy_other and not any_new_category_key
+
+
+_store: Optional[JournaledStore] = None
+_store_lock = threading.Lock()
+
+
+def _get_store() -> JournaledStore:
+    """Shared in-memory mod historic map, persisted through a journal"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JournaledStore(_mod_historic_file_path(), _normalize_mod_historic)
+            atexit.register(_store.compact)
+        return _store
+
+
 def load_mod_historic() -> Dict[str, Union[str, List[str]]]:
     """Load the mod historic mapping. Returns empty dict if missing or invalid.
 
@@ -82,75 +158,10 @@ def load_mod_historic() -> Dict[str, Union[str, List[str]]]:
       - category keys ("ui"/"voiceover"/"loading_screen"/"vfx"/"sfx"/"others"): list[str]
 
     Also supports legacy "other" (string or list) and will merge it into category keys.
-    If the file is legacy-only, this function will best-effort migrate it to the new shape.
+    If the file is legacy-only, it is migrated to the new shape when first loaded.
     """
     try:
-        p = _mod_historic_file_path()
-        if not p.exists():
-            return {}
-        with p.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, dict):
-            result: Dict[str, Union[str, List[str]]] = {}
-
-            # Single-select types
-            for k in ("map", "font", "announcer"):
-                v = data.get(k)
-                if isinstance(v, str):
-                    result[k] = v
-
-            # New per-category lists (string accepted as convenience)
-            any_new_category_key = False
-            for cat in _CATEGORY_KEYS:
-                v = data.get(cat)
-                if isinstance(v, str) or isinstance(v, list):
-                    items = _as_list(v)
-                    if items:
-                        result[cat] = _dedupe_keep_order(items)
-                        any_new_category_key = True
-                    else:
-                        result[cat] = []
-                else:
-                    result[cat] = []
-
-            # Legacy "other" -> merge into inferred categories
-            legacy_items = _as_list(data.get("other"))
-            has_legacy_other = bool(legacy_items)
-            for item in legacy_items:
-                cat = _infer_category_from_relative_path(item)
-                existing = result.get(cat, [])
-                if not isinstance(existing, list):
-                    existing = []
-                result[cat] = _dedupe_keep_order([*existing, item])
-
-            # Best-effort migration: legacy-only "other" and no new category keys
-            if has_legacy_other and not any_new_category_key:
-                try:
-                    compact: Dict[str, Union[str, List[str]]] = {}
-                    for k in ("map", "font", "announcer"):
-                        if isinstance(result.get(k), str):
-                            compact[k] = result[k]  # type: ignore[assignment]
-                    for cat in _CATEGORY_KEYS:
-                        items = result.get(cat, [])
-                        if isinstance(items, list) and items:
-                            compact[cat] = items
-                    p.parent.mkdir(parents=True, exist_ok=True)
-                    with p.open("w", encoding="utf-8") as wf:
-                        json.dump(compact, wf, ensure_ascii=False, indent=2)
-                except Exception:
-                    pass
-
-            # Return compact (drop empty category lists)
-            out: Dict[str, Union[str, List[str]]] = {}
-            for k in ("map", "font", "announcer"):
-                if k in result:
-                    out[k] = result[k]
-            for cat in _CATEGORY_KEYS:
-                items = result.get(cat, [])
-                if isinstance(items, list) and items:
-                    out[cat] = items
-            return out
-        return {}
+        return _get_store().snapshot()
     except Exception:
         return {}
 
@@ -187,42 +198,40 @@ def write_historic_mod(mod_type: str, relative_path: Union[str, List[str]]) -> N
         mod_type: "map"/"font"/"announcer" or a category key (ui/voiceover/loading_screen/vfx/sfx/others).
         relative_path: For category keys, can be a list of relative paths. For single-select keys, must be a string.
     """
-    p = _mod_historic_file_path()
-    m = load_mod_historic()
-    
-    # Normalize legacy "other" writes into per-category keys
-    if mod_type == "other":
-        items = _as_list(relative_path)
-        grouped: Dict[str, List[str]] = {cat: [] for cat in _CATEGORY_KEYS}
-        for item in items:
-            cat = _infer_category_from_relative_path(item)
-            grouped[cat].append(item)
-        for cat, paths in grouped.items():
-            if paths:
-                m[cat] = _dedupe_keep_order(paths)
-        # Avoid writing legacy key
-        if "other" in m:
-            del m["other"]
-        mod_type = "others"
-
-    if mod_type in _CATEGORY_KEYS:
-        items = _as_list(relative_path)
-        if items:
-            m[mod_type] = _dedupe_keep_order(items)
-        else:
-            if mod_type in m:
-                del m[mod_type]
-    else:
-        # Single-select types (string)
-        if isinstance(relative_path, list):
-            m[mod_type] = str(relative_path[0]) if relative_path else ""
+    def apply(m: Dict[str, Union[str, List[str]]]) -> None:
+        key = mod_type
+
+        # Normalize legacy "other" writes into per-category keys
+        if key == "other":
+            items = _as_list(relative_path)
+            grouped: Dict[str, List[str]] = {cat: [] for cat in _CATEGORY_KEYS}
+            for item in items:
+                cat = _infer_category_from_relative_path(item)
+                grouped[cat].append(item)
+            for cat, paths in grouped.items():
+                if paths:
+                    m[cat] = _dedupe_keep_order(paths)
+            # Avoid writing legacy key
+            if "other" in m:
+                del m["other"]
+            key = "others"
+
+        if key in _CATEGORY_KEYS:
+            items = _as_list(relative_path)
+            if items:
+                m[key] = _dedupe_keep_order(items)
+            else:
+                if key in m:
+                    del m[key]
         else:
-            m[mod_type] = str(relative_path)
-    
+            # Single-select types (string)
+            if isinstance(relative_path, list):
+                m[key] = str(relative_path[0]) if relative_path else ""
+            else:
+                m[key] = str(relative_path)
+
     try:
-        p.parent.mkdir(parents=True, exist_ok=True)
-        with p.open("w", encoding="utf-8") as f:
-            json.dump(m, f, ensure_ascii=False, indent=2)
+        _get_store().mutate(apply)
     except Exception:
         # Silently ignore write errors; feature is best-effort
         pass
@@ -234,30 +243,17 @@ def clear_historic_mod(mod_type: str) -> None:
     Args:
         mod_type: One of "map", "font", "announcer", "other"
     """
-    p = _mod_historic_file_path()
-    m = load_mod_historic()
-    if mod_type == "other":
-        # Backward compat: clear all category keys
-        changed = False
-        for cat in _CATEGORY_KEYS:
-            if cat in m:
-                del m[cat]
-                changed = True
-        if "other" in m:
-            del m["other"]
-            changed = True
-        if not changed:
-            return
-    else:
-        if mod_type not in m:
-            return
-        del m[mod_type]
+    def apply(m: Dict[str, Union[str, List[str]]]) -> None:
+        if mod_type == "other":
+            # Backward compat: clear all category keys
+            for cat in _CATEGORY_KEYS:
+                m.pop(cat, None)
+            m.pop("other", None)
+        else:
+            m.pop(mod_type, None)
 
     try:
-        p.parent.mkdir(parents=True, exist_ok=True)
-        with p.open("w", encoding="utf-8") as f:
-            json.dump(m, f, ensure_ascii=False, indent=2)
+        _get_store().mutate(apply)
     except Exception:
-        # Silently ignore write errors; feature is best-effort
+        # Best-effort; ignore errors
         pass
-
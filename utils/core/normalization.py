@@ -4,6 +4,11 @@
 Simplified text matching utilities for UI API detection
 """
 
+import heapq
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
 
 def levenshtein_distance(s1: str, s2: str) -> int:
     """Calculate the Levenshtein distance between two strings.
@@ -73,3 +78,235 @@ def levenshtein_score(detected_text: str, skin_text: str) -> float:
     
     score = 1.0 - (distance / max_len)
     return max(0.0, score)  # Ensure score is not negative
+
+
+def banded_levenshtein_distance(s1: str, s2: str, max_distance: int) -> int:
+    """Levenshtein distance, giving up once it must exceed *max_distance*.
+
+    Only the diagonal band of width 2 * max_distance + 1 is computed, and the
+    scan stops as soon as a whole row is above the bound, so rejecting a
+    distant string costs O(max_distance * len) instead of O(len1 * len2).
+
+    Returns:
+        The exact distance if it is <= max_distance, otherwise max_distance + 1
+    """
+    if max_distance < 0:
+        return 0 if s1 == s2 else max_distance + 1
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    len1, len2 = len(s1), len(s2)
+    if len1 - len2 > max_distance:
+        return max_distance + 1
+    if len2 == 0:
+        return len1
+
+    over = max_distance + 1
+    previous_row = [j if j <= max_distance else over for j in range(len2 + 1)]
+    for i in range(1, len1 + 1):
+        c1 = s1[i - 1]
+        lo = max(1, i - max_distance)
+        hi = min(len2, i + max_distance)
+        current_row = [over] * (len2 + 1)
+        current_row[0] = i if i <= max_distance else over
+        row_min = current_row[0]
+        for j in range(lo, hi + 1):
+            cost = previous_row[j - 1] + (c1 != s2[j - 1])
+            if previous_row[j] + 1 < cost:
+                cost = previous_row[j] + 1
+            if current_row[j - 1] + 1 < cost:
+                cost = current_row[j - 1] + 1
+            if cost > over:
+                cost = over
+            current_row[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > max_distance:
+            return over
+        previous_row = current_row
+    return min(previous_row[len2], over)
+
+
+def _trigrams(text: str) -> Counter:
+    return Counter(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _edit_distance_bound(len1: int, len2: int, shared: int) -> int:
+    """Lower bound on the edit distance of two strings sharing *shared* trigrams"""
+    max_len = len1 if len1 > len2 else len2
+    gram_bound = -(-(max_len - 2 - shared) // 3)
+    length_bound = abs(len1 - len2)
+    return gram_bound if gram_bound > length_bound else length_bound
+
+
+class NameIndex:
+    """Precomputed lookup structure over a fixed list of (id, name) pairs.
+
+    Names are matched exactly as given (callers normalize them first if they
+    want case-insensitive matching). Built once per name list, then queried:
+
+    - closest(): minimum Levenshtein distance, same result and tie-breaking
+      as scanning every name, but candidates are ranked by a trigram lower
+      bound and the scan stops once no remaining name can beat the best one.
+      Only names sharing a trigram with the query are ranked up front.
+    - containing(): first name (in list order) that contains the query or is
+      contained in it, via trigram postings and substring lookups.
+
+    Recent queries are memoized.
+    """
+
+    def __init__(self, items: Iterable[Tuple[Any, str]], memo_size: int = 256):
+        self.ids: List[Any] = []
+        self.names: List[str] = []
+        self._by_name: Dict[str, int] = {}
+        self._grams: List[Counter] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._by_length: Dict[int, List[int]] = {}
+        for item_id, name in items:
+            index = len(self.names)
+            self.ids.append(item_id)
+            self.names.append(name)
+            self._by_name.setdefault(name, index)
+            grams = _trigrams(name)
+            self._grams.append(grams)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(index)
+            self._by_length.setdefault(len(name), []).append(index)
+        self._name_lengths = sorted(self._by_length)
+        self._memo: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._memo_size = memo_size
+        self._memo_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, name: str) -> Optional[Any]:
+        """ID of an exact name match"""
+        index = self._by_name.get(name)
+        return self.ids[index] if index is not None else None
+
+    def closest(self, queries: Sequence[str]) -> Optional[Tuple[Any, str, float]]:
+        """Name with the smallest edit distance to any of *queries*
+
+        Ties go to the earlier name, then the earlier query, as in a nested
+        scan over names and queries.
+
+        Returns:
+            (id, name, similarity) or None if the index is empty
+        """
+        key = ("closest", tuple(queries))
+        found, result = self._memo_get(key)
+        if found:
+            return result
+
+        best = None  # (distance, name index, query index)
+        for query_index, query in enumerate(queries):
+            for bound, index in self._ranked_candidates(query):
+                if best is not None and bound > best[0]:
+                    break
+                limit = best[0] if best is not None else max(len(query), len(self.names[index]))
+                distance = banded_levenshtein_distance(query, self.names[index], limit)
+                if distance > limit:
+                    continue
+                candidate = (distance, index, query_index)
+                if best is None or candidate < best:
+                    best = candidate
+
+        result = None
+        if best is not None:
+            distance, index, query_index = best
+            max_len = max(len(queries[query_index]), len(self.names[index]))
+            similarity = 1.0 - (distance / max_len) if max_len > 0 else 0.0
+            result = (self.ids[index], self.names[index], similarity)
+        self._memo_put(key, result)
+        return result
+
+    def containing(self, query: str) -> Optional[Tuple[Any, str]]:
+        """First name that contains *query* or is contained in it
+
+        Returns:
+            (id, name) or None
+        """
+        key = ("containing", query)
+        found, result = self._memo_get(key)
+        if found:
+            return result
+
+        matches = []
+        # Names containing the query
+        if len(query) < 3:
+            first = next((i for i, name in enumerate(self.names) if query in name), None)
+            if first is not None:
+                matches.append(first)
+        else:
+            # Any name containing the query is in every posting of its
+            # trigrams; postings are in index order, so the first hit in the
+            # shortest one is the earliest match
+            shortest = min((self._postings.get(gram, ()) for gram in _trigrams(query)), key=len)
+            first = next((i for i in shortest if query in self.names[i]), None)
+            if first is not None:
+                matches.append(first)
+        # Names contained in the query (only lengths that exist in the index)
+        for length in self._name_lengths:
+            if length > len(query):
+                break
+            for start in range(len(query) - length + 1):
+                index = self._by_name.get(query[start:start + length])
+                if index is not None:
+                    matches.append(index)
+
+        result = None
+        if matches:
+            index = min(matches)
+            result = (self.ids[index], self.names[index])
+        self._memo_put(key, result)
+        return result
+
+    def _ranked_candidates(self, query: str) -> Iterator[Tuple[int, int]]:
+        """(lower bound on edit distance, name index), best first
+
+        Each edit changes at most 3 trigrams, so two strings sharing `shared`
+        trigrams are at least (max_len - 2 - shared) / 3 edits apart; the
+        length difference is a bound too.
+
+        Only names sharing a trigram with the query are scored and sorted.
+        The rest share none, so their bound depends on their length alone;
+        they are yielded lazily, one length bucket at a time, and closest()
+        stops pulling them once the best match beats their bound. The cost
+        therefore grows with the names that share a trigram with the query,
+        not with the catalog; a query made only of common trigrams can still
+        touch most of a whole-language mapping.
+        """
+        shared: Dict[int, int] = {}
+        for gram, count in _trigrams(query).items():
+            for index in self._postings.get(gram, ()):
+                shared[index] = shared.get(index, 0) + min(count, self._grams[index][gram])
+        query_len = len(query)
+        names = self.names
+        ranked = sorted(
+            (_edit_distance_bound(query_len, len(names[index]), common), index)
+            for index, common in shared.items()
+        )
+        return heapq.merge(ranked, self._unshared_candidates(query_len, shared))
+
+    def _unshared_candidates(self, query_len: int, shared: Dict[int, int]) -> Iterator[Tuple[int, int]]:
+        """Names sharing no trigram with the query, by length bucket, best first"""
+        buckets = sorted(
+            (_edit_distance_bound(query_len, length, 0), length) for length in self._by_length
+        )
+        for bound, length in buckets:
+            for index in self._by_length[length]:
+                if index not in shared:
+                    yield bound, index
+
+    def _memo_get(self, key: Tuple) -> Tuple[bool, Any]:
+        with self._memo_lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return True, self._memo[key]
+        return False, None
+
+    def _memo_put(self, key: Tuple, value: Any) -> None:
+        with self._memo_lock:
+            self._memo[key] = value
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
@@ -36,8 +36,9 @@ def is_safe_path(base_dir: Path, target_path: Path) -> bool:
         base_resolved = base_dir.resolve()
         target_resolved = target_path.resolve()
 
-        # Check if target is within base directory
-        return str(target_resolved).startswith(str(base_resolved))
+        # Check if target is within base directory (a sibling sharing the
+        # base's name as a prefix, e.g. skins_old for skins, is not)
+        return target_resolved == base_resolved or base_resolved in target_resolved.parents
     except (OSError, ValueError):
         return False
 
@@ -9,6 +9,10 @@ This subpackage contains download and network utilities:
 - smart_skin_downloader: Smart skin downloader with rate limiting
 - hashes_downloader: Hashes downloader
 - hash_updater: Hash updater
+- extract_manifest: CRC/size manifest of extracted repository files
+- segmented_download: Parallel, resumable range downloader
+- tree_sync: Incremental folder update from the repository's git tree
+- zip_stream: Streaming ZIP reader (extract while downloading)
 """
 
 from utils.download.repo_downloader import RepoDownloader, download_skins_from_repo
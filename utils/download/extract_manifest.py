@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Extraction Manifest
+Records the CRC32, size and mtime of every file extracted from the repository
+ZIP, so re-extraction only rewrites members whose content changed and cleanup
+of removed files is a set difference instead of a directory walk.
+"""
+
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.core.logging import get_logger
+
+log = get_logger()
+
+MANIFEST_FILE_NAME = ".extract_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_crc32(path: Path) -> Optional[int]:
+    """CRC32 of a local file (as stored in ZipInfo.CRC), None if unreadable"""
+    crc = 0
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                crc = zlib.crc32(block, crc)
+    except OSError:
+        return None
+    return crc
+
+
+def prune_empty_dirs(parents: Iterable[Path], root: Path) -> None:
+    """Remove directories emptied by deletions, deepest first, up to (not including) root"""
+    root_resolved = root.resolve()
+    for dir_path in sorted(set(parents), key=lambda p: len(p.parts), reverse=True):
+        while dir_path.resolve() != root_resolved and root_resolved in dir_path.resolve().parents:
+            try:
+                if any(dir_path.iterdir()):
+                    break
+                dir_path.rmdir()
+            except OSError:
+                break
+            dir_path = dir_path.parent
+
+
+class ExtractManifest:
+    """Per-directory manifest: relative path -> (crc32, size, mtime_ns)
+
+    An entry is trusted while the file's size and mtime still match what was
+    recorded; otherwise the file is re-hashed once. ``complete`` means the
+    manifest covers every file in the directory (set after a full extraction),
+    which is what makes set-difference cleanup safe.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.path = self.root / MANIFEST_FILE_NAME
+        self.complete = False
+        self._entries: Dict[str, Tuple[int, int, int]] = {}
+        self._dirty = False
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def paths(self) -> List[str]:
+        return list(self._entries)
+
+    def needs_write(self, rel_path: str, crc: int, size: int) -> bool:
+        """Whether the local copy of a member differs from (crc, size)"""
+        try:
+            st = os.stat(self.root / rel_path)
+        except OSError:
+            return True
+        if st.st_size != size:
+            return True
+
+        entry = self._entries.get(rel_path)
+        if entry is not None and entry[1] == size and entry[2] == st.st_mtime_ns:
+            # File untouched since we recorded it: the manifest knows its content
+            return entry[0] != crc
+
+        # Unknown or modified since: hash it once
+        if file_crc32(self.root / rel_path) == crc:
+            self._entries[rel_path] = (crc, size, st.st_mtime_ns)
+            self._dirty = True
+            return False
+        return True
+
+    def record(self, rel_path: str, crc: int, size: int) -> None:
+        """Record a member just written to disk"""
+        try:
+            mtime_ns = os.stat(self.root / rel_path).st_mtime_ns
+        except OSError:
+            return
+        self._entries[rel_path] = (crc, size, mtime_ns)
+        self._dirty = True
+
+    def record_file(self, rel_path: str) -> None:
+        """Record a file written by other means (hashes it)"""
+        crc = file_crc32(self.root / rel_path)
+        if crc is not None:
+            self.record(rel_path, crc, (self.root / rel_path).stat().st_size)
+
+    def forget(self, rel_path: str) -> None:
+        if self._entries.pop(rel_path, None) is not None:
+            self._dirty = True
+
+    def stale_paths(self, expected: Iterable[str]) -> List[str]:
+        """Recorded paths not in *expected* (compared case-insensitively)"""
+        expected_lower = {p.lower() for p in expected}
+        return [p for p in self._entries if p.lower() not in expected_lower]
+
+    def mark_complete(self) -> None:
+        if not self.complete:
+            self.complete = True
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest atomically (no-op if unchanged)"""
+        if not self._dirty:
+            return
+        data = {
+            "version": MANIFEST_VERSION,
+            "complete": self.complete,
+            "files": {k: list(v) for k, v in self._entries.items()},
+        }
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            log.debug(f"Failed to save extraction manifest {self.path}: {e}")
+
+    def _load(self) -> None:
+        try:
+            if not self.path.exists():
+                return
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+                return
+            self._entries = {k: (int(v[0]), int(v[1]), int(v[2])) for k, v in data.get("files", {}).items()}
+            self.complete = bool(data.get("complete"))
+        except (OSError, ValueError, TypeError, IndexError) as e:
+            log.debug(f"Failed to read extraction manifest {self.path}: {e}")
+            self._entries = {}
+            self.complete = False
@@ -8,21 +8,50 @@ Supports incremental updates by tracking repository changes
 """
 
 import json
+import os
 import zipfile
+import zlib
 import tempfile
 import shutil
 import requests
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable, Optional, Dict, List, Tuple
 from utils.core.logging import get_logger
 from utils.core.paths import get_skins_dir
-from config import APP_USER_AGENT, SKIN_DOWNLOAD_STREAM_TIMEOUT_S
+from utils.download.extract_manifest import MANIFEST_FILE_NAME, ExtractManifest, prune_empty_dirs
+from utils.download.segmented_download import DownloadError, RemoteInfo, SegmentedDownloader, probe_remote
+from utils.download.tree_sync import TreeSync, TreeSyncError, discard_tree_snapshot
+from utils.download.zip_stream import StreamingUnsupported, StreamingZipReader
+from config import (
+    APP_USER_AGENT, ENABLE_STREAMING_REPO_EXTRACT, REPO_DOWNLOAD_CONNECTIONS,
+    SKIN_DOWNLOAD_STREAM_TIMEOUT_S,
+)
 
 log = get_logger()
 
 ProgressCallback = Callable[[int, Optional[str]], None]
 
 
+@dataclass
+class SkinChangeSet:
+    """Skin files changed by one update, relative to the skins directory (posix paths)
+
+    ``full`` means the tree was (re)extracted wholesale and consumers should
+    rescan instead of applying the lists.
+    """
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    full: bool = False
+
+    def __bool__(self) -> bool:
+        return self.full or bool(self.added or self.modified or self.removed)
+
+
+ChangeCallback = Callable[[SkinChangeSet], None]
+
+
 def _format_size(num: Optional[int]) -> str:
     if num is None or num <= 0:
         return "0B"
@@ -43,6 +72,7 @@ class RepoDownloader:
         target_dir: Path = None,
         repo_url: str = "https://github.com/Alban1911/RoseSkins",
         progress_callback: Optional[ProgressCallback] = None,
+        change_callback: Optional[ChangeCallback] = None,
     ):
         self.repo_url = repo_url
         # Use user data directory for skins to avoid permission issues
@@ -53,10 +83,15 @@ class RepoDownloader:
             'Accept': 'application/vnd.github.v3+json'
         })
         self.progress_callback = progress_callback
+        self.change_callback = change_callback
+        self.last_change_set: Optional[SkinChangeSet] = None
+        self._incremental_manifest: Optional[ExtractManifest] = None
         
         # State tracking for incremental updates
         self.state_file = self.target_dir / '.repo_state.json'
         self.api_base = "https://api.github.com/repos/Alban1911/RoseSkins"
+        # Raw file host used by incremental updates (not counted against the API rate limit)
+        self.raw_base = "https://raw.githubusercontent.com/Alban1911/RoseSkins"
         
         # State tracking for resources folder (skinid_mapping)
         from utils.core.paths import get_user_data_dir
@@ -68,6 +103,16 @@ class RepoDownloader:
         bounded = max(0.0, min(percent, 100.0))
         self.progress_callback(int(bounded), message)
     
+    def _emit_changes(self, changes: SkinChangeSet):
+        """Publish the files changed by an update (e.g. to patch the skin catalog)"""
+        self.last_change_set = changes
+        if not changes or not self.change_callback:
+            return
+        try:
+            self.change_callback(changes)
+        except Exception as e:
+            log.warning(f"Skin change callback failed: {e}")
+    
     def get_repo_state(self) -> Dict:
         """Get current repository state from GitHub API (skins folder only)
         Returns Dict with 'rate_limited' key set to True if rate limited"""
@@ -243,141 +288,27 @@ class RepoDownloader:
         log.info("Repository unchanged, skipping download")
         return False
     
-    def get_changed_files(self, since_commit: str) -> Tuple[List[Dict], Optional[requests.Response]]:
-        """Get list of files that changed since a specific commit
-        Returns: (changed_files_list, response_object or rate_limited marker)"""
-        try:
-            # Get commits since the specified commit
-            response = self.session.get(f"{self.api_base}/compare/{since_commit}...main")
-            response.raise_for_status()
-            compare_data = response.json()
-            
-            changed_files = []
-            for file_info in compare_data.get('files', []):
-                # Only include files in the skins/ directory
-                if file_info['filename'].startswith('skins/'):
-                    # Get download URL using the file's SHA
-                    download_url = None
-                    if file_info.get('sha'):
-                        download_url = f"{self.api_base}/contents/{file_info['filename']}?ref=main"
-                    
-                    changed_files.append({
-                        'filename': file_info['filename'],
-                        'status': file_info['status'],  # 'added', 'modified', 'removed'
-                        'sha': file_info.get('sha'),
-                        'download_url': download_url
-                    })
-            
-            return changed_files, response
-        except requests.HTTPError as e:
-            if e.response and e.response.status_code in (403, 429):
-                log.warning(f"GitHub API rate limit exceeded while getting changed files: {e}")
-                log.info("Will use ZIP download to avoid rate limits")
-                return [], {'rate_limited': True}
-            else:
-                log.error(f"Failed to get changed files: {e}")
-                return [], None
-        except requests.RequestException as e:
-            log.error(f"Failed to get changed files: {e}")
-            return [], None
-    
-    def download_individual_file(self, file_info: Dict) -> Tuple[bool, Optional[str]]:
-        """Download a single file from GitHub
-        Returns: (success, error_type) where error_type can be 'rate_limit', 'network', or None"""
-        if not file_info.get('download_url'):
-            log.warning(f"No download URL for {file_info['filename']}")
-            return False, None
+    def download_repo_zip(self, progress_start: float = 0.0, progress_end: float = 70.0, download_label: str = "skins", remote_info: Optional[RemoteInfo] = None) -> Optional[Path]:
+        """Download the entire repository as a ZIP file
 
-        try:
-            # Calculate local path
-            relative_path = file_info['filename'].replace('skins/', '')
-            local_path = self.target_dir / relative_path
-            
-            # Handle file removal
-            if file_info['status'] == 'removed':
-                if local_path.exists():
-                    local_path.unlink()
-                    log.info(f"Removed {local_path}")
-                return True, None
-            
-            # Create directory if needed
-            local_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # First, get the file contents from GitHub API
-            response = self.session.get(file_info['download_url'])
-            response.raise_for_status()
-            file_data = response.json()
-            
-            # Check if we got the expected response structure
-            if 'download_url' not in file_data:
-                log.error(f"Unexpected response format for {file_info['filename']}")
-                return False, None
-            
-            # Download the actual file content
-            download_response = self.session.get(file_data['download_url'], stream=True, timeout=SKIN_DOWNLOAD_STREAM_TIMEOUT_S)
-            download_response.raise_for_status()
-            
-            with open(local_path, 'wb') as f:
-                for chunk in download_response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            
-            log.info(f"Downloaded {file_info['filename']}")
-            return True, None
-            
-        except requests.HTTPError as e:
-            if e.response and e.response.status_code == 429:
-                log.warning(f"Rate limit hit while downloading {file_info['filename']}")
-                return False, 'rate_limit'
-            else:
-                log.error(f"Failed to download {file_info['filename']}: {e}")
-                return False, 'network'
-        except requests.RequestException as e:
-            log.error(f"Failed to download {file_info['filename']}: {e}")
-            return False, 'network'
-        except Exception as e:
-            log.error(f"Error saving {file_info['filename']}: {e}")
-            return False, None
-        
-    def download_repo_zip(self, progress_start: float = 0.0, progress_end: float = 70.0, download_label: str = "skins") -> Optional[Path]:
-        """Download the entire repository as a ZIP file"""
+        Uses parallel range requests when the server supports them; an
+        interrupted download resumes from its journal on the next attempt.
+        remote_info is an earlier probe of the ZIP URL, reused instead of
+        probing again.
+        """
         # GitHub's ZIP download URL format
         zip_url = f"{self.repo_url}/archive/refs/heads/main.zip"
         
         log.info(f"Downloading repository ZIP from: {zip_url}")
         
         try:
-            # Create temporary file for ZIP
-            temp_zip = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
-            temp_zip_path = Path(temp_zip.name)
-            temp_zip.close()
-
-            # Try to resolve total size via HEAD request first
-            total_size: Optional[int] = None
-            try:
-                head_response = self.session.head(zip_url, allow_redirects=True, timeout=SKIN_DOWNLOAD_STREAM_TIMEOUT_S)
-                head_response.raise_for_status()
-                total_size_header = head_response.headers.get('Content-Length')
-                if total_size_header:
-                    total_size = int(total_size_header)
-            except requests.RequestException:
-                total_size = None
-            except ValueError:
-                total_size = None
+            # Stable path (not a random temp file) so the download can be resumed
+            from utils.core.paths import get_user_data_dir
+            zip_path = get_user_data_dir() / "downloads" / "RoseSkins-main.zip"
+            zip_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Download ZIP file
-            response = self.session.get(zip_url, stream=True, timeout=SKIN_DOWNLOAD_STREAM_TIMEOUT_S)
-            response.raise_for_status()
-            if total_size is None:
-                total_size_header = response.headers.get('Content-Length')
-                try:
-                    total_size = int(total_size_header) if total_size_header else None
-                except ValueError:
-                    total_size = None
-            downloaded = 0
             last_emit = -1
-            last_reported_bytes = 0
-            unknown_estimated_total = total_size if total_size else 200 * 1024 * 1024
+            unknown_estimated_total = 200 * 1024 * 1024
             
             # Use appropriate label based on what's being downloaded
             # Note: We must download the full ZIP, but will only extract what's needed
@@ -389,52 +320,100 @@ class RepoDownloader:
                 progress_msg = "Downloading repository ZIP (will extract skins only)..."
             
             self._emit_progress(progress_start, progress_msg)
+
+            def on_progress(downloaded: int, total_size: Optional[int]):
+                nonlocal last_emit, unknown_estimated_total
+                if total_size and total_size > 0:
+                    fraction = downloaded / total_size
+                else:
+                    if downloaded > unknown_estimated_total:
+                        unknown_estimated_total = int(downloaded * 1.25)
+                    fraction = min(downloaded / max(unknown_estimated_total, 1), 0.99)
+                percent = progress_start + fraction * (progress_end - progress_start)
+                emit_value = int(percent * 10)
+                if emit_value != last_emit:
+                    last_emit = emit_value
+                    downloaded_mb = _format_size(downloaded)
+                    total_mb = _format_size(total_size) if total_size else "?"
+                    self._emit_progress(
+                        percent,
+                        f"{progress_msg} {downloaded_mb} / {total_mb}",
+                    )
+
+            downloader = SegmentedDownloader(
+                self.session,
+                zip_url,
+                zip_path,
+                connections=REPO_DOWNLOAD_CONNECTIONS,
+                timeout=SKIN_DOWNLOAD_STREAM_TIMEOUT_S,
+                progress_callback=on_progress,
+                remote_info=remote_info,
+            )
+            downloader.download()
+
+            # Reading the central directory catches truncated/corrupt archives
+            # (member CRCs are checked during extraction)
+            try:
+                with zipfile.ZipFile(zip_path, 'r'):
+                    pass
+            except zipfile.BadZipFile:
+                log.error("Downloaded repository ZIP is corrupt, discarding it")
+                zip_path.unlink()
+                return None
+
+            downloaded = zip_path.stat().st_size
+            log.info(f"Repository ZIP downloaded: {zip_path}")
+            self._emit_progress(progress_end, f"Download complete ({_format_size(downloaded)} / {_format_size(downloaded)})")
+            return zip_path
             
-            # Save ZIP file
-            with open(temp_zip_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size and total_size > 0:
-                            fraction = downloaded / total_size
-                        else:
-                            if downloaded > unknown_estimated_total:
-                                unknown_estimated_total = int(downloaded * 1.25)
-                            fraction = min(downloaded / max(unknown_estimated_total, 1), 0.99)
-                        percent = progress_start + fraction * (progress_end - progress_start)
-                        emit_value = int(percent * 10)
-                        if emit_value != last_emit:
-                            last_emit = emit_value
-                            downloaded_mb = _format_size(downloaded)
-                            total_mb = _format_size(total_size) if total_size else "?"
-                            self._emit_progress(
-                                percent,
-                                f"{progress_msg} {downloaded_mb} / {total_mb}",
-                            )
- 
-            log.info(f"Repository ZIP downloaded: {temp_zip_path}")
-            final_total = total_size if total_size else downloaded
-            self._emit_progress(progress_end, f"Download complete ({_format_size(downloaded)} / {_format_size(final_total)})")
-            return temp_zip_path
-            
-        except requests.RequestException as e:
+        except (requests.RequestException, DownloadError) as e:
             log.error(f"Failed to download repository ZIP: {e}")
             return None
         except Exception as e:
             log.error(f"Error downloading repository: {e}")
             return None
     
+    def _probe_repo_zip(self) -> Optional[RemoteInfo]:
+        """Probe the repository ZIP for its size and range support
+
+        Returns None when only one connection is configured (no need to know)
+        or the probe failed.
+        """
+        if REPO_DOWNLOAD_CONNECTIONS <= 1:
+            return None
+        try:
+            return probe_remote(
+                self.session,
+                f"{self.repo_url}/archive/refs/heads/main.zip",
+                timeout=SKIN_DOWNLOAD_STREAM_TIMEOUT_S,
+            )
+        except requests.RequestException as e:
+            log.debug(f"Range support probe failed: {e}")
+            return None
+
+    @staticmethod
+    def _prefer_segmented_download(probe: Optional[RemoteInfo]) -> bool:
+        """Whether the repository ZIP should be fetched with parallel range requests
+
+        Streaming extraction only uses one connection, so it's used when the
+        server can't serve ranges (or when only one connection is configured).
+        """
+        return probe is not None and probe.accepts_ranges and bool(probe.size)
+    
     def _cleanup_removed_skin_files(
         self,
         zip_file_list: List[zipfile.ZipInfo],
         target_dir: Path,
+        manifest: Optional[ExtractManifest] = None,
     ) -> int:
         """Remove files from target directory that are no longer in the repository ZIP
 
         Args:
             zip_file_list: List of ZipInfo objects from the repository ZIP
             target_dir: Target directory to clean up
+            manifest: Extraction manifest of target_dir. If it covers every
+                local file, cleanup is a set difference against it instead of
+                a directory walk
 
         Returns:
             Number of files deleted
@@ -471,15 +450,20 @@ class RepoDownloader:
             log.debug("Skipping cleanup: no file entries found in ZIP list (only directories or empty)")
             return 0
         
+        if manifest is not None and manifest.complete:
+            return self._cleanup_from_manifest(expected_relative_paths, target_dir, manifest)
+        
         # Find all files in target directory
         deleted_count = 0
         for local_file in target_dir.rglob('*'):
             if not local_file.is_file():
                 continue
             
-            # Skip state files (like .repo_state.json) but keep other files
+            # Skip state files (like .repo_state.json) and the extraction manifest
             if local_file.name.startswith('.') and local_file.name.endswith('_state.json'):
                 continue
+            if local_file.name == MANIFEST_FILE_NAME:
+                continue
             
             # Get relative path from target_dir
             try:
@@ -496,6 +480,8 @@ class RepoDownloader:
                     local_file.unlink()
                     deleted_count += 1
                     log.debug(f"Removed obsolete file: {local_file}")
+                    if manifest is not None:
+                        manifest.forget(relative_path.as_posix())
                 except Exception as e:
                     log.warning(f"Failed to remove {local_file}: {e}")
         
@@ -512,6 +498,240 @@ class RepoDownloader:
         
         return deleted_count
     
+    def _cleanup_from_manifest(
+        self,
+        expected_relative_paths: set,
+        target_dir: Path,
+        manifest: ExtractManifest,
+    ) -> int:
+        """Delete manifest entries (and their files) that are no longer expected"""
+        deleted_count = 0
+        parents = set()
+        for relative_path in manifest.stale_paths(expected_relative_paths):
+            local_file = target_dir / relative_path
+            try:
+                if local_file.exists():
+                    local_file.unlink()
+                    deleted_count += 1
+                    log.debug(f"Removed obsolete file: {local_file}")
+                manifest.forget(relative_path)
+                parents.add(local_file.parent)
+            except Exception as e:
+                log.warning(f"Failed to remove {local_file}: {e}")
+        
+        prune_empty_dirs(parents, target_dir)
+        return deleted_count
+    
+    def _finish_extraction(
+        self,
+        skins_files: List[zipfile.ZipInfo],
+        resources_files: List[zipfile.ZipInfo],
+        mapping_target_dir: Path,
+        cleanup_progress_start: float,
+        skins_manifest: Optional[ExtractManifest] = None,
+        resources_manifest: Optional[ExtractManifest] = None,
+        all_extracted: bool = True,
+    ) -> None:
+        """Remove files no longer in the repository, save the manifests and record the resources state
+
+        all_extracted: Every member was written or verified, so the manifests
+            now cover the whole directory
+        """
+        # Only perform cleanup if we have files in the ZIP to compare against
+        # Use the reserved progress range (cleanup_progress_start to progress_end)
+        if skins_files:
+            if resources_files:
+                # Both cleanups: split the range
+                self._emit_progress(cleanup_progress_start + 1.0, "Cleaning up removed files...")
+            else:
+                # Only skins cleanup
+                self._emit_progress(cleanup_progress_start + 2.0, "Cleaning up removed files...")
+            deleted_count = self._cleanup_removed_skin_files(skins_files, self.target_dir, skins_manifest)
+            if deleted_count > 0:
+                log.info(f"Removed {deleted_count} files that no longer exist in repository")
+        
+        if resources_files:
+            if skins_files:
+                # Both cleanups: second one
+                self._emit_progress(cleanup_progress_start + 3.0, "Cleaning up removed resource files...")
+            else:
+                # Only resources cleanup
+                self._emit_progress(cleanup_progress_start + 2.0, "Cleaning up removed resource files...")
+            deleted_resources_count = self._cleanup_removed_skin_files(resources_files, mapping_target_dir, resources_manifest)
+            if deleted_resources_count > 0:
+                log.info(f"Removed {deleted_resources_count} resource files that no longer exist in repository")
+
+            # Save resources state after successful extraction
+            resources_state = self.get_resources_state()
+            if resources_state and not resources_state.get('rate_limited'):
+                resources_state['last_checked'] = resources_state.get('last_commit_date')
+                self.save_resources_state(resources_state)
+
+        for files, manifest in ((skins_files, skins_manifest), (resources_files, resources_manifest)):
+            if manifest is None:
+                continue
+            if files and all_extracted:
+                manifest.mark_complete()
+            manifest.save()
+    
+    def _member_target(
+        self,
+        filename: str,
+        extract_skins: bool,
+        extract_resources: bool,
+        mapping_target_dir: Path,
+    ) -> Optional[Tuple[str, Path]]:
+        """Map a repository ZIP member to ("skin" | "resource", local path), or None to skip it"""
+        if filename.endswith('/'):
+            return None
+        if extract_skins and filename.startswith('RoseSkins-main/skins/'):
+            return "skin", self.target_dir / filename[len('RoseSkins-main/skins/'):]
+        if extract_resources and filename.startswith('RoseSkins-main/resources/'):
+            # The resources folder becomes the skinid_mapping folder
+            return "resource", mapping_target_dir / filename[len('RoseSkins-main/resources/'):]
+        return None
+    
+    def stream_and_extract_skins(
+        self,
+        overwrite_existing: bool = False,
+        progress_start: float = 5.0,
+        progress_end: float = 100.0,
+        extract_skins: bool = True,
+        extract_resources: bool = True,
+        download_label: str = "skins",
+    ) -> Optional[bool]:
+        """Download the repository ZIP and extract members while it downloads
+
+        Members are written to their final paths as soon as they're complete
+        (via a .part file), so network and disk time overlap and no temporary
+        copy of the archive is kept. Members whose CRC/size match the
+        extraction manifest are skipped; overwrite_existing is kept for
+        compatibility only.
+
+        Returns:
+            True/False for success/failure, or None if the archive can't be
+            streamed - the caller should fall back to download_repo_zip +
+            extract_skins_from_zip then
+        """
+        zip_url = f"{self.repo_url}/archive/refs/heads/main.zip"
+        log.info(f"Streaming repository ZIP from: {zip_url}")
+
+        from utils.core.paths import get_user_data_dir
+        from utils.core.safe_extract import is_safe_path
+        mapping_target_dir = get_user_data_dir() / "skinid_mapping"
+
+        if download_label == "resources":
+            progress_msg = "Downloading and extracting skin ID mapping..."
+        elif download_label == "both":
+            progress_msg = "Downloading and extracting skins + skin ID mapping..."
+        else:
+            progress_msg = "Downloading and extracting skins..."
+
+        # Reserve 5% of progress range for cleanup operations
+        extraction_end = progress_end - 5.0
+        downloaded = 0
+        total_size: Optional[int] = None
+        last_emit = -1
+
+        def counted(chunks):
+            nonlocal downloaded, last_emit
+            for chunk in chunks:
+                downloaded += len(chunk)
+                estimate = total_size or max(200 * 1024 * 1024, int(downloaded * 1.25))
+                fraction = min(downloaded / estimate, 0.99 if not total_size else 1.0)
+                percent = progress_start + fraction * (extraction_end - progress_start)
+                emit_value = int(percent * 10)
+                if emit_value != last_emit:
+                    last_emit = emit_value
+                    total_mb = _format_size(total_size) if total_size else "?"
+                    self._emit_progress(percent, f"{progress_msg} {_format_size(downloaded)} / {total_mb}")
+                yield chunk
+
+        skins_files: List[zipfile.ZipInfo] = []
+        resources_files: List[zipfile.ZipInfo] = []
+        skins_manifest = ExtractManifest(self.target_dir) if extract_skins else None
+        resources_manifest = ExtractManifest(mapping_target_dir) if extract_resources else None
+        extracted_count = 0
+        skipped_count = 0
+        failed_count = 0
+        response = None
+        try:
+            response = self.session.get(zip_url, stream=True, timeout=SKIN_DOWNLOAD_STREAM_TIMEOUT_S)
+            response.raise_for_status()
+            try:
+                total_size = int(response.headers.get('Content-Length') or 0) or None
+            except ValueError:
+                total_size = None
+            self._emit_progress(progress_start, progress_msg)
+
+            reader = StreamingZipReader(counted(response.iter_content(chunk_size=64 * 1024)))
+            for member in reader.members():
+                target = self._member_target(member.filename, extract_skins, extract_resources, mapping_target_dir)
+                if target is None:
+                    continue
+                entry_type, extract_path = target
+                base_dir = self.target_dir if entry_type == "skin" else mapping_target_dir
+                if not is_safe_path(base_dir, extract_path):
+                    log.error(f"[SECURITY] Blocked unsafe path in repository ZIP: {member.filename}")
+                    continue
+                (skins_files if entry_type == "skin" else resources_files).append(zipfile.ZipInfo(member.filename))
+                manifest = skins_manifest if entry_type == "skin" else resources_manifest
+                rel_path = extract_path.relative_to(base_dir).as_posix()
+
+                # Sizes are unknown up front for members with a data descriptor - always extract those
+                if member.file_size is not None and not manifest.needs_write(rel_path, member.crc, member.file_size):
+                    skipped_count += 1
+                    continue
+
+                extract_path.parent.mkdir(parents=True, exist_ok=True)
+                part_path = extract_path.with_name(extract_path.name + '.part')
+                try:
+                    with open(part_path, 'wb') as target_file:
+                        reader.extract_to(member, target_file)
+                    os.replace(part_path, extract_path)
+                    manifest.record(rel_path, member.crc, member.file_size)
+                    extracted_count += 1
+                except zlib.error as e:
+                    log.warning(f"Failed to extract {member.filename}: {e}")
+                    failed_count += 1
+                finally:
+                    if part_path.exists():
+                        part_path.unlink()
+            reader.drain()
+
+        except StreamingUnsupported as e:
+            log.info(f"Repository ZIP can't be streamed ({e}), falling back to download + extract")
+            return None
+        except (requests.RequestException, EOFError) as e:
+            log.error(f"Failed to stream repository ZIP: {e}")
+            return False
+        except Exception as e:
+            log.error(f"Error streaming repository ZIP: {e}")
+            return False
+        finally:
+            # Release the connection even if the body was only partly read
+            # (the fallback downloads again on the same session)
+            if response is not None:
+                response.close()
+
+        if not skins_files and not resources_files:
+            log.error("No skins or resources folder found in repository ZIP")
+            return False
+
+        log.info(f"Streamed {_format_size(downloaded)}: extracted {extracted_count} files, "
+                 f"skipped {skipped_count} unchanged files")
+        self._finish_extraction(
+            skins_files,
+            resources_files,
+            mapping_target_dir,
+            cleanup_progress_start=extraction_end,
+            skins_manifest=skins_manifest,
+            resources_manifest=resources_manifest,
+            all_extracted=failed_count == 0,
+        )
+        self._emit_progress(progress_end, f"Extraction complete ({_format_size(downloaded)})")
+        return True
+    
     def extract_skins_from_zip(
         self,
         zip_path: Path,
@@ -521,7 +741,12 @@ class RepoDownloader:
         extract_skins: bool = True,
         extract_resources: bool = True,
     ) -> bool:
-        """Extract skins, previews, and resources folder from the RoseSkins repository ZIP"""
+        """Extract skins, previews, and resources folder from the RoseSkins repository ZIP
+
+        Only members whose CRC/size differ from the extraction manifest (or the
+        local file) are written, so overwrite_existing no longer decides
+        correctness; it is kept for compatibility.
+        """
         try:
             log.info("Extracting skins, previews, and resources folder from RoseSkins repository ZIP...")
 
@@ -591,6 +816,9 @@ class RepoDownloader:
                 from utils.core.paths import get_user_data_dir
                 # Place the entire resources folder as skinid_mapping
                 mapping_target_dir = get_user_data_dir() / "skinid_mapping"
+                skins_manifest = ExtractManifest(self.target_dir) if extract_skins else None
+                resources_manifest = ExtractManifest(mapping_target_dir) if extract_resources else None
+                failed_count = 0
 
                 # Reserve 5% of progress range for cleanup operations
                 cleanup_reserve = 5.0
@@ -630,8 +858,9 @@ class RepoDownloader:
                         extract_path.parent.mkdir(parents=True, exist_ok=True)
 
                         file_bytes = _info_size(file_info) or 1
+                        manifest = skins_manifest if entry_type == "skin" else resources_manifest
 
-                        if extract_path.exists() and not overwrite_existing:
+                        if not manifest.needs_write(relative_path, file_info.CRC, file_info.file_size):
                             if entry_type == "skin":
                                 skipped_skin_count += 1
                             else:
@@ -648,6 +877,7 @@ class RepoDownloader:
                                 target.write(chunk)
                                 processed_bytes += len(chunk)
                                 update_progress(label)
+                        manifest.record(relative_path, file_info.CRC, file_info.file_size)
 
                         if entry_type == "skin":
                             if is_zip:
@@ -659,47 +889,23 @@ class RepoDownloader:
 
                     except Exception as e:
                         log.warning(f"Failed to extract {file_info.filename}: {e}")
+                        failed_count += 1
                         processed_bytes += _info_size(file_info) or 1
                         update_progress("Extracting...")
 
-                # Clean up files that exist locally but are no longer in the repository
-                # Only perform cleanup if we have files in the ZIP to compare against
-                # Use the reserved progress range (extraction_end to progress_end)
-                cleanup_progress_start = extraction_end
-                if extract_skins and skins_files:
-                    if extract_resources and resources_files:
-                        # Both cleanups: split the range
-                        self._emit_progress(cleanup_progress_start + 1.0, "Cleaning up removed files...")
-                    else:
-                        # Only skins cleanup
-                        self._emit_progress(cleanup_progress_start + 2.0, "Cleaning up removed files...")
-                    deleted_count = self._cleanup_removed_skin_files(skins_files, self.target_dir)
-                    if deleted_count > 0:
-                        log.info(f"Removed {deleted_count} files that no longer exist in repository")
-                
-                if extract_resources and resources_files:
-                    if extract_skins and skins_files:
-                        # Both cleanups: second one
-                        self._emit_progress(cleanup_progress_start + 3.0, "Cleaning up removed resource files...")
-                    else:
-                        # Only resources cleanup
-                        self._emit_progress(cleanup_progress_start + 2.0, "Cleaning up removed resource files...")
-                    deleted_resources_count = self._cleanup_removed_skin_files(resources_files, mapping_target_dir)
-                    if deleted_resources_count > 0:
-                        log.info(f"Removed {deleted_resources_count} resource files that no longer exist in repository")
-
-                log.info(f"Extracted {extracted_zip_count} new skin .zip files, {extracted_png_count} preview .png files, "
-                        f"and {extracted_resources_count} resource files (skipped {skipped_skin_count} existing skin files, "
-                        f"{skipped_resources_count} existing resource files)")
+                log.info(f"Extracted {extracted_zip_count} new/changed skin .zip files, {extracted_png_count} preview .png files, "
+                        f"and {extracted_resources_count} resource files (skipped {skipped_skin_count} unchanged skin files, "
+                        f"{skipped_resources_count} unchanged resource files)")
 
-                # Save resources state after successful extraction
-                # Save state if we processed any resources files (extracted or skipped)
-                # or if we found resources files in the ZIP (even if none were processed)
-                if extracted_resources_count > 0 or skipped_resources_count > 0 or resources_count > 0:
-                    resources_state = self.get_resources_state()
-                    if resources_state and not resources_state.get('rate_limited'):
-                        resources_state['last_checked'] = resources_state.get('last_commit_date')
-                        self.save_resources_state(resources_state)
+                self._finish_extraction(
+                    skins_files if extract_skins else [],
+                    resources_files if extract_resources else [],
+                    mapping_target_dir,
+                    cleanup_progress_start=extraction_end,
+                    skins_manifest=skins_manifest,
+                    resources_manifest=resources_manifest,
+                    all_extracted=failed_count == 0,
+                )
 
                 total_mb = _format_size(total_bytes)
                 self._emit_progress(progress_end, f"Extraction complete ({_format_size(processed_bytes)} / {total_mb})")
@@ -814,65 +1020,54 @@ class RepoDownloader:
                     log.info("No local state and no existing files found, performing full download")
                     return self.download_and_extract_skins(force_update=True)
             
-            # Get changed files since last update
-            last_commit = local_state.get('last_commit_sha')
-            if not last_commit:
-                log.info("No previous commit found, performing full download")
+            # Diff the skins tree against the local snapshot and fetch only what changed
+            if self._incremental_manifest is None:
+                self._incremental_manifest = ExtractManifest(self.target_dir)
+
+            def on_sync_progress(done: int, total: int):
+                self._emit_progress(10 + (done / total) * 80, f"Applying updates {done}/{total}")
+
+            sync = TreeSync(
+                self.session,
+                self.api_base,
+                self.raw_base,
+                self.target_dir,
+                ref=current_state['last_commit_sha'],
+                manifest=self._incremental_manifest,
+                progress_callback=on_sync_progress,
+            )
+            self._emit_progress(10, "Comparing skins with the repository...")
+            try:
+                result = sync.run()
+            except TreeSyncError as e:
+                log.warning(f"Incremental update not possible ({e}), falling back to ZIP download")
                 return self.download_and_extract_skins(force_update=True)
             
-            changed_files, response = self.get_changed_files(last_commit)
-            if not changed_files:
-                log.info("No skin files changed")
-                # Update state even if no changes
+            changed_count = len(result.added) + len(result.modified) + len(result.removed)
+            log.info(
+                f"Incremental update: {len(result.added)} added, {len(result.modified)} modified, "
+                f"{len(result.removed)} removed, {len(result.failed)} failed ({result.api_calls} API calls)"
+            )
+            
+            # Only advance the recorded commit once everything is applied; failed
+            # files are retried on the next run
+            if not result.failed:
                 current_state['last_checked'] = current_state['last_commit_date']
                 self.save_local_state(current_state)
-                self._emit_progress(100, "Skins already up to date")
-                return True
-            
-            log.info(f"Found {len(changed_files)} changed files")
-            
-            # Check if we have enough API calls remaining
-            if response:
-                remaining_calls = self.get_remaining_api_calls(response)
-                # Need at least 2 API calls per file (get file info + download)
-                estimated_calls = len(changed_files) * 2
-                log.info(f"Remaining API calls: {remaining_calls}, estimated needed: {estimated_calls}")
-                if remaining_calls < estimated_calls + 10:  # 10 calls buffer
-                    log.warning(f"Not enough API calls remaining ({remaining_calls}), falling back to ZIP download")
-                    return self.download_and_extract_skins(force_update=True)
-            
-            # Download changed files
-            total_files = len(changed_files)
-            success_count = 0
-            rate_limit_hit = False
-            for index, file_info in enumerate(changed_files, start=1):
-                success, error_type = self.download_individual_file(file_info)
-                if success:
-                    success_count += 1
-                    if total_files > 0:
-                        progress = 10 + (index / total_files) * 80
-                        self._emit_progress(progress, f"Applying updates {index}/{total_files}")
-                elif error_type == 'rate_limit':
-                    rate_limit_hit = True
-                    log.warning("Rate limit hit during download, falling back to ZIP download")
-                    break
-            
-            if rate_limit_hit:
-                log.info("Switching to ZIP download due to rate limit")
-                return self.download_and_extract_skins(force_update=True)
-            
-            log.info(f"Downloaded {success_count}/{len(changed_files)} changed files")
-            
-            # Update local state
-            current_state['last_checked'] = current_state['last_commit_date']
-            self.save_local_state(current_state)
-            
-            completed = success_count > 0
-            if completed:
+            self._emit_changes(SkinChangeSet(
+                added=result.added,
+                modified=result.modified,
+                removed=result.removed,
+            ))
+            
+            if result.failed:
+                self._emit_progress(100, f"Skins partially updated ({len(result.failed)} files failed)")
+                return changed_count > 0
+            if changed_count:
                 self._emit_progress(100, "Skins updated")
             else:
-                self._emit_progress(100, "No changes applied")
-            return completed
+                self._emit_progress(100, "Skins already up to date")
+            return True
             
         except Exception as e:
             log.error(f"Failed to download incremental updates: {e}")
@@ -937,53 +1132,85 @@ class RepoDownloader:
             else:
                 download_label = "skins"
             
-            # Download repository ZIP
-            zip_path = self.download_repo_zip(progress_start=5.0, progress_end=70.0, download_label=download_label)
-            if not zip_path:
-                self._emit_progress(5, "Failed to start download")
-                return False
-            
-            try:
-                # Extract from ZIP (only what needs updating)
-                success = self.extract_skins_from_zip(
-                    zip_path,
+            # Download and extract the repository ZIP (only what needs updating),
+            # streaming it when possible
+            success = None
+            probe = self._probe_repo_zip() if ENABLE_STREAMING_REPO_EXTRACT else None
+            if ENABLE_STREAMING_REPO_EXTRACT and not self._prefer_segmented_download(probe):
+                success = self.stream_and_extract_skins(
                     overwrite_existing=force_update,
-                    progress_start=70.0,
+                    progress_start=5.0,
                     progress_end=100.0,
                     extract_skins=skins_need_update,
                     extract_resources=resources_need_update,
+                    download_label=download_label,
                 )
+            if success is None:
+                success = self._download_then_extract(
+                    overwrite_existing=force_update,
+                    extract_skins=skins_need_update,
+                    extract_resources=resources_need_update,
+                    download_label=download_label,
+                    remote_info=probe,
+                )
+            
+            # Save state after successful full download
+            if success:
+                current_state = self.get_repo_state()
+                if current_state:
+                    current_state['last_checked'] = current_state['last_commit_date']
+                    self.save_local_state(current_state)
                 
-                # Save state after successful full download
-                if success:
-                    current_state = self.get_repo_state()
-                    if current_state:
-                        current_state['last_checked'] = current_state['last_commit_date']
-                        self.save_local_state(current_state)
-                    
-                    # Resources state is saved in extract_skins_from_zip if resources were extracted
-                
-                if success:
-                    self._emit_progress(100, "Skins ready")
-                    return True
-                self._emit_progress(100, "Extraction failed")
-                return False
-                
-            finally:
-                # Clean up temporary ZIP file
-                try:
-                    zip_path.unlink()
-                    log.debug("Cleaned up temporary ZIP file")
-                except (OSError, FileNotFoundError) as e:
-                    log.debug(f"Could not remove temporary ZIP file: {e}")
-                except Exception as e:
-                    log.debug(f"Unexpected error cleaning up ZIP file: {e}")
+                # Resources state is saved during extraction if resources were extracted
+                if skins_need_update:
+                    # Files were rewritten outside the tree snapshot; it is re-seeded next time
+                    discard_tree_snapshot(self.target_dir)
+                    self._emit_changes(SkinChangeSet(full=True))
+            
+            if success:
+                self._emit_progress(100, "Skins ready")
+                return True
+            self._emit_progress(100, "Extraction failed")
+            return False
             
         except Exception as e:
             log.error(f"Failed to download and extract skins: {e}")
             self._emit_progress(100, f"Failed: {e}")
             return False
     
+    def _download_then_extract(
+        self,
+        overwrite_existing: bool,
+        extract_skins: bool,
+        extract_resources: bool,
+        download_label: str,
+        remote_info: Optional[RemoteInfo] = None,
+    ) -> bool:
+        """Download the repository ZIP to a temporary file, then extract it"""
+        zip_path = self.download_repo_zip(progress_start=5.0, progress_end=70.0, download_label=download_label, remote_info=remote_info)
+        if not zip_path:
+            self._emit_progress(5, "Failed to start download")
+            return False
+        
+        try:
+            return self.extract_skins_from_zip(
+                zip_path,
+                overwrite_existing=overwrite_existing,
+                progress_start=70.0,
+                progress_end=100.0,
+                extract_skins=extract_skins,
+                extract_resources=extract_resources,
+            )
+        finally:
+            # Clean up temporary ZIP file
+            try:
+                zip_path.unlink()
+                log.debug("Cleaned up temporary ZIP file")
+            except (OSError, FileNotFoundError) as e:
+                log.debug(f"Could not remove temporary ZIP file: {e}")
+            except Exception as e:
+                log.debug(f"Unexpected error cleaning up ZIP file: {e}")
+    
     def download_resources_folder_only(self, progress_start: float = 0.0, progress_end: float = 70.0) -> Optional[Path]:
         """Download only the resources folder using GitHub Contents API (more efficient than full ZIP)"""
         try:
@@ -1254,11 +1481,15 @@ def download_skins_from_repo(
     tray_manager=None,
     use_incremental: bool = True,
     progress_callback: Optional[ProgressCallback] = None,
+    change_callback: Optional[ChangeCallback] = None,
 ) -> bool:
-    """Download skins from repository with optional incremental updates"""
+    """Download skins from repository with optional incremental updates
+
+    change_callback receives the SkinChangeSet of the update (if any files changed).
+    """
     try:
         # Note: tray_manager status is already set by caller (download_skins_on_startup)
-        downloader = RepoDownloader(target_dir, progress_callback=progress_callback)
+        downloader = RepoDownloader(target_dir, progress_callback=progress_callback, change_callback=change_callback)
         
         # Get current detailed stats
         current_detailed = downloader.get_detailed_stats()
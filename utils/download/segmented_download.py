@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Segmented Downloader
+Downloads a file over several connections with HTTP Range requests.
+
+Completed byte ranges are recorded in a journal next to the destination file,
+so an interrupted download resumes where it stopped instead of starting over.
+Segment sizes adapt to each connection's measured throughput. Servers that
+don't support ranges are downloaded with a single stream instead.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import requests
+
+from utils.core.logging import get_logger
+
+log = get_logger()
+
+# (bytes downloaded so far, total size or None)
+DownloadProgress = Callable[[int, Optional[int]], None]
+
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_VERSION = 1
+WRITE_BLOCK = 64 * 1024
+MIN_SEGMENT_BYTES = 256 * 1024
+MAX_SEGMENT_BYTES = 16 * 1024 * 1024
+INITIAL_SEGMENT_BYTES = 1024 * 1024
+TARGET_SEGMENT_S = 2.0           # Aim for segments that take about this long
+SEGMENT_ATTEMPTS = 3
+JOURNAL_SAVE_INTERVAL_S = 0.5
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+class DownloadError(Exception):
+    """Download failed (the journal is kept so it can be resumed)"""
+
+
+class _RangesIgnored(DownloadError):
+    """The server answered a range request with the full body"""
+
+
+@dataclass
+class RemoteInfo:
+    """What the server told us about the resource"""
+    size: Optional[int]
+    accepts_ranges: bool
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def _merge(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge overlapping/adjacent [start, end) ranges"""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _missing(done: List[Tuple[int, int]], size: int) -> List[Tuple[int, int]]:
+    """Complement of *done* over [0, size)"""
+    gaps = []
+    pos = 0
+    for start, end in _merge(done):
+        if start > pos:
+            gaps.append((pos, start))
+        pos = max(pos, end)
+    if pos < size:
+        gaps.append((pos, size))
+    return gaps
+
+
+def probe_remote(session: requests.Session, url: str, timeout: float = 60) -> RemoteInfo:
+    """Ask for the first byte of *url* to learn its size and whether ranges work"""
+    response = session.get(url, headers={"Range": "bytes=0-0"}, stream=True,
+                           timeout=timeout, allow_redirects=True)
+    try:
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        match = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+        if response.status_code == 206 and match and match.group(3) != "*":
+            return RemoteInfo(int(match.group(3)), True, etag, last_modified)
+        try:
+            size = int(response.headers.get("Content-Length") or 0) or None
+        except ValueError:
+            size = None
+        return RemoteInfo(size, False, etag, last_modified)
+    finally:
+        response.close()
+
+
+class SegmentedDownloader:
+    """Parallel, resumable download of one URL to one file"""
+
+    def __init__(
+        self,
+        session: requests.Session,
+        url: str,
+        dest: Path,
+        connections: int = 4,
+        timeout: float = 60,
+        expected_sha256: Optional[str] = None,
+        progress_callback: Optional[DownloadProgress] = None,
+        remote_info: Optional[RemoteInfo] = None,
+    ):
+        """
+        Args:
+            remote_info: Result of an earlier probe_remote() for *url*; saves
+                the probe round-trip when the caller already made it
+        """
+        self.session = session
+        self.url = url
+        self.dest = Path(dest)
+        self.journal_path = self.dest.with_name(self.dest.name + JOURNAL_SUFFIX)
+        self.connections = max(1, int(connections))
+        self.timeout = timeout
+        self.expected_sha256 = expected_sha256.lower() if expected_sha256 else None
+        self.progress_callback = progress_callback
+        self.remote_info = remote_info
+
+        self._lock = threading.Lock()
+        self._done: List[Tuple[int, int]] = []
+        self._queue: List[Tuple[int, int]] = []
+        self._downloaded = 0
+        self._last_journal_save = 0.0
+        self._failed: Optional[BaseException] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def probe(self) -> RemoteInfo:
+        """Learn the size and whether ranges work"""
+        return probe_remote(self.session, self.url, self.timeout)
+
+    def download(self) -> Path:
+        """Download to self.dest (resuming if a matching journal exists)"""
+        info = self.remote_info or self.probe()
+        if info.accepts_ranges and info.size and self.connections > 1:
+            try:
+                self._download_segmented(info)
+            except _RangesIgnored:
+                log.info("Server stopped honouring range requests, falling back to a single stream")
+                self._download_single(info)
+        else:
+            log.debug(f"Range requests not supported for {self.url}, using a single stream")
+            self._download_single(info)
+        self._verify(info)
+        self._remove_journal()
+        return self.dest
+
+    # ------------------------------------------------------------------
+    # Single stream
+    # ------------------------------------------------------------------
+
+    def _download_single(self, info: RemoteInfo) -> None:
+        self._remove_journal()
+        self._downloaded = 0
+        self.dest.parent.mkdir(parents=True, exist_ok=True)
+        with self.session.get(self.url, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            total = info.size
+            if total is None:
+                try:
+                    total = int(response.headers.get("Content-Length") or 0) or None
+                except ValueError:
+                    total = None
+            with open(self.dest, "wb") as f:
+                for chunk in response.iter_content(chunk_size=WRITE_BLOCK):
+                    if chunk:
+                        f.write(chunk)
+                        self._downloaded += len(chunk)
+                        self._report(total)
+
+    # ------------------------------------------------------------------
+    # Segmented
+    # ------------------------------------------------------------------
+
+    def _download_segmented(self, info: RemoteInfo) -> None:
+        size = info.size
+        self._done = self._load_journal(info)
+        if self._done:
+            resumed = sum(end - start for start, end in self._done)
+            log.info(f"Resuming download at {resumed * 100 // size}% ({len(self._done)} range(s) done)")
+        else:
+            self.dest.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.dest, "wb") as f:
+                f.truncate(size)
+        self._queue = _missing(self._done, size)
+        self._downloaded = size - sum(end - start for start, end in self._queue)
+        self._failed = None
+        self._save_journal(info, force=True)
+
+        workers = self.connections if size > MIN_SEGMENT_BYTES else 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="SegmentedDownload") as pool:
+            futures = [pool.submit(self._worker, info) for _ in range(workers)]
+            for future in futures:
+                future.result()
+
+        self._save_journal(info, force=True)
+        if self._failed is not None:
+            if isinstance(self._failed, _RangesIgnored):
+                raise self._failed
+            raise DownloadError(f"Download incomplete: {self._failed}")
+        if _missing(self._done, size):
+            raise DownloadError("Download incomplete")
+
+    def _claim(self, segment_bytes: int) -> Optional[Tuple[int, int]]:
+        """Take the next piece of work (at most segment_bytes long)"""
+        with self._lock:
+            if self._failed is not None or not self._queue:
+                return None
+            start, end = self._queue[0]
+            piece_end = min(end, start + segment_bytes)
+            if piece_end < end:
+                self._queue[0] = (piece_end, end)
+            else:
+                self._queue.pop(0)
+            return start, piece_end
+
+    def _resume_point(self, start: int, end: int) -> int:
+        """First byte in [start, end) not recorded as done"""
+        with self._lock:
+            for done_start, done_end in self._done:
+                if done_start <= start < done_end:
+                    return min(done_end, end)
+            return start
+
+    def _requeue(self, start: int, end: int) -> None:
+        with self._lock:
+            self._queue.insert(0, (start, end))
+
+    def _worker(self, info: RemoteInfo) -> None:
+        segment_bytes = INITIAL_SEGMENT_BYTES
+        with open(self.dest, "r+b") as f:
+            while True:
+                piece = self._claim(segment_bytes)
+                if piece is None:
+                    return
+                start, end = piece
+                began = time.monotonic()
+                for attempt in range(1, SEGMENT_ATTEMPTS + 1):
+                    # Retries continue after the prefix a failed attempt already wrote
+                    start = self._resume_point(start, end)
+                    if start >= end:
+                        break
+                    try:
+                        self._fetch(info, f, start, end)
+                        break
+                    except _RangesIgnored as e:
+                        self._fail(e)
+                        return
+                    except (requests.RequestException, OSError) as e:
+                        if attempt == SEGMENT_ATTEMPTS:
+                            self._requeue(start, end)
+                            self._fail(e)
+                            return
+                        log.debug(f"Segment {start}-{end} failed (attempt {attempt}): {e}")
+                        time.sleep(0.5 * attempt)
+                # Size the next segment so it takes about TARGET_SEGMENT_S
+                elapsed = max(time.monotonic() - began, 0.001)
+                rate = (piece[1] - piece[0]) / elapsed
+                segment_bytes = int(min(MAX_SEGMENT_BYTES, max(MIN_SEGMENT_BYTES, rate * TARGET_SEGMENT_S)))
+
+    def _fetch(self, info: RemoteInfo, f, start: int, end: int) -> None:
+        """Fetch [start, end) into f. On error the written prefix stays recorded."""
+        headers = {"Range": f"bytes={start}-{end - 1}"}
+        validator = info.etag or info.last_modified
+        if validator:
+            headers["If-Range"] = validator
+        with self.session.get(self.url, headers=headers, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise _RangesIgnored(f"status {response.status_code} for a range request")
+            pos = start
+            try:
+                for chunk in response.iter_content(chunk_size=WRITE_BLOCK):
+                    if not chunk:
+                        continue
+                    chunk = chunk[:end - pos]
+                    f.seek(pos)
+                    f.write(chunk)
+                    pos += len(chunk)
+                    if pos >= end:
+                        break
+            finally:
+                f.flush()
+                if pos > start:
+                    self._mark_done(info, start, pos)
+            if pos < end:
+                raise requests.ConnectionError(f"connection closed at {pos} of {start}-{end}")
+
+    def _mark_done(self, info: RemoteInfo, start: int, end: int) -> None:
+        with self._lock:
+            self._done = _merge(self._done + [(start, end)])
+            self._downloaded += end - start
+        self._report(info.size)
+        self._save_journal(info)
+
+    def _fail(self, error: BaseException) -> None:
+        with self._lock:
+            if self._failed is None:
+                self._failed = error
+
+    # ------------------------------------------------------------------
+    # Journal
+    # ------------------------------------------------------------------
+
+    def _load_journal(self, info: RemoteInfo) -> List[Tuple[int, int]]:
+        """Completed ranges from a journal that matches this resource, else []"""
+        try:
+            if not self.journal_path.exists() or not self.dest.exists():
+                return []
+            data = json.loads(self.journal_path.read_text(encoding="utf-8"))
+            if (data.get("version") != JOURNAL_VERSION or data.get("url") != self.url
+                    or data.get("size") != info.size or data.get("etag") != info.etag
+                    or data.get("last_modified") != info.last_modified
+                    or self.dest.stat().st_size != info.size):
+                log.debug("Download journal doesn't match the remote file, starting over")
+                return []
+            return _merge([(int(start), int(end)) for start, end in data.get("done", [])])
+        except (OSError, ValueError, TypeError) as e:
+            log.debug(f"Failed to read download journal: {e}")
+            return []
+
+    def _save_journal(self, info: RemoteInfo, force: bool = False) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_journal_save < JOURNAL_SAVE_INTERVAL_S:
+                return
+            self._last_journal_save = now
+            data = {
+                "version": JOURNAL_VERSION,
+                "url": self.url,
+                "size": info.size,
+                "etag": info.etag,
+                "last_modified": info.last_modified,
+                "done": [list(r) for r in self._done],
+            }
+            tmp_path = self.journal_path.with_suffix(".tmp")
+            try:
+                tmp_path.write_text(json.dumps(data), encoding="utf-8")
+                os.replace(tmp_path, self.journal_path)
+            except OSError as e:
+                log.debug(f"Failed to save download journal: {e}")
+
+    def _remove_journal(self) -> None:
+        try:
+            self.journal_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            log.debug(f"Failed to remove download journal: {e}")
+
+    # ------------------------------------------------------------------
+    # Verification / progress
+    # ------------------------------------------------------------------
+
+    def _verify(self, info: RemoteInfo) -> None:
+        """Check size and (when known) SHA-256 of the finished file"""
+        actual_size = self.dest.stat().st_size
+        if info.size and actual_size != info.size:
+            self._discard()
+            raise DownloadError(f"Size mismatch ({actual_size} != {info.size})")
+        if self.expected_sha256:
+            digest = hashlib.sha256()
+            with open(self.dest, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+            if digest.hexdigest() != self.expected_sha256:
+                self._discard()
+                raise DownloadError("Checksum mismatch")
+
+    def _discard(self) -> None:
+        self._remove_journal()
+        try:
+            self.dest.unlink()
+        except OSError:
+            pass
+
+    def _report(self, total: Optional[int]) -> None:
+        if self.progress_callback:
+            self.progress_callback(self._downloaded, total)
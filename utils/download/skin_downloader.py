@@ -250,6 +250,23 @@ class SkinDownloader:
         return removed_count
 
 
+def _apply_catalog_changes(target_dir: Optional[Path], changes, injection_manager=None) -> None:
+    """Patch the skin catalog with the files an update changed
+    
+    Uses the live injector's cache if there is one, otherwise patches the
+    persisted catalog so the next startup doesn't rescan the skins tree.
+    """
+    try:
+        injector = getattr(injection_manager, "injector", None) if injection_manager else None
+        if injector is not None:
+            injector.refresh_skin_cache(changes)
+        else:
+            from injection.mods.zip_resolver import ZipResolver
+            ZipResolver(target_dir or get_skins_dir()).apply_changes(changes)
+    except Exception as e:
+        log.debug(f"[CACHE] Failed to apply skin changes to catalog: {e}")
+
+
 def download_skins_on_startup(
     target_dir: Path = None,
     force_update: bool = False,
@@ -270,6 +287,7 @@ def download_skins_on_startup(
             force_update,
             tray_manager,
             progress_callback=progress_callback,
+            change_callback=lambda changes: _apply_catalog_changes(target_dir, changes, injection_manager),
         )
         if injection_manager:
             injection_manager.initialize_when_ready()
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tree Sync
+Incremental update of a repository folder from its git tree.
+
+The folder's tree is listed with the GitHub trees API (two API calls, one if
+the folder's tree SHA is unchanged) and diffed against a local snapshot of
+path -> blob SHA. Only added and modified files are downloaded, from the raw
+content host (which doesn't count against the API rate limit), by a bounded
+pool of workers; every download is checked against its blob SHA before it
+replaces the local file. Files no longer in the tree are deleted in the same
+pass.
+
+Failed files keep their old snapshot entry, so the next run retries them.
+Rate-limited responses pause every worker until the limit resets (they
+don't use up a file's attempts); once the pauses add up to more than
+max_wait_s the sync is abandoned so the caller can fall back to the
+repository ZIP.
+
+Without a snapshot (first run, or after a ZIP extraction) one is seeded by
+hashing local files whose size matches the tree entry.
+
+Tree and snapshot paths that would resolve outside the folder are skipped,
+never written or deleted.
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import requests
+
+from config import (
+    RATE_LIMIT_REQUEST_TIMEOUT, SKIN_DOWNLOAD_STREAM_TIMEOUT_S,
+    SKIN_UPDATE_ATTEMPTS, SKIN_UPDATE_MAX_WAIT_S, SKIN_UPDATE_WORKERS,
+)
+from utils.core.logging import get_logger
+from utils.core.safe_extract import is_safe_path
+from utils.download.extract_manifest import MANIFEST_FILE_NAME, ExtractManifest, prune_empty_dirs
+
+log = get_logger()
+
+# Ends in _state.json so the ZIP extraction's cleanup leaves it alone
+SNAPSHOT_FILE_NAME = ".repo_tree_state.json"
+SNAPSHOT_VERSION = 1
+PART_SUFFIX = ".part"
+WRITE_BLOCK = 64 * 1024
+
+# (files done, files to download)
+SyncProgress = Callable[[int, int], None]
+# path -> (blob SHA, size)
+RemoteTree = Dict[str, Tuple[str, int]]
+
+
+class TreeSyncError(Exception):
+    """The incremental update can't be done (the caller should download the ZIP)"""
+
+
+class RateLimited(TreeSyncError):
+    """Rate limited for longer than we are willing to wait"""
+
+
+def git_blob_sha(path: Path) -> Optional[str]:
+    """Git blob SHA-1 of a local file, None if unreadable"""
+    try:
+        digest = hashlib.sha1(b"blob %d\0" % os.path.getsize(path))
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def discard_tree_snapshot(target_dir: Path) -> None:
+    """Forget a folder's tree snapshot (after it was rewritten by other means)"""
+    try:
+        (Path(target_dir) / SNAPSHOT_FILE_NAME).unlink()
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        log.debug(f"[TreeSync] Failed to remove snapshot: {e}")
+
+
+@dataclass
+class TreeSyncResult:
+    """Files changed by a sync, relative to the synced folder (posix paths)"""
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    api_calls: int = 0
+
+
+class TreeSync:
+    """Brings a local folder up to date with the same folder of a repository tree"""
+
+    def __init__(
+        self,
+        session: requests.Session,
+        api_base: str,
+        raw_base: str,
+        target_dir: Path,
+        ref: str,
+        folder: str = "skins",
+        workers: int = SKIN_UPDATE_WORKERS,
+        attempts: int = SKIN_UPDATE_ATTEMPTS,
+        max_wait_s: float = SKIN_UPDATE_MAX_WAIT_S,
+        manifest: Optional[ExtractManifest] = None,
+        progress_callback: Optional[SyncProgress] = None,
+    ):
+        self.session = session
+        self.api_base = api_base.rstrip("/")
+        self.raw_base = raw_base.rstrip("/")
+        self.target_dir = Path(target_dir)
+        self.ref = ref
+        self.folder = folder.strip("/")
+        self.workers = max(1, int(workers))
+        self.attempts = max(1, int(attempts))
+        self.max_wait_s = max_wait_s
+        self.manifest = manifest
+        self.progress_callback = progress_callback
+        self.snapshot_path = self.target_dir / SNAPSHOT_FILE_NAME
+
+        self._local = threading.local()
+        self._gate_lock = threading.Lock()
+        self._resume_at = 0.0             # Workers hold off until then (rate limit)
+        self._waited = 0.0                # Total rate-limit pause so far
+        self._abort: Optional[BaseException] = None
+        self._done = 0
+        self._api_calls = 0
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def run(self) -> TreeSyncResult:
+        """Apply the difference between the remote tree and the local folder
+
+        Raises TreeSyncError if the tree can't be listed or the sync had to be
+        abandoned (rate limited for too long).
+        """
+        snapshot_tree, local = self.load_snapshot()
+        tree_sha = self._folder_tree_sha()
+        result = TreeSyncResult()
+        if local is not None and tree_sha == snapshot_tree:
+            log.info(f"[TreeSync] {self.folder}/ tree unchanged ({tree_sha[:8]})")
+            result.api_calls = self._api_calls
+            return result
+
+        remote = self._list_tree(tree_sha)
+        if local is None:
+            local = self._seed_snapshot(remote)
+
+        downloads = {path: entry for path, entry in remote.items() if local.get(path) != entry[0]}
+        removed = [path for path in local if path not in remote]
+        log.info(
+            f"[TreeSync] {len(remote)} files in {self.folder}/: "
+            f"{len(downloads)} to download, {len(removed)} to remove"
+        )
+
+        downloaded = set(self._download_all(downloads))
+        for path in sorted(downloads):
+            if path not in downloaded:
+                result.failed.append(path)
+            elif path in local:
+                result.modified.append(path)
+            else:
+                result.added.append(path)
+        result.removed = self._remove(removed)
+
+        # Failed files keep their old entry (or none), so they are retried next time
+        files = {path: sha for path, sha in local.items() if path in remote}
+        for path in downloaded:
+            files[path] = remote[path][0]
+        self.save_snapshot(None if result.failed else tree_sha, files)
+        if self.manifest is not None:
+            for path in downloaded:
+                self.manifest.record_file(path)
+            for path in result.removed:
+                self.manifest.forget(path)
+            self.manifest.save()
+
+        result.api_calls = self._api_calls
+        if self._abort is not None:
+            raise RateLimited(str(self._abort))
+        return result
+
+    # ------------------------------------------------------------------
+    # Snapshot
+    # ------------------------------------------------------------------
+
+    def load_snapshot(self) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+        """(folder tree SHA or None, path -> blob SHA), or (None, None) without a snapshot"""
+        try:
+            data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+            if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+                return None, None
+            files = data.get("files")
+            if not isinstance(files, dict):
+                return None, None
+            return data.get("tree"), {str(k): str(v) for k, v in files.items()}
+        except FileNotFoundError:
+            return None, None
+        except (OSError, ValueError) as e:
+            log.debug(f"[TreeSync] Ignoring unreadable snapshot {self.snapshot_path}: {e}")
+            return None, None
+
+    def save_snapshot(self, tree_sha: Optional[str], files: Dict[str, str]) -> None:
+        data = {"version": SNAPSHOT_VERSION, "tree": tree_sha, "files": files}
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        try:
+            self.target_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            log.warning(f"[TreeSync] Failed to save snapshot: {e}")
+
+    def _seed_snapshot(self, remote: RemoteTree) -> Dict[str, str]:
+        """Snapshot of the files already on disk
+
+        Files with the size of their tree entry are hashed; others get an
+        empty SHA, so they are downloaded again. Local files not in the tree
+        are listed too, so they get removed.
+        """
+        started = time.monotonic()
+        files: Dict[str, str] = {}
+        hashed = 0
+        if self.target_dir.exists():
+            for path in self.target_dir.rglob("*"):
+                if path.name.startswith(".") or path.name.endswith(PART_SUFFIX) or not path.is_file():
+                    continue
+                rel_path = path.relative_to(self.target_dir).as_posix()
+                entry = remote.get(rel_path)
+                if entry is None:
+                    files[rel_path] = ""
+                    continue
+                try:
+                    same_size = path.stat().st_size == entry[1]
+                except OSError:
+                    continue
+                sha = git_blob_sha(path) if same_size else None
+                hashed += same_size
+                files[rel_path] = sha or ""
+        log.info(f"[TreeSync] Seeded snapshot from {len(files)} local files ({hashed} hashed in {time.monotonic() - started:.1f}s)")
+        return files
+
+    # ------------------------------------------------------------------
+    # Tree listing (API)
+    # ------------------------------------------------------------------
+
+    def _api_get(self, url: str) -> dict:
+        self._api_calls += 1
+        try:
+            response = self.session.get(url, timeout=RATE_LIMIT_REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            raise TreeSyncError(f"tree request failed: {e}") from e
+        if response.status_code in (403, 429) and self._rate_limit_wait(response) is not None:
+            raise RateLimited(f"GitHub API rate limit reached ({response.status_code})")
+        if response.status_code != 200:
+            raise TreeSyncError(f"tree request failed: HTTP {response.status_code}")
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            log.debug(f"[TreeSync] GitHub API rate limit remaining: {remaining}")
+        try:
+            return response.json()
+        except ValueError as e:
+            raise TreeSyncError(f"invalid tree response: {e}") from e
+
+    def _folder_tree_sha(self) -> str:
+        root = self._api_get(f"{self.api_base}/git/trees/{self.ref}")
+        for entry in root.get("tree") or []:
+            if entry.get("path") == self.folder and entry.get("type") == "tree":
+                return entry["sha"]
+        raise TreeSyncError(f"no {self.folder}/ folder in tree {self.ref}")
+
+    def _list_tree(self, tree_sha: str) -> RemoteTree:
+        data = self._api_get(f"{self.api_base}/git/trees/{tree_sha}?recursive=1")
+        if data.get("truncated"):
+            raise TreeSyncError("tree listing truncated by the API")
+        return {
+            entry["path"]: (entry["sha"], int(entry.get("size") or 0))
+            for entry in data.get("tree") or []
+            if entry.get("type") == "blob" and self._local_path(entry["path"]) is not None
+        }
+
+    def _local_path(self, rel_path: str) -> Optional[Path]:
+        """Where *rel_path* goes in the folder, None if it would land outside it"""
+        local_path = self.target_dir / rel_path
+        if local_path == self.target_dir or not is_safe_path(self.target_dir, local_path):
+            log.error(f"[SECURITY] Blocked unsafe path in repository tree: {rel_path}")
+            return None
+        return local_path
+
+    # ------------------------------------------------------------------
+    # Downloads
+    # ------------------------------------------------------------------
+
+    def _download_all(self, downloads: RemoteTree) -> List[str]:
+        """Download files concurrently; returns the paths that succeeded"""
+        if not downloads:
+            return []
+        total = len(downloads)
+        done_lock = threading.Lock()
+
+        def task(item: Tuple[str, Tuple[str, int]]) -> Optional[str]:
+            path, (sha, size) = item
+            ok = self._download(path, sha, size)
+            with done_lock:
+                self._done += 1
+                done = self._done
+            if self.progress_callback:
+                try:
+                    self.progress_callback(done, total)
+                except Exception:
+                    pass
+            return path if ok else None
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, total), thread_name_prefix="SkinUpdate") as pool:
+            return [path for path in pool.map(task, sorted(downloads.items())) if path is not None]
+
+    def _worker_session(self) -> requests.Session:
+        """One session per worker thread (sessions aren't guaranteed thread-safe)"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.session.headers)
+            self._local.session = session
+        return session
+
+    def _download(self, rel_path: str, sha: str, size: int) -> bool:
+        url = f"{self.raw_base}/{self.ref}/{quote(f'{self.folder}/{rel_path}')}"
+        local_path = self._local_path(rel_path)
+        if local_path is None:
+            return False
+        attempt = 0
+        while self._wait_gate():
+            try:
+                if self._fetch(url, local_path, sha, size):
+                    log.debug(f"[TreeSync] Downloaded {self.folder}/{rel_path}")
+                    return True
+                continue  # Rate limited: retry once the pause is over
+            except RateLimited as e:
+                self._abort = self._abort or e
+                return False
+            except (requests.RequestException, OSError, ValueError) as e:
+                attempt += 1
+                if attempt >= self.attempts:
+                    log.warning(f"[TreeSync] Failed to download {self.folder}/{rel_path}: {e}")
+                    return False
+                log.debug(f"[TreeSync] {rel_path} failed (attempt {attempt}): {e}")
+                # Exponential backoff with jitter so workers don't retry in lockstep
+                time.sleep(0.5 * (2 ** (attempt - 1)) * (0.5 + random.random()))
+        return False
+
+    def _fetch(self, url: str, local_path: Path, sha: str, size: int) -> bool:
+        """Download one blob into place; False if rate limited (retry after the wait)"""
+        with self._worker_session().get(url, stream=True, timeout=SKIN_DOWNLOAD_STREAM_TIMEOUT_S) as response:
+            if response.status_code in (403, 429):
+                wait = self._rate_limit_wait(response)
+                if wait is not None:
+                    self._hold(wait)
+                    return False
+            response.raise_for_status()
+
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            part_path = local_path.with_name(local_path.name + PART_SUFFIX)
+            digest = hashlib.sha1(b"blob %d\0" % size)
+            try:
+                with open(part_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=WRITE_BLOCK):
+                        if chunk:
+                            digest.update(chunk)
+                            f.write(chunk)
+                if digest.hexdigest() != sha:
+                    raise ValueError(f"content doesn't match blob {sha[:8]}")
+                os.replace(part_path, local_path)
+            except BaseException:
+                try:
+                    part_path.unlink()
+                except OSError:
+                    pass
+                raise
+        return True
+
+    # ------------------------------------------------------------------
+    # Rate limiting
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _rate_limit_wait(response: requests.Response) -> Optional[float]:
+        """Seconds to wait if *response* is a rate limit, None if it is a plain error"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                return max(0.0, float(response.headers.get("X-RateLimit-Reset", "")) - time.time())
+            except ValueError:
+                return None
+        # 429 without hints: back off briefly; 403 without hints is a real error
+        return 1.0 if response.status_code == 429 else None
+
+    def _hold(self, wait: float) -> None:
+        """Pause every worker for *wait* seconds (or give up if pauses add up to too long)"""
+        with self._gate_lock:
+            now = time.monotonic()
+            resume_at = now + wait
+            if resume_at <= self._resume_at:
+                return  # Another worker already paused at least this long
+            self._waited += resume_at - max(now, self._resume_at)
+            if self._waited > self.max_wait_s:
+                raise RateLimited(f"rate limited for over {self.max_wait_s:.0f}s")
+            self._resume_at = resume_at
+            log.info(f"[TreeSync] Rate limited, pausing downloads for {wait:.1f}s")
+
+    def _wait_gate(self) -> bool:
+        """Wait out a rate-limit pause; False if the sync was abandoned"""
+        while self._abort is None:
+            delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                return True
+            time.sleep(min(delay, 0.5))
+        return False
+
+    # ------------------------------------------------------------------
+    # Removals
+    # ------------------------------------------------------------------
+
+    def _remove(self, removed: List[str]) -> List[str]:
+        """Delete local files that left the tree; returns the ones handled"""
+        handled = []
+        parents = set()
+        for rel_path in sorted(removed):
+            # Snapshot paths are read back from disk: check them like tree paths
+            local_path = self._local_path(rel_path)
+            if local_path is None or local_path.name == MANIFEST_FILE_NAME:
+                continue
+            try:
+                local_path.unlink()
+                log.info(f"Removed {local_path}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                log.warning(f"[TreeSync] Failed to remove {local_path}: {e}")
+                continue
+            handled.append(rel_path)
+            parents.add(local_path.parent)
+
+        prune_empty_dirs(parents, self.target_dir)
+        return handled
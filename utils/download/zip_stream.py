@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming ZIP Reader
+Parses a ZIP archive from a stream of byte chunks (e.g. an HTTP response) by
+walking its local file headers, so members can be written out while the rest
+of the archive is still downloading.
+
+Supports stored and deflated members, data descriptors and Zip64 sizes.
+Members whose end can't be found without the central directory (stored with a
+data descriptor) or that use another compression method raise
+StreamingUnsupported - callers fall back to a regular download + extract.
+"""
+
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+LOCAL_HEADER_SIG = b"PK\x03\x04"
+CENTRAL_DIR_SIG = b"PK\x01\x02"
+END_OF_CENTRAL_DIR_SIG = b"PK\x05\x06"
+DATA_DESCRIPTOR_SIG = b"PK\x07\x08"
+LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+
+FLAG_ENCRYPTED = 0x0001
+FLAG_DATA_DESCRIPTOR = 0x0008
+FLAG_UTF8 = 0x0800
+METHOD_STORED = 0
+METHOD_DEFLATED = 8
+ZIP64_EXTRA_ID = 0x0001
+
+READ_SIZE = 64 * 1024
+
+
+class StreamingUnsupported(Exception):
+    """Archive can't be extracted from a stream (needs the central directory)"""
+
+
+@dataclass
+class StreamMember:
+    """A member as described by its local file header"""
+    filename: str
+    method: int
+    flags: int
+    crc: int
+    compress_size: Optional[int]  # None until the data descriptor is read
+    file_size: Optional[int]
+
+    def is_dir(self) -> bool:
+        return self.filename.endswith("/")
+
+
+class _ChunkBuffer:
+    """Pull-based buffer over an iterator of byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._buf = bytearray()
+        self.consumed = 0  # Bytes handed out so far
+
+    def _fill(self, n: int) -> bool:
+        while len(self._buf) < n:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                return False
+            if chunk:
+                self._buf += chunk
+        return True
+
+    def peek(self, n: int) -> bytes:
+        self._fill(n)
+        return bytes(self._buf[:n])
+
+    def read_exact(self, n: int) -> bytes:
+        if not self._fill(n):
+            raise EOFError(f"Archive truncated (needed {n} bytes, have {len(self._buf)})")
+        data = bytes(self._buf[:n])
+        del self._buf[:n]
+        self.consumed += n
+        return data
+
+    def read_some(self, limit: int = READ_SIZE) -> bytes:
+        """Up to *limit* bytes; empty only at end of stream"""
+        if not self._buf:
+            self._fill(1)
+        data = bytes(self._buf[:limit])
+        del self._buf[:len(data)]
+        self.consumed += len(data)
+        return data
+
+    def unread(self, data: bytes) -> None:
+        if data:
+            self._buf[:0] = data
+            self.consumed -= len(data)
+
+
+def _zip64_sizes(extra: bytes, file_size: int, compress_size: int):
+    """Apply a Zip64 extra field to sizes stored as 0xFFFFFFFF"""
+    pos = 0
+    while pos + 4 <= len(extra):
+        header_id, size = struct.unpack_from("<HH", extra, pos)
+        body = extra[pos + 4:pos + 4 + size]
+        if header_id == ZIP64_EXTRA_ID:
+            values = list(struct.unpack_from(f"<{len(body) // 8}Q", body))
+            if file_size == 0xFFFFFFFF and values:
+                file_size = values.pop(0)
+            if compress_size == 0xFFFFFFFF and values:
+                compress_size = values.pop(0)
+            return file_size, compress_size, True
+        pos += 4 + size
+    return file_size, compress_size, False
+
+
+class StreamingZipReader:
+    """Sequential ZIP reader over a chunk stream
+
+    Usage::
+
+        reader = StreamingZipReader(response.iter_content(64 * 1024))
+        for member in reader.members():
+            if wanted(member):
+                reader.extract_to(member, file_obj)
+            # members not extracted are skipped automatically
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._buf = _ChunkBuffer(chunks)
+        self._pending: Optional[StreamMember] = None
+        self._zip64 = False
+
+    @property
+    def bytes_consumed(self) -> int:
+        return self._buf.consumed
+
+    def members(self) -> Iterator[StreamMember]:
+        """Yield members in archive order until the central directory starts"""
+        while True:
+            if self._pending is not None:
+                self._copy_data(self._pending, None)  # Caller didn't extract it: skip
+            signature = self._buf.peek(4)
+            if signature in (CENTRAL_DIR_SIG, END_OF_CENTRAL_DIR_SIG) or len(signature) < 4:
+                return
+            if signature != LOCAL_HEADER_SIG:
+                raise StreamingUnsupported(f"Unexpected record signature {signature!r} at offset {self._buf.consumed}")
+            self._pending = self._read_header()
+            yield self._pending
+
+    def extract_to(self, member: StreamMember, target: BinaryIO) -> None:
+        """Write the member's decompressed data to *target* and verify its CRC"""
+        if member is not self._pending:
+            raise ValueError("Only the current member can be extracted")
+        self._copy_data(member, target)
+
+    def drain(self) -> int:
+        """Consume the rest of the stream (central directory). Returns bytes read."""
+        total = 0
+        while True:
+            data = self._buf.read_some()
+            if not data:
+                return total
+            total += len(data)
+
+    def _read_header(self) -> StreamMember:
+        (_sig, _version, flags, method, _time, _date, crc,
+         compress_size, file_size, name_len, extra_len) = LOCAL_HEADER.unpack(self._buf.read_exact(LOCAL_HEADER.size))
+        raw_name = self._buf.read_exact(name_len)
+        extra = self._buf.read_exact(extra_len)
+        filename = raw_name.decode("utf-8" if flags & FLAG_UTF8 else "cp437")
+
+        if flags & FLAG_ENCRYPTED:
+            raise StreamingUnsupported(f"{filename}: encrypted members can't be streamed")
+        if method not in (METHOD_STORED, METHOD_DEFLATED):
+            raise StreamingUnsupported(f"{filename}: compression method {method} can't be streamed")
+
+        file_size, compress_size, self._zip64 = _zip64_sizes(extra, file_size, compress_size)
+        if flags & FLAG_DATA_DESCRIPTOR:
+            if method == METHOD_STORED:
+                raise StreamingUnsupported(f"{filename}: stored member without sizes can't be streamed")
+            return StreamMember(filename, method, flags, 0, None, None)
+        return StreamMember(filename, method, flags, crc, compress_size, file_size)
+
+    def _copy_data(self, member: StreamMember, target: Optional[BinaryIO]) -> None:
+        """Consume the member's data, writing it to *target* if given"""
+        self._pending = None
+        crc = 0
+        written = 0
+        remaining = member.compress_size  # None: deflate stream end decides
+        # Skipped members of known size are discarded without inflating them
+        inflate = member.method == METHOD_DEFLATED and (target is not None or remaining is None)
+        decompressor = zlib.decompressobj(-15) if inflate else None
+
+        while remaining is None or remaining > 0:
+            data = self._buf.read_some(READ_SIZE if remaining is None else min(READ_SIZE, remaining))
+            if not data:
+                raise EOFError(f"Archive truncated inside {member.filename}")
+            if remaining is not None:
+                remaining -= len(data)
+            if decompressor is not None:
+                out = decompressor.decompress(data)
+                if decompressor.eof:
+                    self._buf.unread(decompressor.unused_data)
+                    remaining = 0
+            else:
+                out = data
+            if out:
+                written += len(out)
+                if target is not None:
+                    crc = zlib.crc32(out, crc)
+                    target.write(out)
+        if decompressor is not None:
+            tail = decompressor.flush()
+            if tail:
+                written += len(tail)
+                if target is not None:
+                    crc = zlib.crc32(tail, crc)
+                    target.write(tail)
+
+        if member.flags & FLAG_DATA_DESCRIPTOR:
+            self._read_data_descriptor(member)
+
+        if target is not None:
+            if member.file_size is not None and written != member.file_size:
+                raise zlib.error(f"{member.filename}: size mismatch ({written} != {member.file_size})")
+            if crc != member.crc:
+                raise zlib.error(f"{member.filename}: CRC mismatch")
+
+    def _read_data_descriptor(self, member: StreamMember) -> None:
+        if self._buf.peek(4) == DATA_DESCRIPTOR_SIG:
+            self._buf.read_exact(4)
+        if self._zip64:
+            member.crc, member.compress_size, member.file_size = struct.unpack("<IQQ", self._buf.read_exact(20))
+        else:
+            member.crc, member.compress_size, member.file_size = struct.unpack("<III", self._buf.read_exact(12))
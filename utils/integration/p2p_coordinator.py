@@ -46,6 +46,16 @@ class P2PCoordinator:
         # NodeMaster URL from config
         self._nodemaster_url = NODEMASTER_URL
 
+    def _leave_room(self):
+        """Leave the P2P room and release peer skins staged for it"""
+        self.p2p_client.leave_room_sync()
+        p2p_handler = getattr(self.state, "p2p_handler", None)
+        if p2p_handler is not None:
+            try:
+                p2p_handler.release_staged_skins()
+            except Exception as e:
+                log.debug(f"[P2P] Failed to release staged peer skins: {e}")
+
     def is_active(self) -> bool:
         """Check if P2P coordinator should be active based on phase"""
         if self.state.is_solo_queue:
@@ -56,7 +66,7 @@ class P2PCoordinator:
         """Disconnect P2P when entering solo queue"""
         if self._is_connected:
             log.info("[P2P] Entering Solo Queue - Disconnecting to save resources")
-            self.p2p_client.leave_room_sync()
+            self._leave_room()
             self._is_connected = False
             self._is_active = False
 
@@ -77,7 +87,7 @@ class P2PCoordinator:
         # Disconnect when entering game phases to reduce load
         if new_phase in self.DISCONNECT_PHASES and self._is_connected:
             log.info(f"[P2P] Entering {new_phase}, disconnecting to reduce load")
-            self.p2p_client.leave_room_sync()
+            self._leave_room()
             self._is_connected = False
         
         # Reconnect when returning to Lobby (if we have a party)
@@ -115,7 +125,7 @@ class P2PCoordinator:
         # If switching parties, leave the old room first
         if self._is_connected and self._current_party_id and self._current_party_id != party_id:
             log.info(f"[P2P] Switching party, leaving old room first")
-            self.p2p_client.leave_room_sync()
+            self._leave_room()
             self._is_connected = False
 
         # Create ticket from party ID hash
@@ -142,13 +152,13 @@ class P2PCoordinator:
             self._current_ticket = None
             self._is_connected = False
             # Notify sidecar to leave P2P room
-            self.p2p_client.leave_room_sync()
+            self._leave_room()
 
     def reset(self):
         """Reset coordinator state and leave P2P room"""
         if self._is_connected:
             # Notify sidecar to leave P2P room
-            self.p2p_client.leave_room_sync()
+            self._leave_room()
         self._current_party_id = None
         self._current_ticket = None
         self._is_connected = False
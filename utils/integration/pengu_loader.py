@@ -23,6 +23,7 @@ except ImportError:  # pragma: no cover - psutil is part of requirements, but gu
 
 from utils.core.logging import get_logger
 from utils.core.paths import get_app_dir, get_state_dir, get_user_data_dir
+from utils.system.process_watcher import get_process_watcher
 
 log = get_logger("pengu_loader")
 
@@ -411,11 +412,10 @@ def _is_league_running() -> bool:
         return False
 
     try:
-        for proc in psutil.process_iter(["name"]):
-            name = proc.info.get("name")
-            if name and name in _LEAGUE_PROCESSES:
-                log.debug("Detected running League process: %s", name)
-                return True
+        running = get_process_watcher().find(*_LEAGUE_PROCESSES)
+        if running:
+            log.debug("Detected running League process: %s", running[0].name)
+            return True
     except (psutil.Error, OSError) as exc:  # type: ignore[attr-defined]
         log.debug("Failed to inspect running processes: %s", exc)
     return False
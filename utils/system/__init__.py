@@ -8,6 +8,7 @@ This subpackage contains system and OS-specific utilities:
 - win32_base: Windows-specific utilities
 - window_utils: Window detection and monitoring
 - resolution_utils: Resolution handling
+- process_watcher: Shared incremental process-table index with appear/exit events
 """
 
 from utils.system.admin_utils import (
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Process Watcher
+Shared, incremental index of the process table (PID -> name, create time, exe).
+
+Each refresh lists PIDs only and looks up the ones not seen before, instead of
+every consumer walking psutil.process_iter on its own. Consumers can query the
+index (find / is_running) or subscribe to "process named X appeared/exited"
+events; while anyone is subscribed, a background thread refreshes every
+PROCESS_WATCH_INTERVAL_S so events arrive within ~10 ms. That polling costs a
+few percent of one core, so subscribe only while waiting for an event and
+unsubscribe once it arrived.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Import psutil with fallback for development environments
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    psutil = None
+
+from config import PROCESS_WATCH_INTERVAL_S
+from utils.core.logging import get_logger
+
+log = get_logger()
+
+# Names of processes younger than this are re-read on each refresh: on POSIX a
+# new PID can be seen between fork and exec, still carrying its parent's name
+YOUNG_PROCESS_WINDOW_S = 1.0
+
+
+@dataclass
+class ProcessInfo:
+    """Indexed process (exe is resolved lazily, see ProcessWatcher.exe_of)"""
+    pid: int
+    name: str
+    create_time: float
+    exe: Optional[str] = None
+    exe_resolved: bool = False
+
+
+ProcessCallback = Callable[[ProcessInfo], None]
+
+
+@dataclass
+class _Subscription:
+    names: frozenset                   # Lower-case process names
+    on_appear: Optional[ProcessCallback]
+    on_exit: Optional[ProcessCallback]
+
+
+class ProcessWatcher:
+    """Incremental process-table index with appear/exit subscriptions"""
+
+    def __init__(self, interval_s: float = PROCESS_WATCH_INTERVAL_S):
+        self.interval_s = interval_s
+        self._index: Dict[int, ProcessInfo] = {}
+        self._young: Dict[int, float] = {}  # pid -> time.time() after which its name is final
+        self._lock = threading.RLock()
+        self._subscriptions: List[_Subscription] = []
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def available(self) -> bool:
+        return PSUTIL_AVAILABLE
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> None:
+        """Bring the index up to date and notify subscribers"""
+        with self._lock:
+            appeared, exited = self._refresh_locked()
+            subscriptions = list(self._subscriptions)
+        self._dispatch(appeared, exited, subscriptions)
+
+    def find(self, *names: str) -> List[ProcessInfo]:
+        """Running processes with one of *names* (case-insensitive)"""
+        wanted = {n.lower() for n in names}
+        return self.find_matching(lambda name: name in wanted)
+
+    def find_matching(self, predicate: Callable[[str], bool]) -> List[ProcessInfo]:
+        """Running processes whose lower-case name satisfies *predicate*"""
+        self.refresh()
+        with self._lock:
+            matches = [info for info in self._index.values() if info.name and predicate(info.name.lower())]
+        return [info for info in matches if self._still_same(info)]
+
+    def is_running(self, *names: str) -> bool:
+        return bool(self.find(*names))
+
+    def exe_of(self, info: ProcessInfo) -> Optional[str]:
+        """Executable path of an indexed process (looked up once, None if denied)"""
+        if not info.exe_resolved and PSUTIL_AVAILABLE:
+            try:
+                info.exe = psutil.Process(info.pid).exe() or None
+            except (psutil.Error, OSError) as e:
+                log.debug(f"[process-watcher] Can't read exe of PID {info.pid}: {e}")
+            info.exe_resolved = True
+        return info.exe
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def subscribe(
+        self,
+        names: Iterable[str],
+        on_appear: Optional[ProcessCallback] = None,
+        on_exit: Optional[ProcessCallback] = None,
+        replay: bool = False,
+    ) -> Callable[[], None]:
+        """Get called when a process named one of *names* appears or exits
+
+        Callbacks run on the watcher thread and should return quickly. With
+        *replay*, on_appear is also called for matching processes that are
+        already running. Returns an unsubscribe function.
+        """
+        subscription = _Subscription(frozenset(n.lower() for n in names), on_appear, on_exit)
+        with self._lock:
+            appeared, exited = self._refresh_locked()
+            others = list(self._subscriptions)
+            running = [info for info in self._index.values() if info.name.lower() in subscription.names]
+            self._subscriptions.append(subscription)
+            self._ensure_thread()
+        self._dispatch(appeared, exited, others)
+        if replay and on_appear:
+            for info in running:
+                self._call(on_appear, info)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if subscription in self._subscriptions:
+                    self._subscriptions.remove(subscription)
+        return unsubscribe
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _refresh_locked(self) -> Tuple[List[ProcessInfo], List[ProcessInfo]]:
+        if not PSUTIL_AVAILABLE:
+            return [], []
+        try:
+            pids = psutil.pids()
+        except (psutil.Error, OSError) as e:
+            log.debug(f"[process-watcher] Failed to list PIDs: {e}")
+            return [], []
+
+        current = set(pids)
+        exited = [self._index.pop(pid) for pid in list(self._index) if pid not in current]
+        appeared = self._recheck_young(current)
+        now = time.time()
+        for pid in pids:
+            if pid not in self._index:
+                info = self._lookup(pid)
+                self._index[pid] = info
+                if info.name:
+                    appeared.append(info)
+                if now - info.create_time < YOUNG_PROCESS_WINDOW_S:
+                    self._young[pid] = info.create_time + YOUNG_PROCESS_WINDOW_S
+        return appeared, [info for info in exited if info.name]
+
+    def _recheck_young(self, current: set) -> List[ProcessInfo]:
+        """Re-read names of just-started processes; renamed ones count as appeared"""
+        renamed = []
+        now = time.time()
+        for pid, final_at in list(self._young.items()):
+            info = self._index.get(pid)
+            if info is None or pid not in current or now >= final_at:
+                del self._young[pid]
+                continue
+            try:
+                name = psutil.Process(pid).name() or ""
+            except (psutil.Error, OSError):
+                continue
+            if name != info.name:
+                info.name = name
+                info.exe_resolved = False
+                if name:
+                    renamed.append(info)
+        return renamed
+
+    @staticmethod
+    def _lookup(pid: int) -> ProcessInfo:
+        """Name and create time of a new PID (an unnamed entry if it can't be read,
+        so it isn't looked up again on every refresh)"""
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                return ProcessInfo(pid, proc.name() or "", proc.create_time())
+        except (psutil.Error, OSError):
+            return ProcessInfo(pid, "", 0.0)
+
+    def _still_same(self, info: ProcessInfo) -> bool:
+        """Guard against PID reuse between refreshes for query results"""
+        try:
+            if psutil.Process(info.pid).create_time() == info.create_time:
+                return True
+        except (psutil.Error, OSError):
+            pass
+        with self._lock:
+            if self._index.get(info.pid) is info:
+                del self._index[info.pid]
+        return False
+
+    def _dispatch(self, appeared: List[ProcessInfo], exited: List[ProcessInfo], subscriptions: List[_Subscription]) -> None:
+        if not subscriptions:
+            return
+        for info in exited:
+            name = info.name.lower()
+            for subscription in subscriptions:
+                if subscription.on_exit and name in subscription.names:
+                    self._call(subscription.on_exit, info)
+        for info in appeared:
+            name = info.name.lower()
+            for subscription in subscriptions:
+                if subscription.on_appear and name in subscription.names:
+                    self._call(subscription.on_appear, info)
+
+    @staticmethod
+    def _call(callback: ProcessCallback, info: ProcessInfo) -> None:
+        try:
+            callback(info)
+        except Exception as e:
+            log.debug(f"[process-watcher] Callback failed for {info.name} (PID {info.pid}): {e}")
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True, name="ProcessWatcher")
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Refresh while anyone is subscribed"""
+        while True:
+            with self._lock:
+                if not self._subscriptions:
+                    self._thread = None
+                    return
+            started = time.monotonic()
+            self.refresh()
+            time.sleep(max(0.0, self.interval_s - (time.monotonic() - started)))
+
+
+_watcher: Optional[ProcessWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def get_process_watcher() -> ProcessWatcher:
+    """Shared process watcher instance"""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = ProcessWatcher()
+        return _watcher